@@ -114,12 +114,14 @@ def get_presigned_url(
     if match is None:
         raise HTTPException(status_code=404, detail="해당 파일이 DB에 없습니다.")
     # object key/composite key 생성
-    object_key = make_object_key(match)
+    logical_key = make_object_key(match)
     # 권한 정책: base_audio/는 모두 허용, 그 외에는 본인만
-    if object_key.startswith("base_audio/"):
+    if logical_key.startswith("base_audio/"):
         pass
-    elif not object_key.startswith(f"{user_id}/"):
+    elif not logical_key.startswith(f"{user_id}/"):
         raise HTTPException(status_code=403, detail="본인 소유 파일만 접근 가능합니다.")
+    # 콘텐츠 해시 기반으로 저장된 항목은 실제 S3 키(object_key)가 별도로 기록되어 있음
+    object_key = match.get("object_key") or logical_key
     url = create_presigned_url(object_key, expires_in)
     if url is None:
         raise HTTPException(status_code=400, detail="Presigned URL 발급에 실패했습니다. AWS 설정 확인 필요")
@@ -12,6 +12,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from core.database import (
     db, scripts_table, slides_table, sentences_table, practice_scores_table
 )
+from core import speaking_rate
 from core.security import get_current_user_id
 from models.script import (
     PracticeScoreRequest, PracticeScoreResponse, PracticeScoreData
@@ -91,6 +92,7 @@ def submit_practice_score(
     - 새로운 점수 기록 생성
     - 기존 기록이 있으면 attempts 증가 및 best_score 업데이트
     - 연습 진행 상태 추적
+    - `time_taken`이 있으면 사용자별 발화 속도 모델을 갱신 (문장 목록의 `duration_estimate` 개인화)
     """
     sentence = get_sentence_by_id(sentence_id)
     
@@ -158,6 +160,10 @@ def submit_practice_score(
         
         practice_scores_table.insert(score_data)
     
+    # 사용자별 발화 속도 모델 갱신 (문장 목록의 예상 읽기 시간 개인화에 사용)
+    if request.time_taken is not None:
+        speaking_rate.observe(user_id, sentence['text'], request.time_taken)
+    
     # 업데이트된 데이터 조회
     updated_score = practice_scores_table.get(Q.score_id == score_id)
     
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, List, Optional
 
 
 class ScriptEntry(BaseModel):
@@ -173,3 +173,122 @@ class VoiceCloneResponse(BaseModel):
                 }
             }
         }
+
+
+class VoiceUploadFileInfo(BaseModel):
+    """직접 업로드할 음성 샘플 정보"""
+    file_name: str = Field(..., title="원본 파일명", example="sample1.wav")
+    content_type: str = Field(..., title="Content-Type", description="audio/wav 또는 audio/mpeg", example="audio/wav")
+    size: int = Field(..., gt=0, title="파일 크기(바이트)", description="업로드할 파일의 정확한 크기 (3MB 이하)", example=1048576)
+
+
+class VoiceUploadUrlsRequest(BaseModel):
+    """음성 샘플 presigned PUT URL 발급 요청"""
+    files: List[VoiceUploadFileInfo] = Field(..., title="업로드할 음성 샘플 3개")
+
+
+class VoiceUploadTarget(BaseModel):
+    """단일 음성 샘플 업로드 대상"""
+    object_key: str = Field(..., title="S3 객체 경로", example="user123/voice_samples/<upload_id>/sample_1.wav")
+    upload_url: str = Field(..., title="Presigned PUT URL", example="https://...")
+    method: str = Field(default="PUT", title="HTTP 메서드")
+    headers: dict = Field(..., title="업로드 시 반드시 포함할 헤더",
+                          example={"Content-Type": "audio/wav", "Content-Length": "1048576"})
+
+
+class VoiceUploadUrlsResponse(BaseModel):
+    """음성 샘플 presigned PUT URL 발급 응답"""
+    upload_id: str = Field(..., title="업로드 세션 ID")
+    expires_in: int = Field(..., title="URL 유효 시간(초)", example=900)
+    uploads: List[VoiceUploadTarget] = Field(..., title="샘플별 업로드 대상")
+
+
+class VoiceJobError(BaseModel):
+    """작업 실패 정보"""
+    status_code: int = Field(..., title="HTTP 상태 코드", example=502)
+    detail: str = Field(..., title="오류 메시지", example="Supertone API 오류 (500): ...")
+
+
+class VoiceJobResponse(BaseModel):
+    """보이스 클로닝 작업 상태"""
+    job_id: str = Field(..., title="작업 ID")
+    status: str = Field(..., title="작업 상태", description="queued / running / completed / failed", example="running")
+    stage: Optional[str] = Field(default=None, title="진행 단계",
+                                 description="preprocessing / cloning / tts / uploading / presigning (running일 때)", example="cloning")
+    created_at: str = Field(..., title="생성 시각")
+    updated_at: str = Field(..., title="마지막 갱신 시각")
+    result: Optional[VoiceCloneResponse] = Field(default=None, title="완료 결과 (completed일 때)")
+    error: Optional[VoiceJobError] = Field(default=None, title="실패 정보 (failed일 때)")
+
+
+class VoiceJobAcceptedResponse(BaseModel):
+    """보이스 클로닝 작업 등록 응답"""
+    job_id: str = Field(..., title="작업 ID")
+    status: str = Field(..., title="작업 상태", example="queued")
+    status_url: str = Field(..., title="상태 조회 경로", example="/api/v1/voice/jobs/<job_id>")
+    events_url: str = Field(..., title="진행 이벤트(SSE) 경로", example="/api/v1/voice/jobs/<job_id>/events")
+
+
+class TtsCacheStatsResponse(BaseModel):
+    """TTS 캐시 통계"""
+    hits: int = Field(..., title="캐시 적중 횟수")
+    misses: int = Field(..., title="캐시 미스 횟수 (Supertone 호출)")
+    evictions: int = Field(..., title="크기 상한으로 제거된 항목 수")
+    hit_rate: float = Field(..., title="적중률", example=0.75)
+    entries: int = Field(..., title="현재 캐시 항목 수")
+    total_bytes: int = Field(..., title="현재 캐시 총 크기(바이트)")
+    max_bytes: int = Field(..., title="캐시 크기 상한(바이트)")
+
+
+class VoiceQualityIssue(BaseModel):
+    """품질 기준 미달 항목"""
+    code: str = Field(..., title="문제 코드",
+                      description="too_short / clipping / too_quiet / mostly_silence / noisy", example="clipping")
+    detail: str = Field(..., title="설명", example="소리가 너무 커서 찢어진(클리핑) 구간이 있습니다. (0.35%)")
+
+
+class VoiceSampleQuality(BaseModel):
+    """음성 샘플 한 개의 품질 분석 결과"""
+    file_name: str = Field(..., title="원본 파일명", example="sample1.wav")
+    format: str = Field(..., title="파일 형식", example="wav")
+    duration_ms: int = Field(..., title="전체 길이(ms)", example=5230)
+    speech_ms: int = Field(..., title="말소리 길이(ms)", description="-40dBFS 이상인 100ms 구간의 총 길이", example=4100)
+    peak_dbfs: Optional[float] = Field(default=None, title="최대 진폭(dBFS)", example=-1.2)
+    clipping_ratio: float = Field(..., title="클리핑 샘플 비율", example=0.0)
+    rms_dbfs: Optional[float] = Field(default=None, title="평균 음량(dBFS)", example=-21.4)
+    silence_ratio: float = Field(..., title="무음 구간 비율", example=0.21)
+    snr_db: Optional[float] = Field(default=None, title="추정 SNR(dB)", description="잡음이 전혀 없으면 null", example=34.5)
+    passed: bool = Field(..., title="품질 기준 통과 여부")
+    issues: List[VoiceQualityIssue] = Field(default_factory=list, title="기준 미달 항목")
+
+
+class VoiceAnalyzeResponse(BaseModel):
+    """음성 샘플 품질 분석 응답"""
+    passed: bool = Field(..., title="모든 파일이 기준을 통과했는지 여부")
+    files: List[VoiceSampleQuality] = Field(..., title="파일별 분석 결과")
+    thresholds: dict = Field(..., title="적용된 품질 기준",
+                             example={"min_speech_ms": 1000, "max_clipping_ratio": 0.001, "min_rms_dbfs": -45,
+                                      "max_silence_ratio": 0.7, "min_snr_db": 10})
+
+
+class UpstreamCallStats(BaseModel):
+    """외부 API 호출 종류별 결과 카운터"""
+    calls: int = Field(..., title="호출 수 (재시도 제외)")
+    successes: int = Field(..., title="성공")
+    failures: int = Field(..., title="최종 실패")
+    retries: int = Field(..., title="재시도 횟수")
+    short_circuited: int = Field(..., title="서킷이 열려 호출하지 않고 실패한 횟수")
+    hedged: int = Field(..., title="헤징 요청을 보낸 횟수")
+    hedge_wins: int = Field(..., title="헤징 요청이 먼저 성공한 횟수")
+
+
+class CircuitState(BaseModel):
+    """서킷 브레이커 상태"""
+    state: str = Field(..., title="상태", description="closed / open / half_open", example="closed")
+    consecutive_failures: int = Field(..., title="연속 실패 횟수")
+
+
+class UpstreamStatsResponse(BaseModel):
+    """Supertone 호출 안정화 지표"""
+    calls: Dict[str, UpstreamCallStats] = Field(..., title="호출 종류별 결과")
+    circuits: Dict[str, CircuitState] = Field(..., title="호출 종류별 서킷 상태")
@@ -85,10 +85,12 @@ def get_script_contents(
 
     results = []
     for info in filtered:
-        obj_key = make_object_key(info)
+        logical_key = make_object_key(info)
         # permission: base_audio or owner
-        if not obj_key.startswith("base_audio/") and not obj_key.startswith(f"{user_id}/"):
+        if not logical_key.startswith("base_audio/") and not logical_key.startswith(f"{user_id}/"):
             continue
+        # content-addressed entries keep their real S3 key in object_key
+        obj_key = info.get('object_key') or logical_key
         entry = ScriptEntry(
             user_id=info.get('user_id'),
             script_name=info.get('script_name', ''),
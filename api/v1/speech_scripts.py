@@ -2,20 +2,45 @@
 발표 대본 관리 API
 - 발표 대본 업로드 및 메타데이터 관리
 - 슬라이드 대본 업로드 및 처리
+- 발표 자료 파일(PPTX 노트/텍스트) 가져오기
 - 문장 데이터 조회 및 클론 준비
+- 문장 일괄 TTS 생성 (비동기 작업)
 """
 
+import asyncio
+import codecs
+import json
+import math
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Optional, Annotated
-from fastapi import APIRouter, Depends, HTTPException, Query
-from core.database import db, scripts_table, slides_table, sentences_table, practice_scores_table
+from functools import partial
+from typing import AsyncIterator, Dict, List, Optional, Annotated, Set, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Request
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+from core.database import (
+    db, scripts_table, slides_table, sentences_table, practice_scores_table, users_table
+)
+from core import chunk_cache, speaking_rate
 from core.security import get_current_user_id
-from core.script_processor import ScriptProcessor
+from core.script_processor import ChunkStrategy, ChunkStream, ScriptProcessor, SentenceStream
+from core.script_import import ScriptImportError, read_pptx_notes, read_text_slides
+from core.uploads import ReceivedFile, UploadRejectedError, UploadRules, receive_files, sniff_script_format
+from core.config import (
+    SUPERTONE_API_KEY, AUDIO_WORKERS, SCRIPT_BATCH_MAX_SLIDES, SCRIPT_BATCH_PARALLEL_MIN_CHARS,
+    SCRIPT_STREAM_BATCH_CHUNKS, SCRIPT_IMPORT_MAX_BYTES
+)
+from core.workers import run_audio_task
+from core.jobs import JobQueueFullError, enqueue_job, get_job
+from core.script_tts import SCRIPT_TTS_JOB_KIND, render_script_sentences
+from core.storage import unlink_files
 from models.script import (
     UploadScriptRequest, UploadSlideRequest, UploadSlideResponse,
+    UploadSlidesBatchRequest, UploadSlidesBatchResponse, ScriptImportResponse,
     ScriptMetadata, SlideData, SentenceData, SentencesListResponse,
-    ScriptSummaryResponse, SlideStatus
+    ScriptSummaryResponse, SlideStatus,
+    ScriptTtsJobAccepted, ScriptTtsJobResponse, ChunkCacheStatsResponse
 )
 
 router = APIRouter(
@@ -61,6 +86,341 @@ def get_slide_by_id(slide_id: str, user_id: str) -> dict:
     return slide
 
 
+def chunking_options(
+    strategy: ChunkStrategy = Query(ChunkStrategy.CHARACTER_COUNT, description="청크화 전략"),
+    max_chars: int = Query(ScriptProcessor.DEFAULT_CHUNK_CHARS, ge=10, le=1000,
+                           description="청크당 최대 문자 수 (character_count)"),
+    max_sentences: int = Query(ScriptProcessor.DEFAULT_CHUNK_SENTENCES, ge=1, le=20,
+                               description="청크당 최대 문장 수"),
+    max_duration: float = Query(ScriptProcessor.DEFAULT_CHUNK_SECONDS, gt=0, le=120,
+                                description="청크당 최대 예상 읽기 시간(초) (duration)"),
+    balanced: bool = Query(False, description="청크별 읽기 시간이 고르도록 분할")
+) -> dict:
+    """슬라이드 업로드 API 공통 청크화 쿼리 파라미터 (process_slide_script 인자)"""
+    return {
+        "strategy": strategy,
+        "max_chars": max_chars,
+        "max_sentences": max_sentences,
+        "max_duration": max_duration,
+        "balanced": balanced
+    }
+
+
+AUDIO_FIELDS = ('audio_object_key', 'audio_content_hash', 'audio_text_hash', 'audio_length', 'audio_generated_at')
+
+
+# 스크립트별 슬라이드 쓰기 락: script_id → [asyncio.Lock, 기다리거나 사용 중인 요청 수]
+# 기존 문장을 읽어 계획한 뒤 저장하기까지를 직렬화하여, 같은 스크립트의 동시 업로드가 서로의 변경을 덮어쓰지 않도록 함
+_script_locks: Dict[str, list] = {}
+
+
+@asynccontextmanager
+async def _script_write_lock(script_id: str) -> AsyncIterator[None]:
+    entry = _script_locks.setdefault(script_id, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _script_locks[script_id]
+
+
+class _SlideWrites:
+    """여러 슬라이드 업로드의 추가/수정/삭제 내용을 모아 한 번의 저장소 쓰기로 반영하기 위한 묶음"""
+
+    def __init__(self):
+        self.slide_rows: List[dict] = []
+        self.slide_updates: Dict[str, dict] = {}
+        self.sentence_rows: List[dict] = []
+        self.sentence_updates: Dict[str, dict] = {}
+        self.removed_slide_ids: Set[str] = set()
+        self.removed_sentence_ids: Set[str] = set()
+        self.text_changed_sentence_ids: Set[str] = set()  # 텍스트가 바뀌어 연습 점수/오디오 파일을 비울 문장
+
+
+def _load_current_slides(
+    script_id: str,
+    slide_numbers: List[int]
+) -> Tuple[Dict[int, Tuple[dict, List[dict]]], List[dict]]:
+    """
+    slide_numbers에 해당하는 기존 슬라이드와 문장(sentence_number 순)을 읽습니다.
+    같은 slide_number의 슬라이드가 여러 개면(재업로드가 새 슬라이드를 만들던 때의 데이터) 가장 최근 것을 사용합니다.
+
+    반환: ({slide_number: (슬라이드, 문장 목록)}, [가장 최근이 아닌 중복 슬라이드, ...])
+    """
+    from tinydb import Query as TinyQuery
+    Q = TinyQuery()
+    wanted = set(slide_numbers)
+    slides = [slide for slide in slides_table.search(Q.script_id == script_id) if slide.get('slide_number') in wanted]
+    if not slides:
+        return {}, []
+
+    current, stale = {}, []
+    for slide in sorted(slides, key=lambda slide: (slide.get('created_at') or '', slide.doc_id)):
+        if slide['slide_number'] in current:
+            stale.append(current[slide['slide_number']])
+        current[slide['slide_number']] = slide
+
+    slide_ids = {slide['slide_id'] for slide in current.values()}
+    sentences_by_slide = {slide_id: [] for slide_id in slide_ids}
+    for sentence in sentences_table.search(Q.script_id == script_id):
+        if sentence.get('slide_id') in slide_ids:
+            sentences_by_slide[sentence['slide_id']].append(sentence)
+    return {
+        number: (slide, sorted(sentences_by_slide[slide['slide_id']], key=lambda s: s.get('sentence_number', 0)))
+        for number, slide in current.items()
+    }, stale
+
+
+def _build_slide_records(
+    writes: _SlideWrites,
+    script_id: str,
+    slide_number: int,
+    processed_chunks: List[Tuple[str, float, List[int], Optional[int]]],
+    now: datetime,
+    previous: Optional[Tuple[dict, List[dict]]] = None
+) -> dict:
+    """
+    rechunk_slide_script 결과를 writes에 추가하고 UploadSlideResponse 응답을 만듭니다.
+
+    previous(같은 slide_number의 기존 슬라이드와 문장)가 있으면 슬라이드 ID를 유지하고,
+    기존 청크를 재사용한 문장은 sentence_id와 오디오/연습 점수를 유지한 채 바뀐 필드만 수정합니다.
+    텍스트가 바뀐 문장은 오디오 정보와 연습 점수, 오디오 파일을 비우고,
+    재사용되지 않은 기존 문장은 연습 점수·오디오 파일과 함께 삭제합니다.
+    """
+    timestamp = _serialize_datetime(now)
+    if previous is None:
+        slide_id = str(uuid.uuid4())
+        previous_sentences = []
+        writes.slide_rows.append({
+            "slide_id": slide_id,
+            "script_id": script_id,
+            "slide_number": slide_number,
+            "status": SlideStatus.COMPLETED,
+            "created_at": timestamp,
+            "updated_at": timestamp
+        })
+    else:
+        slide, previous_sentences = previous
+        slide_id = slide['slide_id']
+        writes.slide_updates[slide_id] = {"status": SlideStatus.COMPLETED, "updated_at": timestamp}
+
+    changes = {"kept": 0, "updated": 0, "inserted": 0, "removed": 0}
+    reused = set()
+    sentence_list = []
+    for idx, (chunk_text, duration, original_indices, reuse) in enumerate(processed_chunks, 1):
+        if reuse is None:
+            row = {
+                "sentence_id": str(uuid.uuid4()),
+                "slide_id": slide_id,
+                "script_id": script_id,
+                "sentence_number": idx,
+                "text": chunk_text,
+                "original_sentence_indices": original_indices,
+                "duration_estimate": duration,
+                "created_at": timestamp
+            }
+            writes.sentence_rows.append(row)
+            changes["inserted"] += 1
+        else:
+            reused.add(reuse)
+            old = previous_sentences[reuse]
+            fields = {}
+            if old.get('sentence_number') != idx:
+                fields["sentence_number"] = idx
+            if old.get('original_sentence_indices') != original_indices:
+                fields["original_sentence_indices"] = original_indices
+            if old.get('duration_estimate') != duration:
+                fields["duration_estimate"] = duration
+            if old.get('text') != chunk_text:
+                fields["text"] = chunk_text
+                fields.update(dict.fromkeys(AUDIO_FIELDS))
+                writes.text_changed_sentence_ids.add(old['sentence_id'])
+            if fields:
+                writes.sentence_updates[old['sentence_id']] = fields
+                changes["updated"] += 1
+            else:
+                changes["kept"] += 1
+            row = {**old, **fields}
+        sentence_list.append({
+            "sentence_id": row['sentence_id'],
+            "slide_id": slide_id,
+            "sentence_number": idx,
+            "text": chunk_text,
+            "original_sentence_indices": original_indices,
+            "duration_estimate": duration,
+            "audio_object_key": row.get('audio_object_key'),
+            "audio_length": row.get('audio_length'),
+            "created_at": row['created_at']
+        })
+
+    for index, old in enumerate(previous_sentences):
+        if index not in reused:
+            writes.removed_sentence_ids.add(old['sentence_id'])
+            changes["removed"] += 1
+
+    return {
+        "slide_id": slide_id,
+        "script_id": script_id,
+        "slide_number": slide_number,
+        "status": SlideStatus.COMPLETED,
+        "sentence_count": len(sentence_list),
+        "sentences": sentence_list,
+        "changes": changes
+    }
+
+
+def _is_sentence_audio(doc: dict, script: dict, sentence_ids: Set[str]) -> bool:
+    """카탈로그 항목이 sentence_ids 중 한 문장의 생성 오디오(`{sentence_id}.wav`)인지"""
+    file_name = doc.get('file_name') or ''
+    return (
+        doc.get('user_id') == script.get('user_id')
+        and doc.get('script_name') == script['script_id']
+        and file_name.endswith('.wav')
+        and file_name[:-len('.wav')] in sentence_ids
+    )
+
+
+def _save_slides(script: dict, writes: _SlideWrites, max_slide_number: int) -> None:
+    """
+    슬라이드/문장의 추가·수정·삭제와 스크립트 total_slides 갱신을 한 번의 저장소 쓰기로 반영합니다.
+    삭제되거나 텍스트가 바뀐 문장의 연습 점수와 오디오 파일(`{sentence_id}.wav` 카탈로그 항목)도
+    같은 쓰기에서 지우고, 오디오 blob 참조는 저장 후 반납합니다.
+    """
+    script_id = script['script_id']
+    updates, removes = {}, {}
+    if max_slide_number > script.get('total_slides', 0):
+        script_fields = {"total_slides": max_slide_number, "updated_at": _serialize_datetime(datetime.utcnow())}
+        updates[scripts_table] = lambda doc: script_fields if doc.get('script_id') == script_id else None
+    if writes.slide_updates:
+        updates[slides_table] = lambda doc: writes.slide_updates.get(doc.get('slide_id'))
+    if writes.sentence_updates:
+        updates[sentences_table] = lambda doc: writes.sentence_updates.get(doc.get('sentence_id'))
+    # 중복 슬라이드와 함께 지워지는 문장의 ID는 삭제 함수가 모아 둠
+    released_sentence_ids = set(writes.text_changed_sentence_ids)
+
+    def is_removed(doc):
+        return (doc.get('sentence_id') in writes.removed_sentence_ids
+                or doc.get('slide_id') in writes.removed_slide_ids)
+
+    def is_removed_sentence(doc):
+        if not is_removed(doc):
+            return False
+        released_sentence_ids.add(doc.get('sentence_id'))
+        return True
+
+    if writes.removed_slide_ids or writes.removed_sentence_ids:
+        removes[slides_table] = lambda doc: doc.get('slide_id') in writes.removed_slide_ids
+        removes[sentences_table] = is_removed_sentence
+    if writes.removed_slide_ids or writes.removed_sentence_ids or writes.text_changed_sentence_ids:
+        removes[practice_scores_table] = lambda doc: (
+            is_removed(doc) or doc.get('sentence_id') in writes.text_changed_sentence_ids
+        )
+    unlink_files(
+        lambda doc: _is_sentence_audio(doc, script, released_sentence_ids),
+        inserts={slides_table: writes.slide_rows, sentences_table: writes.sentence_rows},
+        removes=removes,
+        updates=updates
+    )
+
+
+def _plan_slide_writes(
+    script_id: str,
+    slides: List[Tuple[int, str]]
+) -> Tuple[_SlideWrites, List[Tuple[str, List[str]]], List[Optional[Tuple[dict, List[dict]]]]]:
+    """
+    업로드할 (slide_number, 대본) 목록에 대해 기존 슬라이드를 읽어
+    (쓰기 묶음, rechunk_slide_scripts 입력, 슬라이드별 기존 데이터)를 만듭니다.
+    중복 슬라이드는 문장과 함께 삭제 대상으로 미리 넣어 둡니다.
+    """
+    current, stale = _load_current_slides(script_id, [number for number, _ in slides])
+    writes = _SlideWrites()
+    writes.removed_slide_ids.update(slide['slide_id'] for slide in stale)
+    previous = [current.get(number) for number, _ in slides]
+    rechunk_inputs = [
+        (text, [sentence['text'] for sentence in existing[1]] if existing else [])
+        for (_, text), existing in zip(slides, previous)
+    ]
+    return writes, rechunk_inputs, previous
+
+
+def _cached_rechunk(
+    slides: List[Tuple[str, List[str]]],
+    chunking: dict
+) -> Tuple[List[Optional[List[Tuple[str, float, List[int], Optional[int]]]]], List[int]]:
+    """처리 결과 캐시로 만들 수 있는 슬라이드 결과와, 처리가 필요한 슬라이드 인덱스 목록을 반환합니다."""
+    results = [chunk_cache.lookup_rechunk(text, previous, chunking) for text, previous in slides]
+    return results, [index for index, result in enumerate(results) if result is None]
+
+
+def _cache_rechunked(
+    slides: List[Tuple[str, List[str]]],
+    results: List[List[Tuple[str, float, List[int], Optional[int]]]],
+    indices: List[int],
+    chunking: dict
+) -> None:
+    """새로 처리한 슬라이드 중 기존 청크가 없던(= process_slide_script와 같은) 결과를 캐시에 넣습니다."""
+    chunk_cache.put_many(
+        ((slides[index][0], [chunk[:3] for chunk in results[index]]) for index in indices if not slides[index][1]),
+        chunking
+    )
+
+
+def _rechunk_slide(text: str, previous_chunks: List[str], chunking: dict) -> List[Tuple[str, float, List[int], Optional[int]]]:
+    """슬라이드 하나를 (처리 결과 캐시를 거쳐) 재청크화합니다."""
+    slides = [(text, previous_chunks)]
+    results, misses = _cached_rechunk(slides, chunking)
+    if misses:
+        results[0] = ScriptProcessor.rechunk_slide_script(text, previous_chunks, **chunking)
+        _cache_rechunked(slides, results, misses, chunking)
+    return results[0]
+
+
+async def _rechunk_slides(
+    slides: List[Tuple[str, List[str]]],
+    chunking: dict
+) -> List[List[Tuple[str, float, List[int], Optional[int]]]]:
+    """
+    여러 슬라이드의 (대본, 기존 청크 텍스트 목록)을 재청크화합니다.
+    처리 결과 캐시에 없는 슬라이드만 처리하며, 그 전체 길이가 SCRIPT_BATCH_PARALLEL_MIN_CHARS 이상이면
+    슬라이드를 워커 수만큼 묶어 프로세스 풀에서 병렬로, 그보다 작으면 (프로세스 간 전달 비용이 더 크므로)
+    스레드 하나에서 처리합니다.
+    """
+    results, misses = await asyncio.to_thread(_cached_rechunk, slides, chunking)
+    if not misses:
+        return results
+    pending = [slides[index] for index in misses]
+
+    process = partial(ScriptProcessor.rechunk_slide_scripts, **chunking)
+    if AUDIO_WORKERS <= 0 or sum(len(text) for text, _ in pending) < SCRIPT_BATCH_PARALLEL_MIN_CHARS:
+        processed = await asyncio.to_thread(process, pending)
+    else:
+        size = math.ceil(len(pending) / AUDIO_WORKERS)
+        groups = await asyncio.gather(*(
+            run_audio_task(process, pending[start:start + size]) for start in range(0, len(pending), size)
+        ))
+        processed = [chunks for group in groups for chunks in group]
+
+    for index, chunks in zip(misses, processed):
+        results[index] = chunks
+    await asyncio.to_thread(_cache_rechunked, slides, results, misses, chunking)
+    return results
+
+
+@router.get(
+    "/chunk-cache/stats",
+    response_model=ChunkCacheStatsResponse,
+    summary="대본 처리 결과 캐시 적중률 조회"
+)
+def get_chunk_cache_stats(user_id: str = Depends(get_current_user_id)):
+    """
+    슬라이드 대본 처리 결과 캐시의 적중(메모리/영구 계층)/미스/제거 횟수(서버 시작 이후)와 현재 항목 수를 반환합니다.
+    """
+    return chunk_cache.cache_stats()
+
+
 @router.post(
     "",
     response_model=ScriptMetadata,
@@ -127,10 +487,11 @@ def create_script(
         }
     }
 )
-def upload_slide(
+async def upload_slide(
     script_id: str,
     slide_number: int,
     request: UploadSlideRequest,
+    chunking: dict = Depends(chunking_options),
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -141,6 +502,10 @@ def upload_slide(
     2. 읽기에 적당한 길이로 청크화
     3. 각 청크를 개별 문장 데이터로 데이터베이스 저장
     
+    **수정(같은 slide_number 재업로드):**
+    기존 슬라이드를 새로 만들지 않고 수정합니다. 바뀌지 않은 청크는 `sentence_id`, 생성된 오디오, 연습 점수가
+    그대로 유지되고, 바뀐 구간의 청크만 수정/추가/삭제됩니다. 변경 내역은 응답의 `changes`에 담깁니다.
+    
     **경로 매개변수:**
     - `script_id`: 상위 스크립트 ID
     - `slide_number`: 슬라이드 순서 (1부터 시작)
@@ -148,80 +513,385 @@ def upload_slide(
     **요청 바디:**
     - `script_text`: 해당 슬라이드의 전체 대본 텍스트
     
+    **쿼리 파라미터 (청크화):**
+    - `strategy`: `sentence_count`(문장 수) / `character_count`(문자 수, 기본) / `duration`(읽기 시간)
+    - `max_chars`, `max_sentences`, `max_duration`: 청크당 상한 (한 문장이 상한을 넘으면 단독 청크)
+    - `balanced`: 앞에서부터 채우는 대신, 같은 청크 수에서 청크별 읽기 시간이 가장 고르게 분할
+    
     **응답:**
     처리된 슬라이드 정보 및 생성된 문장 데이터 포함
     """
     # 권한 확인
     script = get_script_by_id(script_id, user_id)
     
-    # 슬라이드 생성
-    slide_id = str(uuid.uuid4())
-    now = datetime.utcnow()
-    
-    slide_data = {
-        "slide_id": slide_id,
+    async with _script_write_lock(script_id):
+        # 대본 처리 (같은 slide_number의 기존 슬라이드가 있으면 바뀐 구간만 재청크화)
+        writes, rechunk_inputs, previous = await asyncio.to_thread(
+            _plan_slide_writes, script_id, [(slide_number, request.script_text)]
+        )
+        processed_chunks = await asyncio.to_thread(_rechunk_slide, *rechunk_inputs[0], chunking)
+
+        # 슬라이드/문장 저장 (스크립트의 total_slides 갱신 포함, 한 번에 기록)
+        response = _build_slide_records(
+            writes, script_id, slide_number, processed_chunks, datetime.utcnow(), previous[0]
+        )
+        await asyncio.to_thread(_save_slides, script, writes, slide_number)
+
+    return response
+
+
+@router.post(
+    "/{script_id}/slides",
+    response_model=UploadSlidesBatchResponse,
+    summary="슬라이드 대본 일괄 업로드 및 처리",
+    responses={
+        200: {"description": "모든 슬라이드 업로드 및 처리 성공", "model": UploadSlidesBatchResponse},
+        400: {"description": "slide_number 중복 또는 슬라이드 수 초과"},
+        404: {"description": "스크립트를 찾을 수 없음"}
+    }
+)
+async def upload_slides_batch(
+    script_id: str,
+    request: UploadSlidesBatchRequest,
+    chunking: dict = Depends(chunking_options),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    여러 슬라이드의 대본을 한 번에 업로드합니다. 슬라이드별 처리 방식은
+    `PATCH /scripts/{script_id}/slide/{slide_number}`와 같고, 청크화 쿼리 파라미터도 같습니다.
+
+    - 권한 확인은 한 번만 수행합니다.
+    - 큰 발표 자료는 슬라이드들을 프로세스 풀에 나눠 병렬로 처리합니다.
+    - 모든 슬라이드와 문장은 한 번의 저장소 쓰기로 함께 저장되므로, 일부 슬라이드만 저장된 상태는 생기지 않습니다.
+    - 이미 있는 slide_number는 `PATCH`와 같이 바뀐 청크만 수정합니다.
+
+    **응답:** 요청 순서대로 슬라이드별 처리 결과 (`PATCH` 응답과 같은 형식)
+    """
+    script = get_script_by_id(script_id, user_id)
+
+    slides = request.slides
+    if len(slides) > SCRIPT_BATCH_MAX_SLIDES:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {SCRIPT_BATCH_MAX_SLIDES}개의 슬라이드를 업로드할 수 있습니다.")
+    slide_numbers = [slide.slide_number for slide in slides]
+    if len(set(slide_numbers)) != len(slide_numbers):
+        raise HTTPException(status_code=400, detail="slide_number가 중복되었습니다.")
+
+    return await _upload_slides(script, [(slide.slide_number, slide.script_text) for slide in slides], chunking)
+
+
+async def _upload_slides(script: dict, slides: List[Tuple[int, str]], chunking: dict) -> dict:
+    """
+    (slide_number, 대본) 목록을 처리하여 한 번에 저장하고 일괄 업로드 응답을 만듭니다.
+    저장소 읽기/쓰기는 작업자 스레드에서, 계획부터 저장까지는 스크립트별 락 안에서 실행합니다.
+    """
+    script_id = script["script_id"]
+    async with _script_write_lock(script_id):
+        writes, rechunk_inputs, previous = await asyncio.to_thread(_plan_slide_writes, script_id, slides)
+        processed = await _rechunk_slides(rechunk_inputs, chunking)
+
+        now = datetime.utcnow()
+        results = [
+            _build_slide_records(writes, script_id, slide_number, processed_chunks, now, existing)
+            for (slide_number, _), processed_chunks, existing in zip(slides, processed, previous)
+        ]
+        await asyncio.to_thread(_save_slides, script, writes, max(slide_number for slide_number, _ in slides))
+
+    return {
         "script_id": script_id,
-        "slide_number": slide_number,
-        "status": SlideStatus.PROCESSING,
-        "created_at": _serialize_datetime(now),
-        "updated_at": _serialize_datetime(now)
+        "slide_count": len(results),
+        "sentence_count": sum(result["sentence_count"] for result in results),
+        "slides": results
     }
-    slides_table.insert(slide_data)
-    
-    # 대본 처리
-    processor = ScriptProcessor()
-    processed_chunks = processor.process_slide_script(request.script_text)
-    
-    # 문장 데이터 생성
-    sentence_list = []
-    for idx, (chunk_text, duration, original_indices) in enumerate(processed_chunks, 1):
-        sentence_id = str(uuid.uuid4())
-        
-        sentence_data = {
-            "sentence_id": sentence_id,
+
+
+_IMPORT_UPLOAD_RULES = UploadRules(
+    sniff_script_format,
+    f"파일은 {SCRIPT_IMPORT_MAX_BYTES // (1024 * 1024)}MB 이하의 PPTX 또는 텍스트 파일이어야 합니다.",
+    "지원되지 않는 파일 형식입니다. PPTX 또는 UTF-8 텍스트 파일만 허용됩니다.",
+    "파일"
+)
+
+
+def _read_import_file(received: ReceivedFile, delimiter: str) -> Tuple[List[Tuple[int, str]], List[int]]:
+    """
+    가져온 파일에서 (slide_number, 대본) 목록과 대본이 비어 건너뛴 슬라이드 번호 목록을 만듭니다.
+    슬라이드 수가 SCRIPT_BATCH_MAX_SLIDES를 넘으면 나머지를 읽지 않고 ScriptImportError를 발생시킵니다.
+    """
+    if received.format == 'pptx':
+        pages = read_pptx_notes(received.file)
+    else:
+        pages = read_text_slides(received.file, delimiter)
+    slides: List[Tuple[int, str]] = []
+    skipped: List[int] = []
+    for slide_number, text in pages:
+        if slide_number > SCRIPT_BATCH_MAX_SLIDES:
+            raise ScriptImportError(f"한 번에 최대 {SCRIPT_BATCH_MAX_SLIDES}개의 슬라이드를 가져올 수 있습니다.")
+        if text:
+            slides.append((slide_number, text))
+        else:
+            skipped.append(slide_number)
+    return slides, skipped
+
+
+@router.post(
+    "/{script_id}/import",
+    response_model=ScriptImportResponse,
+    summary="발표 자료 파일(PPTX 노트/텍스트)에서 슬라이드 대본 가져오기",
+    responses={
+        200: {"description": "가져온 모든 슬라이드 처리 성공", "model": ScriptImportResponse},
+        400: {"description": "지원되지 않거나 손상된 파일, 대본 없음, 슬라이드 수 초과"},
+        404: {"description": "스크립트를 찾을 수 없음"},
+        413: {"description": "파일이 너무 큼"}
+    }
+)
+async def import_slides(
+    script_id: str,
+    request: Request,
+    delimiter: str = Query("---", min_length=1, max_length=50, description="텍스트 파일의 슬라이드 구분선 (이 내용만 있는 줄)"),
+    chunking: dict = Depends(chunking_options),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    PowerPoint(.pptx) 파일의 슬라이드 노트 또는 텍스트 파일을 슬라이드 대본으로 가져옵니다.
+
+    **요청:** `multipart/form-data`의 `file` 필드에 파일 하나
+    - **PPTX**: 발표 순서대로 각 슬라이드 노트의 본문을 해당 slide_number(1부터)의 대본으로 사용합니다.
+    - **텍스트(UTF-8)**: `delimiter`만 있는 줄로 나눈 구간을 차례로 1, 2, 3... 번 슬라이드의 대본으로 사용합니다.
+
+    노트(구간)가 비어 있는 슬라이드는 건너뛰고 `skipped_slides`에 번호를 담습니다.
+    처리와 저장은 `POST /scripts/{script_id}/slides`와 같으며(한 번에 저장, 이미 있는 슬라이드는 바뀐 청크만 수정),
+    청크화 쿼리 파라미터도 같습니다. 파일은 스트리밍으로 받아 임시 파일에 두고 노트를 하나씩 읽으므로,
+    이미지가 많은 큰 발표 자료도 전체를 메모리에 올리지 않습니다.
+    """
+    script = get_script_by_id(script_id, user_id)
+
+    try:
+        received = await receive_files(request, 'file', 1, SCRIPT_IMPORT_MAX_BYTES, _IMPORT_UPLOAD_RULES)
+    except UploadRejectedError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    if not received:
+        raise HTTPException(status_code=400, detail="가져올 파일(file)을 업로드해야 합니다.")
+
+    try:
+        slides, skipped = await asyncio.to_thread(_read_import_file, received[0], delimiter)
+    except ScriptImportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        received[0].close()
+    if not slides:
+        raise HTTPException(status_code=400, detail="파일에서 가져올 대본을 찾을 수 없습니다.")
+
+    result = await _upload_slides(script, slides, chunking)
+    result["source_format"] = received[0].format
+    result["skipped_slides"] = skipped
+    return result
+
+
+class _RequestStreamingResponse(StreamingResponse):
+    """
+    요청 본문을 읽으면서 응답을 내보내는 StreamingResponse
+
+    Starlette의 StreamingResponse는 (ASGI spec 2.4 미만 서버에서) 응답 중 receive()로 연결 끊김을 기다리며
+    그 사이 도착한 http.request 본문 메시지를 버리므로, 생성기 안의 request.stream()이 영원히 기다리게 됩니다.
+    여기서는 연결 끊김을 request.stream()(ClientDisconnect)과 send 실패로만 감지합니다.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+def _ndjson(item: dict) -> str:
+    return json.dumps(item, ensure_ascii=False) + "\n"
+
+
+async def _stream_slide_chunks(
+    request: Request,
+    script: dict,
+    slide_number: int,
+    chunking: dict
+) -> AsyncIterator[str]:
+    """
+    요청 본문을 받는 대로 문장 분할/청크화하여 청크마다 NDJSON 한 줄을 내보내고,
+    SCRIPT_STREAM_BATCH_CHUNKS개씩 모아 저장합니다. 메모리에는 처리 중인 조각과 한 묶음의 행만 남습니다.
+
+    같은 slide_number의 슬라이드가 있으면 슬라이드 ID를 유지하고, 같은 순서에 같은 텍스트인 기존 문장은
+    sentence_id/오디오/연습 점수를 유지합니다. (전체 대본을 모아 비교하지 않으므로 위치가 밀린 문장은 새로 만듦)
+    쓰이지 않은 기존 문장은 마지막 저장에서 연습 점수·오디오 파일과 함께 삭제됩니다.
+    같은 스크립트의 다른 슬라이드 업로드와 섞이지 않도록 스트림이 끝날 때까지 스크립트별 락을 잡습니다.
+    """
+    script_id = script['script_id']
+    async with _script_write_lock(script_id):
+        timestamp = _serialize_datetime(datetime.utcnow())
+        current, stale = await asyncio.to_thread(_load_current_slides, script_id, [slide_number])
+        writes = _SlideWrites()
+        writes.removed_slide_ids.update(slide['slide_id'] for slide in stale)
+        if slide_number in current:
+            slide, previous_sentences = current[slide_number]
+            slide_id = slide['slide_id']
+            writes.slide_updates[slide_id] = {"status": SlideStatus.PROCESSING, "updated_at": timestamp}
+        else:
+            slide_id = str(uuid.uuid4())
+            previous_sentences = []
+            writes.slide_rows.append({
+                "slide_id": slide_id,
+                "script_id": script_id,
+                "slide_number": slide_number,
+                "status": SlideStatus.PROCESSING,
+                "created_at": timestamp,
+                "updated_at": timestamp
+            })
+        # 처리 중 상태의 슬라이드를 먼저 저장 (중복 슬라이드 정리, total_slides 갱신 포함)
+        await asyncio.to_thread(_save_slides, script, writes, slide_number)
+
+        changes = {"kept": 0, "updated": 0, "inserted": 0, "removed": 0}
+        reused = set()
+        sentence_count = 0
+        writes = _SlideWrites()
+
+        def add_chunk(chunk_text: str, duration: float, original_indices: List[int]) -> str:
+            nonlocal sentence_count
+            position = sentence_count
+            sentence_count += 1
+            old = previous_sentences[position] if position < len(previous_sentences) else None
+            if old is not None and old.get('text') == chunk_text:
+                reused.add(position)
+                fields = {}
+                if old.get('original_sentence_indices') != original_indices:
+                    fields["original_sentence_indices"] = original_indices
+                if old.get('duration_estimate') != duration:
+                    fields["duration_estimate"] = duration
+                if fields:
+                    writes.sentence_updates[old['sentence_id']] = fields
+                changes["updated" if fields else "kept"] += 1
+                row = {**old, **fields}
+            else:
+                row = {
+                    "sentence_id": str(uuid.uuid4()),
+                    "slide_id": slide_id,
+                    "script_id": script_id,
+                    "sentence_number": sentence_count,
+                    "text": chunk_text,
+                    "original_sentence_indices": original_indices,
+                    "duration_estimate": duration,
+                    "created_at": timestamp
+                }
+                writes.sentence_rows.append(row)
+                changes["inserted"] += 1
+            return _ndjson({
+                "type": "sentence",
+                "sentence_id": row['sentence_id'],
+                "slide_id": slide_id,
+                "sentence_number": sentence_count,
+                "text": chunk_text,
+                "original_sentence_indices": original_indices,
+                "duration_estimate": duration,
+                "audio_object_key": row.get('audio_object_key'),
+                "audio_length": row.get('audio_length')
+            })
+
+        def pending() -> int:
+            return len(writes.sentence_rows) + len(writes.sentence_updates)
+
+        def flush() -> None:
+            nonlocal writes
+            _save_slides(script, writes, 0)
+            writes = _SlideWrites()
+
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        sentences = SentenceStream()
+        chunker = ChunkStream(**chunking)
+
+        def process(data: bytes, final: bool = False) -> List[Tuple[str, float, List[int]]]:
+            processed = chunker.feed(sentences.feed(decoder.decode(data, final)))
+            if final:
+                processed += chunker.feed(sentences.close()) + chunker.close()
+            return processed
+
+        completed = False
+        try:
+            async for data in request.stream():
+                for chunk in await asyncio.to_thread(process, data):
+                    yield add_chunk(*chunk)
+                    if pending() >= SCRIPT_STREAM_BATCH_CHUNKS:
+                        await asyncio.to_thread(flush)
+            for chunk in await asyncio.to_thread(process, b'', True):
+                yield add_chunk(*chunk)
+                if pending() >= SCRIPT_STREAM_BATCH_CHUNKS:
+                    await asyncio.to_thread(flush)
+
+            for position, old in enumerate(previous_sentences):
+                if position not in reused:
+                    writes.removed_sentence_ids.add(old['sentence_id'])
+                    changes["removed"] += 1
+            writes.slide_updates[slide_id] = {
+                "status": SlideStatus.COMPLETED, "updated_at": _serialize_datetime(datetime.utcnow())
+            }
+            await asyncio.to_thread(flush)
+            completed = True
+        except Exception as e:
+            # 클라이언트 연결 끊김(ClientDisconnect) 포함: 오류 줄을 마지막으로 스트림을 끝냄
+            yield _ndjson({"type": "error", "slide_id": slide_id, "detail": str(e) or type(e).__name__})
+            return
+        finally:
+            # 취소/생성기 종료(GeneratorExit)를 포함해 끝나지 못한 슬라이드는 processing으로 남기지 않음
+            if not completed:
+                slides_table.update({"status": SlideStatus.FAILED}, lambda doc: doc.get('slide_id') == slide_id)
+
+        yield _ndjson({
+            "type": "summary",
             "slide_id": slide_id,
             "script_id": script_id,
-            "sentence_number": idx,
-            "text": chunk_text,
-            "original_sentence_indices": original_indices,
-            "duration_estimate": duration,
-            "created_at": _serialize_datetime(now)
-        }
-        sentences_table.insert(sentence_data)
-        
-        sentence_list.append({
-            "sentence_id": sentence_id,
-            "slide_id": slide_id,
-            "sentence_number": idx,
-            "text": chunk_text,
-            "original_sentence_indices": original_indices,
-            "duration_estimate": duration,
-            "created_at": now
+            "slide_number": slide_number,
+            "status": SlideStatus.COMPLETED,
+            "sentence_count": sentence_count,
+            "changes": changes
         })
-    
-    # 슬라이드 상태 업데이트
-    from tinydb import Query as TinyQuery
-    Q = TinyQuery()
-    slides_table.update(
-        {"status": SlideStatus.COMPLETED, "updated_at": _serialize_datetime(datetime.utcnow())},
-        Q.slide_id == slide_id
-    )
-    
-    # 스크립트의 total_slides 업데이트 (필요시)
-    if slide_number > script.get('total_slides', 0):
-        scripts_table.update(
-            {"total_slides": slide_number, "updated_at": _serialize_datetime(datetime.utcnow())},
-            Q.script_id == script_id
-        )
-    
-    return {
-        "slide_id": slide_id,
-        "script_id": script_id,
-        "slide_number": slide_number,
-        "status": SlideStatus.COMPLETED,
-        "sentence_count": len(sentence_list),
-        "sentences": sentence_list
+
+
+@router.post(
+    "/{script_id}/slide/{slide_number}/stream",
+    summary="대용량 슬라이드 대본 스트리밍 업로드 및 처리 (NDJSON)",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "처리된 청크를 한 줄에 하나씩(NDJSON) 스트리밍",
+            "content": {"application/x-ndjson": {}}
+        },
+        404: {"description": "스크립트를 찾을 수 없음"}
     }
+)
+async def upload_slide_stream(
+    script_id: str,
+    slide_number: int,
+    request: Request,
+    chunking: dict = Depends(chunking_options),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    한 시간 이상의 발표 녹취록처럼 매우 긴 대본을 위한 스트리밍 업로드입니다.
+
+    **요청 바디:** 대본 원문(UTF-8 텍스트) 그대로. 청크 단위 전송(`Transfer-Encoding: chunked`)을 지원합니다.
+
+    **응답 (`application/x-ndjson`):** 본문을 받는 대로 처리하여 한 줄에 하나씩 내보냅니다.
+    - `{"type": "sentence", ...}`: 처리된 청크 (`GET /scripts/{script_id}/sentences`의 문장과 같은 필드)
+    - `{"type": "summary", ...}`: 마지막 줄. 슬라이드 ID, 문장 수, 변경 내역(`changes`)
+    - `{"type": "error", "detail": ...}`: 처리 중 오류 (슬라이드 상태는 `failed`)
+
+    처리 중인 슬라이드의 상태는 `processing`이며, 문장은 일정 개수씩 나눠 저장됩니다.
+    청크화 쿼리 파라미터는 `PATCH /scripts/{script_id}/slide/{slide_number}`와 같고,
+    `balanced=true`는 대본 전체가 아닌 수백 문장 단위로 고르게 나눕니다.
+    같은 slide_number로 다시 올리면 같은 순서에 같은 텍스트인 청크의 `sentence_id`가 유지됩니다.
+    """
+    script = get_script_by_id(script_id, user_id)
+    return _RequestStreamingResponse(
+        _stream_slide_chunks(request, script, slide_number, chunking),
+        media_type="application/x-ndjson"
+    )
 
 
 @router.get(
@@ -297,7 +967,9 @@ def get_sentences(
     - `slide_id`: 특정 슬라이드의 문장만 필터 (선택사항)
     
     **응답:**
-    모든 문장 데이터 및 메타데이터 포함
+    모든 문장 데이터 및 메타데이터 포함.
+    `duration_estimate`는 요청한 사용자의 연습 기록(`time_taken`)으로 학습한 발화 속도 배율
+    (`speaking_rate_factor`)을 적용한 값입니다.
     """
     script = get_script_by_id(script_id, user_id)
     
@@ -314,6 +986,9 @@ def get_sentences(
         # 전체 스크립트 문장
         sentences = sentences_table.search(Q.script_id == script_id)
     
+    # 사용자의 연습 기록으로 학습한 발화 속도로 예상 읽기 시간 개인화
+    factor = speaking_rate.rate_factor(user_id)
+
     # datetime 변환
     sentence_list = []
     for sent in sentences:
@@ -327,7 +1002,9 @@ def get_sentences(
             "sentence_number": sent['sentence_number'],
             "text": sent['text'],
             "original_sentence_indices": sent.get('original_sentence_indices', []),
-            "duration_estimate": sent.get('duration_estimate'),
+            "duration_estimate": speaking_rate.personalize(sent.get('duration_estimate'), factor),
+            "audio_object_key": sent.get('audio_object_key'),
+            "audio_length": sent.get('audio_length'),
             "created_at": created_at
         })
     
@@ -353,10 +1030,89 @@ def get_sentences(
         "total_slides": script.get('total_slides', 0),
         "slide_id": slide_id,
         "sentences": sentence_list,
-        "total_count": len(sentence_list)
+        "total_count": len(sentence_list),
+        "speaking_rate_factor": factor
     }
 
 
+@router.post(
+    "/{script_id}/tts",
+    response_model=ScriptTtsJobAccepted,
+    status_code=202,
+    summary="스크립트 전체 문장 TTS 일괄 생성 (비동기)",
+    responses={
+        202: {"description": "작업 등록됨 (job_id 반환)", "model": ScriptTtsJobAccepted},
+        400: {"description": "보이스 클로닝을 하지 않은 사용자"},
+        404: {"description": "스크립트를 찾을 수 없음"},
+        503: {"description": "대기 중인 작업이 너무 많음"}
+    }
+)
+async def create_script_tts_job(
+    script_id: str,
+    force: bool = Query(False, description="이미 생성된 문장도 다시 생성"),
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    스크립트의 모든 문장을 사용자의 클론 보이스(`voice_id`)로 합성하는 작업을 등록합니다.
+
+    - 같은 문장/보이스로 이미 생성된 오디오가 있는 문장은 건너뛰므로,
+      대본 수정 후 다시 호출하면 바뀐 문장만 새로 생성됩니다.
+    - 생성된 오디오 경로는 `GET /scripts/{script_id}/sentences`의 `audio_object_key`로 확인합니다.
+    - 진행 상황은 `GET /scripts/{script_id}/tts/{job_id}`로 조회합니다.
+    """
+    get_script_by_id(script_id, user_id)
+
+    if not SUPERTONE_API_KEY:
+        raise HTTPException(status_code=500, detail="Supertone API key가 설정되어 있지 않습니다.")
+
+    from tinydb import Query as TinyQuery
+    Q = TinyQuery()
+    user = users_table.get(Q.id == user_id)
+    voice_id = (user or {}).get('voice_id')
+    if not voice_id:
+        raise HTTPException(status_code=400, detail="보이스 클로닝을 먼저 완료해 주세요.")
+
+    try:
+        job = enqueue_job(
+            SCRIPT_TTS_JOB_KIND, user_id, render_script_sentences,
+            user_id, SUPERTONE_API_KEY, voice_id, script_id, force,
+            idempotency_key=idempotency_key, meta={"script_id": script_id}
+        )
+    except JobQueueFullError:
+        raise HTTPException(status_code=503, detail="대기 중인 작업이 많습니다. 잠시 후 다시 시도해 주세요.")
+
+    return {
+        "job_id": job['job_id'],
+        "status": job['status'],
+        "status_url": f"/api/v1/scripts/{script_id}/tts/{job['job_id']}"
+    }
+
+
+@router.get(
+    "/{script_id}/tts/{job_id}",
+    response_model=ScriptTtsJobResponse,
+    summary="스크립트 일괄 TTS 작업 상태 조회",
+    responses={
+        200: {"description": "작업 상태 (완료 시 result 포함)", "model": ScriptTtsJobResponse},
+        404: {"description": "스크립트 또는 작업을 찾을 수 없음"}
+    }
+)
+def get_script_tts_job(
+    script_id: str,
+    job_id: str,
+    user_id: str = Depends(get_current_user_id)
+):
+    """작업 상태와 진행 상황(`rendering 완료/전체`), 완료 시 생성/건너뜀/실패 문장 수를 반환합니다."""
+    get_script_by_id(script_id, user_id)
+
+    job = get_job(job_id)
+    if (not job or job.get('kind') != SCRIPT_TTS_JOB_KIND or job.get('user_id') != user_id
+            or (job.get('meta') or {}).get('script_id') != script_id):
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
+
+
 @router.patch(
     "/{script_id}",
     response_model=ScriptMetadata,
@@ -412,21 +1168,20 @@ def delete_script(
     script_id: str,
     user_id: str = Depends(get_current_user_id)
 ):
-    """스크립트 및 관련 슬라이드/문장/점수 모두 삭제(영구삭제)"""
+    """스크립트 및 관련 슬라이드/문장/점수와 문장 오디오 파일 모두 삭제(영구삭제)"""
     # 존재 및 권한 확인
     get_script_by_id(script_id, user_id)
 
-    from tinydb import Query as TinyQuery
-    Q = TinyQuery()
+    def in_script(doc):
+        return doc.get('script_id') == script_id
 
-    # 삭제 수행
-    scripts_table.remove(Q.script_id == script_id)
-    slides_table.remove(Q.script_id == script_id)
-    sentences_table.remove(Q.script_id == script_id)
-    # practice_scores_table may contain related entries
-    try:
-        practice_scores_table.remove(Q.script_id == script_id)
-    except Exception:
-        pass
+    # 스크립트에 딸린 데이터와 문장 오디오 카탈로그 항목을 한 번에 삭제하고, 오디오 blob 참조 반납
+    unlink_files(
+        lambda doc: doc.get('user_id') == user_id and doc.get('script_name') == script_id,
+        removes={
+            scripts_table: in_script, slides_table: in_script,
+            sentences_table: in_script, practice_scores_table: in_script
+        }
+    )
 
     return {"deleted": True, "script_id": script_id}
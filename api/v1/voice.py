@@ -1,76 +1,281 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
-from typing import List
-from io import BytesIO
-import os
-import requests
-from pydub import AudioSegment
-import boto3
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Callable, List, Optional, Tuple
+import asyncio
+import time
+from datetime import datetime, timedelta
+import uuid
 from botocore.exceptions import ClientError
 
 from core.security import get_current_user_id
-from core.database import users_table, UserQuery
-from core.config import SUPERTONE_API_KEY, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, S3_BUCKET_NAME, S3_REGION
-from core.s3 import create_presigned_url
-from api.v1.schemas import VoiceCloneResponse
+from core.database import db_lock, users_table, voice_uploads_table, UserQuery
+from core.config import SUPERTONE_API_KEY, S3_BUCKET_NAME
+from core.s3 import (
+    get_s3_client, create_presigned_url, create_presigned_upload_url,
+    read_object, delete_object
+)
+from core.storage import link_file
+from core.uploads import UploadRejectedError, receive_audio_files, sniff_audio_format, SNIFF_BYTES
+from core.audio import (
+    AudioProcessingError, build_clone_payload,
+    adjust_gain_to_target, detect_leading_silence  # noqa: F401 - 기존 import 경로 호환
+)
+from core.audio_quality import DEFAULT_THRESHOLDS, analyze_samples
+from core.workers import run_audio_task
+from core.supertone import SupertoneError, create_cloned_voice, upstream_stats
+from core.tts_cache import cached_text_to_speech, cache_stats
+from core.jobs import JobQueueFullError, enqueue_job, get_job, watch_job
+from api.v1.schemas import (
+    VoiceCloneResponse, VoiceUploadUrlsRequest, VoiceUploadUrlsResponse,
+    VoiceJobResponse, VoiceJobAcceptedResponse, TtsCacheStatsResponse, VoiceAnalyzeResponse,
+    UpstreamStatsResponse
+)
 
 router = APIRouter(
     prefix="/voice",
     tags=["Voice - 보이스 클로닝"]
 )
 
+# 업로드 음성 파일 제한
+MAX_SAMPLE_BYTES = 3 * 1024 * 1024  # 각 업로드 파일 최대 3MB
+REQUIRED_SAMPLE_COUNT = 3
+
+# presigned 직접 업로드에서 허용하는 Content-Type -> 디코딩 포맷
+ALLOWED_SAMPLE_CONTENT_TYPES = {
+    'audio/wav': 'wav',
+    'audio/x-wav': 'wav',
+    'audio/wave': 'wav',
+    'audio/mpeg': 'mp3',
+    'audio/mp3': 'mp3',
+}
+UPLOAD_URL_EXPIRES_IN = 900  # presigned PUT url 유효 시간(초)
+UPLOAD_SESSION_TTL = timedelta(hours=1)  # 업로드 세션 유효 시간
+CLONE_JOB_KIND = 'voice_clone'
+
+# multipart 본문을 직접 스트리밍으로 파싱하는 엔드포인트의 Swagger 요청 스키마
+SAMPLE_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["files"],
+                    "properties": {
+                        "files": {
+                            "type": "array",
+                            "items": {"type": "string", "format": "binary"},
+                            "description": "3개의 음성 파일을 업로드하세요 (wav/mp3, 각 3MB 이하)."
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+JOB_EVENTS_KEEPALIVE = 15  # SSE 연결 유지용 주석 전송 간격(초)
+
+
+class _StageTimer:
+    """처리 단계별 소요 시간을 기록하여 `Server-Timing` 응답 헤더로 만듭니다."""
+
+    def __init__(self):
+        self.durations = {}
+        self._stage: Optional[str] = None
+        self._started = 0.0
+
+    def set_stage(self, stage: Optional[str]) -> None:
+        now = time.perf_counter()
+        if self._stage is not None:
+            self.durations[self._stage] = self.durations.get(self._stage, 0.0) + (now - self._started)
+        self._stage, self._started = stage, now
+
+    def header(self) -> str:
+        self.set_stage(None)
+        return ', '.join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in self.durations.items())
+
 
-def detect_leading_silence(audio: AudioSegment, silence_threshold: int = -40, chunk_duration: int = 100) -> int:
+def _supertone_http_error(e: SupertoneError) -> HTTPException:
+    """SupertoneError를 HTTPException으로 변환 (서킷이 열린 503에는 Retry-After 헤더 포함)"""
+    headers = {'Retry-After': str(e.retry_after)} if e.retry_after else None
+    return HTTPException(status_code=e.status_code, detail=e.detail, headers=headers)
+
+
+async def _clone_from_samples(
+    user_id: str,
+    api_key: str,
+    samples: List[Tuple[bytes, str]],
+    set_stage: Optional[Callable[[str], None]] = None
+) -> dict:
     """
-    오디오의 시작 부분에서 침묵 구간을 감지하고 지속 시간(ms)을 반환합니다.
-    
-    Args:
-        audio: 분석할 AudioSegment
-        silence_threshold: 침묵 판정 기준 (dB, 기본값 -40dB)
-        chunk_duration: 분석 단위 (ms, 기본값 100ms)
-    
-    Returns:
-        제거할 시작 침묵의 지속 시간 (ms)
+    (바이트, 포맷) 형태의 음성 샘플 3개로 전처리 → Supertone 클로닝 → 예제 문장 TTS →
+    S3 업로드 → presigned URL 발급까지 수행하고 `VoiceCloneResponse` 형태의 dict를 반환합니다.
+    `set_stage`가 주어지면 단계(preprocessing/cloning/tts/uploading/presigning)가 바뀔 때마다 호출합니다.
+
+    CPU 위주의 오디오 처리는 프로세스 풀에서, Supertone 호출은 공용 비동기 HTTP 클라이언트로,
+    S3 호출은 스레드에서 실행하여 클로닝이 진행되는 동안에도 이벤트 루프가 다른 요청을 처리할 수 있도록 합니다.
     """
-    silence_duration = 0
-    chunk_size = int(audio.frame_rate * chunk_duration / 1000)  # chunk_duration을 샘플 수로 변환
-    
-    for chunk in audio[::chunk_duration]:
-        if chunk.dBFS < silence_threshold:
-            silence_duration += chunk_duration
-        else:
+    set_stage = set_stage or (lambda stage: None)
+
+    set_stage('preprocessing')
+    try:
+        file_name, payload_bytes, content_type = await run_audio_task(build_clone_payload, samples)
+    except AudioProcessingError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    # Supertone API 호출 (공용 HTTP 클라이언트로 연결 재사용)
+    set_stage('cloning')
+    try:
+        voice_id = await create_cloned_voice(api_key, user_id, file_name, payload_bytes, content_type)
+    except SupertoneError as e:
+        raise _supertone_http_error(e)
+
+    # users 테이블에 voice_id 저장
+    if not users_table.search(UserQuery.id == user_id):
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+    users_table.update({'voice_id': voice_id}, UserQuery.id == user_id)
+
+    # TTS 음성 생성
+    tts_text = "안녕하세요. 이제 저와 함께, 열심히 발표 연습을 해보실까요?"
+    stored = None
+    for _ in range(2):
+        set_stage('tts')
+        # 같은 입력의 TTS 결과가 캐시에 있으면 Supertone 호출과 S3 업로드를 모두 생략
+        try:
+            tts_entry = await cached_text_to_speech(api_key, voice_id, tts_text)
+        except SupertoneError as e:
+            raise _supertone_http_error(e)
+        except ClientError as e:
+            raise HTTPException(status_code=502, detail=f"S3 업로드 실패: {e}")
+
+        # 사용자 파일 항목을 캐시된 blob에 연결 (업로드 없음)
+        set_stage('uploading')
+        try:
+            stored = await asyncio.to_thread(link_file, user_id, 'example.wav', tts_entry['content_hash'])
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"S3 파일 등록 중 예기치 못한 오류: {e}")
+        if stored is not None:
             break
+        # 연결 직전에 캐시 항목이 제거된 경우 한 번 더 생성
+    if stored is None:
+        raise HTTPException(status_code=502, detail="예제 오디오 저장 실패")
+    object_key = stored['object_key']
+
+    # Presigned URL 생성
+    set_stage('presigning')
+    presigned_url = create_presigned_url(object_key, expiration=3600)  # 1시간 유효
+    if not presigned_url:
+        raise HTTPException(status_code=502, detail="Presigned URL 생성 실패")
     
-    return silence_duration
+    return {
+        "voice_id": voice_id,
+        "example_audio": {
+            "object_key": object_key,
+            "presigned_url": presigned_url,
+            "audio_length": tts_entry.get('audio_length') or "unknown"
+        }
+    }
 
 
-def adjust_gain_to_target(audio: AudioSegment, target_dBFS: float = -12.0, max_change_db: float = 20.0) -> AudioSegment:
+def _download_samples(files: List[dict]) -> List[Tuple[bytes, str]]:
+    """
+    presigned 업로드 세션에 기록된 샘플들을 S3에서 읽어 (바이트, 포맷) 목록으로 반환합니다.
+    업로드 누락이나 선언한 크기와의 불일치는 400으로 처리합니다. (스레드에서 실행)
     """
-    오디오의 dBFS를 목표값(target_dBFS)으로 맞춥니다. 필요시 증폭(또는 감쇠)을 적용합니다.
+    s3_client = get_s3_client()
+    samples = []
+    for file_info in files:
+        object_key = file_info['object_key']
+        try:
+            head = s3_client.head_object(Bucket=S3_BUCKET_NAME, Key=object_key)
+        except ClientError:
+            raise HTTPException(status_code=400, detail=f"업로드되지 않은 파일이 있습니다: {file_info['file_name']}")
+        if head.get('ContentLength') != file_info['size']:
+            raise HTTPException(status_code=400, detail=f"업로드된 파일 크기가 선언한 크기와 다릅니다: {file_info['file_name']}")
+        if head.get('ContentType') and head['ContentType'].lower() != file_info['content_type']:
+            raise HTTPException(status_code=400, detail=f"업로드된 파일 형식이 선언한 형식과 다릅니다: {file_info['file_name']}")
+
+        try:
+            contents, _ = read_object(object_key, MAX_SAMPLE_BYTES)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="각 파일은 3MB 이하의 WAV 또는 MP3이어야 합니다.")
+        except ClientError as e:
+            raise HTTPException(status_code=502, detail=f"S3 다운로드 실패: {e}")
+        fmt = sniff_audio_format(contents[:SNIFF_BYTES])
+        if fmt is None:
+            raise HTTPException(status_code=400, detail="지원되지 않는 파일 형식입니다. WAV 또는 MP3만 허용됩니다.")
+        samples.append((contents, fmt))
+    return samples
+
+
+def _require_api_key() -> str:
+    if not SUPERTONE_API_KEY:
+        raise HTTPException(status_code=500, detail="Supertone API key가 설정되어 있지 않습니다.")
+    return SUPERTONE_API_KEY
 
-    - target_dBFS: 목표 RMS/레벨(예: -12.0 dBFS)
-    - max_change_db: 한 번에 적용 가능한 최대 증폭/감쇠(dB)
+
+async def _receive_samples(request: Request, min_count: int) -> List[Tuple[str, bytes, str]]:
+    """
+    multipart로 업로드된 음성 파일(min_count ~ 3개)을 스트리밍으로 수신/검증하고
+    (파일명, 바이트, 포맷) 목록으로 반환합니다.
+    크기 초과나 WAV/MP3가 아닌 헤더는 본문을 끝까지 읽기 전에 거부합니다.
+    포맷은 확장자가 아닌 파일 헤더로 판별합니다.
     """
     try:
-        current_dbfs = audio.dBFS
-    except Exception:
-        return audio
+        received = await receive_audio_files(request, 'files', REQUIRED_SAMPLE_COUNT, MAX_SAMPLE_BYTES)
+    except UploadRejectedError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
-    if current_dbfs is None:
-        return audio
+    try:
+        if len(received) < min_count:
+            if min_count == REQUIRED_SAMPLE_COUNT:
+                raise HTTPException(status_code=400, detail="정확히 3개의 음성 파일을 업로드해야 합니다.")
+            raise HTTPException(status_code=400, detail="음성 파일을 1개 이상 업로드해야 합니다.")
+        # 프로세스 풀로 넘기기 위해 바이트로 읽음 (파일당 최대 3MB)
+        return [(f.file_name, f.read_bytes(), f.format) for f in received]
+    finally:
+        for f in received:
+            f.close()
 
-    change_db = target_dBFS - current_dbfs
-    # 변경량을 제한
-    if change_db > 0:
-        change_db = min(change_db, max_change_db)
-    else:
-        change_db = max(change_db, -max_change_db)
 
-    # 만약 변화가 거의 없다면 원본 반환
-    if abs(change_db) < 0.1:
-        return audio
+async def _read_samples(request: Request) -> List[Tuple[bytes, str]]:
+    """클로닝용 음성 파일 3개를 수신하여 (바이트, 포맷) 목록으로 반환합니다."""
+    received = await _receive_samples(request, REQUIRED_SAMPLE_COUNT)
+    return [(contents, fmt) for _, contents, fmt in received]
 
-    return audio.apply_gain(change_db)
 
+@router.post("/analyze", summary="음성 샘플 품질 분석 (클로닝 전 사전 점검)", response_model=VoiceAnalyzeResponse,
+             responses={
+                 200: {"description": "파일별 길이/피크/클리핑/RMS/무음 비율/SNR과 기준 통과 여부"},
+                 400: {"description": "잘못된 요청(파일 형식/크기/개수, 디코딩 실패)"}
+             },
+             openapi_extra=SAMPLE_UPLOAD_OPENAPI)
+async def analyze_voice_samples(
+    request: Request,
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    업로드한 음성 파일(1~3개)의 품질을 분석합니다. Supertone API는 호출하지 않습니다.
+
+    클로닝 요청(`/voice/clone`, `/voice/clone/jobs`, `/voice/clone/uploads/{upload_id}`)도
+    같은 기준으로 검사하여, 기준을 통과하지 못한 샘플이 있으면 클로닝 전에 422로 거부합니다.
+    녹음 직후 이 API로 먼저 확인하면 다시 녹음해야 할 파일을 바로 안내할 수 있습니다.
+    """
+    received = await _receive_samples(request, 1)
+    try:
+        reports = await run_audio_task(analyze_samples, [(contents, fmt) for _, contents, fmt in received])
+    except AudioProcessingError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    files = [
+        {'file_name': file_name, 'format': fmt, **report}
+        for (file_name, _, fmt), report in zip(received, reports)
+    ]
+    return {
+        'passed': all(report['passed'] for report in reports),
+        'files': files,
+        'thresholds': DEFAULT_THRESHOLDS
+    }
 
 
 @router.post("/clone", summary="음성 3개 합쳐서 보이스 클로닝 요청", response_model=VoiceCloneResponse,
@@ -78,10 +283,14 @@ def adjust_gain_to_target(audio: AudioSegment, target_dBFS: float = -12.0, max_c
                  200: {"description": "voice_id 및 예제 오디오 정보 반환"},
                  400: {"description": "잘못된 요청(파일 형식/크기 등)"},
                  413: {"description": "생성된 오디오가 너무 큼"},
-                 502: {"description": "외부 API 호출 또는 S3 업로드 실패"}
-             })
+                 422: {"description": "음성 샘플 품질 기준 미달 (클리핑/작은 소리/무음/짧은 길이/잡음)"},
+                 502: {"description": "외부 API 호출 또는 S3 업로드 실패"},
+                 503: {"description": "Supertone 장애로 호출 일시 중단 (Retry-After 헤더 참고)"}
+             },
+             openapi_extra=SAMPLE_UPLOAD_OPENAPI)
 async def clone_voice(
-    files: List[UploadFile] = File(..., description="3개의 음성 파일을 업로드하세요 (wav/mp3 등)."),
+    request: Request,
+    response: Response,
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -91,179 +300,281 @@ async def clone_voice(
     반환된 `voice_id`는 `users` 테이블의 해당 사용자 레코드에 저장됩니다.
     "안녕하세요. 이제 저와 함께, 열심히 발표 연습을 해보실까요?"라는 예제 문장을 TTS로 생성하여
     S3에 업로드하고, 해당 오디오의 presigned URL을 함께 반환합니다.
+
+    대용량 업로드는 `POST /voice/clone/upload-urls`로 S3 직접 업로드 후
+    `POST /voice/clone/uploads/{upload_id}`로 처리하는 방식을 권장합니다.
+
+    응답의 `Server-Timing` 헤더에 단계별 처리 시간(ms)이 담깁니다.
+    (receiving, preprocessing, cloning, tts, uploading, presigning)
     """
     # 설정 확인
-    api_key = SUPERTONE_API_KEY
-    if not api_key:
-        raise HTTPException(status_code=500, detail="Supertone API key가 설정되어 있지 않습니다.")
+    api_key = _require_api_key()
+    timer = _StageTimer()
+    timer.set_stage('receiving')
+    samples = await _read_samples(request)
+    result = await _clone_from_samples(user_id, api_key, samples, set_stage=timer.set_stage)
+    response.headers['Server-Timing'] = timer.header()
+    return result
 
-    if not files or len(files) != 3:
-        raise HTTPException(status_code=400, detail="정확히 3개의 음성 파일을 업로드해야 합니다.")
 
-    segments = []
-    max_individual = 3 * 1024 * 1024  # 각 업로드 파일 최대 3MB
-    for f in files:
-        contents = await f.read()
+@router.post("/clone/jobs", summary="보이스 클로닝 작업 등록 (비동기)", status_code=202,
+             response_model=VoiceJobAcceptedResponse,
+             responses={
+                 202: {"description": "작업 등록됨 (job_id 반환)"},
+                 400: {"description": "잘못된 요청(파일 형식/크기 등)"},
+                 503: {"description": "대기 중인 작업이 너무 많음"}
+             },
+             openapi_extra=SAMPLE_UPLOAD_OPENAPI)
+async def create_clone_job(
+    request: Request,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key",
+                                            description="재시도 시 같은 값을 보내면 작업을 중복 생성하지 않음"),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    `/voice/clone`과 같은 처리를 백그라운드 작업으로 등록하고 즉시 `job_id`를 반환합니다.
 
-        # 파일 크기 검사
-        if len(contents) > max_individual:
-            raise HTTPException(status_code=400, detail="각 파일은 3MB 이하의 WAV 또는 MP3이어야 합니다.")
+    - 진행 상황과 결과는 `GET /voice/jobs/{job_id}` 또는 SSE 스트림 `GET /voice/jobs/{job_id}/events`로 확인합니다.
+    - 클라이언트 재시도로 인한 중복 클로닝을 막으려면 `Idempotency-Key` 헤더를 함께 보내세요.
+      같은 키로 다시 요청하면 기존 작업 정보를 반환합니다.
+    - 샘플이 품질 기준(`POST /voice/analyze`)을 통과하지 못하면 Supertone 호출 없이
+      작업이 `failed`(error.status_code=422)로 끝납니다.
+    """
+    api_key = _require_api_key()
+    samples = await _read_samples(request)
 
-        bio = BytesIO(contents)
-        # 포맷 추정 (확장자 기반), 허용 형식은 wav/mp3
-        ext = (f.filename or '').rsplit('.', 1)[-1].lower() if f.filename else 'wav'
-        if ext not in ('wav', 'wave', 'mp3'):
-            raise HTTPException(status_code=400, detail="지원되지 않는 파일 형식입니다. WAV 또는 MP3만 허용됩니다.")
+    try:
+        job = enqueue_job(CLONE_JOB_KIND, user_id, _clone_job, user_id, api_key, samples,
+                          idempotency_key=idempotency_key)
+    except JobQueueFullError:
+        raise HTTPException(status_code=503, detail="대기 중인 작업이 많습니다. 잠시 후 다시 시도해 주세요.")
 
-        fmt = 'wav' if ext in ('wav', 'wave') else 'mp3'
-        try:
-            seg = AudioSegment.from_file(bio, format=fmt)
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"파일 형식 처리 실패: {e}")
-
-        # 시작 무음(침묵) 제거
-        leading_silence_duration = detect_leading_silence(seg, silence_threshold=-40, chunk_duration=100)
-        seg = seg[leading_silence_duration:]
-
-        # 볼륨이 작은 경우 목표 dBFS로 증폭(또는 너무 큰 경우 감쇠)
-        seg = adjust_gain_to_target(seg, target_dBFS=-12.0, max_change_db=20.0)
-
-        segments.append(seg)
-
-    silence = AudioSegment.silent(duration=100)  # 0.1 seconds
-    merged = segments[0] + silence + segments[1] + silence + segments[2]
-
-    out_bio = BytesIO()
-    # 기본은 WAV로 내보내되, 너무 크면 MP3로 압축/샘플레이트를 낮추는 시도 수행
-    merged.export(out_bio, format='wav')
-    out_bio.seek(0)
-
-    payload_bytes = out_bio.getvalue()
-    max_size = 3 * 1024 * 1024  # Supertone 제한에 맞춰 3MB 상한
-
-    files_payload = None
-    # 페이로드가 크게 나오면 압축 시도
-    if len(payload_bytes) > max_size:
-        compressed_bio = None
-        # 시도 순서: 샘플레이트 낮추기 -> 여러 비트레이트로 mp3 내보내기
-        for rate in (22050, 16000, 12000):
-            candidate = merged.set_frame_rate(rate).set_channels(1)
-            for bitrate in ("64k", "48k", "32k"):
-                bio = BytesIO()
-                try:
-                    candidate.export(bio, format='mp3', bitrate=bitrate)
-                except Exception:
-                    # 일부 포맷/옵션에서 실패할 수 있으므로 무시하고 다음 시도
-                    continue
-                bio.seek(0)
-                if len(bio.getvalue()) <= max_size:
-                    compressed_bio = bio
-                    break
-            if compressed_bio:
-                break
-
-        if compressed_bio:
-            files_payload = {'files': ('merged.mp3', compressed_bio, 'audio/mpeg')}
-        else:
-            # 마지막 수단: 길이 제한(예: 첫 30초)로 잘라서 시도
-            trimmed = merged[:30 * 1000]
-            trimmed_bio = BytesIO()
-            trimmed.export(trimmed_bio, format='wav')
-            trimmed_bio.seek(0)
-            if len(trimmed_bio.getvalue()) > max_size:
-                raise HTTPException(status_code=413, detail="생성된 오디오가 너무 큽니다. 업로드할 파일 크기를 줄여주세요.")
-            files_payload = {'files': ('merged.wav', trimmed_bio, 'audio/wav')}
-    else:
-        files_payload = {'files': ('merged.wav', out_bio, 'audio/wav')}
-
-    # Supertone API 호출
-    url = "https://supertoneapi.com/v1/custom-voices/cloned-voice"
-    headers = {"x-sup-api-key": api_key}
-    data = {'name': user_id}
+    return {
+        "job_id": job['job_id'],
+        "status": job['status'],
+        "status_url": f"/api/v1/voice/jobs/{job['job_id']}",
+        "events_url": f"/api/v1/voice/jobs/{job['job_id']}/events"
+    }
 
-    try:
-        resp = requests.post(url, headers=headers, data=data, files=files_payload, timeout=60)
-    except requests.RequestException as e:
-        raise HTTPException(status_code=502, detail=f"Supertone API 호출 실패: {e}")
 
-    if resp.status_code != 200:
-        raise HTTPException(status_code=502, detail=f"Supertone API 오류 ({resp.status_code}): {resp.text}")
+async def _clone_job(set_stage: Callable[[str], None], user_id: str, api_key: str,
+                     samples: List[Tuple[bytes, str]]) -> dict:
+    return await _clone_from_samples(user_id, api_key, samples, set_stage=set_stage)
 
-    try:
-        j = resp.json()
-        voice_id = j.get('voice_id')
-    except Exception:
-        raise HTTPException(status_code=502, detail="Supertone API 응답 처리 실패")
 
-    if not voice_id:
-        raise HTTPException(status_code=502, detail="Supertone가 voice_id를 반환하지 않았습니다.")
+def _get_own_job(job_id: str, user_id: str) -> dict:
+    job = get_job(job_id)
+    if not job or job.get('kind') != CLONE_JOB_KIND:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    if job['user_id'] != user_id:
+        raise HTTPException(status_code=403, detail="본인 작업만 조회할 수 있습니다.")
+    return job
 
-    # users 테이블에 voice_id 저장
-    if not users_table.search(UserQuery.id == user_id):
-        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
-    users_table.update({'voice_id': voice_id}, UserQuery.id == user_id)
 
-    # TTS 음성 생성
-    tts_text = "안녕하세요. 이제 저와 함께, 열심히 발표 연습을 해보실까요?"
-    
-    # Supertone TTS API 호출
-    tts_url = f"https://supertoneapi.com/v1/text-to-speech/{voice_id}?output_format=wav"
-    headers = {
-        "x-sup-api-key": api_key,
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "text": tts_text,
-        "language": "ko",
-        "style": "neutral",
-        "model": "sona_speech_1",
-        "voice_settings": {
-            "pitch_shift": 0,
-            "pitch_variance": 1,
-            "speed": 1
-        }
-    }
-    
-    try:
-        tts_resp = requests.post(tts_url, headers=headers, json=payload, timeout=60)
-    except requests.RequestException as e:
-        raise HTTPException(status_code=502, detail=f"Supertone TTS API 호출 실패: {e}")
-    
-    if tts_resp.status_code != 200:
-        raise HTTPException(status_code=502, detail=f"Supertone TTS API 오류 ({tts_resp.status_code}): {tts_resp.text}")
-    
-    # S3에 업로드
-    object_key = f"{user_id}/example.wav"
-    audio_data = tts_resp.content
-    
-    try:
-        s3_client = boto3.client(
-            's3',
-            region_name=S3_REGION,
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-        )
-        s3_client.put_object(
-            Bucket=S3_BUCKET_NAME,
-            Key=object_key,
-            Body=audio_data,
-            ContentType='audio/wav'
+@router.get("/jobs/{job_id}", summary="보이스 클로닝 작업 상태 조회", response_model=VoiceJobResponse,
+            responses={
+                200: {"description": "작업 상태 (완료 시 result, 실패 시 error 포함)"},
+                403: {"description": "본인 작업이 아님"},
+                404: {"description": "작업 미발견"}
+            })
+def get_clone_job(job_id: str, user_id: str = Depends(get_current_user_id)):
+    """
+    작업 상태(`queued` → `running` → `completed`/`failed`)와 진행 단계를 반환합니다.
+    완료되면 `result`에 `voice_id`와 예제 오디오 정보가, 실패하면 `error`에 상태 코드와 메시지가 담깁니다.
+    """
+    return _get_own_job(job_id, user_id)
+
+
+@router.get("/jobs/{job_id}/events", summary="보이스 클로닝 작업 진행 이벤트 (SSE)",
+            responses={
+                200: {"description": "text/event-stream: 상태가 바뀔 때마다 `status` 이벤트 전송"},
+                403: {"description": "본인 작업이 아님"},
+                404: {"description": "작업 미발견"}
+            })
+async def stream_clone_job_events(job_id: str, request: Request, user_id: str = Depends(get_current_user_id)):
+    """
+    작업 상태를 Server-Sent Events로 전송합니다.
+    연결 직후 현재 상태를 보내고, 이후 상태/단계가 바뀔 때마다 `event: status` 이벤트를 보냅니다.
+    작업이 완료 또는 실패하면 스트림이 종료됩니다.
+    """
+    _get_own_job(job_id, user_id)
+
+    async def events():
+        async for job in watch_job(job_id, keepalive=JOB_EVENTS_KEEPALIVE):
+            if await request.is_disconnected():
+                return
+            if job is None:
+                yield ": keep-alive\n\n"
+                continue
+            payload = VoiceJobResponse(**job).model_dump_json()
+            yield f"event: status\ndata: {payload}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.post("/clone/upload-urls", summary="음성 샘플 S3 직접 업로드용 presigned PUT URL 발급",
+             response_model=VoiceUploadUrlsResponse,
+             responses={
+                 200: {"description": "업로드 세션 ID와 3개의 presigned PUT URL 반환"},
+                 400: {"description": "잘못된 요청(파일 개수/형식/크기)"},
+                 502: {"description": "Presigned URL 발급 실패"}
+             })
+def create_voice_upload_urls(
+    request: VoiceUploadUrlsRequest,
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    3개의 음성 샘플을 API 서버를 거치지 않고 S3에 직접 업로드할 수 있도록
+    presigned PUT URL을 발급합니다.
+
+    - 각 URL에는 요청한 `content_type`과 `size`가 서명되어 있으므로,
+      클라이언트는 응답의 `headers`(Content-Type, Content-Length)를 그대로 사용해 PUT 해야 합니다.
+    - 업로드 완료 후 `POST /voice/clone/uploads/{upload_id}`를 호출하면 클로닝이 진행됩니다.
+    """
+    if len(request.files) != REQUIRED_SAMPLE_COUNT:
+        raise HTTPException(status_code=400, detail="정확히 3개의 음성 파일을 업로드해야 합니다.")
+
+    upload_id = str(uuid.uuid4())
+    now = datetime.utcnow()
+    uploads = []
+    stored_files = []
+    for index, file_info in enumerate(request.files):
+        content_type = file_info.content_type.lower()
+        fmt = ALLOWED_SAMPLE_CONTENT_TYPES.get(content_type)
+        if fmt is None:
+            raise HTTPException(status_code=400, detail="지원되지 않는 파일 형식입니다. WAV 또는 MP3만 허용됩니다.")
+        if file_info.size > MAX_SAMPLE_BYTES:
+            raise HTTPException(status_code=400, detail="각 파일은 3MB 이하의 WAV 또는 MP3이어야 합니다.")
+
+        object_key = f"{user_id}/voice_samples/{upload_id}/sample_{index + 1}.{fmt}"
+        url = create_presigned_upload_url(
+            object_key, content_type, file_info.size, expiration=UPLOAD_URL_EXPIRES_IN
         )
-    except ClientError as e:
-        raise HTTPException(status_code=502, detail=f"S3 업로드 실패: {e}")
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"S3 업로드 중 예기치 못한 오류: {e}")
-    
-    # Presigned URL 생성
-    presigned_url = create_presigned_url(object_key, expiration=3600)  # 1시간 유효
-    if not presigned_url:
-        raise HTTPException(status_code=502, detail="Presigned URL 생성 실패")
-    
-    return {
-        "voice_id": voice_id,
-        "example_audio": {
+        if not url:
+            raise HTTPException(status_code=502, detail="Presigned URL 생성 실패")
+
+        uploads.append({
             "object_key": object_key,
-            "presigned_url": presigned_url,
-            "audio_length": tts_resp.headers.get("X-Audio-Length", "unknown")
-        }
+            "upload_url": url,
+            "method": "PUT",
+            "headers": {
+                "Content-Type": content_type,
+                "Content-Length": str(file_info.size)
+            }
+        })
+        stored_files.append({
+            "object_key": object_key,
+            "file_name": file_info.file_name,
+            "content_type": content_type,
+            "format": fmt,
+            "size": file_info.size
+        })
+
+    voice_uploads_table.insert({
+        "upload_id": upload_id,
+        "user_id": user_id,
+        "files": stored_files,
+        "status": "pending",
+        "created_at": now.isoformat(),
+        "expires_at": (now + UPLOAD_SESSION_TTL).isoformat()
+    })
+
+    return {
+        "upload_id": upload_id,
+        "expires_in": UPLOAD_URL_EXPIRES_IN,
+        "uploads": uploads
     }
+
+
+def _claim_upload_session(upload_id: str, user_id: str) -> dict:
+    """
+    업로드 세션을 검증하고 pending → processing으로 바꿔 반환합니다.
+    확인과 상태 변경을 db_lock 안에서 함께 수행하므로, 같은 세션을 동시에 요청해도 한 요청만 처리합니다.
+    """
+    with db_lock:
+        session = voice_uploads_table.get(UserQuery.upload_id == upload_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+        if session['user_id'] != user_id:
+            raise HTTPException(status_code=403, detail="본인 업로드 세션만 처리할 수 있습니다.")
+        if session.get('status') == 'processing':
+            raise HTTPException(status_code=409, detail="이미 처리 중인 업로드 세션입니다.")
+        if session.get('status') != 'pending':
+            raise HTTPException(status_code=410, detail="이미 처리된 업로드 세션입니다.")
+        if datetime.fromisoformat(session['expires_at']) < datetime.utcnow():
+            raise HTTPException(status_code=410, detail="업로드 세션이 만료되었습니다. 다시 발급받아 주세요.")
+        voice_uploads_table.update(
+            {"status": "processing", "processing_started_at": datetime.utcnow().isoformat()},
+            UserQuery.upload_id == upload_id
+        )
+    return session
+
+
+@router.post("/clone/uploads/{upload_id}", summary="S3에 직접 업로드한 음성 3개로 보이스 클로닝 요청",
+             response_model=VoiceCloneResponse,
+             responses={
+                 200: {"description": "voice_id 및 예제 오디오 정보 반환"},
+                 400: {"description": "업로드 누락 또는 선언한 크기/형식과 불일치"},
+                 403: {"description": "본인 업로드 세션이 아님"},
+                 404: {"description": "업로드 세션 미발견"},
+                 409: {"description": "같은 업로드 세션을 이미 처리 중"},
+                 410: {"description": "업로드 세션 만료 또는 이미 처리됨"},
+                 422: {"description": "음성 샘플 품질 기준 미달"},
+                 502: {"description": "외부 API 호출 또는 S3 처리 실패"}
+             })
+async def clone_voice_from_uploads(
+    upload_id: str,
+    response: Response,
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    `POST /voice/clone/upload-urls`로 발급받은 URL에 업로드를 마친 뒤 호출합니다.
+    S3에 저장된 3개의 샘플을 읽어 `/voice/clone`과 동일한 처리를 수행하고,
+    성공 시 업로드된 샘플 객체는 삭제됩니다.
+    응답의 `Server-Timing` 헤더에 단계별 처리 시간(ms)이 담깁니다. (downloading부터 cleanup까지)
+    """
+    api_key = _require_api_key()
+    session = _claim_upload_session(upload_id, user_id)
+
+    timer = _StageTimer()
+    try:
+        timer.set_stage('downloading')
+        samples = await asyncio.to_thread(_download_samples, session['files'])
+        result = await _clone_from_samples(user_id, api_key, samples, set_stage=timer.set_stage)
+    except (Exception, asyncio.CancelledError) as e:
+        # 실패(취소 포함)하면 다시 시도할 수 있도록 pending으로 되돌림 (만료 시각은 그대로)
+        detail = e.detail if isinstance(e, HTTPException) else str(e) or type(e).__name__
+        voice_uploads_table.update(
+            {"status": "pending", "last_error": detail, "processing_started_at": None},
+            UserQuery.upload_id == upload_id
+        )
+        raise
+
+    timer.set_stage('cleanup')
+    voice_uploads_table.update(
+        {"status": "completed", "completed_at": datetime.utcnow().isoformat()},
+        UserQuery.upload_id == upload_id
+    )
+    for file_info in session['files']:
+        await asyncio.to_thread(delete_object, file_info['object_key'])
+
+    response.headers['Server-Timing'] = timer.header()
+    return result
+
+
+@router.get("/tts-cache/stats", summary="TTS 캐시 적중률/크기 조회", response_model=TtsCacheStatsResponse)
+def get_tts_cache_stats(user_id: str = Depends(get_current_user_id)):
+    """
+    TTS 결과 캐시의 적중/미스/제거 횟수(서버 시작 이후)와 현재 항목 수, 총 크기를 반환합니다.
+    """
+    return cache_stats()
+
+
+@router.get("/upstream/stats", summary="Supertone 호출 결과/서킷 상태 조회", response_model=UpstreamStatsResponse)
+def get_upstream_stats(user_id: str = Depends(get_current_user_id)):
+    """
+    Supertone 호출 종류(`supertone.clone`, `supertone.tts`)별 결과 카운터(서버 시작 이후)와
+    서킷 브레이커 상태(`closed` / `open` / `half_open`)를 반환합니다.
+    """
+    return upstream_stats()
@@ -0,0 +1,94 @@
+"""
+pytest 공용 설정
+- 테스트 전용 TinyDB 파일(임시 디렉터리)을 사용하도록 DB_PATH 환경 변수를 지정
+- S3 호출을 대신하는 메모리 기반 FakeS3 fixture 제공
+- Supertone API를 대신하는 로컬 대역 서버(supertone_stub, scripts/mock_supertone.py) fixture 제공
+"""
+
+import os
+import tempfile
+
+# core.database import 전에 지정되어야 함
+os.environ.setdefault('DB_PATH', os.path.join(tempfile.mkdtemp(prefix='sfitz-test-'), 'db.json'))
+
+import pytest  # noqa: E402
+from botocore.exceptions import ClientError  # noqa: E402
+
+
+class FakeS3:
+    """테스트용 메모리 S3 클라이언트 (이 프로젝트가 사용하는 메서드만 구현)"""
+
+    def __init__(self):
+        self.objects = {}
+        self.put_count = 0
+
+    def put_object(self, Bucket, Key, Body, ContentType=None, **kwargs):
+        data = Body.read() if hasattr(Body, 'read') else bytes(Body)
+        self.objects[Key] = (data, ContentType)
+        self.put_count += 1
+        return {}
+
+    def _get(self, Key, operation):
+        if Key not in self.objects:
+            raise ClientError({'Error': {'Code': 'NoSuchKey', 'Message': Key}}, operation)
+        return self.objects[Key]
+
+    def head_object(self, Bucket, Key):
+        data, content_type = self._get(Key, 'HeadObject')
+        return {'ContentLength': len(data), 'ContentType': content_type}
+
+    def get_object(self, Bucket, Key):
+        import io
+        data, content_type = self._get(Key, 'GetObject')
+        return {'Body': io.BytesIO(data), 'ContentLength': len(data), 'ContentType': content_type}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+        return {}
+
+    def generate_presigned_url(self, ClientMethod, Params, ExpiresIn=300):
+        return f"https://fake-s3.local/{Params['Key']}?method={ClientMethod}&expires={ExpiresIn}"
+
+
+@pytest.fixture
+def fake_s3(monkeypatch):
+    import core.s3
+    import core.storage
+    import api.v1.voice
+
+    from core.database import s3_table, s3_blobs_table, tts_cache_table
+
+    client = FakeS3()
+    for module in (core.s3, core.storage, api.v1.voice):
+        monkeypatch.setattr(module, 'get_s3_client', lambda: client)
+    yield client
+    # 버킷과 함께 버킷을 가리키는 카탈로그도 초기화
+    for table in (s3_table, s3_blobs_table, tts_cache_table):
+        table.truncate()
+
+
+@pytest.fixture(scope='session')
+def _supertone_server():
+    from scripts.mock_supertone import MockSupertone
+
+    # 벤치마크와 같은 대역을 지연/변동 없이, 고정 TTS 응답으로 사용
+    stub = MockSupertone(clone_latency=0.0, tts_latency=0.0, jitter=0.0, tts_audio=b'RIFF')
+    stub.start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def supertone_stub(_supertone_server, monkeypatch):
+    import core.resilience
+    import core.supertone
+
+    _supertone_server.requests.clear()
+    _supertone_server.delay = 0.0
+    _supertone_server.faults = {'clone': [], 'tts': []}
+    _supertone_server.tts_audio = b'RIFF'
+    monkeypatch.setattr(core.supertone, 'SUPERTONE_BASE_URL', _supertone_server.base_url)
+    monkeypatch.setattr(core.supertone, 'SUPERTONE_RETRY_BASE_DELAY', 0.01)
+    core.supertone.reset_breakers()
+    core.resilience.reset_metrics()
+    return _supertone_server
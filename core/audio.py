@@ -0,0 +1,540 @@
+"""
+음성 샘플 신호 처리 유틸리티
+- AudioSegment 원시 샘플을 NumPy 배열로 변환
+- 고정 길이 윈도우 RMS를 벡터 연산으로 한 번에 계산
+- 시작/끝 무음 및 중간의 긴 쉼(pause) 구간 감지
+- 보이스 클로닝 입력 전처리(디코딩, 무음 제거, 볼륨 보정, 병합, 용량 맞춤)
+  무음 제거/볼륨 보정/병합은 샘플 배열에서 한 번에 처리하여 미리 할당한 출력 버퍼에 기록
+
+윈도우 경계와 RMS 계산 방식은 pydub(`audio[::chunk]`, `chunk.dBFS`)과 동일하게 맞춰,
+기존 청크 반복 방식과 같은 결과를 반환합니다.
+"""
+
+from io import BytesIO
+from typing import List, Optional, Tuple
+
+import numpy as np
+from pydub import AudioSegment
+from pydub.utils import ratio_to_db
+
+from core.audio_codecs import decode_audio, encode_mp3, encode_wav
+from core.config import CLONE_LOUDNESS_MODE, VOICE_QUALITY_GATE
+
+
+def segment_to_array(audio: AudioSegment) -> np.ndarray:
+    """
+    AudioSegment의 원시 PCM 데이터를 채널이 섞인(interleaved) 부호 있는 정수 배열로 반환합니다.
+    (8bit도 audioop과 동일하게 부호 있는 값으로 해석)
+    """
+    width = audio.sample_width
+    raw = audio.raw_data
+    if width == 1:
+        return np.frombuffer(raw, dtype=np.int8)
+    if width == 2:
+        return np.frombuffer(raw, dtype='<i2')
+    if width == 4:
+        return np.frombuffer(raw, dtype='<i4')
+    if width == 3:
+        # 24bit: 3바이트씩 읽어 상위 바이트 부호 확장
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        return np.where(values & 0x800000, values - 0x1000000, values)
+    raise ValueError(f"지원하지 않는 sample width: {width}")
+
+
+def _window_bounds(audio: AudioSegment, window_ms: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    `audio[::window_ms]`가 만드는 각 청크의 [시작, 끝) 프레임 인덱스를 반환합니다.
+    pydub의 ms → 프레임 변환(`int(ms * (frame_rate / 1000.0))`)을 그대로 따릅니다.
+    """
+    length_ms = len(audio)
+    starts_ms = np.arange(0, length_ms, window_ms, dtype=np.float64)
+    ends_ms = np.minimum(starts_ms + window_ms, length_ms)
+    per_ms = audio.frame_rate / 1000.0
+    start_frames = (starts_ms * per_ms).astype(np.int64)
+    end_frames = (ends_ms * per_ms).astype(np.int64)
+    return start_frames, end_frames
+
+
+def _window_sum_squares(samples: np.ndarray, start_idx: np.ndarray, end_idx: np.ndarray, exact: bool) -> np.ndarray:
+    """
+    연속된 윈도우([start_idx[i], end_idx[i]) 샘플 구간)의 제곱합을 구합니다.
+    모든 윈도우 길이가 같으면 2차원으로 reshape 후 einsum 한 번으로 계산하고,
+    그렇지 않으면 reduceat으로 계산합니다. exact=True면 int64로 정확히 누적합니다.
+    """
+    dtype = np.int64 if exact else np.float64
+    lengths = end_idx - start_idx
+    first, last = int(start_idx[0]), int(end_idx[-1])
+    if last <= first:
+        return np.zeros(len(start_idx), dtype=dtype)
+    if np.all(lengths == lengths[0]):
+        block = samples[first:last].reshape(len(lengths), int(lengths[0]))
+        return np.einsum('ij,ij->i', block, block, dtype=dtype)
+
+    squares = np.multiply(samples[first:last], samples[first:last], dtype=dtype)
+    sums = np.zeros(len(start_idx), dtype=dtype)
+    nonempty = lengths > 0
+    sums[nonempty] = np.add.reduceat(squares, start_idx[nonempty] - first)
+    return sums
+
+
+def _window_energy(
+    samples: np.ndarray,
+    audio: AudioSegment,
+    window_ms: int,
+    first: int = 0,
+    last: int = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    `audio[::window_ms]` 각 청크의 제곱합과, RMS 계산에 쓰는 샘플 수(청크 길이 × 채널)를 반환합니다.
+    `samples`는 segment_to_array(audio) 결과입니다. (호출자가 이미 변환한 배열을 재사용)
+    """
+    channels = audio.channels
+    total_frames = len(samples) // channels
+    start_frames, end_frames = _window_bounds(audio, window_ms)
+    start_frames, end_frames = start_frames[first:last], end_frames[first:last]
+    if len(start_frames) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    start_idx = np.minimum(start_frames, total_frames) * channels
+    end_idx = np.minimum(end_frames, total_frames) * channels
+    # 16bit 이하는 int64로 정확히, 그 이상은 audioop과 같이 float64로 누적
+    sums = _window_sum_squares(samples, start_idx, end_idx, exact=audio.sample_width <= 2)
+    return sums, (end_frames - start_frames) * channels
+
+
+def windowed_rms(audio: AudioSegment, window_ms: int = 100, first: int = 0, last: int = None) -> np.ndarray:
+    """
+    `audio[::window_ms]` 각 청크의 RMS(정수, audioop.rms와 동일)를 벡터 연산으로 계산합니다.
+    `first`/`last`로 계산할 청크 범위를 제한할 수 있습니다. (조기 종료용)
+    마지막 청크가 실제 데이터보다 길게 계산되는 경우 pydub처럼 부족한 프레임을 0으로 간주합니다.
+    """
+    sums, counts = _window_energy(segment_to_array(audio), audio, window_ms, first, last)
+    rms = np.zeros(len(sums), dtype=np.int64)
+    nonempty = counts > 0
+    rms[nonempty] = np.floor(np.sqrt(sums[nonempty].astype(np.float64) / counts[nonempty])).astype(np.int64)
+    return rms
+
+
+def _silence_rms_cutoff(silence_threshold: float, sample_width: int) -> int:
+    """
+    `dBFS >= silence_threshold`가 되는 가장 작은 정수 RMS를 구합니다.
+    pydub의 dB 변환식(ratio_to_db)을 그대로 사용해 경계값에서도 결과가 같도록 합니다.
+    """
+    max_amplitude = (2 ** (sample_width * 8)) / 2
+    cutoff = max(1, int(max_amplitude * 10 ** (silence_threshold / 20.0)))
+    while cutoff > 1 and ratio_to_db((cutoff - 1) / max_amplitude) >= silence_threshold:
+        cutoff -= 1
+    while ratio_to_db(cutoff / max_amplitude) < silence_threshold:
+        cutoff += 1
+    return cutoff
+
+
+def silent_windows(
+    audio: AudioSegment,
+    silence_threshold: float = -40,
+    chunk_duration: int = 100,
+    first: int = 0,
+    last: int = None
+) -> np.ndarray:
+    """각 `chunk_duration`(ms) 청크가 무음(dBFS < silence_threshold)인지 나타내는 bool 배열"""
+    rms = windowed_rms(audio, chunk_duration, first, last)
+    return rms < _silence_rms_cutoff(silence_threshold, audio.sample_width)
+
+
+def _window_count(audio: AudioSegment, chunk_duration: int) -> int:
+    return -(-len(audio) // chunk_duration)
+
+
+# 시작/끝 무음 감지 시 처음 검사할 청크 수 (이후 두 배씩 확장)
+_SCAN_BLOCK = 16
+
+
+def detect_leading_silence(audio: AudioSegment, silence_threshold: int = -40, chunk_duration: int = 100) -> int:
+    """
+    오디오의 시작 부분에서 침묵 구간을 감지하고 지속 시간(ms)을 반환합니다.
+    앞쪽부터 청크 블록 단위로 RMS를 계산하며, 소리가 나는 청크를 찾으면 즉시 종료합니다.
+
+    Args:
+        audio: 분석할 AudioSegment
+        silence_threshold: 침묵 판정 기준 (dB, 기본값 -40dB)
+        chunk_duration: 분석 단위 (ms, 기본값 100ms)
+
+    Returns:
+        제거할 시작 침묵의 지속 시간 (ms)
+    """
+    total = _window_count(audio, chunk_duration)
+    first, block = 0, _SCAN_BLOCK
+    while first < total:
+        last = min(first + block, total)
+        loud = np.flatnonzero(~silent_windows(audio, silence_threshold, chunk_duration, first, last))
+        if len(loud):
+            return (first + int(loud[0])) * chunk_duration
+        first, block = last, block * 2
+    return total * chunk_duration
+
+
+def detect_trailing_silence(audio: AudioSegment, silence_threshold: int = -40, chunk_duration: int = 100) -> int:
+    """
+    오디오 끝 부분의 침묵 지속 시간(ms)을 반환합니다.
+    청크 경계는 시작 무음 감지와 동일하며, `audio[:len(audio) - 반환값]`으로 잘라낼 수 있습니다.
+    """
+    total = _window_count(audio, chunk_duration)
+    last, block = total, _SCAN_BLOCK
+    while last > 0:
+        first = max(last - block, 0)
+        loud = np.flatnonzero(~silent_windows(audio, silence_threshold, chunk_duration, first, last))
+        if len(loud):
+            return len(audio) - min((first + int(loud[-1]) + 1) * chunk_duration, len(audio))
+        last, block = first, block * 2
+    return len(audio)
+
+
+def detect_long_pauses(
+    audio: AudioSegment,
+    min_pause_ms: int = 700,
+    silence_threshold: int = -40,
+    chunk_duration: int = 100
+) -> List[Tuple[int, int]]:
+    """
+    시작/끝 무음을 제외한 중간의 긴 쉼 구간을 [(시작ms, 끝ms), ...]로 반환합니다.
+    연속된 무음 청크의 길이가 `min_pause_ms` 이상인 구간만 포함합니다.
+    """
+    silent = silent_windows(audio, silence_threshold, chunk_duration)
+    loud = np.flatnonzero(~silent)
+    if len(loud) < 2:
+        return []
+    # 처음과 마지막 소리 청크 사이의 무음 구간만 검사
+    inner = silent[loud[0]:loud[-1] + 1].astype(np.int8)
+    edges = np.diff(np.concatenate(([0], inner, [0])))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+    offset = int(loud[0])
+    pauses = []
+    for start, end in zip(run_starts, run_ends):
+        if (end - start) * chunk_duration >= min_pause_ms:
+            pauses.append(((offset + int(start)) * chunk_duration, (offset + int(end)) * chunk_duration))
+    return pauses
+
+
+# ===== 보이스 클로닝 입력 전처리 파이프라인 =====
+# 아래 함수들은 프로세스 풀(core.workers)에서 실행되므로 모듈 최상위 함수로 두고,
+# 인자/반환값은 모두 pickle 가능한 값(bytes, str, tuple)만 사용합니다.
+
+MAX_CLONE_PAYLOAD_BYTES = 3 * 1024 * 1024  # Supertone 제한에 맞춘 3MB 상한
+SEGMENT_GAP_MS = 100  # 샘플 사이에 넣는 무음 길이
+
+
+class AudioProcessingError(Exception):
+    """오디오 전처리 실패 (API 계층에서 HTTPException으로 변환)"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def adjust_gain_to_target(audio: AudioSegment, target_dBFS: float = -12.0, max_change_db: float = 20.0) -> AudioSegment:
+    """
+    오디오의 dBFS를 목표값(target_dBFS)으로 맞춥니다. 필요시 증폭(또는 감쇠)을 적용합니다.
+
+    - target_dBFS: 목표 RMS/레벨(예: -12.0 dBFS)
+    - max_change_db: 한 번에 적용 가능한 최대 증폭/감쇠(dB)
+    """
+    try:
+        current_dbfs = audio.dBFS
+    except Exception:
+        return audio
+
+    if current_dbfs is None:
+        return audio
+
+    change_db = target_dBFS - current_dbfs
+    # 변경량을 제한
+    if change_db > 0:
+        change_db = min(change_db, max_change_db)
+    else:
+        change_db = max(change_db, -max_change_db)
+
+    # 만약 변화가 거의 없다면 원본 반환
+    if abs(change_db) < 0.1:
+        return audio
+
+    return audio.apply_gain(change_db)
+
+
+def decode_sample(contents: bytes, fmt: str) -> AudioSegment:
+    """업로드된 음성 바이트를 디코딩합니다. 실패 시 AudioProcessingError(400)를 발생시킵니다."""
+    try:
+        return decode_audio(contents, fmt)
+    except Exception as e:
+        raise AudioProcessingError(400, f"파일 형식 처리 실패: {e}")
+
+
+# 병합 시 볼륨 측정 방식: 'rms'(전체 구간 RMS, 기존 dBFS와 동일) / 'gated'(게이팅 적용 라우드니스)
+LOUDNESS_MODES = ('rms', 'gated')
+GATED_BLOCK_WINDOWS = 4  # 게이팅 블록 = 분석 청크 4개(400ms), 청크 1개(100ms)씩 이동 (75% 겹침)
+GATED_ABSOLUTE_DB = -70.0
+GATED_RELATIVE_DB = -10.0
+_GAIN_SCRATCH_SAMPLES = 1 << 16  # 볼륨 보정 시 한 번에 처리하는 샘플 수 (임시 버퍼 크기)
+
+
+def _gated_loudness_db(sums: np.ndarray, counts: np.ndarray, max_amplitude: float) -> Optional[float]:
+    """
+    ITU-R BS.1770 방식의 게이팅(절대 -70dB, 상대 -10dB)으로 측정한 라우드니스(dBFS 기준)를 반환합니다.
+    K-weighting 필터는 적용하지 않으며, 청크별 제곱합(sums)을 겹치는 400ms 블록으로 묶어 계산합니다.
+    소리가 없으면 None.
+    """
+    sums = sums.astype(np.float64)
+    counts = counts.astype(np.float64)
+    if len(sums) >= GATED_BLOCK_WINDOWS:
+        kernel = np.ones(GATED_BLOCK_WINDOWS)
+        block_power = np.convolve(sums, kernel, 'valid') / np.convolve(counts, kernel, 'valid')
+    else:
+        block_power = np.array([sums.sum() / max(counts.sum(), 1.0)])
+    block_power /= max_amplitude ** 2
+
+    with np.errstate(divide='ignore'):
+        block_db = 10 * np.log10(block_power)
+    gated = block_power[block_db > GATED_ABSOLUTE_DB]
+    if len(gated) == 0:
+        return None
+    relative_gate = 10 * np.log10(gated.mean()) + GATED_RELATIVE_DB
+    gated = gated[10 * np.log10(gated) > relative_gate]
+    return float(10 * np.log10(gated.mean()))
+
+
+def _gain_db(current_db: Optional[float], target_dBFS: float, max_change_db: float) -> float:
+    """adjust_gain_to_target과 같은 규칙(변경량 제한, 0.1dB 미만 무시)으로 적용할 gain(dB)을 구합니다."""
+    if current_db is None:
+        return 0.0
+    change_db = target_dBFS - current_db
+    if change_db > 0:
+        change_db = min(change_db, max_change_db)
+    else:
+        change_db = max(change_db, -max_change_db)
+    return change_db if abs(change_db) >= 0.1 else 0.0
+
+
+def _write_with_gain(dest: np.ndarray, src: np.ndarray, gain_db: float, sample_width: int) -> None:
+    """
+    src에 gain을 적용하여 dest에 기록합니다. (audioop.mul과 같이 범위를 넘으면 포화, 내림)
+    작은 임시 버퍼를 재사용하며 구간 단위로 처리하므로 입력 크기만큼의 중간 배열을 만들지 않습니다.
+    """
+    if gain_db == 0.0:
+        dest[:] = src
+        return
+    factor = 10 ** (gain_db / 20)
+    max_value = (2 ** (sample_width * 8)) / 2
+    scratch = np.empty(min(len(src), _GAIN_SCRATCH_SAMPLES), dtype=np.float64)
+    for start in range(0, len(src), _GAIN_SCRATCH_SAMPLES):
+        end = min(start + _GAIN_SCRATCH_SAMPLES, len(src))
+        buf = scratch[:end - start]
+        np.multiply(src[start:end], factor, out=buf)
+        np.clip(buf, -max_value, max_value - 1, out=buf)
+        np.floor(buf, out=buf)
+        dest[start:end] = buf
+
+
+def _trim_and_measure(
+    seg: AudioSegment,
+    loudness: str,
+    target_dBFS: float,
+    max_change_db: float,
+    silence_threshold: float,
+    chunk_duration: int
+) -> Tuple[np.ndarray, float]:
+    """
+    청크별 제곱합을 한 번 계산하여 시작 무음 길이와 무음 제거 후 볼륨을 함께 구합니다.
+    반환: (시작 무음을 뺀 샘플 배열(원본 버퍼의 view), 적용할 gain(dB))
+    """
+    samples = segment_to_array(seg)
+    sums, counts = _window_energy(samples, seg, chunk_duration)
+    if len(sums) == 0:
+        return samples, 0.0
+
+    rms = np.floor(np.sqrt(sums.astype(np.float64) / np.maximum(counts, 1))).astype(np.int64)
+    loud = np.flatnonzero(rms >= _silence_rms_cutoff(silence_threshold, seg.sample_width))
+    lead = int(loud[0]) if len(loud) else len(sums)
+    # seg[lead * chunk_duration:]와 같은 위치 (청크 경계는 pydub 슬라이싱과 동일한 프레임 변환)
+    trim_frame = min(int(lead * chunk_duration * (seg.frame_rate / 1000.0)), len(samples) // seg.channels)
+    trimmed = samples[trim_frame * seg.channels:]
+    if len(trimmed) == 0:
+        return trimmed, 0.0
+
+    max_amplitude = seg.max_possible_amplitude
+    if loudness == 'gated':
+        current_db = _gated_loudness_db(sums[lead:], counts[lead:], max_amplitude)
+    else:
+        # AudioSegment.dBFS와 동일: 정수 RMS(audioop.rms) 기준, 무음이면 -inf
+        total = sums[lead:].sum()
+        level = int(np.sqrt(float(total) / len(trimmed)))
+        current_db = ratio_to_db(level / max_amplitude) if level else -float('inf')
+    return trimmed, _gain_db(current_db, target_dBFS, max_change_db)
+
+
+def merge_clone_segments(
+    segments: List[AudioSegment],
+    gap_ms: int = SEGMENT_GAP_MS,
+    loudness: str = 'rms',
+    target_dBFS: float = -12.0,
+    max_change_db: float = 20.0,
+    silence_threshold: float = -40,
+    chunk_duration: int = 100
+) -> AudioSegment:
+    """
+    각 샘플의 시작 무음을 제거하고 목표 볼륨으로 맞춘 뒤, 사이에 gap_ms 무음을 넣어 하나로 합칩니다.
+
+    샘플마다 청크 에너지를 한 번만 계산해 무음 제거 위치와 볼륨을 구하고, 미리 할당한 출력 버퍼에
+    gain을 적용하며 바로 기록합니다. (슬라이싱/apply_gain/`+` 병합마다 생기던 복사본을 만들지 않음)
+    출력 형식은 pydub 병합과 같이 채널/샘플레이트/샘플 폭의 최댓값이며(8bit 입력은 16bit로),
+    형식이 다른 샘플만 pydub로 변환합니다.
+
+    - loudness: 'rms'면 기존 adjust_gain_to_target(dBFS)과 같은 결과,
+      'gated'면 무음/작은 소리 구간을 제외한 게이팅 라우드니스 기준으로 볼륨을 맞춥니다.
+    """
+    if loudness not in LOUDNESS_MODES:
+        raise ValueError(f"지원하지 않는 loudness 방식: {loudness}")
+    channels = max(seg.channels for seg in segments)
+    frame_rate = max(seg.frame_rate for seg in segments)
+    sample_width = max(max(seg.sample_width for seg in segments), 2)
+    if sample_width == 3:
+        sample_width = 4  # 24bit는 32bit로 병합 (core/audio_codecs.py의 디코딩 결과와 같은 표현)
+
+    parts = []
+    for seg in segments:
+        if seg.sample_width == 3:
+            seg = seg.set_sample_width(4)
+        trimmed, gain_db = _trim_and_measure(
+            seg, loudness, target_dBFS, max_change_db, silence_threshold, chunk_duration
+        )
+        if (seg.channels, seg.frame_rate, seg.sample_width) != (channels, frame_rate, sample_width):
+            # 형식이 다른 샘플: gain 적용 후 pydub과 같은 순서(채널 → 샘플레이트 → 샘플 폭)로 변환
+            gained = np.empty_like(trimmed)
+            _write_with_gain(gained, trimmed, gain_db, seg.sample_width)
+            converted = AudioSegment(
+                data=gained.tobytes(), sample_width=seg.sample_width, frame_rate=seg.frame_rate, channels=seg.channels
+            ).set_channels(channels).set_frame_rate(frame_rate).set_sample_width(sample_width)
+            parts.append((segment_to_array(converted), 0.0))
+        else:
+            parts.append((trimmed, gain_db))
+
+    gap = int(gap_ms * frame_rate / 1000) * channels
+    total = sum(len(samples) for samples, _ in parts) + gap * (len(parts) - 1)
+    # 0으로 초기화된 bytearray를 배열로 감싸 기록하고, 그대로 AudioSegment 데이터로 사용 (tobytes 복사 없음)
+    buffer = bytearray(total * sample_width)
+    out = np.frombuffer(buffer, dtype={2: '<i2', 4: '<i4'}[sample_width])
+    pos = 0
+    for i, (samples, gain_db) in enumerate(parts):
+        if i:
+            pos += gap  # 무음 구간은 0으로 초기화된 상태 그대로
+        _write_with_gain(out[pos:pos + len(samples)], samples, gain_db, sample_width)
+        pos += len(samples)
+    return AudioSegment(data=buffer, sample_width=sample_width, frame_rate=frame_rate, channels=channels)
+
+
+# 용량 초과 시 시도하는 MP3 인코딩 후보 (선호 순서: 높은 샘플레이트/비트레이트 우선)
+CLONE_MP3_CANDIDATES = [
+    (rate, bitrate)
+    for rate in (22050, 16000, 12000)
+    for bitrate in (64, 48, 32)
+]
+WAV_HEADER_BYTES = 44
+# MP3 크기 예측 보정값: ID3 태그 + Xing/LAME 정보 프레임 + 인코더 지연/패딩 샘플
+MP3_TAG_BYTES = 128
+MP3_ENCODER_PADDING_SAMPLES = 1105 + 1152
+
+
+def wav_size(audio: AudioSegment) -> int:
+    """WAV로 내보냈을 때의 정확한 바이트 수 (44바이트 헤더 + PCM 데이터)"""
+    return WAV_HEADER_BYTES + len(audio.raw_data)
+
+
+def estimate_mp3_size(duration_ms: float, frame_rate: int, bitrate_kbps: int) -> int:
+    """
+    CBR MP3로 내보냈을 때의 예상 바이트 수.
+    프레임 크기(샘플 수 × 비트레이트 / 샘플레이트)와 프레임 수로 계산하며,
+    실제 크기보다 약간 크게(3% 이내) 예측하므로 예측이 상한 이하이면 실제로도 대부분 상한 이하입니다.
+    """
+    samples_per_frame = 1152 if frame_rate >= 32000 else 576  # MPEG-1 / MPEG-2(LSF)
+    total_samples = int(duration_ms * frame_rate / 1000) + MP3_ENCODER_PADDING_SAMPLES
+    frames = -(-total_samples // samples_per_frame) + 1  # +1: Xing/LAME 정보 프레임
+    frame_bytes = samples_per_frame * bitrate_kbps * 1000 / 8 / frame_rate
+    return int(frames * frame_bytes) + frames + MP3_TAG_BYTES  # frames: 패딩 바이트 상한
+
+
+def plan_mp3_encoding(duration_ms: float, max_size: int) -> List[Tuple[int, int, int]]:
+    """
+    예상 크기가 max_size 이하인 MP3 후보를 선호 순서대로 반환합니다.
+    반환: [(샘플레이트, 비트레이트(kbps), 예상 바이트 수), ...]
+    """
+    plan = []
+    for rate, bitrate in CLONE_MP3_CANDIDATES:
+        predicted = estimate_mp3_size(duration_ms, rate, bitrate)
+        if predicted <= max_size:
+            plan.append((rate, bitrate, predicted))
+    return plan
+
+
+def _export(audio: AudioSegment, fmt: str, bitrate: Optional[str] = None) -> bytes:
+    """WAV/MP3는 프로세스 안에서 인코딩 (core/audio_codecs.py), 그 외 형식은 pydub(ffmpeg) 사용"""
+    if fmt == 'wav':
+        return encode_wav(audio)
+    if fmt == 'mp3':
+        return encode_mp3(audio, int((bitrate or '64k').rstrip('k')))
+    bio = BytesIO()
+    audio.export(bio, format=fmt, bitrate=bitrate)
+    return bio.getvalue()
+
+
+def build_clone_payload(
+    samples: List[Tuple[bytes, str]],
+    loudness: Optional[str] = None,
+    quality_gate: Optional[bool] = None
+) -> Tuple[str, bytes, str]:
+    """
+    (바이트, 포맷) 샘플 목록을 전처리/병합하여 Supertone 업로드용 오디오를 만듭니다.
+
+    결과 크기를 인코딩 전에 예측하여(WAV는 정확히, MP3는 길이 × 비트레이트로) 조건에 맞는
+    첫 후보만 인코딩합니다. 예측이 빗나가 실제 크기가 상한을 넘을 때만 다음 후보로 넘어갑니다.
+    `loudness`를 생략하면 CLONE_LOUDNESS_MODE 설정을 따릅니다.
+    품질 검사(`quality_gate`, 기본값 VOICE_QUALITY_GATE)를 통과하지 못한 샘플이 있으면
+    병합/인코딩 전에 AudioProcessingError(422)를 발생시킵니다.
+
+    Returns:
+        (파일명, 오디오 바이트, Content-Type)
+    """
+    segments = [decode_sample(contents, fmt) for contents, fmt in samples]
+    if VOICE_QUALITY_GATE if quality_gate is None else quality_gate:
+        from core.audio_quality import assess_segments, raise_for_quality  # 순환 import 방지
+        raise_for_quality(assess_segments(segments))
+    merged = merge_clone_segments(segments, loudness=loudness or CLONE_LOUDNESS_MODE)
+    del segments  # 디코딩 버퍼는 병합 후 바로 해제
+    max_size = MAX_CLONE_PAYLOAD_BYTES
+
+    # 기본은 WAV (크기가 정확히 계산되므로 상한 이하일 때만 인코딩)
+    if wav_size(merged) <= max_size:
+        return 'merged.wav', _export(merged, 'wav'), 'audio/wav'
+
+    # 너무 크면 모노 + 낮은 샘플레이트의 MP3로 압축 (예상 크기가 맞는 첫 후보부터)
+    mono = merged.set_channels(1)
+    miss_ratio = 1.0  # 예측 대비 실제 크기 비율 (빗나간 경우 이후 후보 예측에 반영)
+    for rate, bitrate, predicted in plan_mp3_encoding(len(merged), max_size):
+        if predicted * miss_ratio > max_size:
+            continue
+        try:
+            data = _export(mono.set_frame_rate(rate), 'mp3', bitrate=f"{bitrate}k")
+        except Exception:
+            # MP3 인코딩 자체가 실패하면(lameenc도 ffmpeg도 없는 환경 등) 다른 후보도 같은 이유로 실패하므로 중단
+            break
+        if len(data) <= max_size:
+            return 'merged.mp3', data, 'audio/mpeg'
+        miss_ratio = max(miss_ratio, len(data) / predicted)
+
+    # 마지막 수단: 상한에 들어가는 최대 길이만큼 앞부분을 잘라 WAV로
+    # (WAV 크기 = 헤더 + 프레임 수 × 프레임 크기이므로 남는 바이트 예산으로 프레임 수를 정확히 계산)
+    max_frames = (max_size - WAV_HEADER_BYTES) // merged.frame_width
+    if max_frames <= 0:
+        raise AudioProcessingError(413, "생성된 오디오가 너무 큽니다. 업로드할 파일 크기를 줄여주세요.")
+    trimmed = merged.get_sample_slice(0, max_frames)
+    return 'merged.wav', _export(trimmed, 'wav'), 'audio/wav'
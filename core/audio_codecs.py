@@ -0,0 +1,117 @@
+"""
+오디오 디코딩/인코딩 (프로세스 내 처리)
+- pydub의 `from_file`/`export(format='mp3')`는 호출마다 ffmpeg 프로세스를 띄우므로,
+  가능한 경우 현재 프로세스 안에서 처리합니다.
+- WAV: 표준 라이브러리 `wave` + NumPy로 디코딩/인코딩 (pydub과 같은 샘플 표현으로 변환)
+- MP3: `miniaudio`(디코딩), `lameenc`(인코딩)가 설치되어 있으면 사용하고, 없으면 pydub(ffmpeg)로 처리
+- 오디오 처리 프로세스 풀(core/workers.py)의 워커가 이 모듈을 미리 로드해 두므로
+  일반적인 클론 요청은 새 프로세스를 띄우지 않습니다.
+"""
+
+import wave
+from io import BytesIO
+
+import numpy as np
+from pydub import AudioSegment
+
+try:
+    import lameenc
+except ImportError:  # 선택 의존성: 없으면 ffmpeg로 인코딩
+    lameenc = None
+
+try:
+    import miniaudio
+except ImportError:  # 선택 의존성: 없으면 ffmpeg로 디코딩
+    miniaudio = None
+
+MP3_ENCODER_QUALITY = 3  # LAME 품질 (0: 최고/느림 ~ 9: 최저/빠름), ffmpeg 기본 인코딩과 같은 LAME 기본값
+
+
+def _pcm24_to_pydub32(raw: bytes) -> bytes:
+    """24bit PCM을 pydub과 같은 방식으로 32bit로 변환 (값을 8bit 올리고 하위 바이트는 부호로 채움)"""
+    b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+    out = np.empty((b.shape[0], 4), dtype=np.uint8)
+    out[:, 0] = np.where(b[:, 2] > 0x7F, 0xFF, 0x00)
+    out[:, 1:] = b
+    return out.tobytes()
+
+
+def decode_wav(data: bytes) -> AudioSegment:
+    """WAV 바이트를 ffmpeg 없이 디코딩합니다. (PCM 이외 형식은 wave.Error)"""
+    with wave.open(BytesIO(data), 'rb') as wav:
+        channels = wav.getnchannels()
+        sample_width = wav.getsampwidth()
+        frame_rate = wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+
+    if sample_width == 1:
+        # WAV의 8bit는 부호 없는 값 → pydub/audioop의 부호 있는 표현으로 변환
+        raw = (np.frombuffer(raw, dtype=np.uint8).astype(np.int16) - 128).astype(np.int8).tobytes()
+    elif sample_width == 3:
+        raw = _pcm24_to_pydub32(raw)
+        sample_width = 4
+    return AudioSegment(data=raw, sample_width=sample_width, frame_rate=frame_rate, channels=channels)
+
+
+def decode_mp3(data: bytes) -> AudioSegment:
+    """MP3 바이트를 16bit PCM으로 디코딩합니다. (miniaudio가 없으면 ffmpeg 사용)"""
+    if miniaudio is None:
+        return AudioSegment.from_file(BytesIO(data), format='mp3')
+    # decode()는 44.1kHz 스테레오로 변환하므로 원본 샘플레이트/채널을 유지하는 mp3_read_s16 사용
+    decoded = miniaudio.mp3_read_s16(data)
+    return AudioSegment(
+        data=decoded.samples.tobytes(),
+        sample_width=2,
+        frame_rate=decoded.sample_rate,
+        channels=decoded.nchannels
+    )
+
+
+def decode_audio(data: bytes, fmt: str) -> AudioSegment:
+    """WAV/MP3는 프로세스 안에서, 그 외 형식이나 해석할 수 없는 WAV는 pydub(ffmpeg)로 디코딩합니다."""
+    if fmt == 'wav':
+        try:
+            return decode_wav(data)
+        except (wave.Error, EOFError):
+            # WAVE_FORMAT_EXTENSIBLE, 부동소수 등은 pydub에 맡김
+            pass
+    elif fmt == 'mp3':
+        try:
+            return decode_mp3(data)
+        except Exception:
+            if miniaudio is None:
+                raise
+    return AudioSegment.from_file(BytesIO(data), format=fmt)
+
+
+def encode_wav(audio: AudioSegment) -> bytes:
+    """AudioSegment를 WAV 바이트로 인코딩합니다. (pydub export와 같은 결과)"""
+    raw = audio.raw_data
+    if audio.sample_width == 1:
+        # 부호 있는 8bit → WAV의 부호 없는 8bit
+        raw = (np.frombuffer(raw, dtype=np.int8).astype(np.int16) + 128).astype(np.uint8).tobytes()
+    bio = BytesIO()
+    with wave.open(bio, 'wb') as wav:
+        wav.setnchannels(audio.channels)
+        wav.setsampwidth(audio.sample_width)
+        wav.setframerate(audio.frame_rate)
+        wav.writeframesraw(raw)
+    return bio.getvalue()
+
+
+def encode_mp3(audio: AudioSegment, bitrate_kbps: int) -> bytes:
+    """AudioSegment를 CBR MP3로 인코딩합니다. (lameenc가 없으면 ffmpeg 사용)"""
+    if lameenc is None:
+        bio = BytesIO()
+        audio.export(bio, format='mp3', bitrate=f"{bitrate_kbps}k")
+        return bio.getvalue()
+    pcm = audio.set_sample_width(2)
+    encoder = lameenc.Encoder()
+    encoder.set_bit_rate(bitrate_kbps)
+    encoder.set_in_sample_rate(pcm.frame_rate)
+    encoder.set_channels(pcm.channels)
+    encoder.set_quality(MP3_ENCODER_QUALITY)
+    raw = pcm.raw_data
+    if not isinstance(raw, bytes):
+        raw = bytes(raw)  # lameenc는 읽기 전용 버퍼만 받음 (병합 결과는 bytearray)
+    return bytes(encoder.encode(raw) + encoder.flush())
@@ -0,0 +1,138 @@
+"""
+음성 샘플 품질 분석
+- 업로드된 샘플마다 길이, 피크/클리핑 비율, RMS, 무음 비율, 추정 SNR을 벡터 연산으로 계산
+- 설정된 기준(core/config.py의 VOICE_* 값)을 벗어난 샘플을 Supertone 호출 전에 거부하여
+  클리핑/너무 작은 소리/대부분 무음/너무 짧은 샘플로 클로닝 비용을 쓰지 않도록 함
+- 청크 단위 에너지는 무음 감지와 같은 100ms 윈도우(core/audio.py)를 사용
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+from pydub import AudioSegment
+from pydub.utils import ratio_to_db
+
+from core.audio import (
+    AudioProcessingError, _silence_rms_cutoff, _window_energy, decode_sample, segment_to_array
+)
+from core.config import (
+    VOICE_MAX_CLIPPING_RATIO, VOICE_MAX_SILENCE_RATIO, VOICE_MIN_RMS_DBFS,
+    VOICE_MIN_SNR_DB, VOICE_MIN_SPEECH_MS
+)
+
+ANALYSIS_CHUNK_MS = 100
+SILENCE_THRESHOLD_DB = -40  # 무음 제거(detect_leading_silence)와 같은 기준
+CLIPPING_LEVEL = 0.999  # 최대 진폭 대비 이 비율 이상인 샘플을 클리핑으로 간주
+NOISE_PERCENTILE = 10  # 가장 조용한 10% 청크의 평균 에너지를 잡음으로 추정
+
+DEFAULT_THRESHOLDS = {
+    'min_speech_ms': VOICE_MIN_SPEECH_MS,
+    'max_clipping_ratio': VOICE_MAX_CLIPPING_RATIO,
+    'min_rms_dbfs': VOICE_MIN_RMS_DBFS,
+    'max_silence_ratio': VOICE_MAX_SILENCE_RATIO,
+    'min_snr_db': VOICE_MIN_SNR_DB,
+}
+
+
+def _power_db(power: float) -> Optional[float]:
+    return round(10 * np.log10(power), 2) if power > 0 else None
+
+
+def analyze_segment(seg: AudioSegment) -> dict:
+    """
+    샘플의 품질 지표를 계산합니다. (dB 값은 소리가 전혀 없으면 None)
+
+    - duration_ms / speech_ms: 전체 길이 / 무음(-40dBFS 미만)이 아닌 100ms 청크의 총 길이
+    - peak_dbfs, clipping_ratio: 최대 진폭(dBFS), 최대 진폭 근처(99.9% 이상) 샘플 비율
+    - rms_dbfs: 전체 RMS (AudioSegment.dBFS와 같은 값)
+    - silence_ratio: 무음 청크 비율
+    - snr_db: 가장 조용한 10% 청크를 잡음, 에너지가 중앙값 이상인 청크를 음성으로 본 추정 SNR
+      (잡음이 전혀 없으면 None)
+    """
+    samples = segment_to_array(seg)
+    max_amplitude = seg.max_possible_amplitude
+    report = {
+        'duration_ms': len(seg),
+        'speech_ms': 0,
+        'peak_dbfs': None,
+        'clipping_ratio': 0.0,
+        'rms_dbfs': None,
+        'silence_ratio': 1.0,
+        'snr_db': None,
+    }
+    if len(samples) == 0:
+        return report
+
+    peak = max(int(samples.max()), -int(samples.min()))
+    limit = CLIPPING_LEVEL * max_amplitude
+    clipped = np.count_nonzero(samples >= limit) + np.count_nonzero(samples <= -limit)
+    report['peak_dbfs'] = round(ratio_to_db(peak / max_amplitude), 2) if peak else None
+    report['clipping_ratio'] = round(clipped / len(samples), 6)
+
+    sums, counts = _window_energy(samples, seg, ANALYSIS_CHUNK_MS)
+    total = float(sums.sum())
+    report['rms_dbfs'] = _power_db(total / len(samples) / max_amplitude ** 2)
+
+    # 무음 판정은 detect_leading_silence와 같은 정수 RMS 기준
+    window_rms = np.floor(np.sqrt(sums.astype(np.float64) / np.maximum(counts, 1)))
+    silent = window_rms < _silence_rms_cutoff(SILENCE_THRESHOLD_DB, seg.sample_width)
+    report['speech_ms'] = int(np.count_nonzero(~silent)) * ANALYSIS_CHUNK_MS
+    report['silence_ratio'] = round(float(silent.mean()), 4)
+
+    power = sums.astype(np.float64) / np.maximum(counts, 1)
+    noise = power[power <= np.percentile(power, NOISE_PERCENTILE)].mean()
+    speech = power[power >= np.median(power)].mean()
+    if noise > 0 and speech > 0:
+        report['snr_db'] = round(float(10 * np.log10(speech / noise)), 2)
+    return report
+
+
+def check_quality(report: dict, thresholds: Optional[dict] = None) -> List[dict]:
+    """기준을 벗어난 항목을 [{'code', 'detail'}, ...]로 반환합니다. (빈 목록이면 통과)"""
+    limits = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    issues = []
+
+    def fail(code: str, detail: str) -> None:
+        issues.append({'code': code, 'detail': detail})
+
+    if report['speech_ms'] < limits['min_speech_ms']:
+        fail('too_short', f"말소리 구간이 너무 짧습니다. ({report['speech_ms'] / 1000:.1f}초, "
+                          f"최소 {limits['min_speech_ms'] / 1000:.1f}초)")
+    if report['clipping_ratio'] > limits['max_clipping_ratio']:
+        fail('clipping', f"소리가 너무 커서 찢어진(클리핑) 구간이 있습니다. "
+                         f"({report['clipping_ratio'] * 100:.2f}%)")
+    if report['rms_dbfs'] is None or report['rms_dbfs'] < limits['min_rms_dbfs']:
+        level = '무음' if report['rms_dbfs'] is None else f"{report['rms_dbfs']:.1f}dBFS"
+        fail('too_quiet', f"녹음 소리가 너무 작습니다. ({level}, 최소 {limits['min_rms_dbfs']:.0f}dBFS)")
+    if report['silence_ratio'] > limits['max_silence_ratio']:
+        fail('mostly_silence', f"무음 구간이 너무 많습니다. ({report['silence_ratio'] * 100:.0f}%)")
+    if report['snr_db'] is not None and report['snr_db'] < limits['min_snr_db']:
+        fail('noisy', f"배경 잡음이 너무 큽니다. (SNR {report['snr_db']:.1f}dB, 최소 {limits['min_snr_db']:.0f}dB)")
+    return issues
+
+
+def assess_segments(segments: List[AudioSegment], thresholds: Optional[dict] = None) -> List[dict]:
+    """샘플별 품질 지표에 통과 여부(passed)와 문제 항목(issues)을 더해 반환합니다."""
+    reports = []
+    for seg in segments:
+        report = analyze_segment(seg)
+        report['issues'] = check_quality(report, thresholds)
+        report['passed'] = not report['issues']
+        reports.append(report)
+    return reports
+
+
+def analyze_samples(samples: List[Tuple[bytes, str]], thresholds: Optional[dict] = None) -> List[dict]:
+    """(바이트, 포맷) 샘플들을 디코딩하여 품질을 평가합니다. (프로세스 풀에서 실행)"""
+    return assess_segments([decode_sample(contents, fmt) for contents, fmt in samples], thresholds)
+
+
+def raise_for_quality(reports: List[dict]) -> None:
+    """기준을 통과하지 못한 샘플이 있으면 문제 항목을 모아 AudioProcessingError(422)를 발생시킵니다."""
+    failures = [
+        f"{index}번 파일: " + ' '.join(issue['detail'] for issue in report['issues'])
+        for index, report in enumerate(reports, start=1)
+        if not report['passed']
+    ]
+    if failures:
+        raise AudioProcessingError(422, "음성 샘플 품질 검사를 통과하지 못했습니다. " + ' / '.join(failures))
@@ -0,0 +1,156 @@
+"""
+슬라이드 대본 처리 결과 캐시 (콘텐츠 주소 기반)
+- 대본 원문(앞뒤 공백 제거), 청크화 설정, ScriptProcessor.PROCESSOR_VERSION을 정규화한 JSON의 SHA-256을 키로
+  process_slide_script 결과를 보관
+  (문장 안의 공백/줄바꿈은 청크 텍스트에 그대로 남으므로 키 정규화는 결과가 같은 범위로 제한)
+- 메모리 LRU(SCRIPT_CHUNK_CACHE_SIZE 항목)와 선택적 영구 계층(chunk_cache 테이블, SCRIPT_CHUNK_CACHE_PERSIST)
+- 이미 같은 청크로 저장된 슬라이드의 재업로드는 재청크화 없이 모든 청크를 그대로 유지하는 결과로 바로 반환
+- 프로세스 단위 적중/미스/제거 횟수 제공
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from core.config import SCRIPT_CHUNK_CACHE_PERSIST, SCRIPT_CHUNK_CACHE_PERSIST_MAX, SCRIPT_CHUNK_CACHE_SIZE
+from core.database import chunk_cache_table, write_tables
+from core.script_processor import ChunkStrategy, ScriptProcessor
+
+Chunks = List[Tuple[str, float, List[int]]]
+
+_lock = threading.Lock()
+_memory: "OrderedDict[str, tuple]" = OrderedDict()
+# 프로세스 단위 통계 (재시작 시 초기화)
+_stats = {'hits': 0, 'persistent_hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def cache_key(text: str, options: dict) -> str:
+    """대본과 청크화 설정(process_slide_script 인자, 생략 시 기본값)으로 `sha256:<hex>` 캐시 키를 만듭니다."""
+    canonical = json.dumps(
+        {
+            'version': ScriptProcessor.PROCESSOR_VERSION,
+            'text': text.strip(),
+            'strategy': ChunkStrategy(options.get('strategy', ChunkStrategy.CHARACTER_COUNT)).value,
+            'max_chars': int(options.get('max_chars', ScriptProcessor.DEFAULT_CHUNK_CHARS)),
+            'max_sentences': int(options.get('max_sentences', ScriptProcessor.DEFAULT_CHUNK_SENTENCES)),
+            'max_duration': float(options.get('max_duration', ScriptProcessor.DEFAULT_CHUNK_SECONDS)),
+            'balanced': bool(options.get('balanced', False))
+        },
+        sort_keys=True, ensure_ascii=False, separators=(',', ':')
+    )
+    return 'sha256:' + hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _freeze(chunks: Chunks) -> tuple:
+    return tuple((text, duration, tuple(indices)) for text, duration, indices in chunks)
+
+
+def _thaw(frozen: tuple) -> Chunks:
+    return [(text, duration, list(indices)) for text, duration, indices in frozen]
+
+
+def _remember(key: str, frozen: tuple) -> None:
+    """메모리 LRU에 넣습니다. (_lock 안에서 호출)"""
+    _memory[key] = frozen
+    _memory.move_to_end(key)
+    while len(_memory) > SCRIPT_CHUNK_CACHE_SIZE:
+        _memory.popitem(last=False)
+        _stats['evictions'] += 1
+
+
+def _get(key: str) -> Optional[Chunks]:
+    """통계를 남기지 않고 메모리 → 영구 계층 순으로 찾습니다."""
+    if SCRIPT_CHUNK_CACHE_SIZE <= 0:
+        return None
+    with _lock:
+        frozen = _memory.get(key)
+        if frozen is not None:
+            _memory.move_to_end(key)
+            return _thaw(frozen)
+        if not SCRIPT_CHUNK_CACHE_PERSIST:
+            return None
+        entry = chunk_cache_table.get(lambda doc: doc.get('cache_key') == key)
+        if entry is None:
+            return None
+        frozen = _freeze(entry['chunks'])
+        _remember(key, frozen)
+        _stats['persistent_hits'] += 1
+        return _thaw(frozen)
+
+
+def get(text: str, options: dict) -> Optional[Chunks]:
+    """캐시된 process_slide_script 결과를 반환합니다. 없으면 None."""
+    chunks = _get(cache_key(text, options))
+    _stats['hits' if chunks is not None else 'misses'] += 1
+    return chunks
+
+
+def lookup_rechunk(
+    text: str,
+    previous_chunks: List[str],
+    options: dict
+) -> Optional[List[Tuple[str, float, List[int], Optional[int]]]]:
+    """
+    rechunk_slide_script 결과를 캐시로 만들 수 있으면 반환합니다.
+    - 기존 청크가 없으면 캐시된 결과 그대로 (모두 새 청크)
+    - 기존 청크가 캐시된 결과와 같으면 (같은 대본 재업로드) 모든 청크를 그대로 유지
+    그 밖에는 재청크화가 필요하므로 None (미스로 집계)
+    """
+    chunks = _get(cache_key(text, options))
+    result = None
+    if chunks is not None:
+        if not previous_chunks:
+            result = [chunk + (None,) for chunk in chunks]
+        elif [chunk_text for chunk_text, _, _ in chunks] == list(previous_chunks):
+            result = [chunk + (index,) for index, chunk in enumerate(chunks)]
+    _stats['hits' if result is not None else 'misses'] += 1
+    return result
+
+
+def put_many(items: Iterable[Tuple[str, Chunks]], options: dict) -> None:
+    """(대본, process_slide_script 결과) 목록을 캐시에 넣습니다. 영구 계층에는 한 번의 저장소 쓰기로 기록합니다."""
+    if SCRIPT_CHUNK_CACHE_SIZE <= 0:
+        return
+    rows = {}
+    with _lock:
+        for text, chunks in items:
+            key = cache_key(text, options)
+            frozen = _freeze(chunks)
+            _remember(key, frozen)
+            rows[key] = {
+                'cache_key': key,
+                'chunks': [[chunk_text, duration, list(indices)] for chunk_text, duration, indices in frozen],
+                'created_at': datetime.utcnow().isoformat()
+            }
+        if not SCRIPT_CHUNK_CACHE_PERSIST or not rows:
+            return
+        # 상한을 넘으면 가장 먼저 저장된 항목부터 제거 (같은 키는 새 결과로 교체)
+        kept = sorted((doc for doc in chunk_cache_table.all() if doc['cache_key'] not in rows), key=lambda doc: doc.doc_id)
+        new_rows = list(rows.values())[-SCRIPT_CHUNK_CACHE_PERSIST_MAX:]
+        overflow = max(len(kept) + len(new_rows) - SCRIPT_CHUNK_CACHE_PERSIST_MAX, 0)
+        removed = set(rows) | {doc['cache_key'] for doc in kept[:overflow]}
+        write_tables(
+            inserts={chunk_cache_table: new_rows},
+            removes={chunk_cache_table: lambda doc: doc.get('cache_key') in removed}
+        )
+
+
+def clear() -> None:
+    """메모리 계층을 비웁니다. (영구 계층은 유지)"""
+    with _lock:
+        _memory.clear()
+
+
+def cache_stats() -> dict:
+    """적중(메모리/영구 계층)/미스/제거 횟수, 적중률과 현재 항목 수를 반환합니다."""
+    lookups = _stats['hits'] + _stats['misses']
+    return {
+        **_stats,
+        'hit_rate': round(_stats['hits'] / lookups, 4) if lookups else 0.0,
+        'entries': len(_memory),
+        'max_entries': SCRIPT_CHUNK_CACHE_SIZE,
+        'persistent_entries': len(chunk_cache_table) if SCRIPT_CHUNK_CACHE_PERSIST else 0
+    }
@@ -19,3 +19,96 @@ S3_REGION = os.getenv('S3_REGION', 'ap-northeast-2')
 
 # Supertone API key (optional) - set in environment when using voice cloning
 SUPERTONE_API_KEY = os.getenv('SUPERTONE_API_KEY', '')
+
+# [Supertone API 호출 설정]
+# - SUPERTONE_BASE_URL: Supertone API 주소 (테스트 시 로컬 대역 서버로 변경 가능)
+# - SUPERTONE_CONNECT_TIMEOUT: 연결 수립 제한 시간(초)
+# - SUPERTONE_TIMEOUT: 응답 대기(읽기/쓰기) 제한 시간(초)
+SUPERTONE_BASE_URL = os.getenv('SUPERTONE_BASE_URL', 'https://supertoneapi.com').rstrip('/')
+SUPERTONE_CONNECT_TIMEOUT = float(os.getenv('SUPERTONE_CONNECT_TIMEOUT', '5'))
+SUPERTONE_TIMEOUT = float(os.getenv('SUPERTONE_TIMEOUT', '60'))
+
+# [Supertone 호출 안정화 설정]
+# - SUPERTONE_RETRY_ATTEMPTS: TTS 요청의 최대 시도 횟수 (클로닝은 연결 실패일 때만 재시도)
+# - SUPERTONE_RETRY_BASE_DELAY / SUPERTONE_RETRY_MAX_DELAY: 재시도 대기(지수 백오프 + jitter)의 기준/상한(초)
+# - SUPERTONE_BREAKER_THRESHOLD: 서킷을 여는 연속 실패 횟수
+# - SUPERTONE_BREAKER_RESET: 서킷이 열린 뒤 시험 호출까지 기다리는 시간(초)
+# - SUPERTONE_TTS_HEDGE_DELAY: TTS 응답이 이 시간(초) 안에 오지 않으면 같은 요청을 한 번 더 보냄 (0이면 사용 안 함)
+SUPERTONE_RETRY_ATTEMPTS = int(os.getenv('SUPERTONE_RETRY_ATTEMPTS', '3'))
+SUPERTONE_RETRY_BASE_DELAY = float(os.getenv('SUPERTONE_RETRY_BASE_DELAY', '0.2'))
+SUPERTONE_RETRY_MAX_DELAY = float(os.getenv('SUPERTONE_RETRY_MAX_DELAY', '2'))
+SUPERTONE_BREAKER_THRESHOLD = int(os.getenv('SUPERTONE_BREAKER_THRESHOLD', '5'))
+SUPERTONE_BREAKER_RESET = float(os.getenv('SUPERTONE_BREAKER_RESET', '30'))
+SUPERTONE_TTS_HEDGE_DELAY = float(os.getenv('SUPERTONE_TTS_HEDGE_DELAY', '0'))
+
+# [외부 HTTP 연결 풀 설정]
+# - HTTP_MAX_CONNECTIONS: 동시에 열 수 있는 최대 연결 수
+# - HTTP_MAX_KEEPALIVE: 재사용을 위해 유지하는 유휴 연결 수
+# - HTTP_KEEPALIVE_EXPIRY: 유휴 연결 유지 시간(초)
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '20'))
+HTTP_MAX_KEEPALIVE = int(os.getenv('HTTP_MAX_KEEPALIVE', '10'))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '30'))
+
+# [TTS 캐시 설정]
+# - TTS_CACHE_MAX_BYTES: 캐시에 보관할 TTS 오디오 총 크기 상한 (초과 시 오래 사용되지 않은 항목부터 제거)
+TTS_CACHE_MAX_BYTES = int(os.getenv('TTS_CACHE_MAX_BYTES', str(500 * 1024 * 1024)))
+# - TTS_CACHE_USAGE_FLUSH_ENTRIES / TTS_CACHE_USAGE_FLUSH_SECONDS: 적중한 항목의 사용 시각/횟수를
+#   이 항목 수만큼 모이거나 이 시간(초)이 지나면 한 번에 저장 (종료 시와 LRU 제거 전에도 저장)
+TTS_CACHE_USAGE_FLUSH_ENTRIES = int(os.getenv('TTS_CACHE_USAGE_FLUSH_ENTRIES', '64'))
+TTS_CACHE_USAGE_FLUSH_SECONDS = float(os.getenv('TTS_CACHE_USAGE_FLUSH_SECONDS', '30'))
+
+# [대본 일괄 TTS 설정]
+# - SCRIPT_TTS_CONCURRENCY: 대본 한 개를 합성할 때 동시에 보내는 Supertone TTS 요청 수
+SCRIPT_TTS_CONCURRENCY = int(os.getenv('SCRIPT_TTS_CONCURRENCY', '4'))
+# - SCRIPT_TTS_FLUSH_SENTENCES / SCRIPT_TTS_FLUSH_SECONDS: 합성이 끝난 문장의 오디오 정보와 진행 상황을
+#   이 문장 수마다 또는 이 시간(초)마다 한 번에 저장 (문장마다 DB 파일 전체를 다시 쓰지 않도록)
+SCRIPT_TTS_FLUSH_SENTENCES = int(os.getenv('SCRIPT_TTS_FLUSH_SENTENCES', '20'))
+SCRIPT_TTS_FLUSH_SECONDS = float(os.getenv('SCRIPT_TTS_FLUSH_SECONDS', '2.0'))
+
+# [대본 일괄 업로드 설정]
+# - SCRIPT_BATCH_MAX_SLIDES: 한 번에 업로드할 수 있는 최대 슬라이드 수
+# - SCRIPT_BATCH_PARALLEL_MIN_CHARS: 대본 전체 길이가 이 이상이면 슬라이드 처리를 프로세스 풀(AUDIO_WORKERS)에 나눠 실행
+SCRIPT_BATCH_MAX_SLIDES = int(os.getenv('SCRIPT_BATCH_MAX_SLIDES', '500'))
+SCRIPT_BATCH_PARALLEL_MIN_CHARS = int(os.getenv('SCRIPT_BATCH_PARALLEL_MIN_CHARS', '100000'))
+# - SCRIPT_CHUNK_CACHE_SIZE: 슬라이드 대본 처리 결과 캐시(메모리 LRU)의 최대 항목 수 (0이면 캐시 사용 안 함)
+# - SCRIPT_CHUNK_CACHE_PERSIST: 메모리에서 밀려난 결과도 DB(chunk_cache 테이블)에 보관하여 재시작 후에도 재사용
+# - SCRIPT_CHUNK_CACHE_PERSIST_MAX: DB에 보관할 최대 항목 수 (초과 시 오래된 항목부터 제거)
+SCRIPT_CHUNK_CACHE_SIZE = int(os.getenv('SCRIPT_CHUNK_CACHE_SIZE', '2048'))
+SCRIPT_CHUNK_CACHE_PERSIST = os.getenv('SCRIPT_CHUNK_CACHE_PERSIST', 'false').lower() in ('1', 'true', 'yes')
+SCRIPT_CHUNK_CACHE_PERSIST_MAX = int(os.getenv('SCRIPT_CHUNK_CACHE_PERSIST_MAX', '20000'))
+# - SPEAKING_RATE_MIN_OBSERVATIONS: 사용자별 발화 속도를 예상 읽기 시간에 반영하기 시작하는 연습 기록 수
+SPEAKING_RATE_MIN_OBSERVATIONS = int(os.getenv('SPEAKING_RATE_MIN_OBSERVATIONS', '3'))
+# - SCRIPT_STREAM_BATCH_CHUNKS: 스트리밍 업로드에서 문장(청크)을 이 개수만큼 모아 한 번에 저장
+SCRIPT_STREAM_BATCH_CHUNKS = int(os.getenv('SCRIPT_STREAM_BATCH_CHUNKS', '200'))
+# - SCRIPT_IMPORT_MAX_BYTES: 발표 자료(PPTX/텍스트) 가져오기 파일의 최대 크기
+SCRIPT_IMPORT_MAX_BYTES = int(os.getenv('SCRIPT_IMPORT_MAX_BYTES', str(100 * 1024 * 1024)))
+
+# [오디오 처리 워커 설정]
+# - AUDIO_WORKERS: 오디오 전처리(디코딩/무음 제거/인코딩)를 실행할 프로세스 수 (0이면 스레드에서 실행)
+# - AUDIO_MAX_CONCURRENCY: 동시에 처리할 수 있는 오디오 작업 수 (초과 요청은 대기)
+AUDIO_WORKERS = int(os.getenv('AUDIO_WORKERS', str(min(4, os.cpu_count() or 1))))
+AUDIO_MAX_CONCURRENCY = int(os.getenv('AUDIO_MAX_CONCURRENCY', str(max(AUDIO_WORKERS, 1) * 2)))
+
+# [보이스 클로닝 입력 볼륨 보정]
+# - CLONE_LOUDNESS_MODE: 'rms'(전체 구간 dBFS 기준) 또는 'gated'(무음/작은 소리 구간을 제외한 게이팅 라우드니스 기준)
+CLONE_LOUDNESS_MODE = os.getenv('CLONE_LOUDNESS_MODE', 'rms')
+
+# [보이스 클로닝 샘플 품질 기준] (Supertone 호출 전에 기준 미달 샘플을 422로 거부)
+# - VOICE_QUALITY_GATE: 품질 검사 사용 여부
+# - VOICE_MIN_SPEECH_MS: 파일별 최소 말소리 길이(ms, -40dBFS 이상인 구간)
+# - VOICE_MAX_CLIPPING_RATIO: 최대 진폭 근처 샘플의 허용 비율
+# - VOICE_MIN_RMS_DBFS: 최소 평균 음량 (볼륨 보정 최대 +20dB를 적용해도 너무 작은 녹음 거부)
+# - VOICE_MAX_SILENCE_RATIO: 무음 구간의 허용 비율
+# - VOICE_MIN_SNR_DB: 최소 추정 신호 대 잡음비
+VOICE_QUALITY_GATE = os.getenv('VOICE_QUALITY_GATE', 'true').lower() in ('1', 'true', 'yes')
+VOICE_MIN_SPEECH_MS = int(os.getenv('VOICE_MIN_SPEECH_MS', '1000'))
+VOICE_MAX_CLIPPING_RATIO = float(os.getenv('VOICE_MAX_CLIPPING_RATIO', '0.001'))
+VOICE_MIN_RMS_DBFS = float(os.getenv('VOICE_MIN_RMS_DBFS', '-45'))
+VOICE_MAX_SILENCE_RATIO = float(os.getenv('VOICE_MAX_SILENCE_RATIO', '0.7'))
+VOICE_MIN_SNR_DB = float(os.getenv('VOICE_MIN_SNR_DB', '10'))
+
+# [비동기 작업 큐 설정]
+# - JOB_WORKERS: 동시에 실행할 백그라운드 작업 수
+# - JOB_QUEUE_SIZE: 대기할 수 있는 최대 작업 수 (초과 시 503)
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+JOB_QUEUE_SIZE = int(os.getenv('JOB_QUEUE_SIZE', '100'))
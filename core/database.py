@@ -1,17 +1,118 @@
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
 from tinydb import TinyDB, Query
+from tinydb.table import Table
+
+# 저장소 전체에 대한 잠금
+# TinyDB는 스레드 안전하지 않고(JSONStorage는 파일 핸들 하나를 공유) 작업마다 파일 전체를 읽고 다시 쓰므로,
+# 이벤트 루프와 asyncio.to_thread 작업자 스레드가 동시에 접근하면 서로의 쓰기를 덮어쓸 수 있음.
+# 테이블 작업과 write_tables는 모두 이 잠금 안에서 실행됨 (재진입 가능)
+db_lock = threading.RLock()
+
+_LOCKED_TABLE_METHODS = (
+    'insert', 'insert_multiple', 'update', 'update_multiple', 'upsert', 'remove', 'truncate',
+    'all', 'search', 'get', 'contains', 'count', '__len__'
+)
+
+
+def _locked(method):
+    def wrapper(self, *args, **kwargs):
+        with db_lock:
+            return method(self, *args, **kwargs)
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+class LockedTable(Table):
+    """모든 읽기/쓰기를 db_lock 안에서 실행하는 테이블"""
+
+    def __iter__(self):
+        with db_lock:
+            return iter(list(super().__iter__()))
+
+    def reload(self) -> None:
+        """
+        write_tables처럼 저장소에 직접 쓴 뒤, 쿼리 캐시와 다음 문서 ID를 저장소 기준으로 다시 계산하도록 초기화합니다.
+        TinyDB(4.x)에는 다음 문서 ID를 다시 읽게 하는 공개 API가 없어 내부 속성 `_next_id`에 의존하며,
+        이 의존은 이 메서드 한 곳에만 둡니다. (None이면 다음 insert에서 저장소의 마지막 ID로 다시 계산)
+        """
+        self.clear_cache()
+        self._next_id = None
+
+
+for _name in _LOCKED_TABLE_METHODS:
+    setattr(LockedTable, _name, _locked(getattr(Table, _name)))
+
+
+class LockedTinyDB(TinyDB):
+    table_class = LockedTable
+
 
 # TinyDB 데이터베이스 연결 및 테이블 선언
 # 모든 유저 관련 정보는 이 파일에서 객체를 통해 접근
-DB_PATH = 'db.json'
-db = TinyDB(DB_PATH)
+DB_PATH = os.getenv('DB_PATH', 'db.json')
+db = LockedTinyDB(DB_PATH)
 users_table = db.table('users')
 blacklist_table = db.table('token_blacklist')
 s3_table = db.table('s3_files')
+s3_blobs_table = db.table('s3_blobs')  # 콘텐츠 해시 기반 실제 S3 객체 (참조 카운트)
 
 # 발표 대본 관련 테이블
 scripts_table = db.table('scripts')  # 발표 대본 메타데이터
 slides_table = db.table('slides')  # 슬라이드 정보
 sentences_table = db.table('sentences')  # 청크화된 문장
 practice_scores_table = db.table('practice_scores')  # 연습 점수
+speaking_rates_table = db.table('speaking_rates')  # 사용자별 발화 속도 모델 (연습 소요 시간으로 학습)
+
+# 보이스 클로닝 관련 테이블
+voice_uploads_table = db.table('voice_uploads')  # presigned 직접 업로드 세션
+
+# 비동기 작업(보이스 클로닝 등) 상태
+jobs_table = db.table('jobs')
+# TTS 결과 캐시 (입력 해시 → 콘텐츠 주소 blob)
+tts_cache_table = db.table('tts_cache')
+# 슬라이드 대본 처리 결과 캐시의 영구 계층 (대본/청크화 설정 해시 → 청크 목록)
+chunk_cache_table = db.table('chunk_cache')
 
 UserQuery = Query()
+
+
+def write_tables(
+    inserts: Optional[Dict[Table, List[dict]]] = None,
+    removes: Optional[Dict[Table, Callable[[dict], bool]]] = None,
+    updates: Optional[Dict[Table, Callable[[dict], Optional[dict]]]] = None
+) -> None:
+    """
+    여러 테이블의 삭제/수정/추가를 저장소 읽기 1회, 쓰기 1회로 반영합니다.
+    (TinyDB는 insert/update/remove마다 파일 전체를 다시 쓰므로, 함께 바뀌어야 하는 데이터를 중간 상태 없이 저장할 때 사용)
+
+    - removes: {테이블: 문서를 받아 삭제 여부를 반환하는 함수}
+    - updates: {테이블: 문서를 받아 덮어쓸 필드(수정하지 않으면 None)를 반환하는 함수}
+    - inserts: {테이블: [문서, ...]} (문서 ID는 테이블의 마지막 ID 다음부터)
+    적용 순서는 삭제 → 수정 → 추가이며, 같은 단계 안에서는 전달한 dict의 테이블 순서대로 처리합니다.
+    """
+    inserts = inserts or {}
+    removes = removes or {}
+    updates = updates or {}
+    with db_lock:
+        data = db.storage.read() or {}
+        for table, should_remove in removes.items():
+            docs = data.get(table.name, {})
+            data[table.name] = {doc_id: doc for doc_id, doc in docs.items() if not should_remove(doc)}
+        for table, fields_for in updates.items():
+            for doc in data.get(table.name, {}).values():
+                fields = fields_for(doc)
+                if fields:
+                    doc.update(fields)
+        for table, rows in inserts.items():
+            docs = data.setdefault(table.name, {})
+            next_id = max(map(int, docs), default=0) + 1
+            for offset, row in enumerate(rows):
+                docs[str(next_id + offset)] = dict(row)
+        db.storage.write(data)
+
+        for table in set(inserts) | set(removes) | set(updates):
+            table.reload()
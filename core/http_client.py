@@ -0,0 +1,84 @@
+"""
+외부 API 호출용 공용 비동기 HTTP 클라이언트
+- 하나의 httpx.AsyncClient를 앱 전체에서 공유하여 TCP/TLS 연결을 재사용(keep-alive)합니다.
+- h2 패키지가 설치되어 있으면 HTTP/2를 사용합니다. (없으면 HTTP/1.1)
+- 클라이언트는 앱 lifespan(main.py)에서 생성/종료하며, 생성 전 호출되면 지연 생성합니다.
+- 클라이언트 생성에 드는 블로킹 작업(전송 계층 import, CA 인증서 로드)은 이벤트 루프 밖에서 한 번만 수행합니다.
+"""
+
+import asyncio
+import importlib.util
+import ssl
+from typing import Optional
+
+import httpcore  # noqa: F401 - httpx가 첫 클라이언트 생성 시 import하는 전송 계층을 미리 로드 (요청 중 루프 정지 방지)
+import httpx
+
+from core.config import (
+    SUPERTONE_CONNECT_TIMEOUT, SUPERTONE_TIMEOUT,
+    HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE, HTTP_KEEPALIVE_EXPIRY
+)
+
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_ssl_context: Optional[ssl.SSLContext] = None
+
+
+def default_timeout() -> httpx.Timeout:
+    """기본 제한 시간 (개별 호출에서 timeout 인자로 덮어쓸 수 있음)"""
+    return httpx.Timeout(SUPERTONE_TIMEOUT, connect=SUPERTONE_CONNECT_TIMEOUT)
+
+
+def _get_ssl_context() -> ssl.SSLContext:
+    """
+    CA 번들을 읽어 만든 SSL 컨텍스트 (프로세스당 한 번 생성, 약 100ms의 블로킹 파일 읽기/파싱)
+    클라이언트를 다시 만들 때도 재사용하며, 앱 시작 시 start_http_client가 스레드에서 미리 만듭니다.
+    """
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = httpx.create_ssl_context()
+    return _ssl_context
+
+
+def _create_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        verify=_get_ssl_context(),
+        http2=HTTP2_AVAILABLE,
+        timeout=default_timeout(),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        )
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    공용 AsyncClient를 반환합니다. (이벤트 루프 안에서 호출)
+    연결은 생성된 이벤트 루프에 묶이므로, 다른 루프에서 호출되면 새 클라이언트를 만듭니다.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = _create_client()
+        _client_loop = loop
+    return _client
+
+
+async def start_http_client() -> None:
+    """앱 시작 시 공용 클라이언트를 생성합니다. (SSL 컨텍스트는 스레드에서 생성하여 루프를 막지 않음)"""
+    await asyncio.to_thread(_get_ssl_context)
+    get_http_client()
+
+
+async def close_http_client() -> None:
+    """앱 종료 시 공용 클라이언트의 연결을 모두 닫습니다."""
+    global _client, _client_loop
+    client = _client
+    _client = None
+    _client_loop = None
+    if client is not None and not client.is_closed:
+        await client.aclose()
@@ -0,0 +1,198 @@
+"""
+비동기 작업(Job) 큐
+- 오래 걸리는 작업(보이스 클로닝 등)을 요청과 분리하여 백그라운드 워커에서 실행합니다.
+- API는 입력을 검증한 뒤 작업을 등록하고 즉시 job_id를 반환하며(202),
+  클라이언트는 상태 조회 또는 SSE 이벤트 스트림으로 진행 상황과 결과를 받습니다.
+- 작업 상태는 `jobs` 테이블에 저장되며, 동시에 실행되는 작업 수는 JOB_WORKERS로 제한합니다.
+- 같은 사용자의 같은 Idempotency-Key 요청은 새 작업을 만들지 않고 기존 작업을 반환합니다.
+- 작업 입력(업로드 바이트 등)은 메모리에만 보관하므로, 서버 재시작 시 끝나지 않은 작업은 실패 처리합니다.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from fastapi import HTTPException
+from tinydb import Query as TinyQuery
+
+from core.config import JOB_WORKERS, JOB_QUEUE_SIZE
+from core.database import jobs_table
+
+# 작업 상태
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+FINISHED_STATUSES = (JOB_COMPLETED, JOB_FAILED)
+
+# handler(set_stage, *args) -> 결과 dict
+JobHandler = Callable[..., Awaitable[dict]]
+
+_queue: Optional[asyncio.Queue] = None
+_workers: List[asyncio.Task] = []
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_listeners: Dict[str, Set[asyncio.Queue]] = {}
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + 'Z'
+
+
+class JobQueueFullError(Exception):
+    """대기 중인 작업이 JOB_QUEUE_SIZE를 초과함"""
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    return jobs_table.get(TinyQuery().job_id == job_id)
+
+
+def _update_job(job_id: str, **fields: Any) -> dict:
+    """작업 레코드를 갱신하고 구독 중인 이벤트 스트림에 새 상태를 전달합니다."""
+    fields['updated_at'] = _now()
+    jobs_table.update(fields, TinyQuery().job_id == job_id)
+    job = get_job(job_id)
+    for listener in _listeners.get(job_id, ()):
+        listener.put_nowait(job)
+    return job
+
+
+async def _run_job(job_id: str, handler: JobHandler, args: tuple) -> None:
+    _update_job(job_id, status=JOB_RUNNING, started_at=_now())
+
+    def set_stage(stage: str) -> None:
+        _update_job(job_id, stage=stage)
+
+    try:
+        result = await handler(set_stage, *args)
+    except HTTPException as e:
+        _update_job(job_id, status=JOB_FAILED, error={'status_code': e.status_code, 'detail': e.detail},
+                    finished_at=_now())
+    except Exception as e:
+        _update_job(job_id, status=JOB_FAILED, error={'status_code': 500, 'detail': f"작업 처리 중 오류: {e}"},
+                    finished_at=_now())
+    else:
+        _update_job(job_id, status=JOB_COMPLETED, stage=None, result=result, finished_at=_now())
+
+
+async def _worker(queue: asyncio.Queue) -> None:
+    while True:
+        job_id, handler, args = await queue.get()
+        try:
+            await _run_job(job_id, handler, args)
+        finally:
+            queue.task_done()
+
+
+def fail_interrupted_jobs() -> int:
+    """재시작 전에 끝나지 않은(queued/running) 작업을 실패 처리하고 개수를 반환합니다."""
+    Q = TinyQuery()
+    interrupted = jobs_table.search(Q.status.one_of([JOB_QUEUED, JOB_RUNNING]))
+    for job in interrupted:
+        _update_job(
+            job['job_id'], status=JOB_FAILED, finished_at=_now(),
+            error={'status_code': 503, 'detail': "서버 재시작으로 작업이 중단되었습니다. 다시 요청해 주세요."}
+        )
+    return len(interrupted)
+
+
+def _ensure_workers() -> asyncio.Queue:
+    """현재 이벤트 루프에서 작업 큐와 워커를 준비합니다. (lifespan 전 호출 시 지연 생성)"""
+    global _queue, _loop
+    loop = asyncio.get_running_loop()
+    if _queue is None or _loop is not loop:
+        _queue = asyncio.Queue(maxsize=JOB_QUEUE_SIZE)
+        _loop = loop
+        _workers.clear()
+        _workers.extend(loop.create_task(_worker(_queue)) for _ in range(max(JOB_WORKERS, 1)))
+    return _queue
+
+
+async def start_job_workers() -> None:
+    """앱 시작 시 중단된 작업을 정리하고 워커를 시작합니다."""
+    fail_interrupted_jobs()
+    _ensure_workers()
+
+
+async def stop_job_workers() -> None:
+    """앱 종료 시 워커를 중지합니다. 실행 중이던 작업은 다음 시작 시 실패 처리됩니다."""
+    global _queue, _loop
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _queue = None
+    _loop = None
+
+
+def enqueue_job(
+    kind: str,
+    user_id: str,
+    handler: JobHandler,
+    *args: Any,
+    idempotency_key: Optional[str] = None,
+    meta: Optional[dict] = None
+) -> dict:
+    """
+    작업을 등록하고 작업 레코드를 반환합니다. (이벤트 루프 안에서 호출)
+    `meta`는 조회 시 권한/대상 확인용으로 작업 레코드에 함께 저장됩니다. (예: script_id)
+    같은 사용자/종류/Idempotency-Key의 작업이 이미 있으면 새로 등록하지 않고 기존 레코드를 반환합니다.
+    대기열이 가득 차면 JobQueueFullError를 발생시킵니다.
+    """
+    Q = TinyQuery()
+    if idempotency_key:
+        existing = jobs_table.get(
+            (Q.user_id == user_id) & (Q.kind == kind) & (Q.idempotency_key == idempotency_key)
+        )
+        if existing:
+            return existing
+
+    queue = _ensure_workers()
+    if queue.full():
+        raise JobQueueFullError()
+
+    now = _now()
+    job = {
+        'job_id': str(uuid.uuid4()),
+        'kind': kind,
+        'user_id': user_id,
+        'status': JOB_QUEUED,
+        'stage': None,
+        'idempotency_key': idempotency_key,
+        'meta': meta or {},
+        'result': None,
+        'error': None,
+        'created_at': now,
+        'updated_at': now
+    }
+    jobs_table.insert(job)
+    queue.put_nowait((job['job_id'], handler, args))
+    return job
+
+
+async def watch_job(job_id: str, keepalive: float = 15.0):
+    """
+    작업 상태가 바뀔 때마다 작업 레코드를 내보내는 비동기 제너레이터입니다.
+    현재 상태를 먼저 내보내고, 완료/실패 상태가 되면 종료합니다.
+    변경이 없는 동안에는 keepalive 초마다 None을 내보냅니다. (SSE 연결 유지용)
+    """
+    listener: asyncio.Queue = asyncio.Queue()
+    _listeners.setdefault(job_id, set()).add(listener)
+    try:
+        job = get_job(job_id)
+        if job is None:
+            return
+        yield job
+        while job['status'] not in FINISHED_STATUSES:
+            try:
+                job = await asyncio.wait_for(listener.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            yield job
+    finally:
+        listeners = _listeners.get(job_id)
+        if listeners is not None:
+            listeners.discard(listener)
+            if not listeners:
+                _listeners.pop(job_id, None)
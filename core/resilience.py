@@ -0,0 +1,178 @@
+"""
+외부 API 호출 안정화 도구
+- 재시도: 지수 백오프 + full jitter (재시도해도 안전한 실패에만 적용)
+- 서킷 브레이커: 연속 실패가 기준을 넘으면 일정 시간 동안 호출하지 않고 즉시 실패 (CircuitOpenError)
+  대기 시간이 지나면 한 번의 시험 호출(half-open)로 회복 여부를 확인
+- 요청 헤징: 첫 요청이 hedge_delay 안에 끝나지 않으면 같은 요청을 하나 더 보내 먼저 끝난 결과를 사용
+- 호출 이름별 결과(성공/실패/재시도/차단/헤징) 카운터
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+# 호출 이름별 결과 카운터 (프로세스 단위, 재시작 시 초기화)
+_metrics: Dict[str, Dict[str, int]] = {}
+METRIC_NAMES = ('calls', 'successes', 'failures', 'retries', 'short_circuited', 'hedged', 'hedge_wins')
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 호출하지 않음 (retry_after: 다음 시험 호출까지 남은 초)"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(name, retry_after)
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 서킷 브레이커 (이벤트 루프 한 곳에서 사용)"""
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def before_call(self) -> None:
+        """호출 가능 여부를 확인합니다. 열려 있으면 CircuitOpenError."""
+        if self.state == CIRCUIT_OPEN:
+            remaining = self._opened_at + self.reset_timeout - self._clock()
+            if remaining > 0:
+                raise CircuitOpenError(self.name, remaining)
+            self.state = CIRCUIT_HALF_OPEN
+        if self.state == CIRCUIT_HALF_OPEN:
+            # 시험 호출은 한 번에 하나만 (나머지는 결과가 나올 때까지 차단)
+            if self._probe_in_flight:
+                raise CircuitOpenError(self.name, self.reset_timeout)
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == CIRCUIT_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = CIRCUIT_OPEN
+            self._opened_at = self._clock()
+
+    def release(self) -> None:
+        """결과를 판단할 수 없는 종료(요청 오류, 취소)에서 시험 호출 자리를 반납합니다."""
+        self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        return {'state': self.state, 'consecutive_failures': self.consecutive_failures}
+
+
+def backoff_delay(retry: int, base_delay: float, max_delay: float) -> float:
+    """retry번째(0부터) 재시도 전 대기 시간: [0, min(max_delay, base_delay × 2^retry)] 구간의 균등 난수"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** retry)))
+
+
+def _count(name: str, metric: str) -> None:
+    counters = _metrics.setdefault(name, dict.fromkeys(METRIC_NAMES, 0))
+    counters[metric] += 1
+
+
+def resilience_metrics() -> Dict[str, Dict[str, int]]:
+    return {name: dict(counters) for name, counters in _metrics.items()}
+
+
+def reset_metrics() -> None:
+    _metrics.clear()
+
+
+async def hedged(name: str, call: Callable[[], Awaitable[Any]], hedge_delay: float) -> Any:
+    """
+    call()을 실행하고, hedge_delay초 안에 끝나지 않으면 한 번 더 실행하여 먼저 성공한 결과를 반환합니다.
+    한쪽이 실패하면 다른 쪽의 결과를 기다리며, 둘 다 실패하면 먼저 실패한 쪽의 예외를 전달합니다.
+    남은 요청은 취소합니다.
+    """
+    first = asyncio.ensure_future(call())
+    pending = {first}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+        if done:
+            return first.result()
+
+        _count(name, 'hedged')
+        second = asyncio.ensure_future(call())
+        pending.add(second)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        _count(name, 'hedge_wins')
+                    return task.result()
+                error = error or task.exception()
+        raise error
+    finally:
+        # 호출자가 취소되었거나 한쪽이 먼저 끝난 경우 남은 요청 취소
+        for task in pending:
+            task.cancel()
+
+
+async def call_with_resilience(
+    name: str,
+    call: Callable[[], Awaitable[Any]],
+    breaker: CircuitBreaker,
+    *,
+    attempts: int = 1,
+    is_retryable: Callable[[BaseException], bool] = lambda e: False,
+    is_failure: Callable[[BaseException], bool] = lambda e: True,
+    base_delay: float = 0.2,
+    max_delay: float = 2.0,
+    hedge_delay: Optional[float] = None
+) -> Any:
+    """
+    서킷 브레이커를 거쳐 call()을 실행합니다.
+
+    - is_failure(e)가 True인 예외(업스트림 장애)만 브레이커의 실패로 기록합니다.
+    - is_retryable(e)가 True이면 backoff_delay만큼 쉬고 최대 attempts회까지 다시 시도합니다.
+    - hedge_delay가 주어지면 각 시도를 hedged()로 실행합니다.
+    - 서킷이 열려 있으면 호출하지 않고 CircuitOpenError를 발생시킵니다.
+    """
+    _count(name, 'calls')
+    for retry in range(attempts):
+        try:
+            breaker.before_call()
+        except CircuitOpenError:
+            _count(name, 'short_circuited')
+            raise
+        try:
+            if hedge_delay:
+                result = await hedged(name, call, hedge_delay)
+            else:
+                result = await call()
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as e:
+            if is_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.release()
+            if retry + 1 < attempts and is_retryable(e):
+                _count(name, 'retries')
+                await asyncio.sleep(backoff_delay(retry, base_delay, max_delay))
+                continue
+            _count(name, 'failures')
+            raise
+        breaker.record_success()
+        _count(name, 'successes')
+        return result
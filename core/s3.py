@@ -2,6 +2,18 @@ import boto3
 from botocore.exceptions import ClientError
 from core.config import AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, S3_BUCKET_NAME, S3_REGION
 
+
+# S3 클라이언트 생성 함수
+# 설정값(core.config)을 이용해 boto3 S3 클라이언트를 만들어 반환합니다.
+def get_s3_client():
+    return boto3.client(
+        's3',
+        region_name=S3_REGION,
+        aws_access_key_id=AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+    )
+
+
 # S3 Presigned URL 발급 함수
 # param object_key: presigned url을 발급받고자 하는 버킷 내의 파일 경로(파일명 포함)
 # param expiration: presigned url의 유효 시각(초). 기본 300초(5분).
@@ -13,12 +25,7 @@ def create_presigned_url(object_key: str, expiration: int = 300) -> str:
     예외 상황은 명확한 메시지로 반환합니다.
     """
     try:
-        s3_client = boto3.client(
-            's3',
-            region_name=S3_REGION,
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-        )
+        s3_client = get_s3_client()
         # boto3 generate_presigned_url 함수 사용
         url = s3_client.generate_presigned_url(
             ClientMethod='get_object',
@@ -36,3 +43,81 @@ def create_presigned_url(object_key: str, expiration: int = 300) -> str:
     except Exception as e:
         print(f"[S3 예기치 못한 오류] {e}")
         return None
+
+
+# S3 Presigned PUT URL 발급 함수
+# param object_key: 업로드될 버킷 내 파일 경로
+# param content_type: 업로드 시 반드시 일치해야 하는 Content-Type
+# param content_length: 업로드 시 반드시 일치해야 하는 Content-Length(바이트)
+# param expiration: presigned url 유효 시각(초)
+# return: "성공 시 presigned url(str) / 실패 시 None"
+def create_presigned_upload_url(
+    object_key: str,
+    content_type: str,
+    content_length: int,
+    expiration: int = 900
+) -> str:
+    """
+    클라이언트가 S3에 직접 업로드(PUT)할 수 있는 presigned url을 반환합니다.
+    Content-Type과 Content-Length가 서명에 포함되므로, 클라이언트는 발급 시 지정한
+    값과 동일한 헤더로만 업로드할 수 있습니다. (다르면 S3가 403 SignatureDoesNotMatch 반환)
+    """
+    try:
+        s3_client = get_s3_client()
+        url = s3_client.generate_presigned_url(
+            ClientMethod='put_object',
+            Params={
+                'Bucket': S3_BUCKET_NAME,
+                'Key': object_key,
+                'ContentType': content_type,
+                'ContentLength': content_length,
+            },
+            ExpiresIn=expiration
+        )
+        return url
+    except ClientError as e:
+        print(f"[S3 Presigned PUT URL 발급실패] {e}")
+        return None
+    except Exception as e:
+        print(f"[S3 예기치 못한 오류] {e}")
+        return None
+
+
+# S3 객체 읽기 함수 (크기 상한 적용)
+# param object_key: 읽을 버킷 내 파일 경로
+# param max_bytes: 허용 최대 크기(바이트). 초과 시 ValueError
+# return: (바이트 데이터, Content-Type)
+def read_object(object_key: str, max_bytes: int, chunk_size: int = 64 * 1024):
+    """
+    S3 객체를 청크 단위로 읽어 반환합니다.
+    HEAD 결과와 실제 본문 모두에서 max_bytes를 초과하면 즉시 중단하고 ValueError를 발생시킵니다.
+    S3 오류(ClientError)는 호출자에게 그대로 전달합니다.
+    """
+    s3_client = get_s3_client()
+    resp = s3_client.get_object(Bucket=S3_BUCKET_NAME, Key=object_key)
+    if resp.get('ContentLength', 0) > max_bytes:
+        resp['Body'].close()
+        raise ValueError(f"S3 객체가 허용 크기({max_bytes} bytes)를 초과합니다: {object_key}")
+
+    body = resp['Body']
+    parts = []
+    total = 0
+    try:
+        for chunk in iter(lambda: body.read(chunk_size), b''):
+            total += len(chunk)
+            if total > max_bytes:
+                raise ValueError(f"S3 객체가 허용 크기({max_bytes} bytes)를 초과합니다: {object_key}")
+            parts.append(chunk)
+    finally:
+        body.close()
+    return b''.join(parts), resp.get('ContentType')
+
+
+# S3 객체 삭제 함수 (실패해도 예외를 전파하지 않음)
+def delete_object(object_key: str) -> bool:
+    try:
+        get_s3_client().delete_object(Bucket=S3_BUCKET_NAME, Key=object_key)
+        return True
+    except Exception as e:
+        print(f"[S3 객체 삭제 실패] {object_key}: {e}")
+        return False
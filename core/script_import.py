@@ -0,0 +1,160 @@
+"""
+발표 자료 파일에서 슬라이드별 대본 추출
+- PPTX: 슬라이드 노트(ppt/notesSlides/*.xml)를 슬라이드 순서(presentation.xml의 sldIdLst)에 맞춰 읽음
+  zip 아카이브는 중앙 디렉터리만 읽고, 노트 XML은 멤버별로 스트리밍 파싱(iterparse)하므로
+  이미지·동영상이 많은 큰 파일도 전체를 메모리에 올리지 않음
+- 텍스트: 구분선(기본 `---`)만 있는 줄로 나눈 구간을 차례로 슬라이드에 대응
+"""
+
+import io
+import posixpath
+import zipfile
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+# 노트 XML 하나의 최대 크기 (압축 해제 기준). 비정상적으로 큰 멤버(zip bomb)를 거부
+MAX_XML_MEMBER_BYTES = 16 * 1024 * 1024
+
+_NS_P = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+_NS_A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+_NS_R = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_NS_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_REL_SLIDE = '/slide'
+_REL_NOTES_SLIDE = '/notesSlide'
+
+
+class ScriptImportError(Exception):
+    """가져올 수 없는 파일 (손상된 PPTX, 너무 큰 멤버 등)"""
+    pass
+
+
+def _rels_path(part_path: str) -> str:
+    """파트 경로의 관계 파일 경로 (예: ppt/slides/slide1.xml → ppt/slides/_rels/slide1.xml.rels)"""
+    directory, name = posixpath.split(part_path)
+    return posixpath.join(directory, '_rels', name + '.rels')
+
+
+def _resolve_target(part_path: str, target: str) -> str:
+    """관계의 Target을 패키지 내부 절대 경로로 변환"""
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part_path), target))
+
+
+def _open_member(archive: zipfile.ZipFile, path: str) -> Optional[BinaryIO]:
+    try:
+        info = archive.getinfo(path)
+    except KeyError:
+        return None
+    if info.file_size > MAX_XML_MEMBER_BYTES:
+        raise ScriptImportError(f"PPTX 내부 파일이 너무 큽니다: {path}")
+    return archive.open(info)
+
+
+def _read_relationships(archive: zipfile.ZipFile, part_path: str) -> Dict[str, Tuple[str, str]]:
+    """파트의 관계 목록 {Id: (Type, 절대 Target 경로)}. 관계 파일이 없으면 빈 dict"""
+    member = _open_member(archive, _rels_path(part_path))
+    if member is None:
+        return {}
+    relationships = {}
+    with member:
+        for _, elem in ElementTree.iterparse(member):
+            if elem.tag == _NS_REL + 'Relationship' and elem.get('TargetMode') != 'External':
+                relationships[elem.get('Id')] = (elem.get('Type', ''), _resolve_target(part_path, elem.get('Target', '')))
+            elem.clear()
+    return relationships
+
+
+def _slide_paths(archive: zipfile.ZipFile) -> List[str]:
+    """발표 순서대로 슬라이드 파트 경로 목록"""
+    presentation = 'ppt/presentation.xml'
+    relationships = _read_relationships(archive, presentation)
+    member = _open_member(archive, presentation)
+    if member is None:
+        raise ScriptImportError("PPTX 파일이 아닙니다 (ppt/presentation.xml 없음).")
+    paths = []
+    with member:
+        for _, elem in ElementTree.iterparse(member):
+            if elem.tag == _NS_P + 'sldId':
+                rel_type, target = relationships.get(elem.get(_NS_R + 'id'), ('', ''))
+                if rel_type.endswith(_REL_SLIDE):
+                    paths.append(target)
+            elif elem.tag == _NS_P + 'sldIdLst':
+                break  # 슬라이드 목록 뒤의 내용은 필요 없음
+    return paths
+
+
+def _read_notes_text(member: BinaryIO) -> str:
+    """
+    노트 슬라이드 XML에서 본문 자리 표시자(type="body")의 텍스트만 추출합니다.
+    문단은 줄바꿈으로 잇고, 슬라이드 번호·머리글 등 다른 자리 표시자와 슬라이드 이미지는 제외합니다.
+    """
+    paragraphs: List[str] = []
+    current: List[str] = []
+    in_body = False
+    for event, elem in ElementTree.iterparse(member, events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == _NS_P + 'sp':
+                in_body = False
+            elif elem.tag == _NS_P + 'ph' and elem.get('type') == 'body':
+                in_body = True
+            continue
+        if in_body:
+            if elem.tag == _NS_A + 't':
+                current.append(elem.text or '')
+            elif elem.tag == _NS_A + 'br':
+                current.append('\n')
+            elif elem.tag == _NS_A + 'p':
+                paragraphs.append(''.join(current))
+                current = []
+        if elem.tag in (_NS_A + 'p', _NS_P + 'sp'):
+            elem.clear()
+    return '\n'.join(paragraph.strip() for paragraph in paragraphs if paragraph.strip())
+
+
+def read_pptx_notes(file: BinaryIO) -> Iterator[Tuple[int, str]]:
+    """
+    PPTX 파일에서 (슬라이드 번호, 노트 텍스트)를 발표 순서대로 생성합니다.
+    슬라이드 번호는 1부터이며, 노트가 없는 슬라이드는 텍스트가 빈 문자열입니다.
+    file은 탐색(seek) 가능한 바이너리 파일이어야 합니다.
+    """
+    try:
+        archive = zipfile.ZipFile(file)
+    except zipfile.BadZipFile as e:
+        raise ScriptImportError(f"손상된 PPTX 파일입니다: {e}")
+    try:
+        with archive:
+            for number, slide_path in enumerate(_slide_paths(archive), start=1):
+                notes_path = next((
+                    target for rel_type, target in _read_relationships(archive, slide_path).values()
+                    if rel_type.endswith(_REL_NOTES_SLIDE)
+                ), None)
+                member = _open_member(archive, notes_path) if notes_path else None
+                if member is None:
+                    yield number, ''
+                    continue
+                with member:
+                    yield number, _read_notes_text(member)
+    except (zipfile.BadZipFile, ElementTree.ParseError, EOFError) as e:
+        raise ScriptImportError(f"손상된 PPTX 파일입니다: {e}")
+
+
+def read_text_slides(file: BinaryIO, delimiter: str = '---') -> Iterator[Tuple[int, str]]:
+    """
+    UTF-8 텍스트 파일을 구분선 줄(앞뒤 공백 제외 후 delimiter와 같은 줄)로 나눠
+    (슬라이드 번호, 텍스트)를 차례로 생성합니다. 파일은 한 줄씩 읽습니다.
+    """
+    stream = io.TextIOWrapper(file, encoding='utf-8-sig', errors='replace')
+    try:
+        number = 1
+        lines: List[str] = []
+        for line in stream:
+            if line.strip() == delimiter:
+                yield number, ''.join(lines).strip()
+                number += 1
+                lines = []
+            else:
+                lines.append(line)
+        yield number, ''.join(lines).strip()
+    finally:
+        stream.detach()  # file은 호출자가 닫음
@@ -1,16 +1,24 @@
 """
 발표 대본 처리 유틸리티
-- 마침표 기준 문장 분할
-- 읽기에 적당한 길이로 청크화
+- 문장 분할: 미리 컴파일한 정규식으로 문장 끝 후보를 한 번에 훑으며 (시작, 끝) 오프셋을 생성
+  (소수점, 약어, 말줄임표, 따옴표, 목록 번호, 띄어쓰기 없는 한국어 문장 경계 규칙 적용)
+- 읽기에 적당한 길이로 청크화 (문장 수 / 문자 수 / 읽기 시간 기준)
+  - 기본은 앞에서부터 채우는 방식, balanced는 같은 청크 수에서 청크 길이가 가장 고르게 나뉘도록
+    동적 계획법으로 경계를 선택 (문장 수 상한이 있으므로 문장 수에 선형)
 - 예상 읽기 시간 계산
+- 수정된 대본 재청크화: 기존 청크 중 문장이 바뀌지 않은 청크는 그대로 두고, 바뀐 구간만 새로 청크화
+- 스트리밍 처리: 텍스트 조각을 받는 대로 문장/청크를 만들어, 전체 대본을 메모리에 올리지 않고 처리
+  (SentenceStream, ChunkStream, iter_slide_script)
 """
 
+import math
 import re
-from typing import List, Tuple
+from difflib import SequenceMatcher
+from typing import Iterable, Iterator, List, Optional, Tuple
 from enum import Enum
 
 
-class ChunkStrategy(Enum):
+class ChunkStrategy(str, Enum):
     """청크화 전략"""
     SENTENCE_COUNT = "sentence_count"  # N개의 문장으로 청크
     CHARACTER_COUNT = "character_count"  # 문자 개수 기준
@@ -20,39 +28,111 @@ class ChunkStrategy(Enum):
 class ScriptProcessor:
     """발표 대본 처리 클래스"""
     
-    # 한국어/영어 혼합 텍스트에서 문장 분리 정규식
-    SENTENCE_PATTERN = r'(?<=[.!?。!？])\s+'
-    
+    # 마침표가 문장 끝이 아닌 영어 약어 (마지막 마침표 제외, 대소문자 무시)
+    ABBREVIATIONS = (
+        'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'vs', 'e.g', 'i.e',
+        'fig', 'inc', 'ltd', 'co', 'corp', 'dept', 'approx', 'vol'
+    )
+    # 약어/이니셜(J. K. Rowling) 뒤가 아닌 위치
+    _NOT_ABBREVIATION = ''.join(rf'(?<!\b(?i:{re.escape(word)}))' for word in ABBREVIATIONS) + r'(?<!\b[A-Z])'
+
+    # 문장 경계 정규식 (한 번 훑기): 1번 그룹이 문장 끝(종결 부호 + 닫는 따옴표/괄호), 뒤따르는 공백까지 매칭
+    # 숫자 뒤 마침표(number 그룹)만 문장 맨 앞 목록 번호(1. 서론)인지 추가로 확인
+    SENTENCE_PATTERN = re.compile(r"""
+        (?=[.!?。！？…])   # 종결 부호가 아닌 위치는 대안들을 시도하지 않고 바로 건너뜀
+        (
+            (?<=[0-9])(?P<number>\.)(?=\s)                              # 2024. / 1. 서론
+          | (?:\.{2,}|…)[.…]*[\"'”’」』)\]]*(?=\s+[^\sa-z]|\s*\Z)   # 말줄임표: 뒤가 소문자로 이어지지 않을 때
+          | (?<![.…])[.!?。！？]+[\"'”’」』)\]]+(?=\s+[^\sa-z]|\s*\Z)  # 인용문 끝: "Really?" he asked 는 유지
+          | (?<![.…])(?:[!?。！？][.!?。！？]*
+                      |""" + _NOT_ABBREVIATION + r"""\.(?:[!?。！？][.!?。！？]*|(?!\s+[a-z])))
+            (?=\s|\Z)                          # 일반 문장 끝 (3.5, example.com, a.m. yesterday 제외)
+          | (?<=[가-힣])(?!\.\.)[.!?。！？]+(?=[가-힣])                 # 띄어쓰기 없는 한국어 문장 경계
+        )
+        \s*
+    """, re.VERBOSE)
+    _LEADING_SPACE = re.compile(r'\s*')
+    # 한국식 날짜 표기(2024. 11. 18.): 연·월·일 뒤 마침표는 문장 끝이 아님
+    _DATE_PATTERN = re.compile(r'(?<!\d)\d{4}\.\s?(?:0?[1-9]|1[0-2])\.\s?(?:0?[1-9]|[12][0-9]|3[01])\.(?!\d)')
+    # 숫자 뒤 마침표가 문장 끝인지 판단할 때 앞뒤로 보는 최대 글자 수 (날짜 표기 길이)
+    BOUNDARY_CONTEXT = 13
+
     # 기본 청크화 설정
     DEFAULT_CHUNK_WORDS = 12  # 한 청크당 약 50단어 (한국어 기준 150-200자)
     DEFAULT_CHUNK_CHARS = 70  # 한 청크당 약 200자
+    DEFAULT_CHUNK_SENTENCES = 3
+    DEFAULT_CHUNK_SECONDS = 8.0  # 한국어 약 70자 분량
     
+    # 문장 분할/청크화/읽기 시간 규칙의 버전 (결과가 달라지는 변경 시 올려서 처리 결과 캐시를 무효화)
+    PROCESSOR_VERSION = 2
+
     # 평균 읽기 속도 (초/단어, 한국어 기준)
     AVG_KOREAN_SPEED = 0.4  # 약 150 단어/분
+
+    # 한글 문자 수 세기: UTF-8에서 U+A000~U+DFFF(한글 음절 U+AC00~U+D7A3 포함)는 선두 바이트가 0xEA~0xED인
+    # 3바이트 문자이므로, 그 외 바이트를 bytes.translate로 지운 길이가 한글 문자 수 (문자별 ord() 반복 없음)
+    _NON_HANGUL_BYTES = bytes(b for b in range(256) if not 0xEA <= b <= 0xED)
+
+    @staticmethod
+    def count_hangul(text: str) -> int:
+        """텍스트의 한글 음절 수 (U+A000~U+DFFF 범위의 문자 수)"""
+        return len(text.encode('utf-8').translate(None, ScriptProcessor._NON_HANGUL_BYTES))
     
+    @staticmethod
+    def _is_list_number(text: str, start: int, dot: int) -> bool:
+        """text[dot]의 마침표가 문장 맨 앞 목록 번호(1. 서론)의 일부인지 확인합니다. (start: 현재 문장 시작)"""
+        return dot - start <= 3 and text[start:dot].isdigit()
+
+    @staticmethod
+    def _is_date_part(text: str, dot: int) -> bool:
+        """text[dot]의 마침표가 날짜 표기(2024. 11. 18.)의 연·월·일 뒤 마침표인지 확인합니다."""
+        context = ScriptProcessor.BOUNDARY_CONTEXT
+        return any(
+            match.start() <= dot < match.end()
+            for match in ScriptProcessor._DATE_PATTERN.finditer(text, max(0, dot - context), dot + context + 1)
+        )
+
+    @staticmethod
+    def split_sentence_spans(text: str) -> Iterator[Tuple[int, int]]:
+        """
+        문장마다 원본 텍스트에서의 (시작, 끝) 오프셋을 순서대로 생성합니다.
+        문장 앞뒤 공백은 포함하지 않으며, 문자열을 복사하지 않고 한 번만 훑습니다.
+
+        Args:
+            text: 분할할 원본 텍스트
+
+        Returns:
+            (시작, 끝) 오프셋 이터레이터 (text[시작:끝]이 문장)
+        """
+        is_list_number, is_date_part = ScriptProcessor._is_list_number, ScriptProcessor._is_date_part
+        start = ScriptProcessor._LEADING_SPACE.match(text).end()
+        for match in ScriptProcessor.SENTENCE_PATTERN.finditer(text, start):
+            if match.group('number') and (
+                is_list_number(text, start, match.start()) or is_date_part(text, match.start())
+            ):
+                continue
+            yield start, match.end(1)
+            start = match.end()
+
+        end = len(text)
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if end > start:
+            yield start, end
+
     @staticmethod
     def split_sentences(text: str) -> List[str]:
         """
-        마침표, 물음표, 느낌표를 기준으로 문장 분할
-        
+        문장 부호(. ! ? 。 … 등)를 기준으로 문장 분할
+
         Args:
             text: 분할할 원본 텍스트
-            
+
         Returns:
             문장 리스트
         """
-        # 공백 정규화
-        text = text.strip()
-        
-        # 마침표, 물음표, 느낌표를 기준으로 분할
-        # 공백이 여러 개인 경우도 처리
-        sentences = re.split(r'(?<=[.!?。!？])\s*', text)
-        
-        # 빈 문장 제거
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        return sentences
-    
+        return [text[start:end] for start, end in ScriptProcessor.split_sentence_spans(text)]
+
     @staticmethod
     def estimate_reading_duration(text: str, language: str = "korean") -> float:
         """
@@ -70,7 +150,7 @@ class ScriptProcessor:
             # 단어 단위: 공백 기준 + 글자 기준 하이브리드
             words = len(text.split())
             # 한글 문자 개수 / 3 (평균 3글자/단어)
-            korean_chars = len([c for c in text if ord(c) >= 0xAC00])
+            korean_chars = ScriptProcessor.count_hangul(text)
             estimated_words = max(words, korean_chars // 3)
             return estimated_words * ScriptProcessor.AVG_KOREAN_SPEED
         else:
@@ -78,12 +158,87 @@ class ScriptProcessor:
             words = len(text.split())
             return words * ScriptProcessor.AVG_KOREAN_SPEED
     
+    @staticmethod
+    def _chunk_sizes(
+        sentences: List[str],
+        strategy: ChunkStrategy,
+        max_chars: int,
+        max_duration: float
+    ) -> Tuple[List[float], float]:
+        """전략에 따라 문장별 크기와 청크 크기 상한을 반환합니다. (문장 수 기준은 상한 없음)"""
+        if strategy == ChunkStrategy.CHARACTER_COUNT:
+            return [len(sentence) for sentence in sentences], max_chars
+        if strategy == ChunkStrategy.DURATION:
+            return [ScriptProcessor.estimate_reading_duration(sentence) for sentence in sentences], max_duration
+        return [0] * len(sentences), math.inf
+
+    @staticmethod
+    def _greedy_bounds(sizes: List[float], limit: float, max_sentences: int) -> List[int]:
+        """앞에서부터 상한까지 채우는 청크 경계 (각 청크의 끝 인덱스, 마지막은 len(sizes))"""
+        bounds = []
+        current_size = 0
+        current_count = 0
+        for idx, size in enumerate(sizes):
+            # 현재 청크가 비어있지 않고, 추가하면 한계 초과시 새 청크 시작
+            if current_count and (current_size + size > limit or current_count >= max_sentences):
+                bounds.append(idx)
+                current_size = 0
+                current_count = 0
+            current_size += size
+            current_count += 1
+        if current_count:
+            bounds.append(len(sizes))
+        return bounds
+
+    @staticmethod
+    def _balanced_bounds(
+        sizes: List[float],
+        weights: List[float],
+        limit: float,
+        max_sentences: int
+    ) -> List[int]:
+        """
+        상한을 지키는 분할 중 청크 수가 가장 적고, 그 안에서 청크 가중치(읽기 시간)의 제곱합이
+        가장 작은(= 청크 수와 전체 합이 같을 때 분산이 가장 작은) 경계를 반환합니다.
+
+        best[i] = 문장 0..i-1을 나누는 최적 (청크 수, 제곱합)이며, 마지막 청크는 최대 max_sentences개
+        문장이므로 O(문장 수 × max_sentences)입니다. 한 문장만으로 상한을 넘으면 단독 청크로 허용합니다.
+        """
+        n = len(sizes)
+        size_prefix = [0.0]
+        weight_prefix = [0.0]
+        for size, weight in zip(sizes, weights):
+            size_prefix.append(size_prefix[-1] + size)
+            weight_prefix.append(weight_prefix[-1] + weight)
+
+        best: List[Tuple[int, float]] = [(0, 0.0)] + [(n + 1, math.inf)] * n
+        start_of: List[int] = [0] * (n + 1)
+        for end in range(1, n + 1):
+            for start in range(end - 1, max(end - max_sentences, 0) - 1, -1):
+                if end - start > 1 and size_prefix[end] - size_prefix[start] > limit:
+                    break  # 크기는 음수가 아니므로 더 앞에서 시작하면 계속 초과
+                chunk_weight = weight_prefix[end] - weight_prefix[start]
+                count, cost = best[start]
+                candidate = (count + 1, cost + chunk_weight * chunk_weight)
+                if candidate < best[end]:
+                    best[end] = candidate
+                    start_of[end] = start
+
+        bounds = []
+        end = n
+        while end > 0:
+            bounds.append(end)
+            end = start_of[end]
+        return bounds[::-1]
+
     @staticmethod
     def chunk_sentences(
         sentences: List[str],
         strategy: ChunkStrategy = ChunkStrategy.CHARACTER_COUNT,
         max_chars: int = DEFAULT_CHUNK_CHARS,
-        max_sentences: int = 3
+        max_sentences: int = DEFAULT_CHUNK_SENTENCES,
+        max_duration: float = DEFAULT_CHUNK_SECONDS,
+        balanced: bool = False
     ) -> List[Tuple[str, List[int]]]:
         """
         문장들을 읽기에 적당한 청크로 재배치
@@ -91,50 +246,47 @@ class ScriptProcessor:
         Args:
             sentences: 분할된 문장 리스트
             strategy: 청크화 전략
+                - SENTENCE_COUNT: 청크당 max_sentences개 문장
+                - CHARACTER_COUNT: 청크당 max_chars자 이하 (최대 max_sentences개 문장)
+                - DURATION: 청크당 예상 읽기 시간 max_duration초 이하 (최대 max_sentences개 문장)
             max_chars: 한 청크의 최대 문자 수
             max_sentences: 한 청크의 최대 문장 개수
+            max_duration: 한 청크의 최대 예상 읽기 시간(초)
+            balanced: True면 앞에서부터 채우지 않고, 같은 청크 수에서 청크별 읽기 시간이 가장 고르도록 분할
+                (앞에서부터 채우면 마지막 청크만 짧게 남는 문제 방지)
             
         Returns:
             [(청크_텍스트, [원본_문장_인덱스]), ...] 리스트
+            한 문장이 상한을 넘으면 그 문장만으로 청크를 만듭니다.
         """
+        if not sentences:
+            return []
+        max_sentences = max(max_sentences, 1)
+        sizes, limit = ScriptProcessor._chunk_sizes(sentences, strategy, max_chars, max_duration)
+
+        if balanced:
+            weights = sizes if strategy == ChunkStrategy.DURATION else [
+                ScriptProcessor.estimate_reading_duration(sentence) for sentence in sentences
+            ]
+            bounds = ScriptProcessor._balanced_bounds(sizes, weights, limit, max_sentences)
+        else:
+            bounds = ScriptProcessor._greedy_bounds(sizes, limit, max_sentences)
+
         chunks = []
-        current_chunk = []
-        current_indices = []
-        current_length = 0
-        
-        for idx, sentence in enumerate(sentences):
-            sentence_length = len(sentence)
-            
-            # 청크 크기 초과 여부 판단
-            would_exceed_chars = (current_length + sentence_length) > max_chars
-            would_exceed_sentences = len(current_chunk) >= max_sentences
-            
-            # 현재 청크가 비어있지 않고, 추가하면 한계 초과시
-            if current_chunk and (would_exceed_chars or would_exceed_sentences):
-                # 기존 청크 저장
-                chunk_text = ' '.join(current_chunk)
-                chunks.append((chunk_text, current_indices))
-                current_chunk = []
-                current_indices = []
-                current_length = 0
-            
-            # 새 문장 추가
-            current_chunk.append(sentence)
-            current_indices.append(idx)
-            current_length += sentence_length
-        
-        # 남은 청크 추가
-        if current_chunk:
-            chunk_text = ' '.join(current_chunk)
-            chunks.append((chunk_text, current_indices))
-        
+        start = 0
+        for end in bounds:
+            chunks.append((' '.join(sentences[start:end]), list(range(start, end))))
+            start = end
         return chunks
     
     @staticmethod
     def process_slide_script(
         script_text: str,
         max_chars: int = DEFAULT_CHUNK_CHARS,
-        max_sentences: int = 3
+        max_sentences: int = DEFAULT_CHUNK_SENTENCES,
+        strategy: ChunkStrategy = ChunkStrategy.CHARACTER_COUNT,
+        max_duration: float = DEFAULT_CHUNK_SECONDS,
+        balanced: bool = False
     ) -> List[Tuple[str, float, List[int]]]:
         """
         슬라이드 대본을 처리하여 청크와 메타데이터 반환
@@ -143,6 +295,9 @@ class ScriptProcessor:
             script_text: 슬라이드 대본 원문
             max_chars: 한 청크의 최대 문자 수
             max_sentences: 한 청크의 최대 문장 개수
+            strategy: 청크화 전략 (chunk_sentences 참고)
+            max_duration: 한 청크의 최대 예상 읽기 시간(초, DURATION 전략)
+            balanced: 청크별 읽기 시간이 고르도록 분할
             
         Returns:
             [(텍스트, 예상시간, 원본문장인덱스), ...] 리스트
@@ -156,9 +311,11 @@ class ScriptProcessor:
         # 2. 청크화
         chunks = ScriptProcessor.chunk_sentences(
             sentences,
-            strategy=ChunkStrategy.CHARACTER_COUNT,
+            strategy=strategy,
             max_chars=max_chars,
-            max_sentences=max_sentences
+            max_sentences=max_sentences,
+            max_duration=max_duration,
+            balanced=balanced
         )
         
         # 3. 각 청크의 읽기 시간 계산
@@ -170,6 +327,196 @@ class ScriptProcessor:
         return result
 
 
+    @staticmethod
+    def rechunk_slide_script(
+        script_text: str,
+        previous_chunks: List[str],
+        **options
+    ) -> List[Tuple[str, float, List[int], Optional[int]]]:
+        """
+        수정된 슬라이드 대본을 기존 청크(previous_chunks, 순서대로의 청크 텍스트)에 맞춰 다시 청크화합니다.
+
+        1. 기존 청크를 문장으로 나눈 목록과 새 대본의 문장 목록을 비교(difflib)합니다.
+        2. 문장이 모두 그대로이고 새 대본에서도 연속된 기존 청크는 그대로 유지합니다.
+        3. 유지된 청크 사이의 바뀐 구간만 새로 청크화하고, 같은 구간에 있던 기존 청크를 순서대로 재사용합니다.
+        따라서 문장 하나를 고치면 그 문장이 속한 구간의 청크만 바뀌고, 나머지 청크의 경계는 흔들리지 않습니다.
+
+        Args:
+            script_text: 수정된 슬라이드 대본 원문
+            previous_chunks: 기존 청크 텍스트 목록 (비어 있으면 process_slide_script와 같음)
+            options: process_slide_script의 청크화 인자
+
+        Returns:
+            [(텍스트, 예상시간, 원본문장인덱스, 재사용할_기존_청크_인덱스 또는 None), ...] 리스트
+            기존 청크를 재사용한 항목의 텍스트가 기존과 같으면 변경 없음, 다르면 수정된 청크입니다.
+        """
+        if not previous_chunks:
+            return [chunk + (None,) for chunk in ScriptProcessor.process_slide_script(script_text, **options)]
+
+        sentences = ScriptProcessor.split_sentences(script_text)
+        old_sentences = []
+        old_ranges = []  # 기존 청크별 old_sentences 구간
+        for chunk_text in previous_chunks:
+            chunk_sentences = ScriptProcessor.split_sentences(chunk_text)
+            old_ranges.append((len(old_sentences), len(old_sentences) + len(chunk_sentences)))
+            old_sentences.extend(chunk_sentences)
+
+        # 기존 문장 인덱스 → 새 문장 인덱스 (바뀌지 않은 문장만, 순서 보존)
+        new_index_of = {}
+        matcher = SequenceMatcher(None, old_sentences, sentences, autojunk=False)
+        for tag, old_start, old_end, new_start, _ in matcher.get_opcodes():
+            if tag == 'equal':
+                for offset in range(old_end - old_start):
+                    new_index_of[old_start + offset] = new_start + offset
+
+        # 유지할 청크: 모든 문장이 그대로이고 새 대본에서도 연속된 청크 → (새 시작, 새 끝, 기존 청크 인덱스)
+        anchors = []
+        for chunk_index, (start, end) in enumerate(old_ranges):
+            mapped = [new_index_of.get(index) for index in range(start, end)]
+            if mapped and None not in mapped and mapped[-1] - mapped[0] == end - start - 1:
+                anchors.append((mapped[0], mapped[-1] + 1, chunk_index))
+
+        result = []
+        new_position = 0
+        old_position = 0
+        for anchor_start, anchor_end, anchor_chunk in anchors + [(len(sentences), len(sentences), len(previous_chunks))]:
+            # 유지된 청크 사이 구간: 새로 청크화하고 같은 구간의 기존 청크 ID를 순서대로 재사용
+            reusable = list(range(old_position, anchor_chunk))
+            gap = sentences[new_position:anchor_start]
+            if gap:
+                for chunk_text, indices in ScriptProcessor.chunk_sentences(gap, **options):
+                    reuse = reusable.pop(0) if reusable else None
+                    result.append((
+                        chunk_text,
+                        ScriptProcessor.estimate_reading_duration(chunk_text),
+                        [new_position + index for index in indices],
+                        reuse
+                    ))
+            if anchor_chunk < len(previous_chunks):
+                chunk_text = previous_chunks[anchor_chunk]
+                result.append((
+                    chunk_text,
+                    ScriptProcessor.estimate_reading_duration(chunk_text),
+                    list(range(anchor_start, anchor_end)),
+                    anchor_chunk
+                ))
+            new_position = anchor_end
+            old_position = anchor_chunk + 1
+        return result
+
+    @staticmethod
+    def rechunk_slide_scripts(
+        slides: List[Tuple[str, List[str]]],
+        **options
+    ) -> List[List[Tuple[str, float, List[int], Optional[int]]]]:
+        """
+        여러 슬라이드의 (대본, 기존 청크 텍스트 목록)을 차례로 rechunk_slide_script로 처리합니다.
+        (프로세스 풀에 슬라이드 묶음 단위로 넘기기 위한 함수)
+        """
+        return [ScriptProcessor.rechunk_slide_script(text, previous, **options) for text, previous in slides]
+
+
+class SentenceStream:
+    """
+    텍스트 조각을 차례로 받아 완성된 문장만 돌려주는 증분 문장 분할기
+
+    마지막 문장은 다음 조각과 이어질 수 있으므로 close()까지 보류합니다.
+    문장 경계는 문장 안의 문자와 뒤따르는 최대 BOUNDARY_CONTEXT 글자만 보고 정해지므로,
+    끝에서 그만큼 떨어진 문장까지만 내보내면 결과는 전체를 split_sentences한 것과 같습니다.
+    단, 문장부호 없이 max_sentence_chars를 넘는 문장(구두점 없는 음성 인식 결과 등)은 보류 버퍼가 끝없이
+    커지지 않도록 마지막 공백에서 끊어 내보냅니다.
+    """
+
+    MAX_SENTENCE_CHARS = 4000
+
+    def __init__(self, max_sentence_chars: int = MAX_SENTENCE_CHARS):
+        self._buffer = ''
+        self._max_sentence_chars = max_sentence_chars
+
+    def feed(self, piece: str) -> List[str]:
+        if not piece:
+            return []
+        buffer = self._buffer + piece
+        spans = list(ScriptProcessor.split_sentence_spans(buffer))
+        if not spans:  # 공백뿐
+            self._buffer = ''
+            return []
+        # 숫자 뒤 마침표는 뒤따르는 글자(날짜 표기)에 따라 경계가 바뀔 수 있으므로, 끝에 가까운 문장은 보류
+        ready = len(spans) - 1
+        while ready and spans[ready - 1][1] + ScriptProcessor.BOUNDARY_CONTEXT >= len(buffer):
+            ready -= 1
+        sentences = [buffer[start:end] for start, end in spans[:ready]]
+        tail = buffer[spans[ready][0]:]
+        while len(tail) > self._max_sentence_chars:
+            cut = tail.rfind(' ', 1, self._max_sentence_chars + 1)
+            cut = cut if cut > 0 else self._max_sentence_chars
+            sentences.append(tail[:cut].rstrip())
+            tail = tail[cut:].lstrip()
+        self._buffer = tail
+        return sentences
+
+    def close(self) -> List[str]:
+        sentences = ScriptProcessor.split_sentences(self._buffer)
+        self._buffer = ''
+        return sentences
+
+
+class ChunkStream:
+    """
+    문장을 차례로 받아 청크 (텍스트, 예상시간, 원본문장인덱스)를 돌려주는 증분 청크화기
+
+    문장을 window개씩 모아 chunk_sentences로 나누고, 마지막 청크는 다음 문장과 합쳐질 수 있으므로
+    다음 묶음으로 넘깁니다. 따라서 앞에서부터 채우는 방식은 process_slide_script와 결과가 같고,
+    balanced는 묶음 단위로 고르게 나눕니다. 메모리는 window개 문장만큼만 사용합니다.
+    """
+
+    DEFAULT_WINDOW = 256  # 한 번에 청크화하는 문장 수
+
+    def __init__(self, window: int = DEFAULT_WINDOW, **options):
+        self._options = options
+        # 묶음에 청크가 둘 이상 나와야 앞부분을 확정할 수 있음
+        self._window = max(window, 2 * options.get('max_sentences', ScriptProcessor.DEFAULT_CHUNK_SENTENCES))
+        self._sentences: List[str] = []
+        self._offset = 0  # self._sentences[0]의 원본 문장 인덱스
+
+    def _chunks(self, final: bool) -> List[Tuple[str, float, List[int]]]:
+        chunks = ScriptProcessor.chunk_sentences(self._sentences, **self._options)
+        if not final:
+            chunks = chunks[:-1]
+        done = chunks[-1][1][-1] + 1 if chunks else 0
+        result = [
+            (text, ScriptProcessor.estimate_reading_duration(text), [self._offset + index for index in indices])
+            for text, indices in chunks
+        ]
+        del self._sentences[:done]
+        self._offset += done
+        return result
+
+    def feed(self, sentences: Iterable[str]) -> List[Tuple[str, float, List[int]]]:
+        result = []
+        for sentence in sentences:
+            self._sentences.append(sentence)
+            if len(self._sentences) >= self._window:
+                result.extend(self._chunks(final=False))
+        return result
+
+    def close(self) -> List[Tuple[str, float, List[int]]]:
+        return self._chunks(final=True) if self._sentences else []
+
+
+def iter_slide_script(pieces: Iterable[str], **options) -> Iterator[Tuple[str, float, List[int]]]:
+    """
+    텍스트 조각 스트림을 process_slide_script와 같은 (텍스트, 예상시간, 원본문장인덱스) 청크 스트림으로 처리합니다.
+    options는 process_slide_script의 청크화 인자(와 ChunkStream의 window)입니다.
+    """
+    sentences = SentenceStream()
+    chunks = ChunkStream(**options)
+    for piece in pieces:
+        yield from chunks.feed(sentences.feed(piece))
+    yield from chunks.feed(sentences.close())
+    yield from chunks.close()
+
+
 # ===== 테스트/예시 =====
 if __name__ == "__main__":
     sample_text = """안녕하십니까. 지금부터 발표를 시작하겠습니다. 
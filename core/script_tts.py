@@ -0,0 +1,133 @@
+"""
+발표 대본 문장 일괄 TTS 생성
+- 스크립트의 모든 문장을 사용자의 voice_id로 합성하여 문장별 오디오 파일로 저장
+- Supertone 동시 호출 수는 SCRIPT_TTS_CONCURRENCY로 제한
+- 문장마다 합성 입력 해시(audio_text_hash)를 기록하여, 같은 문장/보이스/설정이면 다시 생성하지 않음
+  (문장이 수정되면 해시가 달라져 해당 문장만 다시 생성)
+- 합성 결과는 TTS 캐시(core/tts_cache.py)를 거치므로 다른 스크립트의 같은 문장도 재사용
+- 문장별 오디오 정보와 진행 상황은 일정 문장 수/시간마다 모아서 한 번에 저장
+  (SCRIPT_TTS_FLUSH_SENTENCES, SCRIPT_TTS_FLUSH_SECONDS)
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from botocore.exceptions import ClientError
+from tinydb import Query as TinyQuery
+
+from core.config import SCRIPT_TTS_CONCURRENCY, SCRIPT_TTS_FLUSH_SENTENCES, SCRIPT_TTS_FLUSH_SECONDS
+from core.database import sentences_table, write_tables
+from core.storage import link_file
+from core.supertone import SupertoneError
+from core.tts_cache import cached_text_to_speech, tts_cache_key
+
+SCRIPT_TTS_JOB_KIND = 'script_tts'
+
+
+def sentence_audio_file_name(sentence: dict) -> str:
+    return f"{sentence['sentence_id']}.wav"
+
+
+def needs_render(sentence: dict, voice_id: str) -> bool:
+    """저장된 오디오가 없거나 문장/보이스가 바뀌었으면 True"""
+    return not (
+        sentence.get('audio_object_key')
+        and sentence.get('audio_text_hash') == tts_cache_key(voice_id, sentence['text'])
+    )
+
+
+async def render_script_sentences(
+    set_stage: Callable[[str], None],
+    user_id: str,
+    api_key: str,
+    voice_id: str,
+    script_id: str,
+    force: bool = False,
+    concurrency: Optional[int] = None,
+    flush_every: Optional[int] = None,
+    flush_seconds: Optional[float] = None
+) -> dict:
+    """
+    스크립트의 문장들을 합성하고 문장 레코드에 오디오 정보(audio_object_key 등)를 기록합니다.
+    문장별 실패는 작업 전체를 중단하지 않고 결과의 `failed` 목록에 담습니다.
+
+    끝난 문장의 오디오 정보는 flush_every개(기본 SCRIPT_TTS_FLUSH_SENTENCES)가 모이거나
+    flush_seconds(기본 SCRIPT_TTS_FLUSH_SECONDS)가 지날 때마다 write_tables 한 번으로 저장하고,
+    진행 상황(set_stage)도 그때만 갱신합니다. 저장은 작업자 스레드에서 실행되어 이벤트 루프를 막지 않습니다.
+    """
+    Q = TinyQuery()
+    sentences = sentences_table.search(Q.script_id == script_id)
+    targets = [s for s in sentences if force or needs_render(s, voice_id)]
+    total = len(targets)
+    semaphore = asyncio.Semaphore(concurrency or SCRIPT_TTS_CONCURRENCY)
+    flush_every = flush_every or SCRIPT_TTS_FLUSH_SENTENCES
+    flush_seconds = SCRIPT_TTS_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+    flush_lock = asyncio.Lock()
+    pending: Dict[str, dict] = {}  # sentence_id → 저장할 오디오 정보
+    done = 0
+    reported = 0
+    last_flush = time.monotonic()
+    failed = []
+
+    def flush_due() -> bool:
+        return done - reported >= flush_every or time.monotonic() - last_flush >= flush_seconds
+
+    async def flush(final: bool = False) -> None:
+        nonlocal reported, last_flush
+        async with flush_lock:
+            if not final and not flush_due():
+                return  # 기다리는 동안 다른 문장이 먼저 저장함
+            batch = dict(pending)
+            pending.clear()
+            reported, last_flush = done, time.monotonic()
+            if batch:
+                await asyncio.to_thread(
+                    write_tables, updates={sentences_table: lambda doc: batch.get(doc.get('sentence_id'))}
+                )
+            set_stage(f"rendering {reported}/{total}")
+
+    set_stage(f"rendering 0/{total}")
+
+    async def render(sentence: dict) -> None:
+        nonlocal done
+        async with semaphore:
+            try:
+                entry = await cached_text_to_speech(api_key, voice_id, sentence['text'])
+                stored = await asyncio.to_thread(
+                    link_file, user_id, sentence_audio_file_name(sentence), entry['content_hash'], script_id
+                )
+                if stored is None:
+                    raise RuntimeError("생성된 오디오를 찾을 수 없습니다.")
+            except (SupertoneError, ClientError, RuntimeError) as e:
+                failed.append({
+                    'sentence_id': sentence['sentence_id'],
+                    'detail': getattr(e, 'detail', None) or str(e)
+                })
+            else:
+                pending[sentence['sentence_id']] = {
+                    'audio_object_key': stored['object_key'],
+                    'audio_content_hash': entry['content_hash'],
+                    'audio_text_hash': entry['cache_key'],
+                    'audio_length': entry.get('audio_length'),
+                    'audio_generated_at': datetime.utcnow().isoformat()
+                }
+            done += 1
+        if flush_due():
+            await flush()
+
+    try:
+        await asyncio.gather(*(render(sentence) for sentence in targets))
+    finally:
+        # 작업이 중간에 실패해도 이미 합성된 문장의 오디오 정보는 저장
+        await flush(final=True)
+
+    return {
+        'script_id': script_id,
+        'voice_id': voice_id,
+        'total_sentences': len(sentences),
+        'rendered': total - len(failed),
+        'skipped': len(sentences) - total,
+        'failed': failed
+    }
@@ -0,0 +1,92 @@
+"""
+사용자별 발화 속도 모델
+- 연습 기록(practice_scores)의 문장별 소요 시간(time_taken)과 기본 예상 읽기 시간의 비율을 관측값으로 사용
+- 관측값은 로그 비율로 다루어 빠르게/느리게 읽은 경우를 대칭으로 취급하고,
+  Huber 방식으로 잔차를 잘라낸 EWMA로 한 건씩 갱신 (녹음 실패, 중간에 멈춘 연습 같은 이상값에 강함)
+- 처음 몇 건은 평균, 이후에는 최근 기록에 더 큰 가중치
+- 사용자별 상태(평균 로그 비율, 잔차 규모, 관측 수)는 speaking_rates 테이블에 저장
+- 목록 API의 duration_estimate에 사용자별 배율을 곱해 개인화 (저장된 값은 기본 추정치 그대로)
+"""
+
+import math
+from datetime import datetime
+from typing import Optional
+
+from tinydb import Query as TinyQuery
+
+from core.config import SPEAKING_RATE_MIN_OBSERVATIONS
+from core.database import speaking_rates_table
+from core.script_processor import ScriptProcessor
+
+HUBER_K = 1.5  # 잔차 규모의 이 배수를 넘는 잔차는 잘라서 반영
+MIN_ALPHA = 0.1  # EWMA 최소 가중치 (약 최근 20건의 기록이 주로 반영됨)
+INITIAL_SCALE = 0.25  # 첫 관측 직후의 잔차 규모 (로그 비율, 약 ±28%)
+MIN_SCALE = 0.05
+# 기본 추정치 대비 이 범위를 벗어난 관측은 측정 오류로 보고 버림
+MIN_RATIO, MAX_RATIO = 0.2, 5.0
+# 개인화 배율 범위
+MIN_FACTOR, MAX_FACTOR = 0.5, 2.0
+
+
+def update_state(state: Optional[dict], ratio: float) -> dict:
+    """
+    관측 비율(실제 소요 시간 / 기본 추정치) 하나로 모델 상태를 갱신한 새 상태를 반환합니다.
+
+    상태: {'log_rate': 평균 로그 비율, 'scale': 잔차 절댓값의 EWMA, 'count': 관측 수}
+    """
+    x = math.log(ratio)
+    if not state or not state.get('count'):
+        return {'log_rate': x, 'scale': INITIAL_SCALE, 'count': 1}
+
+    count = state['count'] + 1
+    alpha = max(1.0 / count, MIN_ALPHA)
+    scale = state['scale']
+    residual = x - state['log_rate']
+    bound = HUBER_K * scale
+    clipped = max(-bound, min(bound, residual))
+    return {
+        'log_rate': state['log_rate'] + alpha * clipped,
+        'scale': max(MIN_SCALE, (1 - alpha) * scale + alpha * abs(clipped)),
+        'count': count
+    }
+
+
+def observe(user_id: str, text: str, time_taken: Optional[float]) -> Optional[dict]:
+    """
+    연습 기록 하나(문장 텍스트, 소요 시간)를 사용자 모델에 반영합니다.
+    반영하지 않은 관측(소요 시간 없음, 추정할 수 없는 문장, 범위를 벗어난 비율)이면 None을 반환합니다.
+    """
+    baseline = ScriptProcessor.estimate_reading_duration(text)
+    if not time_taken or time_taken <= 0 or baseline <= 0:
+        return None
+    ratio = time_taken / baseline
+    if not MIN_RATIO <= ratio <= MAX_RATIO:
+        return None
+
+    Q = TinyQuery()
+    current = speaking_rates_table.get(Q.user_id == user_id)
+    state = update_state(current, ratio)
+    state['updated_at'] = datetime.utcnow().isoformat()
+    if current:
+        speaking_rates_table.update(state, Q.user_id == user_id)
+    else:
+        speaking_rates_table.insert({'user_id': user_id, **state})
+    return state
+
+
+def rate_factor(user_id: str) -> float:
+    """
+    사용자의 예상 읽기 시간 배율 (기본 추정치 × 배율 = 개인화 추정치)
+    관측이 SPEAKING_RATE_MIN_OBSERVATIONS건 미만이면 1.0
+    """
+    state = speaking_rates_table.get(TinyQuery().user_id == user_id)
+    if not state or state.get('count', 0) < SPEAKING_RATE_MIN_OBSERVATIONS:
+        return 1.0
+    return max(MIN_FACTOR, min(MAX_FACTOR, math.exp(state['log_rate'])))
+
+
+def personalize(duration: Optional[float], factor: float) -> Optional[float]:
+    """기본 예상 읽기 시간에 배율을 적용합니다."""
+    if duration is None or factor == 1.0:
+        return duration
+    return round(duration * factor, 2)
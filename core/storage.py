@@ -0,0 +1,301 @@
+"""
+콘텐츠 주소 기반(content-addressed) S3 저장소
+- 업로드 데이터를 스트리밍으로 해시(SHA-256)하여 `s3_files` 카탈로그에 `content_hash`/`size` 기록
+- 실제 S3 객체는 해시 기반 키(`cas/<앞 2자리>/<해시>.<확장자>`)에 한 번만 저장
+- `s3_blobs` 테이블에서 참조 카운트를 관리하여, 같은 내용이면 PUT을 생략하고
+  더 이상 참조되지 않는 객체만 삭제
+- S3 PUT/DELETE는 전역 락 밖에서, 같은 콘텐츠 해시끼리만 직렬화하는 해시별 락 안에서 수행
+"""
+
+import hashlib
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from io import BytesIO
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from tinydb import Query as TinyQuery
+from tinydb.table import Table
+
+from core.config import S3_BUCKET_NAME
+from core.database import s3_table, s3_blobs_table, write_tables
+from core.s3 import get_s3_client
+
+HASH_ALGORITHM = 'sha256'
+HASH_CHUNK_SIZE = 64 * 1024
+CAS_PREFIX = 'cas'
+
+# 카탈로그/참조 카운트를 읽고 갱신하는 구간을 묶는 락 (tts_cache도 사용)
+# 이 락 안에서는 S3를 호출하거나 콘텐츠 락을 잡지 않음 (잠금 순서: 콘텐츠 락 → _lock)
+_lock = threading.RLock()
+
+# 콘텐츠 해시별 락: 같은 해시의 업로드/삭제만 직렬화하여, 느린 S3 호출이 다른 해시의 작업을 막지 않도록 함
+_content_locks: Dict[str, list] = {}  # content_hash → [threading.Lock, 사용 중인 스레드 수]
+_content_locks_guard = threading.Lock()
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + 'Z'
+
+
+@contextmanager
+def _content_lock(content_hash: str) -> Iterator[None]:
+    """content_hash의 업로드/삭제 구간을 직렬화합니다. 사용하는 스레드가 없으면 락을 정리합니다."""
+    with _content_locks_guard:
+        entry = _content_locks.setdefault(content_hash, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _content_locks_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _content_locks[content_hash]
+
+
+def _increment_ref(content_hash: str) -> Optional[dict]:
+    """blob 참조를 1 증가시킨 레코드를 반환합니다. blob이 없으면 None. (_lock 안에서 호출)"""
+    Q = TinyQuery()
+    blob = s3_blobs_table.get(Q.content_hash == content_hash)
+    if not blob:
+        return None
+    s3_blobs_table.update(
+        {'ref_count': blob.get('ref_count', 0) + 1, 'updated_at': _now()},
+        Q.content_hash == content_hash
+    )
+    return s3_blobs_table.get(Q.content_hash == content_hash)
+
+
+def hash_stream(fileobj: BinaryIO, chunk_size: int = HASH_CHUNK_SIZE) -> Tuple[str, int]:
+    """
+    파일 객체를 청크 단위로 읽어 `sha256:<hex>` 형식의 해시와 크기(바이트)를 반환합니다.
+    읽기가 끝나면 파일 위치를 처음으로 되돌립니다.
+    """
+    digest = hashlib.new(HASH_ALGORITHM)
+    size = 0
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(chunk_size), b''):
+        digest.update(chunk)
+        size += len(chunk)
+    fileobj.seek(0)
+    return f"{HASH_ALGORITHM}:{digest.hexdigest()}", size
+
+
+def content_object_key(content_hash: str, ext: str = '') -> str:
+    """콘텐츠 해시로부터 S3 객체 키를 만듭니다. (예: cas/ab/abcdef....wav)"""
+    hex_digest = content_hash.split(':', 1)[-1]
+    suffix = f".{ext.lstrip('.')}" if ext else ''
+    return f"{CAS_PREFIX}/{hex_digest[:2]}/{hex_digest}{suffix}"
+
+
+def acquire_content(
+    data: Union[bytes, BinaryIO],
+    content_type: str,
+    ext: str = ''
+) -> dict:
+    """
+    데이터를 콘텐츠 주소 저장소에 등록하고 참조를 1 증가시킨 blob 레코드를 반환합니다.
+    같은 해시의 객체가 이미 있으면 S3 업로드를 생략합니다.
+    S3 오류(ClientError 등)는 호출자에게 그대로 전달합니다.
+
+    업로드는 전역 락 밖에서 수행하므로 다른 파일의 업로드나 캐시 조회를 막지 않습니다.
+    같은 해시의 동시 요청은 해시별 락으로 직렬화되어 PUT은 한 번만 일어나고,
+    같은 해시의 삭제(release_content)와도 겹치지 않습니다. _lock을 잡은 채로 호출하면 안 됩니다.
+    """
+    fileobj = BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+    content_hash, size = hash_stream(fileobj)
+
+    with _content_lock(content_hash):
+        with _lock:
+            blob = _increment_ref(content_hash)
+        if blob:
+            return blob
+
+        object_key = content_object_key(content_hash, ext)
+        get_s3_client().put_object(
+            Bucket=S3_BUCKET_NAME,
+            Key=object_key,
+            Body=fileobj,
+            ContentType=content_type
+        )
+        with _lock:
+            # 업로드 중에 다른 경로(마이그레이션 등)가 같은 blob을 등록했으면 중복 행을 만들지 않고 참조만 증가
+            blob = _increment_ref(content_hash)
+            if blob:
+                return blob
+            now = _now()
+            s3_blobs_table.insert({
+                'content_hash': content_hash,
+                'object_key': object_key,
+                'size': size,
+                'content_type': content_type,
+                'ref_count': 1,
+                'created_at': now,
+                'updated_at': now
+            })
+            return s3_blobs_table.get(TinyQuery().content_hash == content_hash)
+
+
+def retain_content(content_hash: str) -> Optional[dict]:
+    """이미 저장된 blob의 참조를 1 증가시킵니다. blob이 없으면 None을 반환합니다."""
+    with _lock:
+        return _increment_ref(content_hash)
+
+
+def release_content(content_hash: Optional[str]) -> None:
+    """
+    blob 참조를 1 감소시키고, 더 이상 참조가 없으면 blob 레코드와 S3 객체를 삭제합니다.
+    해시가 없는(마이그레이션 이전) 항목은 무시합니다.
+    S3 삭제는 전역 락 밖에서 수행하므로 _lock을 잡은 채로 호출하면 안 됩니다.
+    """
+    if not content_hash:
+        return
+    Q = TinyQuery()
+    with _content_lock(content_hash):
+        with _lock:
+            blob = s3_blobs_table.get(Q.content_hash == content_hash)
+            if not blob:
+                return
+            ref_count = blob.get('ref_count', 1) - 1
+            if ref_count > 0:
+                s3_blobs_table.update(
+                    {'ref_count': ref_count, 'updated_at': _now()},
+                    Q.content_hash == content_hash
+                )
+                return
+            # 레코드를 먼저 지우므로 이후의 retain_content는 None을 받고, acquire_content는 해시 락을 기다렸다가 다시 업로드
+            s3_blobs_table.remove(Q.content_hash == content_hash)
+        try:
+            get_s3_client().delete_object(Bucket=S3_BUCKET_NAME, Key=blob['object_key'])
+        except Exception as e:
+            # 객체 삭제에 실패해도 카탈로그는 정리 (고아 객체는 버킷 수명주기 정책으로 처리)
+            print(f"[S3 객체 삭제 실패] {blob['object_key']}: {e}")
+
+
+def release_contents(content_hashes: List[Optional[str]]) -> None:
+    """여러 blob 참조를 차례로 반납합니다. (_lock 밖에서 호출)"""
+    for content_hash in content_hashes:
+        release_content(content_hash)
+
+
+def unlink_files(
+    match: Callable[[dict], bool],
+    inserts: Optional[Dict[Table, List[dict]]] = None,
+    removes: Optional[Dict[Table, Callable[[dict], bool]]] = None,
+    updates: Optional[Dict[Table, Callable[[dict], Optional[dict]]]] = None
+) -> int:
+    """
+    match가 참인 카탈로그 항목을 다른 테이블 변경(write_tables 인자)과 같은 한 번의 쓰기로 삭제한 뒤,
+    삭제된 항목의 blob 참조를 반납합니다. 카탈로그 삭제는 removes의 다른 테이블보다 나중에 평가되므로
+    match는 그 삭제 함수들이 모아 둔 값을 참고할 수 있습니다. 반환: 삭제된 카탈로그 항목 수
+    """
+    released: List[Optional[str]] = []
+
+    def is_unlinked(doc: dict) -> bool:
+        if not match(doc):
+            return False
+        released.append(doc.get('content_hash'))
+        return True
+
+    with _lock:
+        write_tables(inserts=inserts, removes={**(removes or {}), s3_table: is_unlinked}, updates=updates)
+    release_contents(released)
+    return len(released)
+
+
+def _file_query(user_id: str, file_name: str, script_name: str):
+    """삭제되지 않은 카탈로그 항목 조건 (필드가 없는 구버전 항목도 매칭되도록 dict 기반 비교)"""
+    def match(doc) -> bool:
+        return (
+            doc.get('user_id') == user_id
+            and doc.get('file_name') == file_name
+            and (doc.get('script_name') or '') == script_name
+            and not doc.get('deleted', False)
+        )
+    return match
+
+
+def _upsert_file(
+    user_id: str,
+    file_name: str,
+    blob: dict,
+    script_name: str,
+    script: Optional[str]
+) -> Tuple[dict, Optional[str]]:
+    """
+    카탈로그(`s3_files`) 항목을 blob에 연결합니다. 호출 시점에 blob 참조는 이미 확보되어 있어야 합니다. (_lock 안에서 호출)
+    반환: (카탈로그 항목, 반납해야 할 blob 해시 또는 None) — 반납은 _lock을 놓은 뒤 release_content로 수행
+    """
+    query = _file_query(user_id, file_name, script_name)
+    now = _now()
+    existing = s3_table.get(query)
+    fields = {
+        'object_key': blob['object_key'],
+        'size': blob['size'],
+        'content_hash': blob['content_hash'],
+        'updated_at': now
+    }
+    if script is not None:
+        fields['script'] = script
+
+    if existing:
+        previous_hash = existing.get('content_hash')
+        s3_table.update(fields, query)
+        # 내용이 바뀌었으면 이전 blob을, 같은 내용으로 덮어썼으면 새로 확보한 중복 참조를 반납
+        to_release = previous_hash if previous_hash != blob['content_hash'] else blob['content_hash']
+    else:
+        s3_table.insert({
+            'id': str(uuid.uuid4()),
+            'user_id': user_id,
+            'script_name': script_name,
+            'file_name': file_name,
+            'script': script,
+            'visibility': 'public' if user_id == 'base_audio' else 'private',
+            'created_at': now,
+            'deleted': False,
+            **fields
+        })
+        to_release = None
+    return s3_table.get(query), to_release
+
+
+def save_file(
+    user_id: str,
+    file_name: str,
+    data: Union[bytes, BinaryIO],
+    content_type: str,
+    script_name: str = '',
+    script: Optional[str] = None
+) -> dict:
+    """
+    파일을 콘텐츠 주소 저장소에 저장하고 `s3_files` 카탈로그 항목을 생성/갱신하여 반환합니다.
+    같은 사용자/파일명 항목이 있으면 새 내용으로 교체하고 이전 blob 참조를 반납합니다.
+    """
+    ext = file_name.rsplit('.', 1)[-1] if '.' in file_name else ''
+    blob = acquire_content(data, content_type, ext)
+    with _lock:
+        saved, to_release = _upsert_file(user_id, file_name, blob, script_name, script)
+    release_content(to_release)
+    return saved
+
+
+def link_file(
+    user_id: str,
+    file_name: str,
+    content_hash: str,
+    script_name: str = '',
+    script: Optional[str] = None
+) -> Optional[dict]:
+    """
+    이미 저장된 blob(content_hash)을 업로드 없이 카탈로그 항목에 연결합니다.
+    blob이 없으면 None을 반환합니다.
+    """
+    with _lock:
+        blob = _increment_ref(content_hash)
+        if blob is None:
+            return None
+        linked, to_release = _upsert_file(user_id, file_name, blob, script_name, script)
+    release_content(to_release)
+    return linked
@@ -0,0 +1,205 @@
+"""
+Supertone API 호출 모듈
+- 보이스 클로닝(cloned-voice 생성)과 TTS(text-to-speech) 호출을 담당합니다.
+- 모든 호출은 공용 HTTP 클라이언트(core/http_client.py)로 연결을 재사용하며, 호출별 제한 시간을 적용합니다.
+- 실패는 SupertoneError(status_code, detail)로 통일하여 API 계층에서 HTTPException으로 변환합니다.
+- 호출은 core/resilience.py를 거칩니다.
+  - TTS(같은 입력이면 같은 결과)는 연결 실패/5xx/429에 재시도하고, 설정 시 헤징 요청을 보냅니다.
+  - 클로닝은 보이스가 중복 생성될 수 있으므로 요청이 전송되지 않은 연결 실패에만 재시도합니다.
+  - 호출 종류별 서킷 브레이커가 열려 있으면 Supertone을 호출하지 않고 503으로 즉시 실패합니다.
+"""
+
+import math
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from core.config import (
+    SUPERTONE_BASE_URL, SUPERTONE_CONNECT_TIMEOUT, SUPERTONE_TIMEOUT,
+    SUPERTONE_RETRY_ATTEMPTS, SUPERTONE_RETRY_BASE_DELAY, SUPERTONE_RETRY_MAX_DELAY,
+    SUPERTONE_BREAKER_THRESHOLD, SUPERTONE_BREAKER_RESET, SUPERTONE_TTS_HEDGE_DELAY
+)
+from core.http_client import get_http_client
+from core.resilience import CircuitBreaker, CircuitOpenError, call_with_resilience, resilience_metrics
+
+DEFAULT_TTS_SETTINGS = {
+    "language": "ko",
+    "style": "neutral",
+    "model": "sona_speech_1",
+    "voice_settings": {
+        "pitch_shift": 0,
+        "pitch_variance": 1,
+        "speed": 1
+    }
+}
+
+
+CLONE_CALL = 'supertone.clone'
+TTS_CALL = 'supertone.tts'
+# 업스트림 장애로 보고 재시도/서킷 실패로 기록하는 응답 코드
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class SupertoneError(Exception):
+    """
+    Supertone 호출 실패 (status_code는 클라이언트에 돌려줄 HTTP 상태 코드)
+    - upstream_status: Supertone 응답 코드 (응답을 받지 못했으면 None)
+    - connect_failed: 연결을 맺지 못해 요청이 전송되지 않음
+    - retry_after: 서킷이 열려 있을 때 다시 시도할 수 있을 때까지 남은 초
+    """
+
+    def __init__(self, status_code: int, detail: str, upstream_status: Optional[int] = None,
+                 connect_failed: bool = False, retry_after: Optional[int] = None):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.upstream_status = upstream_status
+        self.connect_failed = connect_failed
+        self.retry_after = retry_after
+
+    @property
+    def upstream_failure(self) -> bool:
+        """응답이 없거나 5xx/429 (요청 내용이 아닌 업스트림 상태 때문인 실패)"""
+        return self.retry_after is None and (self.upstream_status is None or self.upstream_status in RETRYABLE_STATUS)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(name, SUPERTONE_BREAKER_THRESHOLD, SUPERTONE_BREAKER_RESET)
+    return breaker
+
+
+def reset_breakers() -> None:
+    """서킷 상태를 초기화합니다. (설정 변경/테스트용)"""
+    _breakers.clear()
+
+
+def upstream_stats() -> dict:
+    """호출 종류별 결과 카운터와 서킷 상태"""
+    return {
+        'calls': {name: counters for name, counters in resilience_metrics().items() if name.startswith('supertone.')},
+        'circuits': {name: breaker.snapshot() for name, breaker in _breakers.items()}
+    }
+
+
+def _transport_error(message: str, e: httpx.HTTPError) -> SupertoneError:
+    # 연결 수립/연결 풀 대기 단계의 실패는 요청이 전송되지 않았으므로 재시도해도 안전
+    connect_failed = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+    return SupertoneError(502, f"{message}: {e!r}", connect_failed=connect_failed)
+
+
+def _is_upstream_failure(e: BaseException) -> bool:
+    return isinstance(e, SupertoneError) and e.upstream_failure
+
+
+def _is_connect_failure(e: BaseException) -> bool:
+    return isinstance(e, SupertoneError) and e.connect_failed
+
+
+async def _resilient(name: str, call: Callable[[], Awaitable], **options):
+    try:
+        return await call_with_resilience(
+            name, call, get_breaker(name),
+            is_failure=_is_upstream_failure,
+            base_delay=SUPERTONE_RETRY_BASE_DELAY,
+            max_delay=SUPERTONE_RETRY_MAX_DELAY,
+            **options
+        )
+    except CircuitOpenError as e:
+        retry_after = max(1, math.ceil(e.retry_after))
+        raise SupertoneError(
+            503, f"Supertone API 장애로 요청을 잠시 중단했습니다. {retry_after}초 후 다시 시도해 주세요.",
+            retry_after=retry_after
+        )
+
+
+def _url(path: str) -> str:
+    return f"{SUPERTONE_BASE_URL}{path}"
+
+
+def _timeout(read: Optional[float]) -> httpx.Timeout:
+    return httpx.Timeout(read if read is not None else SUPERTONE_TIMEOUT, connect=SUPERTONE_CONNECT_TIMEOUT)
+
+
+async def create_cloned_voice(
+    api_key: str,
+    name: str,
+    file_name: str,
+    data: bytes,
+    content_type: str,
+    timeout: Optional[float] = None
+) -> str:
+    """
+    음성 파일로 클론 보이스를 생성하고 voice_id를 반환합니다.
+    요청이 전송된 뒤의 실패는 보이스가 이미 생성되었을 수 있으므로 재시도하지 않습니다.
+    """
+    async def call() -> str:
+        try:
+            resp = await get_http_client().post(
+                _url("/v1/custom-voices/cloned-voice"),
+                headers={"x-sup-api-key": api_key},
+                data={'name': name},
+                files={'files': (file_name, data, content_type)},
+                timeout=_timeout(timeout)
+            )
+        except httpx.HTTPError as e:
+            raise _transport_error("Supertone API 호출 실패", e)
+
+        if resp.status_code != 200:
+            raise SupertoneError(502, f"Supertone API 오류 ({resp.status_code}): {resp.text}",
+                                 upstream_status=resp.status_code)
+
+        try:
+            voice_id = resp.json().get('voice_id')
+        except Exception:
+            raise SupertoneError(502, "Supertone API 응답 처리 실패", upstream_status=resp.status_code)
+
+        if not voice_id:
+            raise SupertoneError(502, "Supertone가 voice_id를 반환하지 않았습니다.", upstream_status=resp.status_code)
+        return voice_id
+
+    return await _resilient(CLONE_CALL, call, attempts=SUPERTONE_RETRY_ATTEMPTS, is_retryable=_is_connect_failure)
+
+
+async def text_to_speech(
+    api_key: str,
+    voice_id: str,
+    text: str,
+    output_format: str = 'wav',
+    settings: Optional[dict] = None,
+    timeout: Optional[float] = None
+) -> Tuple[bytes, str]:
+    """
+    지정한 보이스로 문장을 합성합니다. 업스트림 장애(연결 실패, 5xx, 429)는 jitter 백오프로 재시도합니다.
+    반환: (오디오 바이트, X-Audio-Length 헤더 값 또는 "unknown")
+    """
+    payload = {"text": text, **(settings or DEFAULT_TTS_SETTINGS)}
+
+    async def call() -> Tuple[bytes, str]:
+        try:
+            resp = await get_http_client().post(
+                _url(f"/v1/text-to-speech/{voice_id}"),
+                params={"output_format": output_format},
+                headers={"x-sup-api-key": api_key},
+                json=payload,
+                timeout=_timeout(timeout)
+            )
+        except httpx.HTTPError as e:
+            raise _transport_error("Supertone TTS API 호출 실패", e)
+
+        if resp.status_code != 200:
+            raise SupertoneError(502, f"Supertone TTS API 오류 ({resp.status_code}): {resp.text}",
+                                 upstream_status=resp.status_code)
+
+        return resp.content, resp.headers.get("X-Audio-Length", "unknown")
+
+    return await _resilient(
+        TTS_CALL, call,
+        attempts=SUPERTONE_RETRY_ATTEMPTS,
+        is_retryable=_is_upstream_failure,
+        hedge_delay=SUPERTONE_TTS_HEDGE_DELAY or None
+    )
@@ -0,0 +1,227 @@
+"""
+TTS 결과 캐시 (콘텐츠 주소 저장소 기반)
+- TTS 입력(voice_id, 문장, 언어/스타일/모델, voice_settings, 출력 형식)을 정규화한 JSON의 SHA-256을 키로 사용
+- 생성된 오디오는 콘텐츠 주소 저장소(core/storage.py)에 저장하고 `tts_cache` 테이블에 키 → blob 매핑을 기록
+- 캐시 항목은 blob 참조를 하나 보유하므로, 같은 오디오를 사용하는 파일 항목과 독립적으로 제거 가능
+- 전체 크기가 TTS_CACHE_MAX_BYTES를 넘으면 가장 오래 사용되지 않은 항목부터 제거(LRU)
+- 적중 시 사용 시각/횟수는 메모리에 모아 두었다가 일정 개수/시간마다, 그리고 제거 전에 한 번에 저장
+  (적중마다 DB 파일 전체를 다시 쓰지 않도록)
+- 같은 키의 동시 요청은 한 번만 Supertone을 호출 (진행 중인 요청 결과를 공유)
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from tinydb import Query as TinyQuery
+
+from core.config import TTS_CACHE_MAX_BYTES, TTS_CACHE_USAGE_FLUSH_ENTRIES, TTS_CACHE_USAGE_FLUSH_SECONDS
+from core.database import tts_cache_table, write_tables
+# 캐시 항목과 blob 참조 카운트를 함께 갱신하므로 저장소와 같은 락을 사용
+# (S3 업로드/삭제를 하는 acquire_content/release_content는 이 락 밖에서 호출)
+from core.storage import _lock, acquire_content, release_content, release_contents
+from core.supertone import DEFAULT_TTS_SETTINGS, text_to_speech
+
+AUDIO_CONTENT_TYPES = {'wav': 'audio/wav', 'mp3': 'audio/mpeg'}
+
+# 프로세스 단위 적중률 통계 (재시작 시 초기화)
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+_inflight: Dict[str, asyncio.Future] = {}
+
+# 아직 저장하지 않은 사용 기록: cache_key → (마지막 사용 시각, 추가 적중 수)
+_usage: Dict[str, Tuple[str, int]] = {}
+_usage_lock = threading.Lock()
+_usage_flushed_at = time.monotonic()
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + 'Z'
+
+
+def tts_cache_key(voice_id: str, text: str, settings: Optional[dict] = None, output_format: str = 'wav') -> str:
+    """TTS 입력을 정규화(키 정렬, 공백 없는 JSON)하여 `sha256:<hex>` 캐시 키를 만듭니다."""
+    canonical = json.dumps(
+        {
+            'voice_id': voice_id,
+            'text': text,
+            'output_format': output_format,
+            **(settings or DEFAULT_TTS_SETTINGS)
+        },
+        sort_keys=True, ensure_ascii=False, separators=(',', ':')
+    )
+    return 'sha256:' + hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _with_usage(entry: dict) -> dict:
+    """저장된 항목에 아직 저장하지 않은 사용 기록을 반영한 사본"""
+    with _usage_lock:
+        usage = _usage.get(entry['cache_key'])
+    if usage is None:
+        return entry
+    last_used_at, hits = usage
+    return {**entry, 'last_used_at': last_used_at, 'hits': entry.get('hits', 0) + hits}
+
+
+def flush_usage() -> int:
+    """모아 둔 사용 기록을 write_tables 한 번으로 저장하고, 저장한 항목 수를 반환합니다."""
+    global _usage_flushed_at
+    with _usage_lock:
+        pending = dict(_usage)
+        _usage.clear()
+        _usage_flushed_at = time.monotonic()
+    if not pending:
+        return 0
+
+    def fields_for(doc: dict) -> Optional[dict]:
+        usage = pending.get(doc.get('cache_key'))
+        if usage is None:
+            return None
+        return {'last_used_at': usage[0], 'hits': doc.get('hits', 0) + usage[1]}
+
+    write_tables(updates={tts_cache_table: fields_for})
+    return len(pending)
+
+
+def lookup(cache_key: str) -> Optional[dict]:
+    """
+    캐시 항목을 찾아 반환합니다. 없으면 None.
+    사용 시각/횟수는 메모리에 기록하고, TTS_CACHE_USAGE_FLUSH_ENTRIES개가 모이거나
+    TTS_CACHE_USAGE_FLUSH_SECONDS가 지나면 한 번에 저장합니다.
+    """
+    entry = tts_cache_table.get(TinyQuery().cache_key == cache_key)
+    if not entry:
+        return None
+    with _usage_lock:
+        _, hits = _usage.get(cache_key, ('', 0))
+        _usage[cache_key] = (_now(), hits + 1)
+        due = (len(_usage) >= TTS_CACHE_USAGE_FLUSH_ENTRIES
+               or time.monotonic() - _usage_flushed_at >= TTS_CACHE_USAGE_FLUSH_SECONDS)
+    entry = _with_usage(entry)
+    if due:
+        flush_usage()
+    return entry
+
+
+def store(cache_key: str, voice_id: str, data: bytes, audio_length: str, output_format: str = 'wav') -> dict:
+    """생성된 오디오를 저장소에 올리고 캐시 항목을 기록한 뒤, 크기 상한을 넘으면 오래된 항목을 제거합니다."""
+    Q = TinyQuery()
+    existing = tts_cache_table.get(Q.cache_key == cache_key)
+    if existing:
+        return existing
+    blob = acquire_content(data, AUDIO_CONTENT_TYPES.get(output_format, 'application/octet-stream'), output_format)
+    with _lock:
+        existing = tts_cache_table.get(Q.cache_key == cache_key)
+        if not existing:
+            now = _now()
+            tts_cache_table.insert({
+                'cache_key': cache_key,
+                'voice_id': voice_id,
+                'content_hash': blob['content_hash'],
+                'object_key': blob['object_key'],
+                'size': blob['size'],
+                'audio_length': audio_length,
+                'hits': 0,
+                'created_at': now,
+                'last_used_at': now
+            })
+    if existing:
+        # 업로드하는 동안 같은 키가 먼저 기록됨: 새로 확보한 참조는 반납
+        release_content(blob['content_hash'])
+        return existing
+    evict(TTS_CACHE_MAX_BYTES, keep=cache_key)
+    return tts_cache_table.get(Q.cache_key == cache_key)
+
+
+def evict(max_bytes: int, keep: Optional[str] = None) -> int:
+    """
+    캐시 전체 크기가 max_bytes 이하가 될 때까지 마지막 사용 시각이 오래된 항목부터 제거하고
+    제거한 항목 수를 반환합니다. `keep` 키의 항목은 제거하지 않습니다.
+    """
+    Q = TinyQuery()
+    released = []
+    flush_usage()  # 최근 사용 기록을 반영한 뒤 오래된 항목을 고름
+    with _lock:
+        entries = sorted(tts_cache_table.all(), key=lambda e: e.get('last_used_at', ''))
+        total = sum(e.get('size', 0) for e in entries)
+        for entry in entries:
+            if total <= max_bytes:
+                break
+            if entry['cache_key'] == keep:
+                continue
+            tts_cache_table.remove(Q.cache_key == entry['cache_key'])
+            released.append(entry['content_hash'])
+            total -= entry.get('size', 0)
+    release_contents(released)
+    _stats['evictions'] += len(released)
+    return len(released)
+
+
+def invalidate_voice(voice_id: str) -> int:
+    """특정 보이스의 캐시 항목을 모두 제거합니다. (보이스 재생성/삭제 시)"""
+    Q = TinyQuery()
+    with _lock:
+        entries = tts_cache_table.search(Q.voice_id == voice_id)
+        tts_cache_table.remove(Q.voice_id == voice_id)
+    release_contents([entry['content_hash'] for entry in entries])
+    return len(entries)
+
+
+def cache_stats() -> dict:
+    """적중/미스/제거 횟수, 적중률과 현재 캐시 크기를 반환합니다."""
+    entries = tts_cache_table.all()
+    lookups = _stats['hits'] + _stats['misses']
+    return {
+        **_stats,
+        'hit_rate': round(_stats['hits'] / lookups, 4) if lookups else 0.0,
+        'entries': len(entries),
+        'total_bytes': sum(e.get('size', 0) for e in entries),
+        'max_bytes': TTS_CACHE_MAX_BYTES
+    }
+
+
+async def cached_text_to_speech(
+    api_key: str,
+    voice_id: str,
+    text: str,
+    settings: Optional[dict] = None,
+    output_format: str = 'wav'
+) -> dict:
+    """
+    캐시를 먼저 확인하고, 없으면 Supertone TTS를 호출해 결과를 캐시에 저장합니다.
+    반환: 캐시 항목 (content_hash, object_key, size, audio_length 등)
+    Supertone 오류는 SupertoneError로, S3 오류는 그대로 호출자에게 전달됩니다.
+    """
+    cache_key = tts_cache_key(voice_id, text, settings, output_format)
+    entry = await asyncio.to_thread(lookup, cache_key)
+    if entry:
+        _stats['hits'] += 1
+        return entry
+
+    pending = _inflight.get(cache_key)
+    if pending is not None:
+        # 같은 입력을 처리 중인 요청의 결과를 공유
+        _stats['hits'] += 1
+        return await asyncio.shield(pending)
+
+    _stats['misses'] += 1
+    future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = future
+    try:
+        data, audio_length = await text_to_speech(api_key, voice_id, text, output_format, settings)
+        entry = await asyncio.to_thread(store, cache_key, voice_id, data, audio_length, output_format)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # 대기 중인 요청이 없어도 경고가 남지 않도록 조회 처리
+        raise
+    else:
+        future.set_result(entry)
+        return entry
+    finally:
+        _inflight.pop(cache_key, None)
@@ -0,0 +1,236 @@
+"""
+업로드 파일 스트리밍 수신 (음성 파일, 대본 파일)
+- multipart 요청 본문을 청크 단위로 파싱하여 파일별 SpooledTemporaryFile에 기록
+  (작은 파일은 메모리, 큰 파일은 임시 파일로 넘어가므로 요청당 메모리 사용량이 제한됨)
+- 파일 크기가 상한을 넘는 순간 나머지 본문을 읽지 않고 중단
+- 파일 앞부분으로 형식 확인: 음성은 WAV(RIFF/WAVE) 또는 MP3(ID3 태그, MPEG 프레임 동기),
+  대본은 PPTX(ZIP) 또는 텍스트
+"""
+
+import asyncio
+from tempfile import SpooledTemporaryFile
+from typing import Callable, List, Optional
+
+import multipart
+from multipart.multipart import parse_options_header
+from starlette.requests import Request
+
+UPLOAD_SPOOL_MAX_BYTES = 1024 * 1024  # 이보다 큰 파일은 디스크 임시 파일로 기록
+SNIFF_BYTES = 12  # 형식 판별에 필요한 앞부분 길이
+MULTIPART_OVERHEAD_BYTES = 64 * 1024  # 경계/헤더 등 파일 외 본문 허용량
+MAX_PART_HEADER_BYTES = 16 * 1024  # 파트 하나의 헤더(이름+값) 합계 상한. 헤더는 메모리에 모으므로 제한
+# 한 번에 파싱하는 본문 크기. 서버/프록시가 큰 덩어리로 전달해도 이 단위마다 이벤트 루프에 양보
+# (python-multipart 파싱은 순수 파이썬이라 1MB에 수십 ms가 걸림)
+PARSE_SLICE_BYTES = 64 * 1024
+
+
+class UploadRejectedError(Exception):
+    """업로드 거부 (API 계층에서 HTTPException으로 변환)"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def sniff_audio_format(head: bytes) -> Optional[str]:
+    """
+    파일 앞부분으로 오디오 컨테이너를 판별합니다.
+    반환: 'wav' / 'mp3' / None(알 수 없음)
+    """
+    if len(head) >= 12 and head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+        return 'wav'
+    if head[:3] == b'ID3':
+        return 'mp3'
+    if len(head) >= 3 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0:
+        # MPEG 오디오 프레임 헤더: 버전(01 예약)·레이어(00 예약)·비트레이트(1111 금지)·샘플레이트(11 예약) 확인
+        version = (head[1] >> 3) & 0x03
+        layer = (head[1] >> 1) & 0x03
+        bitrate_index = head[2] >> 4
+        sample_rate_index = (head[2] >> 2) & 0x03
+        if version != 1 and layer != 0 and bitrate_index != 0x0F and sample_rate_index != 0x03:
+            return 'mp3'
+    return None
+
+
+def sniff_script_format(head: bytes) -> Optional[str]:
+    """
+    파일 앞부분으로 대본 파일 형식을 판별합니다.
+    반환: 'pptx'(ZIP 로컬 파일 헤더) / 'text'(NUL 바이트 없음) / None(알 수 없음)
+    """
+    if head[:4] == b'PK\x03\x04':
+        return 'pptx'
+    if b'\x00' not in head:
+        return 'text'
+    return None
+
+
+class UploadRules:
+    """파일 종류별 형식 판별 함수와 거부 메시지"""
+
+    def __init__(self, sniff: Callable[[bytes], Optional[str]], size_detail: str, format_detail: str, noun: str):
+        self.sniff = sniff
+        self.size_detail = size_detail
+        self.format_detail = format_detail
+        self.noun = noun  # 파일 수 오류 메시지에 쓰는 이름
+
+
+AUDIO_UPLOAD_RULES = UploadRules(
+    sniff_audio_format,
+    "각 파일은 3MB 이하의 WAV 또는 MP3이어야 합니다.",
+    "지원되지 않는 파일 형식입니다. WAV 또는 MP3만 허용됩니다.",
+    "음성 파일"
+)
+
+
+class ReceivedFile:
+    """스트리밍으로 수신한 업로드 파일 (SpooledTemporaryFile에 보관)"""
+
+    def __init__(self, field_name: str, file_name: str, content_type: str, rules: UploadRules = AUDIO_UPLOAD_RULES):
+        self.field_name = field_name
+        self.file_name = file_name
+        self.content_type = content_type
+        self.file = SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_BYTES)
+        self.size = 0
+        self.format: Optional[str] = None
+        self.rules = rules
+        self._head = b''
+
+    def write(self, data: bytes, max_bytes: int) -> None:
+        self.size += len(data)
+        if self.size > max_bytes:
+            raise UploadRejectedError(400, self.rules.size_detail)
+        if self.format is None and len(self._head) < SNIFF_BYTES:
+            self._head += data[:SNIFF_BYTES - len(self._head)]
+            if len(self._head) >= SNIFF_BYTES:
+                self._check_format()
+        self.file.write(data)
+
+    def finish(self) -> None:
+        if self.format is None:
+            self._check_format()
+        self.file.seek(0)
+
+    def _check_format(self) -> None:
+        self.format = self.rules.sniff(self._head)
+        if self.format is None:
+            raise UploadRejectedError(400, self.rules.format_detail)
+
+    def read_bytes(self) -> bytes:
+        self.file.seek(0)
+        return self.file.read()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+async def receive_audio_files(
+    request: Request,
+    field_name: str,
+    max_files: int,
+    max_file_bytes: int
+) -> List[ReceivedFile]:
+    """
+    multipart 요청에서 `field_name` 음성 파일들을 스트리밍으로 수신합니다.
+
+    - Content-Length가 허용량을 넘으면 본문을 읽기 전에 413으로 거부합니다.
+    - 파일이 max_file_bytes를 넘거나, 헤더가 WAV/MP3가 아니거나, 파일 수가 max_files를 넘으면
+      그 시점에 수신을 중단하고 UploadRejectedError(400)를 발생시킵니다.
+    - 다른 이름의 필드는 무시합니다. 반환된 파일은 호출자가 close() 해야 합니다.
+    """
+    return await receive_files(request, field_name, max_files, max_file_bytes, AUDIO_UPLOAD_RULES)
+
+
+async def receive_files(
+    request: Request,
+    field_name: str,
+    max_files: int,
+    max_file_bytes: int,
+    rules: UploadRules
+) -> List[ReceivedFile]:
+    """receive_audio_files와 같은 방식으로, rules의 형식 판별과 메시지를 사용해 파일들을 수신합니다."""
+    content_length = request.headers.get('content-length')
+    if content_length and content_length.isdigit() and \
+            int(content_length) > max_files * max_file_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise UploadRejectedError(413, "요청 본문이 너무 큽니다. " + rules.size_detail)
+
+    content_type, params = parse_options_header(request.headers.get('content-type', ''))
+    if content_type != b'multipart/form-data' or b'boundary' not in params:
+        raise UploadRejectedError(400, "multipart/form-data 형식으로 업로드해야 합니다.")
+
+    files: List[ReceivedFile] = []
+    state = {'headers': {}, 'header_field': b'', 'header_value': b'', 'header_bytes': 0, 'current': None}
+
+    def on_part_begin():
+        state['headers'] = {}
+        state['header_bytes'] = 0
+        state['current'] = None
+
+    def count_header_bytes(size):
+        state['header_bytes'] += size
+        if state['header_bytes'] > MAX_PART_HEADER_BYTES:
+            raise UploadRejectedError(413, f"파트 헤더가 너무 큽니다 (최대 {MAX_PART_HEADER_BYTES // 1024}KB).")
+
+    def on_header_field(data, start, end):
+        count_header_bytes(end - start)
+        state['header_field'] += data[start:end]
+
+    def on_header_value(data, start, end):
+        count_header_bytes(end - start)
+        state['header_value'] += data[start:end]
+
+    def on_header_end():
+        state['headers'][state['header_field'].lower()] = state['header_value']
+        state['header_field'] = b''
+        state['header_value'] = b''
+
+    def on_headers_finished():
+        _, options = parse_options_header(state['headers'].get(b'content-disposition', b''))
+        name = options.get(b'name', b'').decode('utf-8', 'replace')
+        if name != field_name or b'filename' not in options:
+            return
+        if len(files) >= max_files:
+            raise UploadRejectedError(400, f"정확히 {max_files}개의 {rules.noun}을 업로드해야 합니다.")
+        received = ReceivedFile(
+            name,
+            options[b'filename'].decode('utf-8', 'replace'),
+            state['headers'].get(b'content-type', b'application/octet-stream').decode('latin-1'),
+            rules
+        )
+        files.append(received)
+        state['current'] = received
+
+    def on_part_data(data, start, end):
+        if state['current'] is not None:
+            state['current'].write(data[start:end], max_file_bytes)
+
+    def on_part_end():
+        if state['current'] is not None:
+            state['current'].finish()
+            state['current'] = None
+
+    parser = multipart.MultipartParser(params[b'boundary'], {
+        'on_part_begin': on_part_begin,
+        'on_header_field': on_header_field,
+        'on_header_value': on_header_value,
+        'on_header_end': on_header_end,
+        'on_headers_finished': on_headers_finished,
+        'on_part_data': on_part_data,
+        'on_part_end': on_part_end
+    })
+    try:
+        async for chunk in request.stream():
+            if len(chunk) <= PARSE_SLICE_BYTES:
+                parser.write(chunk)
+                continue
+            for start in range(0, len(chunk), PARSE_SLICE_BYTES):
+                parser.write(chunk[start:start + PARSE_SLICE_BYTES])
+                await asyncio.sleep(0)
+        parser.finalize()
+    except Exception as e:
+        for received in files:
+            received.close()
+        if isinstance(e, UploadRejectedError):
+            raise
+        raise UploadRejectedError(400, f"업로드 본문을 해석할 수 없습니다: {e}")
+    return files
@@ -0,0 +1,68 @@
+"""
+CPU 작업용 프로세스 풀
+- pydub 디코딩/인코딩(ffmpeg 호출 포함), 무음 제거, 볼륨 보정 등 CPU 위주 작업을
+  이벤트 루프 밖의 전용 프로세스 풀에서 실행합니다.
+- 세마포어로 동시에 제출되는 작업 수를 제한하여 메모리 사용량과 대기열 길이를 억제합니다.
+- 풀은 앱 lifespan(main.py)에서 시작/종료하며, 시작되지 않은 상태에서 호출되면 지연 생성합니다.
+"""
+
+import asyncio
+import multiprocessing
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from core.config import AUDIO_WORKERS, AUDIO_MAX_CONCURRENCY
+
+_executor: Optional[ProcessPoolExecutor] = None
+_semaphores = weakref.WeakKeyDictionary()  # 이벤트 루프별 세마포어
+
+
+def _warmup() -> None:
+    """워커 프로세스에서 무거운 모듈(pydub, numpy)을 미리 import"""
+    import core.audio  # noqa: F401
+
+
+def start_audio_workers() -> None:
+    """오디오 처리 프로세스 풀을 시작합니다. (AUDIO_WORKERS=0이면 풀 없이 스레드에서 실행)"""
+    global _executor
+    if _executor is not None or AUDIO_WORKERS <= 0:
+        return
+    # fork는 스레드를 사용하는 서버 프로세스에서 안전하지 않으므로 spawn 사용
+    _executor = ProcessPoolExecutor(
+        max_workers=AUDIO_WORKERS,
+        mp_context=multiprocessing.get_context('spawn')
+    )
+    for _ in range(AUDIO_WORKERS):
+        _executor.submit(_warmup)
+
+
+def shutdown_audio_workers() -> None:
+    """프로세스 풀을 종료합니다. 실행 중인 작업은 완료까지 기다립니다."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+    _semaphores.clear()
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(AUDIO_MAX_CONCURRENCY)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+async def run_audio_task(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    CPU 위주 함수 `fn(*args)`를 프로세스 풀에서 실행하고 결과를 기다립니다.
+    `fn`과 인자/반환값은 pickle 가능해야 합니다. 예외는 호출자에게 그대로 전달됩니다.
+    """
+    async with _get_semaphore():
+        if AUDIO_WORKERS <= 0:
+            return await asyncio.to_thread(fn, *args)
+        start_audio_workers()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, fn, *args)
@@ -1,5 +1,10 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from core.workers import start_audio_workers, shutdown_audio_workers
+from core.http_client import start_http_client, close_http_client
+from core.jobs import start_job_workers, stop_job_workers
+from core.tts_cache import flush_usage
 from api.v1.users import router as users_router
 from api.v1.files import router as files_router
 from api.v1.scripts import router as scripts_router
@@ -7,11 +12,26 @@ from api.v1.voice import router as voice_router
 from api.v1.speech_scripts import router as speech_scripts_router
 from api.v1.practice_scores import router as practice_scores_router
 
+
+# 앱 시작/종료 시 공용 자원(오디오 처리 프로세스 풀, 외부 API HTTP 클라이언트, 작업 큐, TTS 캐시 사용 기록) 관리
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_audio_workers()
+    await start_http_client()
+    await start_job_workers()
+    yield
+    await stop_job_workers()
+    flush_usage()  # TTS 캐시 사용 기록 저장
+    await close_http_client()
+    shutdown_audio_workers()
+
+
 # FastAPI 앱 객체, Swagger 등 글로벌 설정만 담당
 app = FastAPI(
     title="SFITZ API",
     description="React 프론트엔드와 통신하기 위한 백엔드 API입니다.\n\n[담당자] 백엔드팀",
-    version="1.1.0"
+    version="1.1.0",
+    lifespan=lifespan
 )
 
 # CORS 등 글로벌 미들웨어 설정
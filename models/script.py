@@ -55,6 +55,11 @@ class SentenceData(BaseModel):
         default=None,
         description="예상 읽기 시간(초)"
     )
+    audio_object_key: Optional[str] = Field(
+        default=None,
+        description="생성된 TTS 오디오의 S3 객체 경로 (POST /scripts/{script_id}/tts 이후)"
+    )
+    audio_length: Optional[str] = Field(default=None, description="TTS 오디오 길이(초)")
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -94,6 +99,14 @@ class UploadSlideRequest(BaseModel):
     script_text: str = Field(..., description="해당 슬라이드의 발표 대본 전체")
 
 
+class SlideChangeSummary(BaseModel):
+    """슬라이드 재업로드 시 문장(청크) 변경 내역"""
+    kept: int = Field(0, description="그대로 유지된 문장 수 (ID, 오디오, 연습 점수 유지)")
+    updated: int = Field(0, description="ID는 유지하고 텍스트/순서가 바뀐 문장 수")
+    inserted: int = Field(0, description="새로 추가된 문장 수")
+    removed: int = Field(0, description="삭제된 문장 수 (연습 점수도 함께 삭제)")
+
+
 class UploadSlideResponse(BaseModel):
     """슬라이드 업로드 응답"""
     slide_id: str
@@ -102,6 +115,33 @@ class UploadSlideResponse(BaseModel):
     status: SlideStatus
     sentence_count: int
     sentences: List[SentenceData]
+    changes: SlideChangeSummary = Field(default_factory=SlideChangeSummary,
+                                        description="같은 slide_number의 기존 슬라이드 대비 변경 내역")
+
+
+class SlideScriptItem(BaseModel):
+    """일괄 업로드할 슬라이드 하나"""
+    slide_number: int = Field(..., ge=1, description="슬라이드 순서 (1부터 시작)")
+    script_text: str = Field(..., description="해당 슬라이드의 발표 대본 전체")
+
+
+class UploadSlidesBatchRequest(BaseModel):
+    """슬라이드 대본 일괄 업로드 요청"""
+    slides: List[SlideScriptItem] = Field(..., min_length=1, description="슬라이드 목록 (slide_number 중복 불가)")
+
+
+class UploadSlidesBatchResponse(BaseModel):
+    """슬라이드 일괄 업로드 응답"""
+    script_id: str
+    slide_count: int
+    sentence_count: int = Field(..., description="생성된 전체 문장(청크) 수")
+    slides: List[UploadSlideResponse] = Field(..., description="슬라이드별 처리 결과 (요청 순서)")
+
+
+class ScriptImportResponse(UploadSlidesBatchResponse):
+    """발표 자료 파일 가져오기 응답"""
+    source_format: str = Field(..., description="가져온 파일 형식 (pptx/text)")
+    skipped_slides: List[int] = Field(default_factory=list, description="노트(대본)가 비어 있어 건너뛴 슬라이드 번호")
 
 
 class ScriptSummaryResponse(BaseModel):
@@ -123,6 +163,9 @@ class SentencesListResponse(BaseModel):
     slide_id: Optional[str] = Field(None, description="특정 슬라이드만 조회시 ID")
     sentences: List[SentenceData]
     total_count: int
+    speaking_rate_factor: float = Field(
+        1.0, description="duration_estimate에 적용된 사용자별 발화 속도 배율 (연습 기록이 적으면 1.0)"
+    )
 
 
 class PracticeScoreRequest(BaseModel):
@@ -139,3 +182,49 @@ class PracticeScoreResponse(BaseModel):
     best_score: Optional[float]
     attempts: int
     created_at: datetime
+
+
+class ScriptTtsJobAccepted(BaseModel):
+    """대본 일괄 TTS 작업 등록 응답"""
+    job_id: str
+    status: str = Field(..., description="작업 상태 (queued)")
+    status_url: str = Field(..., description="상태 조회 경로")
+
+
+class ScriptTtsFailure(BaseModel):
+    """합성에 실패한 문장"""
+    sentence_id: str
+    detail: str
+
+
+class ScriptTtsResult(BaseModel):
+    """대본 일괄 TTS 결과"""
+    script_id: str
+    voice_id: str
+    total_sentences: int
+    rendered: int = Field(..., description="이번 작업에서 새로 생성한 문장 수")
+    skipped: int = Field(..., description="같은 문장/보이스의 오디오가 이미 있어 건너뛴 문장 수")
+    failed: List[ScriptTtsFailure] = Field(default_factory=list)
+
+
+class ScriptTtsJobResponse(BaseModel):
+    """대본 일괄 TTS 작업 상태"""
+    job_id: str
+    status: str = Field(..., description="queued / running / completed / failed")
+    stage: Optional[str] = Field(default=None, description="진행 상황 (예: rendering 3/10)")
+    created_at: str
+    updated_at: str
+    result: Optional[ScriptTtsResult] = None
+    error: Optional[dict] = Field(default=None, description="작업 실패 정보 (status_code, detail)")
+
+
+class ChunkCacheStatsResponse(BaseModel):
+    """대본 처리 결과 캐시 통계"""
+    hits: int = Field(..., description="캐시 적중 횟수 (영구 계층 적중 포함)")
+    persistent_hits: int = Field(..., description="메모리에 없고 영구 계층에서 찾은 횟수")
+    misses: int = Field(..., description="캐시 미스 횟수 (대본 처리 실행)")
+    evictions: int = Field(..., description="메모리 상한으로 제거된 항목 수")
+    hit_rate: float = Field(..., description="적중률")
+    entries: int = Field(..., description="메모리 캐시 항목 수")
+    max_entries: int = Field(..., description="메모리 캐시 최대 항목 수")
+    persistent_entries: int = Field(..., description="영구 계층 항목 수 (사용하지 않으면 0)")
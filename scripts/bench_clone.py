@@ -0,0 +1,225 @@
+"""
+벤치마크: 보이스 클로닝 전체 경로(POST /voice/clone)의 동시 부하 지연 시간
+
+- 업로드 수신 → 전처리(프로세스 풀) → Supertone 클로닝/TTS → S3 업로드 → presigned URL 발급을
+  실제 API 코드 그대로 실행합니다.
+- Supertone은 scripts/mock_supertone.py 대역 서버(같은 프로세스의 uvicorn 스레드, 또는 --supertone-url)로,
+  S3는 호출마다 --s3-latency만큼 지연되는 메모리 버킷으로, DB는 임시 TinyDB 파일로 대체합니다.
+- 요청마다 다른 사용자로 호출하며(대역의 voice_id도 사용자마다 달라 TTS 캐시가 적중하지 않음),
+  응답의 Server-Timing 헤더에서 단계별 처리 시간을 모아 p50/p95/max를 출력합니다.
+
+사용법: 프로젝트 루트에서
+    python3 scripts/bench_clone.py --requests 24 --concurrency 8
+    python3 scripts/bench_clone.py --clone-latency 1.5 --error-rate 0.05 --samples a.wav b.wav c.wav
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import wave
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import numpy as np
+
+# core.database import 전에 지정되어야 함
+os.environ.setdefault('DB_PATH', os.path.join(tempfile.mkdtemp(prefix='sfitz-bench-'), 'db.json'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+from botocore.exceptions import ClientError  # noqa: E402
+from fastapi import Request  # noqa: E402
+
+import api.v1.voice as voice  # noqa: E402
+import core.s3  # noqa: E402
+import core.storage  # noqa: E402
+import core.supertone  # noqa: E402
+from core.database import users_table  # noqa: E402
+from core.http_client import close_http_client  # noqa: E402
+from core.security import get_current_user_id  # noqa: E402
+from core.workers import shutdown_audio_workers, start_audio_workers  # noqa: E402
+from main import app  # noqa: E402
+from mock_supertone import MockSupertone  # noqa: E402
+
+STAGES = ('receiving', 'preprocessing', 'cloning', 'tts', 'uploading', 'presigning')
+
+
+class MemoryS3:
+    """호출마다 latency초 지연되는 메모리 S3 클라이언트 (이 프로젝트가 사용하는 메서드만 구현)"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.objects = {}
+        self._lock = threading.Lock()
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def put_object(self, Bucket, Key, Body, ContentType=None, **kwargs):
+        self._wait()
+        data = Body.read() if hasattr(Body, 'read') else bytes(Body)
+        with self._lock:
+            self.objects[Key] = (data, ContentType)
+        return {}
+
+    def _get(self, Key, operation):
+        self._wait()
+        with self._lock:
+            if Key not in self.objects:
+                raise ClientError({'Error': {'Code': 'NoSuchKey', 'Message': Key}}, operation)
+            return self.objects[Key]
+
+    def head_object(self, Bucket, Key):
+        data, content_type = self._get(Key, 'HeadObject')
+        return {'ContentLength': len(data), 'ContentType': content_type}
+
+    def get_object(self, Bucket, Key):
+        data, content_type = self._get(Key, 'GetObject')
+        return {'Body': io.BytesIO(data), 'ContentLength': len(data), 'ContentType': content_type}
+
+    def delete_object(self, Bucket, Key):
+        self._wait()
+        with self._lock:
+            self.objects.pop(Key, None)
+        return {}
+
+    def generate_presigned_url(self, ClientMethod, Params, ExpiresIn=300):
+        # 실제 boto3도 네트워크 없이 로컬에서 서명하므로 지연 없음
+        return f"https://bench-s3.local/{Params['Key']}?method={ClientMethod}&expires={ExpiresIn}"
+
+
+def speech_like_wav(seconds: float, seed: int, frame_rate: int = 44100) -> bytes:
+    """음절 사이 쉼이 있는 발화 형태의 모노 16bit WAV (품질 검사 통과용)"""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * frame_rate)
+    t = np.arange(n) / frame_rate
+    envelope = np.sin(2 * np.pi * 1.5 * t) > -0.6
+    samples = 6000 * np.sin(2 * np.pi * (180 + 10 * seed) * t) * envelope + rng.normal(0, 30, n)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(frame_rate)
+        wav.writeframes(samples.astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+def load_samples(paths, seconds: float):
+    if paths:
+        if len(paths) != 3:
+            sys.exit("--samples에는 파일 3개를 지정해야 합니다.")
+        return [(Path(p).name, Path(p).read_bytes()) for p in paths]
+    return [(f"sample{i}.wav", speech_like_wav(seconds, i)) for i in range(3)]
+
+
+def parse_server_timing(header: str) -> dict:
+    timings = {}
+    for item in filter(None, (part.strip() for part in header.split(','))):
+        name, _, params = item.partition(';')
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'dur':
+                timings[name.strip()] = float(value)
+    return timings
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else float('nan')
+
+
+async def run_load(samples, total: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    stage_ms = defaultdict(list)
+    latencies = []
+    statuses = Counter()
+
+    async def one(client: httpx.AsyncClient, index: int):
+        async with semaphore:
+            files = [('files', (name, data, 'audio/wav')) for name, data in samples]
+            started = time.perf_counter()
+            resp = await client.post('/api/v1/voice/clone', files=files, headers={'x-bench-user': f"bench-{index}"})
+            elapsed = (time.perf_counter() - started) * 1000
+        statuses[resp.status_code] += 1
+        if resp.status_code == 200:
+            latencies.append(elapsed)
+            for stage, ms in parse_server_timing(resp.headers.get('server-timing', '')).items():
+                stage_ms[stage].append(ms)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench', timeout=None) as client:
+        wall_started = time.perf_counter()
+        await asyncio.gather(*(one(client, i) for i in range(total)))
+        wall = time.perf_counter() - wall_started
+    await close_http_client()
+    return stage_ms, latencies, statuses, wall
+
+
+def report(stage_ms, latencies, statuses, wall, total):
+    print(f"{'stage':<14} {'p50':>9} {'p95':>9} {'max':>9}")
+    for stage in [s for s in STAGES if s in stage_ms] + sorted(set(stage_ms) - set(STAGES)):
+        values = stage_ms[stage]
+        print(f"{stage:<14} {percentile(values, 50):>7.1f}ms {percentile(values, 95):>7.1f}ms {max(values):>7.1f}ms")
+    if latencies:
+        print(f"{'end-to-end':<14} {percentile(latencies, 50):>7.1f}ms {percentile(latencies, 95):>7.1f}ms "
+              f"{max(latencies):>7.1f}ms")
+    print(f"요청 {total}건, 성공 {len(latencies)}건, 소요 {wall:.2f}s, 처리량 {len(latencies) / wall:.2f} req/s")
+    print("응답 코드:", ', '.join(f"{code}={count}" for code, count in sorted(statuses.items())))
+    print("업스트림 호출:", core.supertone.upstream_stats())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="보이스 클로닝 전체 경로 부하 벤치마크")
+    parser.add_argument('--requests', type=int, default=16, help="총 요청 수")
+    parser.add_argument('--concurrency', type=int, default=4, help="동시 요청 수")
+    parser.add_argument('--samples', nargs='*', help="업로드할 음성 파일 3개 (생략 시 합성 WAV)")
+    parser.add_argument('--sample-seconds', type=float, default=5.0, help="합성 샘플 길이(초)")
+    parser.add_argument('--supertone-url', help="이미 실행 중인 대역 서버 주소 (생략 시 프로세스 안에서 실행)")
+    parser.add_argument('--clone-latency', type=float, default=1.0)
+    parser.add_argument('--tts-latency', type=float, default=0.3)
+    parser.add_argument('--jitter', type=float, default=0.2)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--s3-latency', type=float, default=0.03, help="S3 호출 1회당 지연(초)")
+    args = parser.parse_args()
+
+    samples = load_samples(args.samples, args.sample_seconds)
+
+    mock = None
+    if args.supertone_url:
+        base_url = args.supertone_url.rstrip('/')
+    else:
+        mock = MockSupertone(args.clone_latency, args.tts_latency, args.jitter, args.error_rate, args.seed)
+        base_url = mock.start()
+    core.supertone.SUPERTONE_BASE_URL = base_url
+    voice.SUPERTONE_API_KEY = voice.SUPERTONE_API_KEY or 'bench-key'
+
+    s3 = MemoryS3(args.s3_latency)
+    for module in (core.s3, core.storage, voice):
+        module.get_s3_client = lambda: s3
+
+    def bench_user(request: Request) -> str:
+        return request.headers['x-bench-user']
+
+    app.dependency_overrides[get_current_user_id] = bench_user
+    users_table.insert_multiple({'id': f"bench-{i}", 'username': f"bench-{i}"} for i in range(args.requests))
+
+    start_audio_workers()
+    try:
+        print(f"Supertone 대역: {base_url}, 요청 {args.requests}건 × 동시 {args.concurrency}, "
+              f"샘플 {', '.join(name for name, _ in samples)}")
+        stage_ms, latencies, statuses, wall = asyncio.run(run_load(samples, args.requests, args.concurrency))
+        report(stage_ms, latencies, statuses, wall, args.requests)
+    finally:
+        shutdown_audio_workers()
+        app.dependency_overrides.pop(get_current_user_id, None)
+        if mock is not None:
+            mock.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+벤치마크: 클론 요청 1건당 프로세스 생성 수와 처리 시간 (프로세스 내 코덱 vs ffmpeg)
+
+- 클론 요청과 같은 입력(샘플 3개)으로 build_clone_payload를 실행하며 subprocess.Popen 호출 수를 셉니다.
+- native: core/audio_codecs.py의 wave/NumPy, lameenc, miniaudio 경로
+- ffmpeg: lameenc/miniaudio를 끄고 WAV도 pydub from_file/export를 거치는 기존 경로 (ffmpeg, ffprobe 필요)
+- 케이스: 짧은 WAV(병합 결과가 WAV), 긴 WAV(MP3로 축소), MP3 입력
+
+사용법: 프로젝트 루트에서
+    python3 scripts/bench_clone_codecs.py
+"""
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment
+from pydub.utils import which
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import core.audio as audio  # noqa: E402
+import core.audio_codecs as audio_codecs  # noqa: E402
+
+REPEAT = 3
+
+
+def speech_like(seconds, seed, frame_rate=44100):
+    rng = np.random.default_rng(seed)
+    n = int(seconds * frame_rate)
+    t = np.arange(n) / frame_rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)
+    signal = 8000 * envelope * np.sin(2 * np.pi * 180 * t) + rng.normal(0, 20, n)
+    return AudioSegment(data=signal.astype('<i2').tobytes(), sample_width=2, frame_rate=frame_rate, channels=1)
+
+
+def encode(seg, fmt):
+    bio = BytesIO()
+    seg.export(bio, format=fmt, **({'bitrate': '128k'} if fmt == 'mp3' else {}))
+    return bio.getvalue()
+
+
+@contextmanager
+def count_spawns():
+    real_popen = subprocess.Popen
+    spawns = [0]
+
+    def counting_popen(*args, **kwargs):
+        spawns[0] += 1
+        return real_popen(*args, **kwargs)
+
+    subprocess.Popen = counting_popen
+    try:
+        yield spawns
+    finally:
+        subprocess.Popen = real_popen
+
+
+@contextmanager
+def legacy_codecs():
+    """ffmpeg 경로: 선택 의존성을 끄고 WAV도 pydub로 처리"""
+    saved = (audio_codecs.lameenc, audio_codecs.miniaudio, audio.decode_audio, audio.encode_wav)
+    audio_codecs.lameenc = None
+    audio_codecs.miniaudio = None
+    audio.decode_audio = lambda data, fmt: AudioSegment.from_file(BytesIO(data), format=fmt)
+    audio.encode_wav = lambda seg: encode(seg, 'wav')
+    try:
+        yield
+    finally:
+        audio_codecs.lameenc, audio_codecs.miniaudio, audio.decode_audio, audio.encode_wav = saved
+
+
+def run(samples):
+    best = float('inf')
+    with count_spawns() as spawns:
+        for _ in range(REPEAT):
+            t0 = time.perf_counter()
+            name, data, _ = audio.build_clone_payload(samples)
+            best = min(best, time.perf_counter() - t0)
+    return name, len(data), spawns[0] / REPEAT, best
+
+
+def main():
+    has_ffmpeg = which('ffmpeg') is not None and which('ffprobe') is not None
+    cases = [
+        ("WAV 3 x 5s", [(encode(speech_like(5, i), 'wav'), 'wav') for i in range(3)]),
+        ("WAV 3 x 16s", [(encode(speech_like(16, i), 'wav'), 'wav') for i in range(3)]),
+    ]
+    if has_ffmpeg or audio_codecs.lameenc is not None:
+        cases.append(("MP3 3 x 16s", [(audio_codecs.encode_mp3(speech_like(16, i), 128), 'mp3') for i in range(3)]))
+
+    print(f"{'case':<14} {'path':<7} {'result':<12} {'bytes':>9} {'spawns/req':>10} {'time/req':>10}")
+    modes = [('native', None)] + ([('ffmpeg', legacy_codecs)] if has_ffmpeg else [])
+    for label, samples in cases:
+        for mode, ctx in modes:
+            if ctx is None:
+                name, size, spawns, elapsed = run(samples)
+            else:
+                with ctx():
+                    name, size, spawns, elapsed = run(samples)
+            print(f"{label:<14} {mode:<7} {name:<12} {size:>9} {spawns:>10.1f} {elapsed * 1000:>8.1f}ms")
+    if not has_ffmpeg:
+        print("ffmpeg/ffprobe가 없어 기존 경로 비교는 생략했습니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+벤치마크: 대본 처리(core/script_processor.py) 처리량
+
+- 한국어/영어 혼합 문장(소수점, 약어, 말줄임표, 따옴표, 목록 번호 포함)으로 1KB~10MB 말뭉치를 만들어
+  크기별로 다음을 측정합니다. (반복 실행 중 최솟값)
+  - split: split_sentences — MB/s, 문장/s
+  - chunk: 미리 분할한 문장의 chunk_sentences (전략별, balanced 포함) — 문장/s, 청크/s
+  - process: process_slide_script (분할 + 청크화 + 읽기 시간) — 문장/s, 청크/s
+  - stream: iter_slide_script에 64KB 조각으로 흘려 넣기 — 문장/s, 청크/s
+- --legacy: 기존 re.split + 이중 strip 분할과 비교 (기존 구현은 "3.5", "Dr.", "..." 안에서도 잘라 문장 수가 더 많음)
+
+사용법: 프로젝트 루트에서
+    python3 scripts/bench_script_processor.py
+    python3 scripts/bench_script_processor.py --sizes 1K 100K 1M --ops split process
+    python3 scripts/bench_script_processor.py --legacy --sizes 5M
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.script_processor import ChunkStrategy, ScriptProcessor, iter_slide_script  # noqa: E402
+
+DEFAULT_SIZES = ('1K', '10K', '100K', '1M', '10M')
+OPERATIONS = ('split', 'chunk', 'process', 'stream')
+STREAM_PIECE = 64 * 1024
+MIN_MEASURE_SECONDS = 0.5  # 작은 입력은 이 시간 이상 반복해 측정
+
+SENTENCES = [
+    "안녕하십니까.", "지금부터 발표를 시작하겠습니다.", "올해 매출은 작년 대비 3.5배 증가했습니다.",
+    "여러분, 정말 그럴까요?", "좋은 팀 문화는 조직의 생산성을 높입니다!", "그런데... 문제는 여기서 시작됩니다.",
+    "\"이게 가능할까?\"라고 생각하실 수 있습니다.", "1. 시장 현황을 먼저 보겠습니다.",
+    "Dr. Kim presented the results at 9.30 a.m. yesterday.", "Well... maybe not.",
+    "Our revenue grew by 12.7% this quarter.", "Is this the right approach?",
+    "자세한 내용은 example.com 에서 확인하세요.", "감사합니다.그리고 질문 받겠습니다.",
+    "이번 분기에는 신규 고객 확보, 기존 고객 유지, 운영 비용 절감이라는 세 가지 목표를 동시에 달성하기 위해 "
+    "부서 간 협업 체계를 전면적으로 재정비했습니다.",
+]
+
+CHUNK_CASES = [
+    ('sentence_count', dict(strategy=ChunkStrategy.SENTENCE_COUNT)),
+    ('character_count', dict(strategy=ChunkStrategy.CHARACTER_COUNT)),
+    ('duration', dict(strategy=ChunkStrategy.DURATION)),
+    ('duration+balanced', dict(strategy=ChunkStrategy.DURATION, balanced=True)),
+]
+
+
+def legacy_split_sentences(text):
+    """기존 ScriptProcessor.split_sentences 구현"""
+    text = text.strip()
+    sentences = re.split(r'(?<=[.!?。!？])\s*', text)
+    return [s.strip() for s in sentences if s.strip()]
+
+
+def parse_size(value: str) -> int:
+    units = {'K': 1024, 'M': 1024 * 1024}
+    value = value.strip().upper().rstrip('B')
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def corpus(size_bytes, seed=0):
+    """UTF-8 기준 size_bytes 이상의 말뭉치 (10%는 줄바꿈으로 구분)"""
+    rng = random.Random(seed)
+    parts, size = [], 0
+    while size < size_bytes:
+        part = rng.choice(SENTENCES) + ('\n' if rng.random() < 0.1 else ' ')
+        parts.append(part)
+        size += len(part.encode('utf-8'))
+    return ''.join(parts)
+
+
+def measure(fn, arg):
+    """결과와 1회 최소 소요 시간 (MIN_MEASURE_SECONDS 동안, 최소 3회 반복)"""
+    best = float('inf')
+    result = None
+    started = time.perf_counter()
+    runs = 0
+    while runs < 3 or time.perf_counter() - started < MIN_MEASURE_SECONDS:
+        t0 = time.perf_counter()
+        result = fn(arg)
+        best = min(best, time.perf_counter() - t0)
+        runs += 1
+    return result, best
+
+
+def row(size_label, name, elapsed, size_mb, sentences, chunks=None):
+    chunk_rate = f"{chunks / elapsed:>12,.0f}" if chunks is not None else f"{'-':>12}"
+    print(f"{size_label:>6} {name:<24} {elapsed * 1000:>9.2f}ms {size_mb / elapsed:>8.1f} "
+          f"{sentences / elapsed:>12,.0f} {chunk_rate}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대본 처리 처리량 벤치마크")
+    parser.add_argument('--sizes', nargs='*', default=list(DEFAULT_SIZES), help="말뭉치 크기 (예: 1K 10M)")
+    parser.add_argument('--ops', nargs='*', default=list(OPERATIONS), choices=OPERATIONS)
+    parser.add_argument('--legacy', action='store_true', help="기존 re.split 분할과 비교")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'case':<24} {'time':>11} {'MB/s':>8} {'sentences/s':>12} {'chunks/s':>12}")
+    for size_label in args.sizes:
+        text = corpus(parse_size(size_label), args.seed)
+        size_mb = len(text.encode('utf-8')) / 1024 / 1024
+        sentences = ScriptProcessor.split_sentences(text)
+
+        if args.legacy:
+            result, elapsed = measure(legacy_split_sentences, text)
+            row(size_label, 'split (legacy)', elapsed, size_mb, len(result))
+        if 'split' in args.ops:
+            result, elapsed = measure(ScriptProcessor.split_sentences, text)
+            row(size_label, 'split', elapsed, size_mb, len(result))
+            _, elapsed = measure(lambda t: list(ScriptProcessor.split_sentence_spans(t)), text)
+            row(size_label, 'split (spans)', elapsed, size_mb, len(result))
+        if 'chunk' in args.ops:
+            for name, options in CHUNK_CASES:
+                result, elapsed = measure(lambda s: ScriptProcessor.chunk_sentences(s, **options), sentences)
+                row(size_label, f"chunk {name}", elapsed, size_mb, len(sentences), len(result))
+        if 'process' in args.ops:
+            result, elapsed = measure(ScriptProcessor.process_slide_script, text)
+            row(size_label, 'process', elapsed, size_mb, len(sentences), len(result))
+        if 'stream' in args.ops:
+            pieces = [text[i:i + STREAM_PIECE] for i in range(0, len(text), STREAM_PIECE)]
+            result, elapsed = measure(lambda p: list(iter_slide_script(p)), pieces)
+            row(size_label, 'stream', elapsed, size_mb, len(sentences), len(result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+벤치마크: 시작 무음 감지 (기존 pydub 청크 반복 vs NumPy 벡터 연산)
+
+- 60초 길이의 합성 샘플(여러 샘플레이트/채널)에 대해 두 구현의 결과가 같은지 확인하고 실행 시간을 비교합니다.
+- 실제 녹음 파일 경로를 인자로 주면 해당 파일들도 함께 비교합니다. (MP3는 ffmpeg 필요)
+
+사용법: 프로젝트 루트에서
+    python3 scripts/bench_silence.py
+    python3 scripts/bench_silence.py sample1.wav sample2.mp3
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.audio import detect_leading_silence  # noqa: E402
+
+REPEAT = 5
+
+
+def legacy_detect_leading_silence(audio, silence_threshold=-40, chunk_duration=100):
+    """기존 api/v1/voice.py 구현"""
+    silence_duration = 0
+    for chunk in audio[::chunk_duration]:
+        if chunk.dBFS < silence_threshold:
+            silence_duration += chunk_duration
+        else:
+            break
+    return silence_duration
+
+
+def synthetic(seconds, frame_rate, channels, lead_s):
+    rng = np.random.default_rng(frame_rate + channels)
+    n = int(seconds * frame_rate)
+    t = np.arange(n) / frame_rate
+    signal = 6000 * np.sin(2 * np.pi * 180 * t) + rng.normal(0, 15, n)
+    signal[: int(lead_s * frame_rate)] = rng.normal(0, 15, int(lead_s * frame_rate))
+    data = np.repeat(signal, channels).astype('<i2').tobytes()
+    return AudioSegment(data=data, sample_width=2, frame_rate=frame_rate, channels=channels)
+
+
+def best_of(fn, *args):
+    best = float('inf')
+    result = None
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return result, best
+
+
+def run_case(name, seg):
+    legacy, t_legacy = best_of(legacy_detect_leading_silence, seg)
+    fast, t_fast = best_of(detect_leading_silence, seg)
+    status = "OK " if legacy == fast else "MISMATCH"
+    print(f"{status} {name:<34} {legacy:>6}ms  legacy {t_legacy * 1000:8.2f}ms  "
+          f"numpy {t_fast * 1000:7.2f}ms  x{t_legacy / max(t_fast, 1e-9):.1f}")
+    return legacy == fast
+
+
+def main():
+    ok = True
+    # 시작 무음이 길수록 기존 구현은 더 많은 청크를 순회 (최악: 전체가 무음)
+    for frame_rate, channels in ((16000, 1), (44100, 2), (48000, 2)):
+        for lead_s in (0.5, 30.0, 60.0):
+            seg = synthetic(60, frame_rate, channels, lead_s)
+            ok &= run_case(f"60s {frame_rate}Hz {channels}ch lead={lead_s}s", seg)
+
+    for path in sys.argv[1:]:
+        seg = AudioSegment.from_file(path)
+        ok &= run_case(Path(path).name, seg)
+
+    if not ok:
+        sys.exit("결과 불일치가 있습니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,18 +6,41 @@
 - 기존 각 항목에 `id`, `object_key`, `visibility`, `created_at`, `updated_at`, `deleted` 필드를 추가
 - 변경된 `s3_files` 리스트로 `db.json`을 갱신
 
+대용량 DB(수 GB)에서도 동작하도록 스트리밍 방식으로 처리합니다.
+- 전체 JSON을 메모리에 올리지 않고, `s3_files` 항목만 하나씩 파싱/변환하며
+  나머지 테이블은 원본 바이트를 그대로 복사합니다.
+- `--batch-size`개 항목마다 출력 파일을 fsync하고 체크포인트(`db.json.migrate-checkpoint`)를
+  기록합니다. 중간에 실패하면 같은 명령으로 재실행 시 마지막 체크포인트부터 이어서 진행합니다.
+- 변환은 멱등적입니다. 이미 마이그레이션된 항목은 `id` 등 기존 값을 그대로 유지합니다.
+- 배치마다 진행률과 처리량(records/s, MB/s)을 출력합니다.
+
 사용법: 프로젝트 루트에서
     python3 scripts/migrate_s3.py
+    python3 scripts/migrate_s3.py --db path/to/db.json --batch-size 5000
+    python3 scripts/migrate_s3.py --restart   # 체크포인트 무시하고 처음부터
 
 주의: 실행 전에 저장소/파일을 커밋하거나 백업을 확인하세요. 스크립트는 자동으로 백업을 생성합니다.
 """
+import argparse
 import json
+import os
+import re
 import shutil
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
 
 DB_PATH = Path(__file__).resolve().parents[1] / 'db.json'
+TARGET_KEY = 's3_files'
+DEFAULT_BATCH_SIZE = 10000
+READ_CHUNK_SIZE = 1 << 20  # 1MB
+WRITE_FLUSH_SIZE = 1 << 20
+
+WHITESPACE = b' \t\r\n'
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_STRUCTURAL = re.compile(rb'["{}\[\]]')
+_SCALAR_END = re.compile(rb'[,}\]\s]')
 
 
 def make_object_key(file_info):
@@ -29,48 +52,366 @@ def make_object_key(file_info):
     return key
 
 
-def main():
-    if not DB_PATH.exists():
-        print(f"DB file not found: {DB_PATH}")
-        return
-    ts = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
-    backup = DB_PATH.with_suffix(f'.bak.{ts}')
-    shutil.copy(DB_PATH, backup)
-    print(f"Backup created: {backup}")
+def migrate_item(item, now):
+    """
+    단일 `s3_files` 항목을 새 스키마로 변환합니다.
+    이미 존재하는 값(id 포함)은 유지하므로 여러 번 실행해도 결과가 같습니다.
+    스키마에 없는 추가 필드도 보존합니다.
+    """
+    new_item = {
+        'id': item.get('id') or str(uuid.uuid4()),
+        'user_id': item.get('user_id'),
+        'script_name': item.get('script_name', ''),
+        'file_name': item.get('file_name'),
+        'object_key': item.get('object_key') or make_object_key(item),
+        'script': item.get('script'),
+        'visibility': item.get('visibility') or ('public' if item.get('user_id') == 'base_audio' else 'private'),
+        'size': item.get('size'),
+        'content_hash': item.get('content_hash'),
+        'created_at': item.get('created_at', now),
+        'updated_at': item.get('updated_at', now),
+        'deleted': item.get('deleted', False),
+    }
+    for key, value in item.items():
+        new_item.setdefault(key, value)
+    return new_item
 
-    with open(DB_PATH, 'r', encoding='utf-8') as f:
-        raw = json.load(f)
 
-    old_list = raw.get('s3_files', [])
-    if not old_list:
-        print("No s3_files found to migrate.")
-        return
+class JsonStreamReader:
+    """
+    바이너리 파일 위에서 동작하는 최소한의 스트리밍 JSON 스캐너.
+    구조 문자(`{}[],:"`)는 모두 ASCII이므로 UTF-8 바이트를 디코딩하지 않고 스캔할 수 있습니다.
+    `tell()`은 다음에 읽을 바이트의 절대 오프셋을 반환하므로 체크포인트 재개에 사용합니다.
+    """
+
+    def __init__(self, f, chunk_size=READ_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = b''
+        self.pos = 0
+        self.base = f.tell()  # buf[0]의 절대 오프셋
+
+    def tell(self):
+        return self.base + self.pos
+
+    def _fill(self):
+        if self.pos < len(self.buf):
+            return True
+        self.base += len(self.buf)
+        self.buf = self.f.read(self.chunk_size)
+        self.pos = 0
+        return bool(self.buf)
+
+    def peek(self):
+        """공백을 건너뛰고 다음 구조 문자(1바이트)를 소비하지 않고 반환합니다. EOF면 b''."""
+        while self._fill():
+            while self.pos < len(self.buf):
+                ch = self.buf[self.pos:self.pos + 1]
+                if ch not in WHITESPACE:
+                    return ch
+                self.pos += 1
+        return b''
+
+    def expect(self, ch):
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"JSON 파싱 오류: offset {self.tell()}에서 {ch!r} 기대, {got!r} 발견")
+        self.pos += 1
+
+    def copy_value(self, sink):
+        """
+        JSON 값 하나를 파싱 없이 스캔하며 원본 바이트를 `sink(bytes)`로 흘려보냅니다.
+        값의 크기와 무관하게 메모리 사용량은 읽기 청크 크기 수준으로 유지됩니다.
+        """
+        first = self.peek()
+        if not first:
+            raise ValueError("JSON 파싱 오류: 값이 필요한 위치에서 파일이 끝났습니다.")
+        depth = 0
+        in_string = False
+        escaped = False
+        scalar = first not in (b'{', b'[', b'"')
+        while self._fill():
+            buf = self.buf
+            start = i = self.pos
+            end = len(buf)
+            done = False
+            while i < end:
+                if escaped:
+                    # 직전 청크가 백슬래시로 끝난 경우 이스케이프된 문자 1개를 건너뜀
+                    escaped = False
+                    i += 1
+                    continue
+                if in_string:
+                    m = _STRING_SPECIAL.search(buf, i)
+                    if m is None:
+                        i = end
+                        break
+                    i = m.end()
+                    if m.group() == b'\\':
+                        escaped = True
+                        continue
+                    in_string = False
+                    if depth == 0:
+                        done = True
+                        break
+                elif scalar:
+                    m = _SCALAR_END.search(buf, i)
+                    if m is None:
+                        i = end
+                        break
+                    i = m.start()
+                    done = True
+                    break
+                else:
+                    m = _STRUCTURAL.search(buf, i)
+                    if m is None:
+                        i = end
+                        break
+                    i = m.end()
+                    c = m.group()
+                    if c == b'"':
+                        in_string = True
+                    elif c in (b'{', b'['):
+                        depth += 1
+                    else:
+                        depth -= 1
+                        if depth == 0:
+                            done = True
+                            break
+            sink(buf[start:i])
+            self.pos = i
+            if done:
+                return
+        if not scalar:
+            raise ValueError("JSON 파싱 오류: 값이 닫히기 전에 파일이 끝났습니다.")
+
+    def read_value(self):
+        """JSON 값 하나를 읽어 원본 바이트로 반환합니다. (작은 값 전용)"""
+        parts = []
+        self.copy_value(parts.append)
+        return b''.join(parts)
+
+
+class BufferedSink:
+    """작은 write 호출을 모아 일정 크기마다 파일에 기록합니다."""
+
+    def __init__(self, f, flush_size=WRITE_FLUSH_SIZE):
+        self.f = f
+        self.flush_size = flush_size
+        self.parts = []
+        self.size = 0
+
+    def __call__(self, data):
+        if not data:
+            return
+        self.parts.append(data)
+        self.size += len(data)
+        if self.size >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        if self.parts:
+            self.f.write(b''.join(self.parts))
+            self.parts = []
+            self.size = 0
+
+    def sync(self):
+        self.flush()
+        self.f.flush()
+        os.fsync(self.f.fileno())
+
+
+class Progress:
+    """배치 단위 진행률/처리량 출력"""
+
+    def __init__(self, total_bytes, start_offset=0, start_records=0):
+        self.total_bytes = max(total_bytes, 1)
+        self.start_offset = start_offset
+        self.start_records = start_records
+        self.started = time.monotonic()
+
+    def report(self, offset, records, final=False):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        rec_rate = (records - self.start_records) / elapsed
+        mb_rate = (offset - self.start_offset) / elapsed / (1 << 20)
+        label = "done" if final else "progress"
+        print(
+            f"[{label}] {records} records, "
+            f"{offset / (1 << 20):.1f}/{self.total_bytes / (1 << 20):.1f}MB "
+            f"({offset / self.total_bytes * 100:.1f}%), "
+            f"{rec_rate:.0f} rec/s, {mb_rate:.1f} MB/s"
+        )
+
+
+def _checkpoint_path(db_path):
+    return db_path.with_name(db_path.name + '.migrate-checkpoint')
 
-    new_list = []
+
+def _output_path(db_path):
+    return db_path.with_name(db_path.name + '.migrating')
+
+
+def _source_fingerprint(db_path):
+    st = db_path.stat()
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def _write_checkpoint(path, state):
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _load_checkpoint(db_path):
+    ckpt_path = _checkpoint_path(db_path)
+    out_path = _output_path(db_path)
+    if not ckpt_path.exists() or not out_path.exists():
+        return None
+    with open(ckpt_path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('source') != _source_fingerprint(db_path):
+        print("DB 파일이 체크포인트 이후 변경되어 처음부터 다시 진행합니다.")
+        return None
+    return state
+
+
+def _migrate_container(reader, sink, out, state, batch_size, progress, ckpt_path):
+    """`s3_files` 컨테이너(리스트 또는 TinyDB 테이블 dict)의 항목을 배치 단위로 변환합니다."""
+    is_table = state['container'] == '{'
+    close = b'}' if is_table else b']'
     now = datetime.utcnow().isoformat() + 'Z'
-    for item in old_list:
-        new_item = {
-            'id': str(uuid.uuid4()),
-            'user_id': item.get('user_id'),
-            'script_name': item.get('script_name', ''),
-            'file_name': item.get('file_name'),
-            'object_key': item.get('object_key') or make_object_key(item),
-            'script': item.get('script'),
-            'visibility': 'public' if item.get('user_id') == 'base_audio' else 'private',
-            'size': item.get('size'),
-            'content_hash': item.get('content_hash'),
-            'created_at': item.get('created_at', now),
-            'updated_at': item.get('updated_at', now),
-            'deleted': item.get('deleted', False),
-        }
-        new_list.append(new_item)
-
-    raw['s3_files'] = new_list
-
-    with open(DB_PATH, 'w', encoding='utf-8') as f:
-        json.dump(raw, f, ensure_ascii=False, indent=2)
-
-    print(f"Migration complete. {len(new_list)} records updated in {DB_PATH}")
+    records = state['records']
+
+    while True:
+        ch = reader.peek()
+        if ch == close:
+            reader.pos += 1
+            sink(close)
+            return records
+        if records > 0:
+            reader.expect(b',')
+            sink(b',')
+
+        if is_table:
+            sink(reader.read_value())  # doc_id 키 (문자열)
+            reader.expect(b':')
+            sink(b':')
+        item = json.loads(reader.read_value())
+        sink(json.dumps(migrate_item(item, now), ensure_ascii=False).encode('utf-8'))
+        records += 1
+
+        if records % batch_size == 0:
+            sink.sync()
+            state.update({
+                'records': records,
+                'input_offset': reader.tell(),
+                'output_offset': out.tell(),
+            })
+            _write_checkpoint(ckpt_path, state)
+            progress.report(reader.tell(), records)
+
+
+def migrate(db_path=DB_PATH, batch_size=DEFAULT_BATCH_SIZE, restart=False, backup=True):
+    db_path = Path(db_path)
+    if not db_path.exists():
+        print(f"DB file not found: {db_path}")
+        return
+    ckpt_path = _checkpoint_path(db_path)
+    out_path = _output_path(db_path)
+
+    state = None if restart else _load_checkpoint(db_path)
+    total_bytes = db_path.stat().st_size
+
+    with open(db_path, 'rb') as src:
+        if state:
+            print(f"Resuming from checkpoint: {state['records']} records already migrated.")
+            src.seek(state['input_offset'])
+            out = open(out_path, 'r+b')
+            out.truncate(state['output_offset'])
+            out.seek(state['output_offset'])
+            reader = JsonStreamReader(src)
+        else:
+            if backup:
+                ts = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+                backup_path = db_path.with_suffix(f'.bak.{ts}')
+                shutil.copy(db_path, backup_path)
+                print(f"Backup created: {backup_path}")
+            out = open(out_path, 'wb')
+            reader = JsonStreamReader(src)
+            state = {'source': _source_fingerprint(db_path), 'records': 0}
+
+        progress = Progress(total_bytes, start_offset=reader.tell(), start_records=state['records'])
+        sink = BufferedSink(out)
+        try:
+            if 'container' not in state:
+                # 최상위 객체를 처음부터 스캔하며 s3_files 이전 키들은 그대로 복사
+                reader.expect(b'{')
+                sink(b'{')
+                first_key = True
+                found = False
+                while True:
+                    if reader.peek() == b'}':
+                        break
+                    if not first_key:
+                        reader.expect(b',')
+                        sink(b',')
+                    first_key = False
+                    raw_key = reader.read_value()
+                    reader.expect(b':')
+                    sink(raw_key + b':')
+                    if json.loads(raw_key) == TARGET_KEY:
+                        container = reader.peek()
+                        if container not in (b'[', b'{'):
+                            raise ValueError("s3_files 값은 리스트 또는 테이블(dict)이어야 합니다.")
+                        reader.pos += 1
+                        sink(container)
+                        state['container'] = container.decode()
+                        found = True
+                        break
+                    reader.copy_value(sink)
+                if not found:
+                    out.close()
+                    out_path.unlink()
+                    print("No s3_files found to migrate.")
+                    return
+
+            records = _migrate_container(reader, sink, out, state, batch_size, progress, ckpt_path)
+
+            # s3_files 이후의 나머지 최상위 키/닫는 괄호는 그대로 복사
+            while True:
+                ch = reader.peek()
+                if ch == b'}':
+                    reader.pos += 1
+                    sink(b'}')
+                    break
+                reader.expect(b',')
+                sink(b',')
+                sink(reader.read_value())
+                reader.expect(b':')
+                sink(b':')
+                reader.copy_value(sink)
+            sink.sync()
+        finally:
+            out.close()
+
+    os.replace(out_path, db_path)
+    if ckpt_path.exists():
+        ckpt_path.unlink()
+    progress.report(total_bytes, records, final=True)
+    print(f"Migration complete. {records} records updated in {db_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="s3_files 스키마 마이그레이션 (스트리밍/재개 가능)")
+    parser.add_argument('--db', default=str(DB_PATH), help="대상 db.json 경로")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="체크포인트 간 항목 수")
+    parser.add_argument('--restart', action='store_true', help="체크포인트를 무시하고 처음부터 실행")
+    parser.add_argument('--no-backup', action='store_true', help="백업 파일을 만들지 않음")
+    args = parser.parse_args()
+    migrate(Path(args.db), batch_size=args.batch_size, restart=args.restart, backup=not args.no_backup)
 
 
 if __name__ == '__main__':
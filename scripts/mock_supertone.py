@@ -0,0 +1,185 @@
+"""
+로컬 Supertone API 대역 서버 (부하 테스트/벤치마크용)
+
+- POST /v1/custom-voices/cloned-voice: 업로드 파일을 받아 voice_id(voice-<name>) 반환
+- POST /v1/text-to-speech/{voice_id}: 문장 길이에 비례하는 합성 음성(WAV, 또는 MP3)과 X-Audio-Length 헤더 반환
+- 응답 지연(latency ± jitter)과 오류 비율(error_rate, 500/503 중 무작위)을 호출 종류별로 설정 가능
+- GET /health: 설정값과 호출 종류별 요청/오류 수
+
+사용법: 프로젝트 루트에서
+    python3 scripts/mock_supertone.py --port 9100 --clone-latency 1.5 --tts-latency 0.4 --error-rate 0.02
+
+이 서버로 실제 API를 확인하려면 SUPERTONE_BASE_URL=http://127.0.0.1:9100 으로 API 서버를 실행합니다.
+(scripts/bench_clone.py와 테스트의 supertone_stub fixture는 MockSupertone을 프로세스 안에서 직접 띄웁니다.)
+"""
+import argparse
+import asyncio
+import random
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from fastapi import FastAPI, Request, Response
+from pydub import AudioSegment
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.audio_codecs import encode_mp3, encode_wav  # noqa: E402
+
+TTS_FRAME_RATE = 44100
+SECONDS_PER_CHAR = 0.08  # 한국어 발화 속도(약 12자/초)에 맞춘 합성 음성 길이
+ERROR_STATUSES = (500, 503)
+
+
+def synthesize(text: str, frame_rate: int = TTS_FRAME_RATE) -> AudioSegment:
+    """문장 길이에 비례하는 말소리 형태(음절 단위로 켜지고 꺼지는 톤)의 모노 16bit 음성을 만듭니다."""
+    seconds = max(len(text.strip()), 1) * SECONDS_PER_CHAR + 0.3
+    t = np.arange(int(seconds * frame_rate)) / frame_rate
+    envelope = np.sin(2 * np.pi * 4 * t) > -0.3
+    signal = 6000 * envelope * np.sin(2 * np.pi * 190 * t)
+    return AudioSegment(data=signal.astype('<i2').tobytes(), sample_width=2, frame_rate=frame_rate, channels=1)
+
+
+class MockSupertone:
+    """
+    Supertone API 대역 (벤치마크와 테스트 공용)
+    - clone_latency/tts_latency: 호출 종류별 기본 응답 지연(초), jitter: 지연에 곱해지는 ±비율
+      (delay에 값을 넣으면 두 지연을 한 번에 지정)
+    - error_rate: 요청이 500/503으로 실패할 확률
+    - faults: 호출 종류('clone'/'tts')별로 다음 요청들에 순서대로 적용할 장애
+      (int: 해당 상태 코드로 바로 응답, float: 그만큼 더 늦게 정상 응답)
+    - tts_audio: 지정하면 합성 음성 대신 이 바이트를 TTS 응답으로 돌려줌
+    - requests: (호출 종류, 클라이언트 포트, 요청 헤더) 기록, stats: 호출 종류별 요청/오류 수
+    """
+
+    def __init__(self, clone_latency: float = 1.0, tts_latency: float = 0.3, jitter: float = 0.2,
+                 error_rate: float = 0.0, seed=None, tts_audio: Optional[bytes] = None):
+        self.clone_latency = clone_latency
+        self.tts_latency = tts_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.tts_audio = tts_audio
+        self.rng = random.Random(seed)
+        self.faults = {'clone': [], 'tts': []}
+        self.requests = []
+        self.stats = {kind: {'requests': 0, 'errors': 0} for kind in ('clone', 'tts')}
+        self.base_url = ''
+        self._server = None
+        self._thread = None
+
+    @property
+    def delay(self) -> float:
+        return self.clone_latency
+
+    @delay.setter
+    def delay(self, seconds: float):
+        self.clone_latency = self.tts_latency = seconds
+
+    async def _simulate(self, kind: str, request: Request) -> Optional[Response]:
+        """지연 후 오류를 주입할 차례면 오류 응답을, 아니면 None을 반환합니다."""
+        self.requests.append((kind, request.client.port, dict(request.headers)))
+        self.stats[kind]['requests'] += 1
+        fault = self.faults[kind].pop(0) if self.faults[kind] else None
+        if isinstance(fault, int):
+            self.stats[kind]['errors'] += 1
+            return Response(f'{{"error": "injected {fault}"}}', status_code=fault, media_type='application/json')
+        latency = self.clone_latency if kind == 'clone' else self.tts_latency
+        jitter = 1 + self.rng.uniform(-self.jitter, self.jitter) if self.jitter else 1
+        await asyncio.sleep(max(latency * jitter + (fault or 0.0), 0.0))
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.stats[kind]['errors'] += 1
+            status = self.rng.choice(ERROR_STATUSES)
+            return Response(f'{{"error": "mock upstream error {status}"}}', status_code=status,
+                            media_type='application/json')
+        return None
+
+    def build_app(self) -> FastAPI:
+        app = FastAPI(title="Supertone mock")
+
+        @app.post('/v1/custom-voices/cloned-voice')
+        async def cloned_voice(request: Request):
+            form = await request.form()
+            upload = form.get('files')
+            if upload is None or not request.headers.get('x-sup-api-key'):
+                return Response('{"error": "files and x-sup-api-key are required"}', status_code=400,
+                                media_type='application/json')
+            await upload.read()
+            return await self._simulate('clone', request) or {'voice_id': f"voice-{form.get('name')}"}
+
+        @app.post('/v1/text-to-speech/{voice_id}')
+        async def text_to_speech(voice_id: str, request: Request, output_format: str = 'wav'):
+            payload = await request.json()
+            error = await self._simulate('tts', request)
+            if error is not None:
+                return error
+            if self.tts_audio is not None:
+                return Response(self.tts_audio, media_type='audio/wav', headers={'X-Audio-Length': '0.5'})
+            seg = synthesize(payload.get('text', ''))
+            if output_format == 'mp3':
+                audio, media_type = encode_mp3(seg, 128), 'audio/mpeg'
+            else:
+                audio, media_type = encode_wav(seg), 'audio/wav'
+            return Response(audio, media_type=media_type,
+                            headers={'X-Audio-Length': f"{seg.duration_seconds:.3f}"})
+
+        @app.get('/health')
+        def health():
+            return {
+                'clone_latency': self.clone_latency, 'tts_latency': self.tts_latency, 'jitter': self.jitter,
+                'error_rate': self.error_rate, 'stats': self.stats
+            }
+
+        return app
+
+    def start(self) -> str:
+        """빈 포트에 uvicorn을 별도 스레드로 띄우고 base_url을 반환합니다."""
+        import uvicorn
+
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        self._server = uvicorn.Server(uvicorn.Config(self.build_app(), log_level='warning', lifespan='off'))
+        self._thread = threading.Thread(target=self._server.run, kwargs={'sockets': [sock]}, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        self.base_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+        return self.base_url
+
+    def stop(self):
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+    def connection_count(self) -> int:
+        """요청을 보낸 서로 다른 TCP 연결 수"""
+        return len({port for _, port, _ in self.requests})
+
+
+def create_app(clone_latency: float = 1.0, tts_latency: float = 0.3, jitter: float = 0.2,
+               error_rate: float = 0.0, seed=None) -> FastAPI:
+    """설정값으로 Supertone 대역 앱을 만듭니다. (별도 프로세스로 실행할 때 사용)"""
+    return MockSupertone(clone_latency, tts_latency, jitter, error_rate, seed).build_app()
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="로컬 Supertone API 대역 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--clone-latency', type=float, default=1.0, help="클로닝 응답 지연(초)")
+    parser.add_argument('--tts-latency', type=float, default=0.3, help="TTS 응답 지연(초)")
+    parser.add_argument('--jitter', type=float, default=0.2, help="지연 변동 비율 (0.2 = ±20%%)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="500/503 응답 비율 (0~1)")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    app = create_app(args.clone_latency, args.tts_latency, args.jitter, args.error_rate, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
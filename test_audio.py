@@ -0,0 +1,282 @@
+"""
+음성 신호 처리 유틸리티(core/audio.py) 테스트
+기존 pydub 청크 반복 방식과 동일한 결과를 내는지 확인합니다.
+
+실행: python3 -m pytest test_audio.py
+"""
+
+import io
+import wave
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+from pydub.utils import which
+
+import core.audio_codecs as audio_codecs
+
+from core.audio import (
+    detect_leading_silence, detect_trailing_silence, detect_long_pauses, windowed_rms,
+    AudioProcessingError, build_clone_payload, wav_size, estimate_mp3_size, _export,
+    adjust_gain_to_target, merge_clone_segments,
+    CLONE_MP3_CANDIDATES, MAX_CLONE_PAYLOAD_BYTES, WAV_HEADER_BYTES
+)
+
+
+def legacy_detect_leading_silence(audio, silence_threshold=-40, chunk_duration=100):
+    """기존 api/v1/voice.py 구현 (비교 기준)"""
+    silence_duration = 0
+    for chunk in audio[::chunk_duration]:
+        if chunk.dBFS < silence_threshold:
+            silence_duration += chunk_duration
+        else:
+            break
+    return silence_duration
+
+
+def make_segment(samples: np.ndarray, frame_rate: int, channels: int, sample_width: int = 2) -> AudioSegment:
+    dtype = {1: np.int8, 2: '<i2', 4: '<i4'}[sample_width]
+    return AudioSegment(
+        data=samples.astype(dtype).tobytes(),
+        sample_width=sample_width,
+        frame_rate=frame_rate,
+        channels=channels
+    )
+
+
+def speech_like(rng, seconds, frame_rate, channels, lead_s, tail_s, amplitude=8000, noise=20):
+    """앞뒤 무음 + 중간 쉼이 있는 합성 신호"""
+    n = int(seconds * frame_rate)
+    t = np.arange(n) / frame_rate
+    envelope = (np.sin(2 * np.pi * 0.7 * t) > -0.3).astype(float)
+    signal = amplitude * np.sin(2 * np.pi * 220 * t) * envelope
+    signal[: int(lead_s * frame_rate)] = 0
+    signal[n - int(tail_s * frame_rate):] = 0
+    signal += rng.normal(0, noise, n)
+    return make_segment(np.repeat(signal, channels), frame_rate, channels)
+
+
+@pytest.mark.parametrize("frame_rate,channels", [(16000, 1), (22050, 1), (44100, 2), (48000, 2), (11025, 1)])
+@pytest.mark.parametrize("lead_s", [0.0, 0.35, 1.27])
+def test_leading_silence_matches_legacy(frame_rate, channels, lead_s):
+    rng = np.random.default_rng(int(frame_rate * 10 + lead_s * 100))
+    seg = speech_like(rng, 4.123, frame_rate, channels, lead_s, 0.5)
+    for threshold in (-40, -50, -30):
+        for chunk in (100, 10, 37):
+            assert detect_leading_silence(seg, threshold, chunk) == legacy_detect_leading_silence(seg, threshold, chunk)
+
+
+def test_windowed_rms_matches_pydub_chunks():
+    rng = np.random.default_rng(7)
+    seg = speech_like(rng, 2.0517, 44100, 2, 0.2, 0.2)
+    expected = [chunk.rms for chunk in seg[::100]]
+    assert windowed_rms(seg, 100).tolist() == expected
+
+
+@pytest.mark.parametrize("sample_width", [1, 4])
+def test_other_sample_widths(sample_width):
+    rng = np.random.default_rng(sample_width)
+    scale = {1: 60, 4: 2 ** 28}[sample_width]
+    n = 16000 * 2
+    samples = (rng.normal(0, 1, n) * scale).clip(-scale * 2, scale * 2)
+    samples[:5000] = 0
+    seg = make_segment(samples, 16000, 1, sample_width)
+    assert windowed_rms(seg, 100).tolist() == [chunk.rms for chunk in seg[::100]]
+    assert detect_leading_silence(seg) == legacy_detect_leading_silence(seg)
+
+
+def test_all_silent_and_empty():
+    seg = AudioSegment.silent(duration=1234, frame_rate=16000)
+    assert detect_leading_silence(seg) == legacy_detect_leading_silence(seg)
+    assert detect_trailing_silence(seg) == len(seg)
+    assert detect_long_pauses(seg) == []
+    empty = AudioSegment.empty()
+    assert detect_leading_silence(empty) == legacy_detect_leading_silence(empty) == 0
+
+
+def test_trailing_silence_and_pauses():
+    frame_rate = 16000
+    tone = make_segment(8000 * np.sin(np.arange(frame_rate) * 0.2), frame_rate, 1)  # 1초
+    quiet = AudioSegment.silent(duration=800, frame_rate=frame_rate)
+    short = AudioSegment.silent(duration=300, frame_rate=frame_rate)
+    seg = quiet + tone + quiet + tone + short + tone + AudioSegment.silent(duration=450, frame_rate=frame_rate)
+
+    assert detect_leading_silence(seg) == 800
+    assert detect_trailing_silence(seg) == 450  # 마지막 소리 청크(4800~4900ms) 이후 전체
+    assert detect_long_pauses(seg, min_pause_ms=700) == [(1800, 2600)]
+    assert detect_long_pauses(seg, min_pause_ms=300) == [(1800, 2600), (3600, 3900)]
+
+
+@pytest.mark.parametrize("frame_rate,channels,sample_width", [(44100, 1, 2), (22050, 2, 2), (16000, 1, 4), (8000, 1, 1)])
+def test_wav_size_is_exact(frame_rate, channels, sample_width):
+    seg = AudioSegment.silent(duration=1234, frame_rate=frame_rate).set_channels(channels).set_sample_width(sample_width)
+    assert wav_size(seg) == len(_export(seg, 'wav'))
+
+
+@pytest.mark.skipif(which('ffmpeg') is None and audio_codecs.lameenc is None, reason="MP3 인코딩에 ffmpeg 또는 lameenc 필요")
+def test_mp3_size_estimate_is_slightly_conservative():
+    rng = np.random.default_rng(3)
+    seg = speech_like(rng, 20, 44100, 1, 0.0, 0.0)
+    for rate, bitrate in CLONE_MP3_CANDIDATES:
+        actual = len(_export(seg.set_frame_rate(rate), 'mp3', bitrate=f"{bitrate}k"))
+        predicted = estimate_mp3_size(len(seg), rate, bitrate)
+        assert actual <= predicted <= actual * 1.03
+
+
+def wav_bytes(seconds, frame_rate=44100, seed=0):
+    seg = speech_like(np.random.default_rng(seed), seconds, frame_rate, 1, 0.0, 0.0)
+    return _export(seg, 'wav')
+
+
+def count_exports(monkeypatch, mp3_size=None, mp3_error=False):
+    """core.audio._export 호출을 기록하고, MP3는 지정한 크기의 가짜 바이트로 대체"""
+    import core.audio
+    calls = []
+    real_export = core.audio._export
+
+    def fake_export(audio, fmt, bitrate=None):
+        calls.append((fmt, audio.frame_rate, bitrate))
+        if fmt != 'mp3':
+            return real_export(audio, fmt)
+        if mp3_error:
+            raise RuntimeError("encoder unavailable")
+        return b'\xff' * mp3_size(audio.frame_rate, bitrate)
+
+    monkeypatch.setattr(core.audio, '_export', fake_export)
+    return calls
+
+
+def test_clone_payload_small_input_encodes_wav_once(monkeypatch):
+    calls = count_exports(monkeypatch)
+    name, data, content_type = build_clone_payload([(wav_bytes(3, seed=i), 'wav') for i in range(3)])
+    assert (name, content_type) == ('merged.wav', 'audio/wav')
+    assert calls == [('wav', 44100, None)]
+    assert len(data) <= MAX_CLONE_PAYLOAD_BYTES
+
+
+def test_clone_payload_large_input_encodes_predicted_mp3_once(monkeypatch):
+    calls = count_exports(monkeypatch, mp3_size=lambda rate, bitrate: 400_000)
+    name, _, content_type = build_clone_payload([(wav_bytes(16, seed=i), 'wav') for i in range(3)])
+    assert (name, content_type) == ('merged.mp3', 'audio/mpeg')
+    assert calls == [('mp3', 22050, '64k')]
+
+
+def test_clone_payload_falls_back_when_prediction_misses(monkeypatch):
+    # 64k 결과가 예측의 약 10배로 나오면 이후 후보 예측도 같은 비율로 보정해 상한에 맞는 것만 시도
+    calls = count_exports(
+        monkeypatch,
+        mp3_size=lambda rate, bitrate: 4_000_000 if bitrate == '64k' else 2_000_000
+    )
+    name, _, _ = build_clone_payload([(wav_bytes(16, seed=i), 'wav') for i in range(3)])
+    assert name == 'merged.mp3'
+    assert calls == [('mp3', 22050, '64k'), ('mp3', 22050, '48k')]
+
+
+def test_clone_payload_encoder_failure_trims_without_retrying(monkeypatch):
+    calls = count_exports(monkeypatch, mp3_error=True)
+    name, data, _ = build_clone_payload([(wav_bytes(16, seed=i), 'wav') for i in range(3)])
+    assert name == 'merged.wav'
+    assert calls == [('mp3', 22050, '64k'), ('wav', 44100, None)]
+    # 상한에 들어가는 최대 길이로 정확히 자름 (프레임 크기 2바이트)
+    assert len(data) == WAV_HEADER_BYTES + (MAX_CLONE_PAYLOAD_BYTES - WAV_HEADER_BYTES) // 2 * 2
+
+
+def test_clone_payload_over_limit_trims_to_exact_budget(monkeypatch):
+    calls = count_exports(monkeypatch, mp3_error=True)
+    stereo = speech_like(np.random.default_rng(1), 10, 48000, 2, 0.0, 0.0)
+    name, data, _ = build_clone_payload([(_export(stereo, 'wav'), 'wav')] * 3)
+    assert name == 'merged.wav'
+    assert [fmt for fmt, _, _ in calls] == ['mp3', 'wav']
+    frame_width = 2 * 2
+    assert MAX_CLONE_PAYLOAD_BYTES - frame_width < len(data) <= MAX_CLONE_PAYLOAD_BYTES
+    with wave.open(io.BytesIO(data)) as wav:
+        assert (wav.getnchannels(), wav.getframerate()) == (2, 48000)
+        assert wav.getnframes() == (MAX_CLONE_PAYLOAD_BYTES - WAV_HEADER_BYTES) // frame_width
+
+
+def test_clone_payload_too_large_without_encoding(monkeypatch):
+    import core.audio
+    calls = count_exports(monkeypatch, mp3_error=True)
+    monkeypatch.setattr(core.audio, 'MAX_CLONE_PAYLOAD_BYTES', WAV_HEADER_BYTES + 1)
+    with pytest.raises(AudioProcessingError) as exc:
+        build_clone_payload([(wav_bytes(3, seed=i), 'wav') for i in range(3)])
+    assert exc.value.status_code == 413
+    assert calls == []  # 맞는 MP3 후보도 없고 WAV 헤더조차 들어가지 않으므로 인코딩하지 않음
+
+
+def legacy_prepare(seg):
+    """기존 prepare_segment 처리 (무음 제거 슬라이싱 → dBFS 기준 apply_gain)"""
+    seg = seg[legacy_detect_leading_silence(seg):]
+    return adjust_gain_to_target(seg, target_dBFS=-12.0, max_change_db=20.0)
+
+
+def assert_merged_regions(merged, expected_segments, gap_ms=100):
+    """병합 결과의 각 구간이 기존 방식으로 처리한 샘플과 같고, 사이가 gap_ms 무음인지 확인"""
+    raw = merged.raw_data
+    gap = int(gap_ms * merged.frame_rate / 1000) * merged.frame_width
+    pos = 0
+    for i, expected in enumerate(expected_segments):
+        if i:
+            assert raw[pos:pos + gap] == b'\0' * gap
+            pos += gap
+        assert raw[pos:pos + len(expected.raw_data)] == expected.raw_data
+        pos += len(expected.raw_data)
+    assert pos == len(raw)
+
+
+@pytest.mark.parametrize("frame_rate,channels,sample_width", [(44100, 1, 2), (48000, 2, 2), (16000, 1, 4)])
+def test_merge_matches_legacy_pipeline(frame_rate, channels, sample_width):
+    rng = np.random.default_rng(frame_rate)
+    segments = [
+        speech_like(rng, 4, frame_rate, channels, lead, 0.5, amplitude=amp).set_sample_width(sample_width)
+        for lead, amp in ((1.2, 800), (0.0, 20000), (0.35, 30000))
+    ]
+    merged = merge_clone_segments(segments)
+    assert (merged.frame_rate, merged.channels, merged.sample_width) == (frame_rate, channels, sample_width)
+    assert_merged_regions(merged, [legacy_prepare(seg) for seg in segments])
+
+
+def test_merge_converts_mismatched_formats_like_pydub():
+    rng = np.random.default_rng(5)
+    segments = [
+        speech_like(rng, 2, 22050, 1, 0.5, 0.0, amplitude=3000),
+        speech_like(rng, 2, 44100, 2, 0.2, 0.0),
+        speech_like(rng, 2, 16000, 1, 0.0, 0.0).set_sample_width(1),
+    ]
+    merged = merge_clone_segments(segments)
+    assert (merged.frame_rate, merged.channels, merged.sample_width) == (44100, 2, 2)
+    expected = [
+        legacy_prepare(seg).set_channels(2).set_frame_rate(44100).set_sample_width(2)
+        for seg in segments
+    ]
+    assert_merged_regions(merged, expected)
+
+
+def test_merge_all_silent_sample_is_dropped():
+    rng = np.random.default_rng(6)
+    silent = make_segment(rng.normal(0, 5, 44100), 44100, 1)
+    loud = speech_like(rng, 2, 44100, 1, 0.0, 0.0)
+    merged = merge_clone_segments([silent, loud])
+    assert_merged_regions(merged, [silent[len(silent):], legacy_prepare(loud)])
+
+
+def test_gated_loudness_ignores_quiet_stretches():
+    # 2초 발화(-20dBFS 수준) + 4초 작은 잡음(무음 기준 -40dB보다는 큼): RMS 방식은 잡음 때문에 과하게 증폭
+    rng = np.random.default_rng(7)
+    n = 44100
+    t = np.arange(2 * n) / n
+    speech = 0.1 * 32768 * np.sqrt(2) * np.sin(2 * np.pi * 200 * t)
+    hum = rng.normal(0, 0.012 * 32768, 4 * n)
+    seg = make_segment(np.concatenate([speech, hum]), n, 1)
+
+    speech_db = {}
+    for mode in ('rms', 'gated'):
+        merged = merge_clone_segments([seg], loudness=mode)
+        speech_db[mode] = merged[:2000].dBFS
+    assert speech_db['gated'] == pytest.approx(-12.0, abs=0.5)
+    assert speech_db['rms'] > -12.0 + 3
+
+
+def test_merge_rejects_unknown_loudness_mode():
+    with pytest.raises(ValueError):
+        merge_clone_segments([AudioSegment.silent(100)], loudness='lufs')
@@ -0,0 +1,111 @@
+"""
+프로세스 내 오디오 코덱(core/audio_codecs.py) 테스트
+ffmpeg를 거치는 pydub 처리와 같은 결과를 내는지 확인합니다.
+
+실행: python3 -m pytest test_audio_codecs.py
+"""
+
+import subprocess
+from io import BytesIO
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+import core.audio_codecs as audio_codecs
+from core.audio import build_clone_payload
+from core.audio_codecs import decode_audio, decode_mp3, decode_wav, encode_mp3, encode_wav
+
+
+def tone(seconds, frame_rate=44100, channels=1, sample_width=2, seed=0):
+    rng = np.random.default_rng(seed)
+    n = int(seconds * frame_rate) * channels
+    t = np.arange(n) / frame_rate
+    signal = 0.4 * np.sin(2 * np.pi * 220 * t) + rng.normal(0, 0.02, n)
+    seg = AudioSegment(
+        data=(signal * 32767).astype('<i2').tobytes(),
+        sample_width=2, frame_rate=frame_rate, channels=channels
+    )
+    return seg.set_sample_width(sample_width)
+
+
+def pydub_wav(seg: AudioSegment) -> bytes:
+    bio = BytesIO()
+    seg.export(bio, format='wav')
+    return bio.getvalue()
+
+
+@pytest.mark.parametrize("sample_width", [1, 2, 3, 4])
+@pytest.mark.parametrize("channels", [1, 2])
+def test_decode_wav_matches_pydub(sample_width, channels):
+    if sample_width == 3:
+        # 24bit WAV 직접 작성 (pydub은 24bit로 내보내지 않음)
+        import wave
+        samples = np.random.default_rng(1).integers(-2 ** 23, 2 ** 23, 8000 * channels, dtype=np.int32)
+        raw = samples.astype('<i4').view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+        bio = BytesIO()
+        with wave.open(bio, 'wb') as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(3)
+            wav.setframerate(16000)
+            wav.writeframes(raw)
+        data = bio.getvalue()
+    else:
+        data = pydub_wav(tone(0.5, 16000, channels, sample_width))
+
+    expected = AudioSegment.from_file(BytesIO(data), format='wav')
+    decoded = decode_wav(data)
+    assert (decoded.frame_rate, decoded.channels, decoded.sample_width) == \
+        (expected.frame_rate, expected.channels, expected.sample_width)
+    assert decoded.raw_data == expected.raw_data
+
+
+@pytest.mark.parametrize("sample_width", [1, 2, 4])
+def test_encode_wav_matches_pydub_export(sample_width):
+    seg = tone(0.7, 22050, 2, sample_width)
+    assert encode_wav(seg) == pydub_wav(seg)
+
+
+def test_decode_audio_does_not_spawn_for_wav(monkeypatch):
+    def no_spawn(*args, **kwargs):
+        raise AssertionError("subprocess spawned")
+
+    monkeypatch.setattr(subprocess, 'Popen', no_spawn)
+    data = pydub_wav(tone(0.3))
+    assert decode_audio(data, 'wav').raw_data == tone(0.3).raw_data
+
+
+@pytest.mark.skipif(audio_codecs.lameenc is None or audio_codecs.miniaudio is None,
+                    reason="lameenc/miniaudio 필요")
+def test_mp3_roundtrip_in_process(monkeypatch):
+    monkeypatch.setattr(subprocess, 'Popen', lambda *a, **k: pytest.fail("subprocess spawned"))
+    seg = tone(2.0, 22050)
+    data = encode_mp3(seg, 64)
+    # CBR 64kbps: 2초 ≈ 16KB (+ 인코더 지연/패딩 프레임)
+    assert 15_000 < len(data) < 18_500
+
+    decoded = decode_mp3(data)
+    assert decoded.frame_rate == 22050 and decoded.sample_width == 2
+    # 인코더 지연/패딩으로 조금 길어질 수 있음
+    assert 2000 <= len(decoded) < 2100
+    assert abs(decoded.dBFS - seg.dBFS) < 1.0
+
+
+@pytest.mark.skipif(audio_codecs.lameenc is None or audio_codecs.miniaudio is None,
+                    reason="lameenc/miniaudio 필요")
+def test_clone_payload_without_subprocess(monkeypatch):
+    # 3개 × 16초 WAV → MP3로 축소되어야 하는 입력에서도 프로세스를 띄우지 않음
+    monkeypatch.setattr(subprocess, 'Popen', lambda *a, **k: pytest.fail("subprocess spawned"))
+    samples = [(pydub_wav(tone(16, seed=i)), 'wav') for i in range(3)]
+    name, data, content_type = build_clone_payload(samples, quality_gate=False)
+    assert (name, content_type) == ('merged.mp3', 'audio/mpeg')
+    assert len(decode_mp3(data)) > 40_000
+
+
+@pytest.mark.skipif(audio_codecs.lameenc is None, reason="lameenc 필요")
+def test_clone_payload_mp3_without_resampling():
+    # 22050Hz 모노 입력은 변환 없이 병합 버퍼(bytearray)가 그대로 인코더로 전달됨
+    samples = [(pydub_wav(tone(25, 22050, seed=i)), 'wav') for i in range(3)]
+    name, data, _ = build_clone_payload(samples, quality_gate=False)
+    assert name == 'merged.mp3'
+    assert isinstance(data, bytes)
@@ -0,0 +1,143 @@
+"""
+음성 샘플 품질 분석(core/audio_quality.py) 및 품질 검사 API 테스트
+- 클리핑/작은 소리/대부분 무음/짧은 길이/잡음 샘플이 각각 해당 항목으로 거부되는지 확인
+- 기준 미달 샘플은 Supertone 호출 없이 422로 거부되는지 확인
+
+실행: python3 -m pytest test_audio_quality.py
+"""
+
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+import api.v1.voice as voice
+import core.workers
+from core.audio import AudioProcessingError, build_clone_payload
+from core.audio_codecs import encode_wav
+from core.audio_quality import analyze_segment, assess_segments, check_quality
+from core.database import users_table
+from core.security import get_current_user_id
+from main import app
+from test_voice_concurrency import make_wav
+
+FRAME_RATE = 22050
+USER_ID = 'quality-user'
+
+
+def voice_like(seconds=4.0, amplitude=6000, noise=20, pause=True, seed=0):
+    """음절 사이 쉼이 있는 발화 형태의 합성 신호 (float 샘플, 포화 처리 전)"""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * FRAME_RATE)
+    t = np.arange(n) / FRAME_RATE
+    envelope = np.sin(2 * np.pi * 1.5 * t) > -0.6 if pause else 1.0
+    return amplitude * np.sin(2 * np.pi * 180 * t) * envelope + rng.normal(0, noise, n)
+
+
+def to_segment(signal):
+    data = np.clip(signal, -32768, 32767).astype('<i2').tobytes()
+    return AudioSegment(data=data, sample_width=2, frame_rate=FRAME_RATE, channels=1)
+
+
+def issue_codes(signal):
+    return [issue['code'] for issue in check_quality(analyze_segment(to_segment(signal)))]
+
+
+def test_good_sample_passes():
+    report = analyze_segment(to_segment(voice_like()))
+    assert check_quality(report) == []
+    assert report['duration_ms'] == 4000
+    assert 3000 <= report['speech_ms'] <= 3800  # 쉼(약 0.2초)이 걸친 청크는 말소리로 계산
+    assert report['peak_dbfs'] == pytest.approx(-14.7, abs=0.2)
+    assert report['clipping_ratio'] == 0.0
+    assert report['snr_db'] > 40
+
+
+def test_metrics_match_pydub():
+    seg = to_segment(voice_like(seed=3))
+    report = analyze_segment(seg)
+    assert report['rms_dbfs'] == pytest.approx(seg.dBFS, abs=0.01)
+    assert report['peak_dbfs'] == pytest.approx(seg.max_dBFS, abs=0.01)
+
+
+@pytest.mark.parametrize("signal,code", [
+    (voice_like(amplitude=60000), 'clipping'),
+    (voice_like(amplitude=60, noise=2), 'too_quiet'),
+    (np.concatenate([voice_like(1.5), np.zeros(FRAME_RATE * 6)]), 'mostly_silence'),
+    (voice_like(0.8), 'too_short'),
+    (voice_like(noise=2500), 'noisy'),
+])
+def test_bad_samples_are_flagged(signal, code):
+    assert code in issue_codes(signal)
+
+
+def test_digital_silence_has_no_level():
+    report = analyze_segment(to_segment(np.zeros(FRAME_RATE)))
+    assert report['rms_dbfs'] is None and report['peak_dbfs'] is None and report['snr_db'] is None
+    assert {'too_quiet', 'mostly_silence', 'too_short'} <= {i['code'] for i in check_quality(report)}
+
+
+def test_thresholds_are_configurable():
+    seg = to_segment(voice_like(seconds=2))
+    assert assess_segments([seg])[0]['passed']
+    report = assess_segments([seg], thresholds={'min_speech_ms': 5000})[0]
+    assert not report['passed']
+    assert [i['code'] for i in report['issues']] == ['too_short']
+
+
+def test_clone_payload_rejects_before_merging(monkeypatch):
+    import core.audio
+    monkeypatch.setattr(core.audio, 'merge_clone_segments', lambda *a, **k: pytest.fail("merged"))
+    samples = [(encode_wav(to_segment(voice_like(seed=i))), 'wav') for i in range(2)]
+    samples.append((encode_wav(to_segment(voice_like(amplitude=60000))), 'wav'))
+
+    with pytest.raises(AudioProcessingError) as exc:
+        build_clone_payload(samples)
+    assert exc.value.status_code == 422
+    assert '3번 파일' in exc.value.detail and '클리핑' in exc.value.detail
+
+
+@pytest.fixture
+def quality_env(monkeypatch, fake_s3, supertone_stub):
+    monkeypatch.setattr(voice, 'SUPERTONE_API_KEY', 'test-key')
+    monkeypatch.setattr(core.workers, 'AUDIO_WORKERS', 0)
+    app.dependency_overrides[get_current_user_id] = lambda: USER_ID
+    users_table.insert({'id': USER_ID, 'username': USER_ID})
+    yield supertone_stub
+    app.dependency_overrides.pop(get_current_user_id, None)
+    users_table.remove(lambda row: row.get('id') == USER_ID)
+
+
+def post(path, files):
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.post(path, files=files)
+    return asyncio.run(scenario())
+
+
+def test_analyze_endpoint_reports_each_file(quality_env):
+    clipped = encode_wav(to_segment(voice_like(amplitude=60000)))
+    files = [('files', ('good.wav', make_wav(2), 'audio/wav')), ('files', ('loud.wav', clipped, 'audio/wav'))]
+    resp = post('/api/v1/voice/analyze', files)
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body['passed'] is False
+    assert [f['file_name'] for f in body['files']] == ['good.wav', 'loud.wav']
+    assert body['files'][0]['passed'] is True
+    assert [i['code'] for i in body['files'][1]['issues']] == ['clipping']
+    assert body['thresholds']['min_speech_ms'] == 1000
+    assert quality_env.requests == []
+
+
+def test_clone_with_bad_sample_skips_supertone(quality_env):
+    quiet = encode_wav(to_segment(voice_like(amplitude=60, noise=2)))
+    files = [('files', (f'{i}.wav', data, 'audio/wav')) for i, data in enumerate([make_wav(2), make_wav(2, seed=1), quiet])]
+    resp = post('/api/v1/voice/clone', files)
+
+    assert resp.status_code == 422
+    assert '3번 파일' in resp.json()['detail']
+    assert quality_env.requests == []
@@ -0,0 +1,25 @@
+"""
+벤치마크 스크립트(scripts/bench_clone.py) 스모크 테스트
+- 공용 Supertone 대역(scripts/mock_supertone.py)을 띄워 요청 2건이 끝까지 성공하는지 확인
+
+실행: python3 -m pytest test_bench_clone.py
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+
+def test_bench_clone_completes_small_run(tmp_path):
+    result = subprocess.run(
+        [sys.executable, str(ROOT / 'scripts' / 'bench_clone.py'), '--requests', '2', '--concurrency', '2',
+         '--sample-seconds', '3', '--clone-latency', '0.01', '--tts-latency', '0.01', '--s3-latency', '0'],
+        cwd=ROOT, env={**os.environ, 'DB_PATH': str(tmp_path / 'db.json')},
+        capture_output=True, text=True, timeout=120
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert '요청 2건, 성공 2건' in result.stdout
@@ -0,0 +1,115 @@
+"""
+대본 처리 결과 캐시(core/chunk_cache.py) 테스트
+- 키: 앞뒤 공백, 청크화 설정, 처리기 버전
+- 메모리 LRU 상한, 영구 계층(chunk_cache 테이블)과 상한
+- 같은 덱 재업로드 시 대본 처리를 건너뜀
+
+실행: python3 -m pytest test_chunk_cache.py
+"""
+
+import pytest
+
+from core import chunk_cache
+from core.database import chunk_cache_table, scripts_table, sentences_table, slides_table
+from core.script_processor import ChunkStrategy, ScriptProcessor
+from core.security import get_current_user_id
+from main import app
+from test_script_slides import SLIDE_TEXT, create_script, deck, run_with_client
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    chunk_cache.clear()
+    monkeypatch.setattr(chunk_cache, '_stats', dict.fromkeys(chunk_cache._stats, 0))
+    yield
+    chunk_cache.clear()
+    chunk_cache_table.truncate()
+
+
+def test_key_depends_on_text_options_and_version(monkeypatch):
+    key = chunk_cache.cache_key(SLIDE_TEXT, {})
+
+    assert chunk_cache.cache_key(f"  {SLIDE_TEXT}\n", {}) == key
+    assert chunk_cache.cache_key(SLIDE_TEXT, {'strategy': ChunkStrategy.CHARACTER_COUNT, 'balanced': False}) == key
+    assert chunk_cache.cache_key(SLIDE_TEXT, {'max_chars': 40}) != key
+    assert chunk_cache.cache_key(SLIDE_TEXT, {'balanced': True}) != key
+    assert chunk_cache.cache_key(SLIDE_TEXT.replace("  ", " ") + " 끝.", {}) != key
+    monkeypatch.setattr(ScriptProcessor, 'PROCESSOR_VERSION', ScriptProcessor.PROCESSOR_VERSION + 1)
+    assert chunk_cache.cache_key(SLIDE_TEXT, {}) != key
+
+
+def test_lookup_rechunk_hits_only_when_reusable():
+    chunks = ScriptProcessor.process_slide_script(SLIDE_TEXT)
+    chunk_cache.put_many([(SLIDE_TEXT, chunks)], {})
+    texts = [text for text, _, _ in chunks]
+
+    assert chunk_cache.lookup_rechunk(SLIDE_TEXT, [], {}) == [chunk + (None,) for chunk in chunks]
+    assert chunk_cache.lookup_rechunk(SLIDE_TEXT, texts, {}) == [chunk + (i,) for i, chunk in enumerate(chunks)]
+    assert chunk_cache.lookup_rechunk(SLIDE_TEXT, texts[:1], {}) is None
+    assert chunk_cache.lookup_rechunk(SLIDE_TEXT, [], {'max_chars': 40}) is None
+    stats = chunk_cache.cache_stats()
+    assert (stats['hits'], stats['misses']) == (2, 2)
+    # 반환값을 수정해도 캐시는 그대로
+    chunk_cache.get(SLIDE_TEXT, {})[0][2].append(99)
+    assert chunk_cache.get(SLIDE_TEXT, {}) == chunks
+
+
+def test_memory_tier_is_bounded_lru(monkeypatch):
+    monkeypatch.setattr(chunk_cache, 'SCRIPT_CHUNK_CACHE_SIZE', 2)
+    texts = [f"{n}번 슬라이드입니다." for n in range(3)]
+    chunk_cache.put_many([(texts[0], []), (texts[1], [])], {})
+    chunk_cache.get(texts[0], {})  # 0번을 최근 사용으로
+    chunk_cache.put_many([(texts[2], [])], {})
+
+    assert chunk_cache.get(texts[1], {}) is None
+    assert chunk_cache.get(texts[0], {}) == []
+    assert chunk_cache.cache_stats()['evictions'] == 1
+
+
+def test_persistent_tier_survives_memory_loss_and_is_bounded(monkeypatch):
+    monkeypatch.setattr(chunk_cache, 'SCRIPT_CHUNK_CACHE_PERSIST', True)
+    monkeypatch.setattr(chunk_cache, 'SCRIPT_CHUNK_CACHE_PERSIST_MAX', 3)
+    texts = [f"{n}번 슬라이드입니다." for n in range(5)]
+    chunk_cache.put_many([(text, ScriptProcessor.process_slide_script(text)) for text in texts[:3]], {})
+    chunk_cache.put_many([(texts[0], ScriptProcessor.process_slide_script(texts[0]))], {})  # 교체, 중복 없음
+    assert len(chunk_cache_table) == 3
+    chunk_cache.put_many([(text, ScriptProcessor.process_slide_script(text)) for text in texts[3:]], {})
+
+    chunk_cache.clear()
+    assert len(chunk_cache_table) == 3
+    assert chunk_cache.get(texts[1], {}) is None  # 가장 먼저 저장된 항목부터 제거
+    assert chunk_cache.get(texts[4], {}) == ScriptProcessor.process_slide_script(texts[4])
+    stats = chunk_cache.cache_stats()
+    assert stats['persistent_hits'] == 1 and stats['persistent_entries'] == 3
+
+
+def test_reuploading_same_deck_skips_processing(monkeypatch):
+    app.dependency_overrides[get_current_user_id] = lambda: 'chunk-cache-user'
+    calls = []
+    real = ScriptProcessor.rechunk_slide_scripts
+    monkeypatch.setattr(ScriptProcessor, 'rechunk_slide_scripts',
+                        staticmethod(lambda slides, **options: (calls.append(len(slides)), real(slides, **options))[1]))
+
+    async def scenario(client):
+        first_id = await create_script(client)
+        second_id = await create_script(client)
+        first = (await client.post(f'/api/v1/scripts/{first_id}/slides', json={'slides': deck(4)})).json()
+        # 다른 스크립트에 같은 덱, 같은 스크립트에 재업로드
+        second = (await client.post(f'/api/v1/scripts/{second_id}/slides', json={'slides': deck(4)})).json()
+        again = (await client.post(f'/api/v1/scripts/{first_id}/slides', json={'slides': deck(4)})).json()
+        stats = (await client.get('/api/v1/scripts/chunk-cache/stats')).json()
+        return first, second, again, stats
+
+    try:
+        first, second, again, stats = run_with_client(scenario)
+    finally:
+        app.dependency_overrides.pop(get_current_user_id, None)
+        for table in (scripts_table, slides_table, sentences_table):
+            table.truncate()
+
+    assert calls == [4]
+    strip = lambda body: [[(s['text'], s['original_sentence_indices']) for s in slide['sentences']]
+                          for slide in body['slides']]
+    assert strip(first) == strip(second) == strip(again)
+    assert all(slide['changes']['kept'] == slide['sentence_count'] for slide in again['slides'])
+    assert (stats['hits'], stats['misses']) == (8, 4)
@@ -0,0 +1,142 @@
+"""
+s3_files 스키마 마이그레이션(scripts/migrate_s3.py) 테스트
+- 리스트 형태와 TinyDB 테이블(dict) 형태의 s3_files 모두 변환, 다른 테이블은 원본 그대로 유지
+- 이스케이프된 따옴표·괄호·유니코드가 든 문자열이 읽기 청크 경계에 걸려도 올바르게 스캔
+- 중간에 실패한 뒤 재실행하면 체크포인트부터 이어서 진행, 두 번째 실행은 결과를 바꾸지 않음
+
+실행: python3 -m pytest test_migrate_s3.py
+"""
+
+import io
+import json
+
+import pytest
+
+from scripts import migrate_s3
+from scripts.migrate_s3 import JsonStreamReader, migrate
+
+TRICKY = '따옴표 \" 백슬래시 \\ 괄호 {[}] 쉼표, 콜론: 🎤'
+
+
+def make_rows(count):
+    return [
+        {'user_id': f'user-{i % 3}', 'file_name': f'{i}_{TRICKY}.wav', 'script_name': '발표' if i % 2 else '',
+         'size': 100 + i, 'extra': {'note': TRICKY, 'tags': ['a', '}', ']']}}
+        for i in range(count)
+    ]
+
+
+def make_db(tmp_path, rows, table_form):
+    s3_files = {str(i + 1): row for i, row in enumerate(rows)} if table_form else rows
+    data = {
+        '_default': {},
+        'users': {'1': {'id': 'u1', 'username': TRICKY}},
+        's3_files': s3_files,
+        'scripts': {'1': {'script_name': '{"not": "json"}', 'text': '끝 \\'}},
+    }
+    path = tmp_path / 'db.json'
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding='utf-8')
+    return path, data
+
+
+def migrated_rows(data, table_form):
+    rows = data['s3_files']
+    return list(rows.values()) if table_form else rows
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """청크 경계가 문자열/이스케이프 한가운데에 걸리도록 읽기 청크를 작게"""
+    monkeypatch.setattr(JsonStreamReader.__init__, '__defaults__', (7,))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 64])
+def test_copy_value_handles_escapes_across_chunks(chunk_size):
+    value = {'text': TRICKY, 'list': [1, -2.5e3, True, None, '\\'], 'nested': {'k': '\\"}'}}
+    raw = json.dumps(value, ensure_ascii=False).encode('utf-8')
+    reader = JsonStreamReader(io.BytesIO(b'  ' + raw + b' , 42]'), chunk_size=chunk_size)
+
+    assert json.loads(reader.read_value()) == value
+    reader.expect(b',')
+    assert reader.read_value() == b'42'
+    assert reader.peek() == b']'
+
+
+@pytest.mark.parametrize('table_form', [False, True])
+def test_migrates_list_and_table_forms(tmp_path, small_chunks, table_form):
+    rows = make_rows(7)
+    path, original = make_db(tmp_path, rows, table_form)
+
+    migrate(path, batch_size=3, backup=False)
+
+    data = json.loads(path.read_text(encoding='utf-8'))
+    assert {key: data[key] for key in ('_default', 'users', 'scripts')} == \
+        {key: original[key] for key in ('_default', 'users', 'scripts')}
+    result = migrated_rows(data, table_form)
+    if table_form:
+        assert list(data['s3_files']) == [str(i) for i in range(1, 8)]
+    assert [row['file_name'] for row in result] == [row['file_name'] for row in rows]
+    assert result[0]['extra'] == rows[0]['extra']
+    assert result[1]['object_key'] == f'user-1/발표/1_{TRICKY}.wav'
+    assert result[0]['object_key'] == f'user-0/0_{TRICKY}.wav'
+    assert all(row['visibility'] == 'private' and row['deleted'] is False for row in result)
+    assert len({row['id'] for row in result}) == len(rows)
+    assert not (tmp_path / 'db.json.migrating').exists()
+    assert not (tmp_path / 'db.json.migrate-checkpoint').exists()
+
+
+@pytest.mark.parametrize('table_form', [False, True])
+def test_resumes_from_checkpoint_after_crash(tmp_path, small_chunks, monkeypatch, table_form):
+    rows = make_rows(10)
+    path, _ = make_db(tmp_path, rows, table_form)
+    original_migrate_item = migrate_s3.migrate_item
+    calls = []
+    crash_at = [8]
+
+    def crashing_migrate_item(item, now):
+        calls.append(item['file_name'])
+        if len(calls) == crash_at[0]:
+            raise RuntimeError('simulated crash')
+        return original_migrate_item(item, now)
+
+    monkeypatch.setattr(migrate_s3, 'migrate_item', crashing_migrate_item)
+    with pytest.raises(RuntimeError):
+        migrate(path, batch_size=3, backup=False)
+
+    checkpoint = json.loads((tmp_path / 'db.json.migrate-checkpoint').read_text())
+    assert checkpoint['records'] == 6
+    assert (tmp_path / 'db.json.migrating').exists()
+    assert json.loads(path.read_text(encoding='utf-8'))['s3_files'] == \
+        ({str(i + 1): row for i, row in enumerate(rows)} if table_form else rows)  # 원본은 그대로
+
+    calls.clear()
+    crash_at[0] = None
+    migrate(path, batch_size=3, backup=False)
+
+    assert calls == [row['file_name'] for row in rows[6:]]  # 체크포인트 이후 항목만 처리
+    result = migrated_rows(json.loads(path.read_text(encoding='utf-8')), table_form)
+    assert [row['file_name'] for row in result] == [row['file_name'] for row in rows]
+    assert all('object_key' in row and 'id' in row for row in result)
+    assert not (tmp_path / 'db.json.migrate-checkpoint').exists()
+
+
+def test_second_run_is_a_no_op(tmp_path, small_chunks):
+    path, _ = make_db(tmp_path, make_rows(5), table_form=True)
+
+    migrate(path, batch_size=2, backup=False)
+    first = path.read_bytes()
+    migrate(path, batch_size=2, backup=False)
+
+    assert path.read_bytes() == first
+
+
+def test_backup_is_created_and_missing_table_is_left_alone(tmp_path):
+    path = tmp_path / 'db.json'
+    path.write_text(json.dumps({'_default': {}, 'users': {}}), encoding='utf-8')
+    before = path.read_bytes()
+
+    migrate(path)
+
+    assert path.read_bytes() == before
+    assert not (tmp_path / 'db.json.migrating').exists()
+    assert [p.read_bytes() for p in tmp_path.glob('db.bak.*')] == [before]
@@ -0,0 +1,195 @@
+"""
+Supertone 호출 안정화(core/resilience.py, core/supertone.py) 테스트
+장애를 주입하는 로컬 대역 서버(conftest.py의 supertone_stub)를 대상으로
+재시도, 서킷 브레이커, 헤징 요청, 결과 카운터를 확인합니다.
+
+실행: python3 -m pytest test_resilience.py
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import core.supertone
+from core.http_client import close_http_client
+from core.resilience import (
+    CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN, CircuitBreaker, CircuitOpenError,
+    backoff_delay, resilience_metrics
+)
+from core.security import get_current_user_id
+from core.supertone import CLONE_CALL, TTS_CALL, SupertoneError, create_cloned_voice, get_breaker, text_to_speech
+from main import app
+
+
+def run(coro):
+    async def wrapper():
+        try:
+            return await coro
+        finally:
+            await close_http_client()
+    return asyncio.run(wrapper())
+
+
+def tts_requests(stub):
+    return [kind for kind, _, _ in stub.requests if kind == 'tts']
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    delays = [backoff_delay(retry, 0.1, 1.0) for retry in range(6) for _ in range(200)]
+    assert all(0 <= d <= 1.0 for d in delays)
+    assert max(backoff_delay(0, 0.1, 1.0) for _ in range(200)) <= 0.1
+    assert len(set(delays)) > 100
+
+
+def test_circuit_breaker_states():
+    now = [0.0]
+    breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_CLOSED
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+    with pytest.raises(CircuitOpenError) as exc:
+        breaker.before_call()
+    assert exc.value.retry_after == 10
+
+    now[0] = 10.5
+    breaker.before_call()  # 시험 호출 허용
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # 시험 호출 중에는 다른 호출 차단
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+
+    now[0] = 21
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.snapshot() == {'state': CIRCUIT_CLOSED, 'consecutive_failures': 0}
+
+
+def test_tts_retries_upstream_errors(supertone_stub):
+    supertone_stub.faults['tts'] = [500, 503]
+    assert run(text_to_speech('key', 'voice', '안녕하세요')) == (supertone_stub.tts_audio, '0.5')
+    assert len(tts_requests(supertone_stub)) == 3
+    counters = resilience_metrics()[TTS_CALL]
+    assert (counters['calls'], counters['retries'], counters['successes'], counters['failures']) == (1, 2, 1, 0)
+    assert get_breaker(TTS_CALL).state == CIRCUIT_CLOSED
+
+
+def test_tts_gives_up_after_max_attempts(supertone_stub):
+    supertone_stub.faults['tts'] = [502, 502, 502, 502]
+    with pytest.raises(SupertoneError) as exc:
+        run(text_to_speech('key', 'voice', '안녕하세요'))
+    assert exc.value.status_code == 502 and exc.value.upstream_status == 502
+    assert len(tts_requests(supertone_stub)) == 3
+    assert resilience_metrics()[TTS_CALL]['failures'] == 1
+
+
+def test_client_errors_are_not_retried(supertone_stub):
+    supertone_stub.faults['tts'] = [400]
+    with pytest.raises(SupertoneError) as exc:
+        run(text_to_speech('key', 'voice', '안녕하세요'))
+    assert exc.value.upstream_status == 400
+    assert len(tts_requests(supertone_stub)) == 1
+    assert get_breaker(TTS_CALL).consecutive_failures == 0
+
+
+def test_clone_is_not_retried_after_request_was_sent(supertone_stub):
+    supertone_stub.faults['clone'] = [500]
+    with pytest.raises(SupertoneError):
+        run(create_cloned_voice('key', 'tester', 'merged.wav', b'RIFF', 'audio/wav'))
+    assert [kind for kind, _, _ in supertone_stub.requests] == ['clone']
+    assert resilience_metrics()[CLONE_CALL]['retries'] == 0
+
+
+def test_clone_retries_connection_failures(supertone_stub, monkeypatch):
+    real_get_client = core.supertone.get_http_client
+    failures = [httpx.ConnectError('connection refused')]
+
+    class FlakyClient:
+        async def post(self, *args, **kwargs):
+            if failures:
+                raise failures.pop()
+            return await real_get_client().post(*args, **kwargs)
+
+    monkeypatch.setattr(core.supertone, 'get_http_client', lambda: FlakyClient())
+    assert run(create_cloned_voice('key', 'tester', 'merged.wav', b'RIFF', 'audio/wav')) == 'voice-tester'
+    assert resilience_metrics()[CLONE_CALL]['retries'] == 1
+
+
+def test_open_circuit_fails_fast_until_reset(supertone_stub, monkeypatch):
+    monkeypatch.setattr(core.supertone, 'SUPERTONE_RETRY_ATTEMPTS', 1)
+    monkeypatch.setattr(core.supertone, 'SUPERTONE_BREAKER_THRESHOLD', 2)
+    monkeypatch.setattr(core.supertone, 'SUPERTONE_BREAKER_RESET', 0.3)
+    core.supertone.reset_breakers()
+    supertone_stub.faults['tts'] = [500, 500]
+
+    async def scenario():
+        errors = []
+        for _ in range(3):
+            try:
+                await text_to_speech('key', 'voice', '안녕하세요')
+            except SupertoneError as e:
+                errors.append(e)
+        await asyncio.sleep(0.35)
+        return errors, await text_to_speech('key', 'voice', '안녕하세요')
+
+    errors, recovered = run(scenario())
+
+    assert [e.status_code for e in errors] == [502, 502, 503]
+    assert errors[2].retry_after == 1
+    assert recovered[1] == '0.5'
+    assert len(tts_requests(supertone_stub)) == 3  # 서킷이 열린 동안의 호출은 전송되지 않음
+    assert resilience_metrics()[TTS_CALL]['short_circuited'] == 1
+    assert get_breaker(TTS_CALL).state == CIRCUIT_CLOSED
+
+
+def test_hedged_tts_returns_faster_response(supertone_stub, monkeypatch):
+    monkeypatch.setattr(core.supertone, 'SUPERTONE_TTS_HEDGE_DELAY', 0.05)
+    supertone_stub.faults['tts'] = [1.0]  # 첫 요청만 1초 지연
+
+    start = time.perf_counter()
+    result = run(text_to_speech('key', 'voice', '안녕하세요'))
+    elapsed = time.perf_counter() - start
+
+    assert result == (supertone_stub.tts_audio, '0.5')
+    assert elapsed < 0.8
+    assert len(tts_requests(supertone_stub)) == 2
+    counters = resilience_metrics()[TTS_CALL]
+    assert (counters['hedged'], counters['hedge_wins'], counters['successes']) == (1, 1, 1)
+
+
+def test_hedge_is_not_sent_for_fast_responses(supertone_stub, monkeypatch):
+    monkeypatch.setattr(core.supertone, 'SUPERTONE_TTS_HEDGE_DELAY', 0.5)
+    run(text_to_speech('key', 'voice', '안녕하세요'))
+    assert len(tts_requests(supertone_stub)) == 1
+    assert resilience_metrics()[TTS_CALL]['hedged'] == 0
+
+
+def test_upstream_stats_endpoint(supertone_stub, monkeypatch):
+    monkeypatch.setattr(core.supertone, 'SUPERTONE_RETRY_ATTEMPTS', 1)
+    monkeypatch.setattr(core.supertone, 'SUPERTONE_BREAKER_THRESHOLD', 1)
+    core.supertone.reset_breakers()
+    supertone_stub.faults['tts'] = [500]
+    with pytest.raises(SupertoneError):
+        run(text_to_speech('key', 'voice', '안녕하세요'))
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.get('/api/v1/voice/upstream/stats')
+
+    app.dependency_overrides[get_current_user_id] = lambda: 'stats-user'
+    try:
+        resp = asyncio.run(scenario())
+    finally:
+        app.dependency_overrides.pop(get_current_user_id, None)
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body['circuits'][TTS_CALL]['state'] == CIRCUIT_OPEN
+    assert body['calls'][TTS_CALL]['failures'] == 1
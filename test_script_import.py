@@ -0,0 +1,251 @@
+"""
+발표 자료 파일 가져오기 테스트
+- PPTX 노트 추출: 발표 순서(sldIdLst) 대응, 본문 자리 표시자만 사용, 노트 없는 슬라이드 건너뜀
+- 텍스트 파일: 구분선으로 슬라이드 나누기
+- 가져오기 API: 일괄 업로드 경로로 저장, 잘못된 파일/슬라이드 수 초과 거부, 200장 발표 자료
+
+실행: python3 -m pytest test_script_import.py
+"""
+
+import asyncio
+import io
+import zipfile
+
+import httpx
+import pytest
+
+import api.v1.speech_scripts as speech_scripts
+from core import chunk_cache, storage
+from core.database import scripts_table, slides_table, sentences_table, practice_scores_table
+from core.script_import import ScriptImportError, read_pptx_notes, read_text_slides
+from core.security import get_current_user_id
+from main import app
+
+USER_ID = 'script-import-user'
+
+P = 'http://schemas.openxmlformats.org/presentationml/2006/main'
+A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+R = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+REL = 'http://schemas.openxmlformats.org/package/2006/relationships'
+REL_SLIDE = R + '/slide'
+REL_NOTES = R + '/notesSlide'
+
+
+def rels(*relationships):
+    items = ''.join(
+        f'<Relationship Id="{rid}" Type="{rel_type}" Target="{target}"/>'
+        for rid, rel_type, target in relationships
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="{REL}">{items}</Relationships>'
+
+
+def notes_xml(paragraphs, slide_number):
+    body = ''.join(f'<a:p><a:r><a:t>{text}</a:t></a:r></a:p>' for text in paragraphs)
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?><p:notes xmlns:p="{P}" xmlns:a="{A}"><p:cSld><p:spTree>'
+        '<p:sp><p:nvSpPr><p:nvPr><p:ph type="sldImg"/></p:nvPr></p:nvSpPr></p:sp>'
+        f'<p:sp><p:nvSpPr><p:nvPr><p:ph type="body" idx="1"/></p:nvPr></p:nvSpPr><p:txBody>{body}</p:txBody></p:sp>'
+        '<p:sp><p:nvSpPr><p:nvPr><p:ph type="sldNum" idx="5"/></p:nvPr></p:nvSpPr>'
+        f'<p:txBody><a:p><a:fld type="slidenum"><a:t>{slide_number}</a:t></a:fld></a:p></p:txBody></p:sp>'
+        '</p:spTree></p:cSld></p:notes>'
+    )
+
+
+def make_pptx(notes, order=None):
+    """
+    notes: 발표 순서대로 슬라이드별 노트 문단 목록 (None이면 노트 없음)
+    order: 슬라이드 파트 번호 (기본 1..n). 발표 순서와 파트 번호가 다른 경우를 만들 때 사용
+    """
+    order = order or list(range(1, len(notes) + 1))
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        slide_ids = ''.join(f'<p:sldId id="{256 + i}" r:id="rIdS{part}"/>' for i, part in enumerate(order))
+        archive.writestr('ppt/presentation.xml', (
+            f'<?xml version="1.0" encoding="UTF-8"?><p:presentation xmlns:p="{P}" xmlns:r="{R}">'
+            f'<p:sldIdLst>{slide_ids}</p:sldIdLst><p:sldSz cx="9144000" cy="6858000"/></p:presentation>'
+        ))
+        archive.writestr('ppt/_rels/presentation.xml.rels', rels(
+            *((f'rIdS{part}', REL_SLIDE, f'slides/slide{part}.xml') for part in sorted(order)),
+            ('rIdT', R + '/theme', 'theme/theme1.xml')
+        ))
+        for position, (part, paragraphs) in enumerate(zip(order, notes), start=1):
+            archive.writestr(f'ppt/slides/slide{part}.xml', f'<p:sld xmlns:p="{P}"/>')
+            archive.writestr('ppt/media/image%d.png' % part, b'\x89PNG' + bytes(2048))
+            if paragraphs is None:
+                continue
+            # 노트 파트 번호를 슬라이드 파트 번호와 다르게 하여 관계를 따라가는지 확인
+            archive.writestr(f'ppt/slides/_rels/slide{part}.xml.rels', rels(
+                ('rId1', R + '/image', f'../media/image{part}.png'),
+                ('rId2', REL_NOTES, f'../notesSlides/notesSlide{1000 - part}.xml')
+            ))
+            archive.writestr(f'ppt/notesSlides/notesSlide{1000 - part}.xml', notes_xml(paragraphs, position))
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def import_env():
+    app.dependency_overrides[get_current_user_id] = lambda: USER_ID
+    yield
+    app.dependency_overrides.pop(get_current_user_id, None)
+    for table in (scripts_table, slides_table, sentences_table, practice_scores_table):
+        table.truncate()
+    chunk_cache.clear()
+
+
+def run_with_client(scenario):
+    async def wrapper():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await scenario(client)
+    return asyncio.run(wrapper())
+
+
+async def create_script(client):
+    return (await client.post('/api/v1/scripts', json={'script_name': '발표'})).json()['script_id']
+
+
+async def import_file(client, script_id, name, data, **params):
+    return await client.post(
+        f'/api/v1/scripts/{script_id}/import', files={'file': (name, data)}, params=params
+    )
+
+
+def test_read_pptx_notes_follows_presentation_order():
+    data = make_pptx(
+        [['첫 번째 슬라이드입니다.', '둘째 문단입니다.'], None, ['세 번째 &amp; &lt;특수&gt; 문자입니다.']],
+        order=[3, 1, 2]
+    )
+
+    notes = list(read_pptx_notes(io.BytesIO(data)))
+
+    assert notes == [
+        (1, '첫 번째 슬라이드입니다.\n둘째 문단입니다.'),
+        (2, ''),
+        (3, '세 번째 & <특수> 문자입니다.'),
+    ]
+
+
+def test_read_pptx_notes_rejects_non_presentation_zip():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('hello.txt', 'hi')
+
+    with pytest.raises(ScriptImportError):
+        list(read_pptx_notes(io.BytesIO(buffer.getvalue())))
+    with pytest.raises(ScriptImportError):
+        list(read_pptx_notes(io.BytesIO(b'PK\x03\x04' + bytes(100))))
+
+
+def test_read_text_slides_splits_on_delimiter_lines():
+    text = '﻿첫 슬라이드.\n이어지는 줄.\n---\n\n  ---  \n셋째 슬라이드. 내용에 --- 포함.\n'
+
+    slides = list(read_text_slides(io.BytesIO(text.encode('utf-8'))))
+
+    assert slides == [(1, '첫 슬라이드.\n이어지는 줄.'), (2, ''), (3, '셋째 슬라이드. 내용에 --- 포함.')]
+    assert list(read_text_slides(io.BytesIO('a\n###\nb'.encode()), '###')) == [(1, 'a'), (2, 'b')]
+
+
+def test_import_pptx_saves_notes_as_slides(import_env):
+    data = make_pptx([['안녕하십니까. 발표를 시작하겠습니다.'], None, ['감사합니다.']], order=[2, 3, 1])
+
+    async def scenario(client):
+        script_id = await create_script(client)
+        resp = await import_file(client, script_id, 'deck.pptx', data)
+        sentences = await client.get(f'/api/v1/scripts/{script_id}/sentences')
+        return script_id, resp, sentences
+
+    script_id, resp, sentences = run_with_client(scenario)
+
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body['source_format'] == 'pptx'
+    assert body['skipped_slides'] == [2]
+    assert body['slide_count'] == 2
+    assert [slide['slide_number'] for slide in body['slides']] == [1, 3]
+    assert [s['text'] for s in sentences.json()['sentences']] == ['안녕하십니까. 발표를 시작하겠습니다.', '감사합니다.']
+    assert sorted(slide['slide_number'] for slide in slides_table.all() if slide['script_id'] == script_id) == [1, 3]
+
+
+def test_import_text_file_reuses_batch_path(import_env):
+    text = '첫 슬라이드입니다.\n---\n두 번째 슬라이드입니다.\n'
+
+    async def scenario(client):
+        script_id = await create_script(client)
+        first = await import_file(client, script_id, 'script.txt', text.encode())
+        again = await import_file(client, script_id, 'script.txt', text.replace('두 번째', '2번').encode())
+        return first, again
+
+    first, again = run_with_client(scenario)
+
+    assert first.status_code == 200, first.text
+    assert first.json()['source_format'] == 'text'
+    assert first.json()['sentence_count'] == 2
+    assert again.status_code == 200, again.text
+    first_ids = [s['sentence_id'] for slide in first.json()['slides'] for s in slide['sentences']]
+    again_ids = [s['sentence_id'] for slide in again.json()['slides'] for s in slide['sentences']]
+    assert again_ids[0] == first_ids[0]  # 바뀌지 않은 슬라이드의 문장은 유지
+    assert again.json()['slides'][1]['changes']['updated'] == 1
+
+
+@pytest.mark.parametrize("name,data", [
+    ('image.png', b'\x89PNG\r\n\x1a\n' + bytes(64)),
+    ('deck.pptx', b'PK\x03\x04' + bytes(64)),
+    ('empty.txt', b'\n---\n  \n'),
+])
+def test_import_rejects_unusable_files(import_env, name, data):
+    async def scenario(client):
+        script_id = await create_script(client)
+        return await import_file(client, script_id, name, data)
+
+    resp = run_with_client(scenario)
+
+    assert resp.status_code == 400, resp.text
+    assert slides_table.all() == []
+
+
+def test_import_rejects_too_many_slides(import_env, monkeypatch):
+    monkeypatch.setattr(speech_scripts, 'SCRIPT_BATCH_MAX_SLIDES', 3)
+
+    async def scenario(client):
+        script_id = await create_script(client)
+        return await import_file(client, script_id, 'script.txt', '\n---\n'.join('슬라이드.' for _ in range(4)).encode())
+
+    resp = run_with_client(scenario)
+
+    assert resp.status_code == 400
+    assert '3' in resp.json()['detail']
+    assert slides_table.all() == []
+
+
+def test_import_rejects_missing_file_field(import_env):
+    async def scenario(client):
+        script_id = await create_script(client)
+        return await client.post(f'/api/v1/scripts/{script_id}/import', files={'other': ('a.txt', b'hi')})
+
+    assert run_with_client(scenario).status_code == 400
+
+
+def test_import_large_deck_in_one_write(import_env, monkeypatch):
+    slide_count = 200
+    data = make_pptx([[f'{i}번 슬라이드의 노트입니다.', '다음으로 넘어가겠습니다.'] for i in range(1, slide_count + 1)])
+    writes = []
+    original = storage.write_tables
+
+    def counting_write_tables(**kwargs):
+        writes.append(kwargs)
+        return original(**kwargs)
+
+    monkeypatch.setattr(storage, 'write_tables', counting_write_tables)
+
+    async def scenario(client):
+        script_id = await create_script(client)
+        return await import_file(client, script_id, 'deck.pptx', data)
+
+    resp = run_with_client(scenario)
+
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body['slide_count'] == slide_count
+    assert body['slides'][-1]['slide_number'] == slide_count
+    assert body['slides'][41]['sentences'][0]['text'].startswith('42번 슬라이드')
+    assert len(writes) == 1
@@ -0,0 +1,287 @@
+"""
+대본 처리(core/script_processor.py) 테스트
+- 문장 분할: 한국어 종결, 소수점, 약어, 말줄임표, 따옴표, 목록 번호 규칙과 (시작, 끝) 오프셋
+- 청크화 전략, 재청크화, 스트리밍 처리
+- 속성 테스트: 무작위 입력에서 문장이 순서대로 정확히 한 번씩 포함, 상한 준수, 스트리밍 = 전체 처리
+
+실행: python3 -m pytest test_script_processor.py
+"""
+
+import math
+import random
+
+import pytest
+
+from core.script_processor import ChunkStrategy, ScriptProcessor, SentenceStream, iter_slide_script
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("안녕하십니까. 지금부터 발표를 시작하겠습니다.", ["안녕하십니까.", "지금부터 발표를 시작하겠습니다."]),
+    ("정말 그럴까요? 그렇습니다!  \n 감사합니다", ["정말 그럴까요?", "그렇습니다!", "감사합니다"]),
+    ("매출이 3.5배 늘었습니다. 다음입니다.", ["매출이 3.5배 늘었습니다.", "다음입니다."]),
+    ("발표를 마칩니다.질문 받겠습니다.", ["발표를 마칩니다.", "질문 받겠습니다."]),
+    ("자세한 내용은 example.com 에서 보세요.", ["자세한 내용은 example.com 에서 보세요."]),
+    ("Dr. Kim and Mr. Lee met at 9 a.m. yesterday. Then they left.",
+     ["Dr. Kim and Mr. Lee met at 9 a.m. yesterday.", "Then they left."]),
+    ("J. K. Rowling wrote it. E.g. this one.", ["J. K. Rowling wrote it.", "E.g. this one."]),
+    ("Well... maybe not. 그런데... 문제는 여기서 시작됩니다.",
+     ["Well... maybe not.", "그런데...", "문제는 여기서 시작됩니다."]),
+    ("음...그러니까요. 정말…", ["음...그러니까요.", "정말…"]),
+    ('"Really?" he asked. "Yes." She nodded.', ['"Really?" he asked.', '"Yes."', "She nodded."]),
+    ('"좋아요."라고 말했습니다. 끝.', ['"좋아요."라고 말했습니다.', "끝."]),
+    ("1. 서론입니다. 2. 본론입니다. 올해는 2024. 끝", ["1. 서론입니다.", "2. 본론입니다.", "올해는 2024.", "끝"]),
+    ("와!!! 대단해요?! 네", ["와!!!", "대단해요?!", "네"]),
+    ("2024. 11. 18. 회의.", ["2024. 11. 18. 회의."]),
+    ("회의는 2024.11.18. 오후입니다. 2024. 1. 5. 에는 쉽니다.", ["회의는 2024.11.18. 오후입니다.", "2024. 1. 5. 에는 쉽니다."]),
+    ("올해는 2024. 13. 주제입니다.", ["올해는 2024.", "13. 주제입니다."]),
+    ("", []),
+    ("  \n ", []),
+])
+def test_split_sentences(text, expected):
+    assert ScriptProcessor.split_sentences(text) == expected
+
+
+def test_sentence_spans_are_offsets_into_original_text():
+    text = "  첫 문장입니다.   둘째 문장?\n\n셋째  "
+    spans = list(ScriptProcessor.split_sentence_spans(text))
+
+    assert [text[start:end] for start, end in spans] == ["첫 문장입니다.", "둘째 문장?", "셋째"]
+    # 문장 사이에는 공백만 남음
+    gaps = [text[end:start] for (_, end), (start, _) in zip(spans, spans[1:])]
+    assert all(not gap.strip() for gap in gaps)
+
+
+
+SLIDE_TEXT = (
+    "안녕하십니까. 지금부터 발표를 시작하겠습니다. 오늘은 효율적인 팀 관리에 대해 얘기하려고 합니다. "
+    "먼저 팀 문화의 중요성을 살펴보겠습니다. 좋은 팀 문화는 조직의 생산성을 높입니다. "
+    "이번에는 구체적인 사례를 보여드리겠습니다. 감사합니다."
+)
+
+
+def _covers_in_order(chunks, count):
+    return [index for _, indices in chunks for index in indices] == list(range(count))
+
+
+def test_sentence_count_strategy_ignores_length():
+    sentences = ["가" * 200, "나", "다", "라"]
+    chunks = ScriptProcessor.chunk_sentences(sentences, ChunkStrategy.SENTENCE_COUNT, max_chars=10, max_sentences=2)
+
+    assert [indices for _, indices in chunks] == [[0, 1], [2, 3]]
+
+
+def test_character_count_strategy_matches_greedy_packing():
+    sentences = ScriptProcessor.split_sentences(SLIDE_TEXT)
+    chunks = ScriptProcessor.chunk_sentences(sentences, ChunkStrategy.CHARACTER_COUNT, max_chars=40, max_sentences=3)
+
+    assert _covers_in_order(chunks, len(sentences))
+    for _, indices in chunks:
+        assert len(indices) <= 3
+        assert len(indices) == 1 or sum(len(sentences[i]) for i in indices) <= 40
+    assert chunks[0][1] == [0, 1]  # 7 + 17자, 세 번째 문장(28자)을 더하면 40자 초과
+
+
+def test_duration_strategy_respects_limit():
+    sentences = ScriptProcessor.split_sentences(SLIDE_TEXT)
+    chunks = ScriptProcessor.chunk_sentences(sentences, ChunkStrategy.DURATION, max_duration=4.0, max_sentences=5)
+
+    assert _covers_in_order(chunks, len(sentences))
+    for _, indices in chunks:
+        total = sum(ScriptProcessor.estimate_reading_duration(sentences[i]) for i in indices)
+        assert len(indices) == 1 or total <= 4.0
+
+
+def test_oversized_sentence_becomes_its_own_chunk():
+    sentences = ["짧다.", "가" * 100 + ".", "짧다."]
+    for balanced in (False, True):
+        chunks = ScriptProcessor.chunk_sentences(sentences, max_chars=20, balanced=balanced)
+        assert [indices for _, indices in chunks] == [[0], [1], [2]]
+
+
+@pytest.mark.parametrize("strategy", list(ChunkStrategy))
+def test_balanced_keeps_chunk_count_and_evens_out_durations(strategy):
+    sentences = ScriptProcessor.split_sentences(SLIDE_TEXT)
+    options = dict(max_chars=80, max_sentences=3, max_duration=7.0)
+    greedy = ScriptProcessor.chunk_sentences(sentences, strategy, **options)
+    balanced = ScriptProcessor.chunk_sentences(sentences, strategy, balanced=True, **options)
+
+    def spread(chunks):
+        durations = [sum(ScriptProcessor.estimate_reading_duration(sentences[i]) for i in indices)
+                     for _, indices in chunks]
+        return sum(d * d for d in durations)
+
+    assert _covers_in_order(balanced, len(sentences))
+    assert len(balanced) == len(greedy)
+    assert spread(balanced) <= spread(greedy)
+    for _, indices in balanced:
+        assert len(indices) <= 3
+
+
+def test_balanced_avoids_lopsided_last_chunk():
+    sentences = ["가나다라마바사아자차카타파하."] * 7
+    greedy = ScriptProcessor.chunk_sentences(sentences, ChunkStrategy.SENTENCE_COUNT, max_sentences=3)
+    balanced = ScriptProcessor.chunk_sentences(sentences, ChunkStrategy.SENTENCE_COUNT, max_sentences=3, balanced=True)
+
+    assert [len(indices) for _, indices in greedy] == [3, 3, 1]
+    assert sorted(len(indices) for _, indices in balanced) == [2, 2, 3]
+
+
+def test_rechunk_without_previous_chunks_matches_process():
+    fresh = ScriptProcessor.process_slide_script(SLIDE_TEXT)
+    assert ScriptProcessor.rechunk_slide_script(SLIDE_TEXT, []) == [chunk + (None,) for chunk in fresh]
+
+
+def test_rechunk_keeps_unchanged_chunks_and_localizes_edits():
+    previous = [text for text, _, _ in ScriptProcessor.process_slide_script(SLIDE_TEXT)]
+
+    unchanged = ScriptProcessor.rechunk_slide_script(SLIDE_TEXT, previous)
+    assert [(text, reuse) for text, _, _, reuse in unchanged] == [(text, i) for i, text in enumerate(previous)]
+
+    # 앞에 문장 추가: 기존 청크는 모두 그대로, 새 청크만 추가
+    prepended = ScriptProcessor.rechunk_slide_script("새 문장입니다. " + SLIDE_TEXT, previous)
+    assert [reuse for _, _, _, reuse in prepended] == [None, 0, 1, 2]
+    assert [text for text, _, _, _ in prepended[1:]] == previous
+    assert _covers_in_order([(t, i) for t, _, i, _ in prepended], 8)
+
+    # 가운데 청크의 문장 하나 수정: 그 청크만 같은 ID로 다시 만들어짐
+    edited = ScriptProcessor.rechunk_slide_script(SLIDE_TEXT.replace("좋은 팀", "훌륭한 팀"), previous)
+    assert [reuse for _, _, _, reuse in edited] == [0, 1, 2]
+    assert [text == previous[i] for text, _, _, i in edited] == [True, False, True]
+
+    # 문장 삭제: 나머지 청크의 문장 인덱스만 당겨짐
+    removed = ScriptProcessor.rechunk_slide_script(SLIDE_TEXT.replace("감사합니다.", ""), previous)
+    assert [(reuse, indices) for _, _, indices, reuse in removed] == [(0, [0, 1, 2]), (1, [3, 4, 5])]
+
+    assert ScriptProcessor.rechunk_slide_script("", previous) == []
+
+
+def test_streaming_pipeline_matches_whole_text_processing():
+    text = ' '.join(
+        f"{n}번째 문단입니다. " + SLIDE_TEXT + " Dr. Kim said 3.5 is fine... 2024. 11. 18. 회의." for n in range(40)
+    )
+    pieces = [text[start:start + 13] for start in range(0, len(text), 13)]
+
+    assert list(iter_slide_script(pieces, window=8)) == ScriptProcessor.process_slide_script(text)
+
+    stream = SentenceStream()
+    sentences = [s for piece in pieces for s in stream.feed(piece)] + stream.close()
+    assert sentences == ScriptProcessor.split_sentences(text)
+
+
+def test_sentence_stream_bounds_unpunctuated_text():
+    stream = SentenceStream(max_sentence_chars=100)
+    sentences = [s for _ in range(100) for s in stream.feed("구두점 없는 녹취록 ")] + stream.close()
+
+    assert max(map(len, sentences)) <= 100
+    assert ' '.join(sentences).split() == ("구두점 없는 녹취록 " * 100).split()
+
+
+# ===== 속성 테스트 (시드 고정 무작위 입력) =====
+
+WORDS = ["발표", "팀", "문화", "생산성", "3.5배", "Dr.", "e.g.", "example.com", "\"인용\"", "데이터", "2024년",
+         "고객", "Q&A", "매출", "전략", "(괄호)", "효율", "협업", "AI", "…"]
+ENDINGS = [".", "!", "?", "...", "…", "?!", "다.", "요.", ""]
+
+
+def random_sentences(rng, count):
+    sentences = []
+    for _ in range(count):
+        length = rng.choice([1, 2, 4, 8, 30])  # 상한을 넘는 긴 문장도 포함
+        sentences.append(' '.join(rng.choice(WORDS) for _ in range(length)) + rng.choice(ENDINGS[:-1]))
+    return sentences
+
+
+def random_text(rng, count):
+    separators = [" ", "  ", "\n", "\n\n", "\t "]
+    return ''.join(s + rng.choice(separators) for s in random_sentences(rng, count)) + rng.choice(ENDINGS)
+
+
+def chunk_size(sentence, strategy):
+    if strategy == ChunkStrategy.CHARACTER_COUNT:
+        return len(sentence)
+    if strategy == ChunkStrategy.DURATION:
+        return ScriptProcessor.estimate_reading_duration(sentence)
+    return 0
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_chunking_properties(seed):
+    rng = random.Random(seed)
+    sentences = random_sentences(rng, rng.randint(0, 60))
+    strategy = rng.choice(list(ChunkStrategy))
+    options = dict(max_chars=rng.randint(10, 120), max_sentences=rng.randint(1, 6),
+                   max_duration=rng.uniform(1.0, 12.0))
+    limit = {ChunkStrategy.CHARACTER_COUNT: options['max_chars'],
+             ChunkStrategy.DURATION: options['max_duration']}.get(strategy, math.inf)
+
+    greedy = ScriptProcessor.chunk_sentences(sentences, strategy, **options)
+    balanced = ScriptProcessor.chunk_sentences(sentences, strategy, balanced=True, **options)
+
+    for chunks in (greedy, balanced):
+        # 모든 문장이 순서대로 정확히 한 번씩 포함
+        assert _covers_in_order(chunks, len(sentences))
+        for text, indices in chunks:
+            assert indices and len(indices) <= options['max_sentences']
+            assert text == ' '.join(sentences[i] for i in indices)
+            # 한 문장이 상한을 넘는 경우만 예외
+            assert len(indices) == 1 or sum(chunk_size(sentences[i], strategy) for i in indices) <= limit + 1e-9
+    assert len(balanced) == len(greedy)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_split_and_process_properties(seed):
+    rng = random.Random(seed)
+    text = random_text(rng, rng.randint(0, 40))
+    spans = list(ScriptProcessor.split_sentence_spans(text))
+    sentences = ScriptProcessor.split_sentences(text)
+
+    assert sentences == [text[start:end] for start, end in spans]
+    assert all(sentence and sentence == sentence.strip() for sentence in sentences)
+    # 문장 구간은 겹치지 않고 순서대로이며, 구간 밖에는 공백만 남음
+    bounds = [0] + [offset for span in spans for offset in span] + [len(text)]
+    assert bounds == sorted(bounds)
+    assert all(not text[bounds[i]:bounds[i + 1]].strip() for i in range(0, len(bounds), 2))
+
+    max_sentences = rng.randint(1, 5)
+    processed = ScriptProcessor.process_slide_script(text, max_sentences=max_sentences)
+    assert _covers_in_order([(t, i) for t, _, i in processed], len(sentences))
+    for chunk_text, duration, indices in processed:
+        assert chunk_text == ' '.join(sentences[i] for i in indices)
+        assert duration == ScriptProcessor.estimate_reading_duration(chunk_text)
+
+    pieces, position = [], 0
+    while position < len(text):
+        step = rng.randint(1, 40)
+        pieces.append(text[position:position + step])
+        position += step
+    assert list(iter_slide_script(pieces, window=rng.randint(1, 12), max_sentences=max_sentences)) == processed
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_rechunk_properties(seed):
+    rng = random.Random(seed)
+    old_sentences = random_sentences(rng, rng.randint(1, 25))
+    previous = [text for text, _, _ in ScriptProcessor.process_slide_script(' '.join(old_sentences))]
+
+    new_sentences = list(old_sentences)
+    for _ in range(rng.randint(0, 4)):
+        position = rng.randrange(len(new_sentences) + 1)
+        action = rng.choice(['insert', 'delete', 'replace'])
+        if action == 'insert' or not new_sentences:
+            new_sentences.insert(position, random_sentences(rng, 1)[0])
+        elif action == 'delete':
+            del new_sentences[min(position, len(new_sentences) - 1)]
+        else:
+            new_sentences[min(position, len(new_sentences) - 1)] = random_sentences(rng, 1)[0]
+    text = ' '.join(new_sentences)
+    sentences = ScriptProcessor.split_sentences(text)
+
+    result = ScriptProcessor.rechunk_slide_script(text, previous)
+
+    assert _covers_in_order([(t, i) for t, _, i, _ in result], len(sentences))
+    reused = [reuse for _, _, _, reuse in result if reuse is not None]
+    assert reused == sorted(set(reused))  # 기존 청크는 한 번씩, 순서대로 재사용
+    for chunk_text, _, indices, _ in result:
+        assert chunk_text == ' '.join(sentences[i] for i in indices)
+    if new_sentences == old_sentences:
+        assert [(t, reuse) for t, _, _, reuse in result] == [(t, i) for i, t in enumerate(previous)]
@@ -0,0 +1,341 @@
+"""
+슬라이드 대본 업로드 API 테스트
+- 청크화 전략/상한 쿼리 파라미터
+- 일괄 업로드: 슬라이드별 결과, 한 번의 저장소 쓰기, 프로세스 풀 병렬 처리
+- 재업로드: 바뀌지 않은 청크의 sentence_id/오디오/연습 점수 유지, 바뀐 행만 기록
+- 같은 스크립트의 동시 업로드 직렬화, 저장소 작업은 이벤트 루프 밖에서 실행
+- 스트리밍 업로드: NDJSON 응답, 묶음 저장
+
+실행: python3 -m pytest test_script_slides.py
+"""
+
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+
+import api.v1.speech_scripts as speech_scripts
+from core import chunk_cache
+from core.database import db, scripts_table, slides_table, sentences_table, practice_scores_table
+from core.script_processor import ScriptProcessor
+from core.security import get_current_user_id
+from core.workers import shutdown_audio_workers
+from main import app
+
+USER_ID = 'script-slides-user'
+SLIDE_TEXT = (
+    "안녕하십니까. 지금부터 발표를 시작하겠습니다. 오늘은 효율적인 팀 관리에 대해 얘기하려고 합니다. "
+    "먼저 팀 문화의 중요성을 살펴보겠습니다. 좋은 팀 문화는 조직의 생산성을 높입니다. "
+    "이번에는 구체적인 사례를 보여드리겠습니다. 감사합니다."
+)
+
+
+@pytest.fixture
+def slides_env():
+    app.dependency_overrides[get_current_user_id] = lambda: USER_ID
+    yield
+    app.dependency_overrides.pop(get_current_user_id, None)
+    for table in (scripts_table, slides_table, sentences_table, practice_scores_table):
+        table.truncate()
+    chunk_cache.clear()
+
+
+def run_with_client(scenario):
+    async def wrapper():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await scenario(client)
+    return asyncio.run(wrapper())
+
+
+async def create_script(client):
+    return (await client.post('/api/v1/scripts', json={'script_name': '발표'})).json()['script_id']
+
+
+def test_upload_slide_uses_chunking_parameters(slides_env):
+    async def scenario(client):
+        script_id = await create_script(client)
+        default = await client.patch(f'/api/v1/scripts/{script_id}/slide/1', json={'script_text': SLIDE_TEXT})
+        by_count = await client.patch(
+            f'/api/v1/scripts/{script_id}/slide/2', json={'script_text': SLIDE_TEXT},
+            params={'strategy': 'sentence_count', 'max_sentences': 3, 'balanced': 'true'}
+        )
+        return default, by_count
+
+    default, by_count = run_with_client(scenario)
+
+    assert default.status_code == 200, default.text
+    assert [s['original_sentence_indices'] for s in default.json()['sentences']] == \
+        [[0, 1, 2], [3, 4, 5], [6]]
+    assert by_count.status_code == 200, by_count.text
+    assert sorted(len(s['original_sentence_indices']) for s in by_count.json()['sentences']) == [2, 2, 3]
+
+
+@pytest.mark.parametrize("params", [
+    {'strategy': 'words'},
+    {'max_sentences': 0},
+    {'max_duration': 0},
+])
+def test_upload_slide_rejects_invalid_chunking_parameters(slides_env, params):
+    async def scenario(client):
+        script_id = await create_script(client)
+        return await client.patch(f'/api/v1/scripts/{script_id}/slide/1', json={'script_text': SLIDE_TEXT},
+                                  params=params)
+
+    assert run_with_client(scenario).status_code == 422
+
+
+def deck(count):
+    return [{'slide_number': n, 'script_text': f"{n}번 슬라이드입니다. " + SLIDE_TEXT} for n in range(1, count + 1)]
+
+
+def test_batch_upload_saves_all_slides_in_one_write(slides_env, monkeypatch):
+    writes = []
+    real_write = db.storage.write
+    monkeypatch.setattr(db.storage, 'write', lambda data: (writes.append(1), real_write(data)))
+
+    async def scenario(client):
+        script_id = await create_script(client)
+        writes.clear()
+        resp = await client.post(f'/api/v1/scripts/{script_id}/slides', json={'slides': deck(5)})
+        summary = (await client.get(f'/api/v1/scripts/{script_id}')).json()
+        return script_id, resp, summary
+
+    script_id, resp, summary = run_with_client(scenario)
+
+    assert resp.status_code == 200, resp.text
+    assert len(writes) == 1
+    body = resp.json()
+    assert [slide['slide_number'] for slide in body['slides']] == [1, 2, 3, 4, 5]
+    expected = ScriptProcessor.process_slide_script(deck(1)[0]['script_text'])
+    assert [s['text'] for s in body['slides'][0]['sentences']] == [text for text, _, _ in expected]
+    assert body['sentence_count'] == sum(slide['sentence_count'] for slide in body['slides'])
+    assert summary['total_slides'] == 5
+    assert summary['sentence_count'] == body['sentence_count']
+    assert len(slides_table.search(lambda row: row['script_id'] == script_id)) == 5
+
+
+def test_concurrent_uploads_to_same_script_are_serialized(slides_env, monkeypatch):
+    threads = []
+    real_plan, real_save = speech_scripts._plan_slide_writes, speech_scripts._save_slides
+
+    def recording_plan(*args):
+        threads.append(threading.current_thread())
+        return real_plan(*args)
+
+    def recording_save(*args):
+        threads.append(threading.current_thread())
+        return real_save(*args)
+
+    monkeypatch.setattr(speech_scripts, '_plan_slide_writes', recording_plan)
+    monkeypatch.setattr(speech_scripts, '_save_slides', recording_save)
+
+    async def scenario(client):
+        script_id = await create_script(client)
+        return script_id, await asyncio.gather(
+            client.patch(f'/api/v1/scripts/{script_id}/slide/1', json={'script_text': SLIDE_TEXT}),
+            client.post(f'/api/v1/scripts/{script_id}/slides', json={'slides': deck(2)}),
+            client.patch(f'/api/v1/scripts/{script_id}/slide/1', json={'script_text': SLIDE_TEXT}),
+        )
+
+    script_id, responses = run_with_client(scenario)
+
+    assert [resp.status_code for resp in responses] == [200, 200, 200]
+    # 나중 요청은 앞 요청이 저장한 슬라이드를 보고 수정하므로 같은 번호의 슬라이드가 중복 생성되지 않음
+    assert sorted(slide['slide_number'] for slide in slides_table.all()) == [1, 2]
+    assert len({resp.json().get('slide_id') for resp in (responses[0], responses[2])}) == 1
+    assert threads and threading.main_thread() not in threads
+    assert speech_scripts._script_locks == {}
+
+
+def test_batch_upload_rejects_duplicate_slide_numbers(slides_env):
+    async def scenario(client):
+        script_id = await create_script(client)
+        slides = deck(2) + [{'slide_number': 2, 'script_text': "중복입니다."}]
+        return await client.post(f'/api/v1/scripts/{script_id}/slides', json={'slides': slides})
+
+    resp = run_with_client(scenario)
+
+    assert resp.status_code == 400
+    assert not slides_table.all()
+
+
+def test_batch_upload_parallel_matches_serial(slides_env, monkeypatch):
+    async def upload(client):
+        script_id = await create_script(client)
+        resp = await client.post(f'/api/v1/scripts/{script_id}/slides', json={'slides': deck(7)},
+                                 params={'balanced': 'true'})
+        assert resp.status_code == 200, resp.text
+        return [[(s['text'], s['original_sentence_indices']) for s in slide['sentences']]
+                for slide in resp.json()['slides']]
+
+    serial = run_with_client(upload)
+    chunk_cache.clear()  # 두 번째 업로드도 캐시가 아닌 프로세스 풀에서 처리되도록
+    monkeypatch.setattr(speech_scripts, 'AUDIO_WORKERS', 2)
+    monkeypatch.setattr(speech_scripts, 'SCRIPT_BATCH_PARALLEL_MIN_CHARS', 0)
+    try:
+        parallel = run_with_client(upload)
+    finally:
+        shutdown_audio_workers()
+
+    assert parallel == serial
+
+
+def test_reupload_keeps_unchanged_sentence_ids(slides_env):
+    async def scenario(client):
+        script_id = await create_script(client)
+        url = f'/api/v1/scripts/{script_id}/slide/1'
+        first = (await client.patch(url, json={'script_text': SLIDE_TEXT})).json()
+        sentence_ids = [s['sentence_id'] for s in first['sentences']]
+        # 첫 청크에는 오디오, 모든 청크에는 연습 점수가 있다고 가정
+        sentences_table.update({'audio_object_key': 'audio/first.wav', 'audio_text_hash': 'h'},
+                               lambda doc: doc['sentence_id'] == sentence_ids[0])
+        sentences_table.update({'audio_object_key': 'audio/second.wav', 'audio_text_hash': 'h'},
+                               lambda doc: doc['sentence_id'] == sentence_ids[1])
+        practice_scores_table.insert_multiple(
+            {'score_id': f'score-{i}', 'sentence_id': sid, 'slide_id': first['slide_id'], 'script_id': script_id}
+            for i, sid in enumerate(sentence_ids)
+        )
+        edited = SLIDE_TEXT.replace("좋은 팀 문화는", "훌륭한 팀 문화는").replace("감사합니다.", "")
+        second = await client.patch(url, json={'script_text': edited})
+        return first, second
+
+    first, second = run_with_client(scenario)
+
+    assert second.status_code == 200, second.text
+    body = second.json()
+    old_ids = [s['sentence_id'] for s in first['sentences']]
+    assert body['slide_id'] == first['slide_id']
+    assert [s['sentence_id'] for s in body['sentences']] == old_ids[:2]
+    assert body['changes'] == {'kept': 1, 'updated': 1, 'inserted': 0, 'removed': 1}
+    assert body['sentences'][0]['audio_object_key'] == 'audio/first.wav'
+    assert body['sentences'][1]['audio_object_key'] is None
+    assert len(slides_table.all()) == 1
+    assert sorted(s['sentence_id'] for s in sentences_table.all()) == sorted(old_ids[:2])
+    # 텍스트가 바뀐 문장의 연습 점수는 이전 텍스트 기준이므로 삭제된 문장의 점수와 함께 비움
+    assert [score['sentence_id'] for score in practice_scores_table.all()] == [old_ids[0]]
+    stored = {s['sentence_id']: s for s in sentences_table.all()}
+    assert stored[old_ids[1]]['text'] == body['sentences'][1]['text']
+    assert stored[old_ids[1]]['audio_text_hash'] is None
+
+
+def test_batch_reupload_writes_once_and_removes_duplicate_slides(slides_env, monkeypatch):
+    writes = []
+    real_write = db.storage.write
+
+    async def scenario(client):
+        script_id = await create_script(client)
+        url = f'/api/v1/scripts/{script_id}/slide/2'
+        # 재업로드가 새 슬라이드를 만들던 때 남은 같은 번호의 슬라이드
+        stale = (await client.patch(url, json={'script_text': "예전 대본입니다."})).json()
+        slides_table.update({'created_at': '2000-01-01T00:00:00'}, lambda doc: doc['slide_id'] == stale['slide_id'])
+        slides_table.insert({'slide_id': 'latest', 'script_id': script_id, 'slide_number': 2,
+                             'status': 'completed', 'created_at': '2001-01-01T00:00:00'})
+        first = (await client.post(f'/api/v1/scripts/{script_id}/slides', json={'slides': deck(3)})).json()
+        monkeypatch.setattr(db.storage, 'write', lambda data: (writes.append(1), real_write(data)))
+        second = await client.post(f'/api/v1/scripts/{script_id}/slides', json={'slides': deck(3)})
+        return first, second
+
+    first, second = run_with_client(scenario)
+
+    assert second.status_code == 200, second.text
+    assert len(writes) == 1
+    assert [slide['slide_id'] for slide in second.json()['slides']] == [slide['slide_id'] for slide in first['slides']]
+    assert first['slides'][1]['slide_id'] == 'latest'
+    assert all(slide['changes']['kept'] == slide['sentence_count'] for slide in second.json()['slides'])
+    assert sorted(slide['slide_number'] for slide in slides_table.all()) == [1, 2, 3]
+    assert len(sentences_table.all()) == second.json()['sentence_count']
+
+
+def read_ndjson(resp):
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+def test_stream_upload_matches_patch_and_saves_in_batches(slides_env, monkeypatch):
+    monkeypatch.setattr(speech_scripts, 'SCRIPT_STREAM_BATCH_CHUNKS', 4)
+    text = ' '.join(f"{n}번째 문단입니다. " + SLIDE_TEXT for n in range(5))
+    writes = []
+    real_write = db.storage.write
+
+    async def body():
+        data = text.encode('utf-8')
+        for start in range(0, len(data), 7):  # UTF-8 문자 중간에서 끊기는 조각
+            yield data[start:start + 7]
+
+    async def scenario(client):
+        script_id = await create_script(client)
+        monkeypatch.setattr(db.storage, 'write', lambda data: (writes.append(1), real_write(data)))
+        streamed = await client.post(f'/api/v1/scripts/{script_id}/slide/1/stream', content=body())
+        monkeypatch.setattr(db.storage, 'write', real_write)
+        patched = await client.patch(f'/api/v1/scripts/{script_id}/slide/2', json={'script_text': text})
+        listed = (await client.get(f'/api/v1/scripts/{script_id}/sentences')).json()
+        return streamed, patched.json(), listed
+
+    streamed, patched, listed = run_with_client(scenario)
+
+    assert streamed.status_code == 200
+    assert streamed.headers['content-type'].startswith('application/x-ndjson')
+    lines = read_ndjson(streamed)
+    chunks, summary = lines[:-1], lines[-1]
+    assert summary['type'] == 'summary' and summary['status'] == 'completed'
+    assert {line['type'] for line in chunks} == {'sentence'}
+    assert [(c['text'], c['original_sentence_indices']) for c in chunks] == \
+        [(s['text'], s['original_sentence_indices']) for s in patched['sentences']]
+    assert summary['sentence_count'] == len(chunks) == 15
+    # 처리 중 슬라이드 저장 1회 + 4개씩 3회 + 마지막 저장 1회
+    assert len(writes) == 5
+    stored = [s for s in sentences_table.all() if s['slide_id'] == summary['slide_id']]
+    assert sorted(s['sentence_id'] for s in stored) == sorted(c['sentence_id'] for c in chunks)
+    assert slides_table.get(lambda doc: doc['slide_id'] == summary['slide_id'])['status'] == 'completed'
+
+
+def test_stream_reupload_keeps_same_position_sentences(slides_env):
+    async def scenario(client):
+        script_id = await create_script(client)
+        url = f'/api/v1/scripts/{script_id}/slide/1/stream'
+        first = read_ndjson(await client.post(url, content=SLIDE_TEXT.encode('utf-8')))
+        edited = SLIDE_TEXT.replace("감사합니다.", "질문 받겠습니다.")
+        second = read_ndjson(await client.post(url, content=edited.encode('utf-8')))
+        return first, second
+
+    first, second = run_with_client(scenario)
+
+    assert second[-1]['slide_id'] == first[-1]['slide_id']
+    assert second[-1]['changes'] == {'kept': 2, 'updated': 0, 'inserted': 1, 'removed': 1}
+    assert [c['sentence_id'] for c in second[:2]] == [c['sentence_id'] for c in first[:2]]
+    assert sorted(s['sentence_id'] for s in sentences_table.all()) == \
+        sorted(c['sentence_id'] for c in second[:-1])
+    assert len(slides_table.all()) == 1
+
+
+def test_stream_upload_disconnect_ends_stream_and_marks_slide_failed(slides_env):
+    async def scenario(client):
+        script_id = await create_script(client)
+        messages = [
+            {'type': 'http.request', 'body': SLIDE_TEXT.encode('utf-8'), 'more_body': True},
+            {'type': 'http.disconnect'},
+        ]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'POST',
+            'scheme': 'http', 'path': f'/api/v1/scripts/{script_id}/slide/1/stream', 'raw_path': b'',
+            'query_string': b'', 'root_path': '', 'headers': [(b'host', b'test')], 'server': ('test', 80),
+            'client': ('test', 1234),
+        }
+        await asyncio.wait_for(app(scope, receive, send), timeout=10)
+        return b''.join(m.get('body', b'') for m in sent if m['type'] == 'http.response.body')
+
+    body = run_with_client(scenario)
+
+    lines = [json.loads(line) for line in body.decode('utf-8').splitlines()]
+    assert lines[-1]['type'] == 'error'
+    assert [slide['status'] for slide in slides_table.all()] == ['failed']
@@ -0,0 +1,232 @@
+"""
+대본 문장 일괄 TTS 생성 API 테스트
+- 작업 등록 → 문장별 오디오 기록, 변경된 문장만 재생성, 동시 요청 수 제한
+- 대본 수정/스크립트 삭제 시 바뀌거나 지워진 문장의 오디오 파일 항목과 blob 참조 반납
+- Supertone API는 로컬 대역 서버로, S3는 메모리 대역으로 대체합니다.
+
+실행: python3 -m pytest test_script_tts.py
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+import api.v1.speech_scripts as speech_scripts
+from core.database import (
+    users_table, scripts_table, slides_table, sentences_table, jobs_table, s3_table, s3_blobs_table,
+    tts_cache_table
+)
+from core.http_client import close_http_client
+from core.jobs import stop_job_workers
+from core.script_tts import render_script_sentences
+from core.security import get_current_user_id
+from main import app
+
+USER_ID = 'script-tts-user'
+SCRIPT_TEXT = "첫 번째 문장입니다. 두 번째 문장입니다. 세 번째 문장입니다. 네 번째 문장입니다."
+
+
+@pytest.fixture
+def script_env(monkeypatch, fake_s3, supertone_stub):
+    monkeypatch.setattr(speech_scripts, 'SUPERTONE_API_KEY', 'test-key')
+    app.dependency_overrides[get_current_user_id] = lambda: USER_ID
+    users_table.insert({'id': USER_ID, 'voice_id': 'voice-script'})
+    yield supertone_stub
+    app.dependency_overrides.pop(get_current_user_id, None)
+    users_table.remove(lambda row: row.get('id') == USER_ID)
+    for table in (scripts_table, slides_table, sentences_table, jobs_table):
+        table.truncate()
+
+
+def run_with_client(scenario):
+    async def wrapper():
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                return await scenario(client)
+        finally:
+            await stop_job_workers()
+            await close_http_client()
+    return asyncio.run(wrapper())
+
+
+async def create_script(client, text=SCRIPT_TEXT):
+    script_id = (await client.post('/api/v1/scripts', json={'script_name': '발표'})).json()['script_id']
+    await client.patch(f'/api/v1/scripts/{script_id}/slide/1', json={'script_text': text})
+    return script_id
+
+
+async def render(client, script_id, **params):
+    resp = await client.post(f'/api/v1/scripts/{script_id}/tts', params=params)
+    assert resp.status_code == 202, resp.text
+    status_url = resp.json()['status_url']
+    for _ in range(200):
+        job = (await client.get(status_url)).json()
+        if job['status'] in ('completed', 'failed'):
+            return job
+        await asyncio.sleep(0.02)
+    raise AssertionError('작업이 끝나지 않았습니다.')
+
+
+def tts_texts(stub):
+    return [kind for kind, _, _ in stub.requests if kind == 'tts']
+
+
+def test_render_records_audio_and_skips_unchanged(script_env):
+    async def scenario(client):
+        script_id = await create_script(client)
+        first = await render(client, script_id)
+        second = await render(client, script_id)
+        sentences = (await client.get(f'/api/v1/scripts/{script_id}/sentences')).json()['sentences']
+        return first, second, sentences
+
+    first, second, sentences = run_with_client(scenario)
+
+    assert first['status'] == 'completed'
+    total = first['result']['total_sentences']
+    assert first['result']['rendered'] == total and first['result']['failed'] == []
+    assert second['result']['rendered'] == 0 and second['result']['skipped'] == total
+    assert all(s['audio_object_key'] and s['audio_length'] == '0.5' for s in sentences)
+    assert len(tts_texts(script_env)) == len({s['text'] for s in sentences})
+
+
+def test_changed_sentence_is_rerendered(script_env):
+    async def scenario(client):
+        script_id = await create_script(client)
+        await render(client, script_id)
+        target = sentences_table.search(lambda s: s['script_id'] == script_id)[0]
+        sentences_table.update({'text': target['text'] + ' 수정'}, lambda s: s['sentence_id'] == target['sentence_id'])
+        before = len(tts_texts(script_env))
+        job = await render(client, script_id)
+        return job, len(tts_texts(script_env)) - before
+
+    job, new_calls = run_with_client(scenario)
+
+    assert job['result']['rendered'] == 1
+    assert new_calls == 1
+
+
+def test_edit_and_delete_release_sentence_audio(script_env, fake_s3):
+    one_per_chunk = {'strategy': 'sentence_count', 'max_sentences': 1}
+
+    def audio_files(script_id):
+        return {row['file_name'] for row in s3_table.all() if row.get('script_name') == script_id}
+
+    def ref_count():
+        (blob,) = s3_blobs_table.all()  # 대역 서버는 모든 문장에 같은 오디오를 돌려줌
+        return blob['ref_count'] - len(tts_cache_table.all())  # TTS 캐시 항목의 참조는 제외
+
+    async def scenario(client):
+        script_id = (await client.post('/api/v1/scripts', json={'script_name': '발표'})).json()['script_id']
+        url = f'/api/v1/scripts/{script_id}/slide/1'
+        first = (await client.patch(url, json={'script_text': SCRIPT_TEXT}, params=one_per_chunk)).json()
+        await render(client, script_id)
+        files_before = audio_files(script_id)
+        edited = SCRIPT_TEXT.replace('두 번째', '2번째').replace(' 네 번째 문장입니다.', '')
+        patched = (await client.patch(url, json={'script_text': edited}, params=one_per_chunk)).json()
+        files_after_edit, refs_after_edit = audio_files(script_id), ref_count()
+        deleted = await client.delete(f'/api/v1/scripts/{script_id}')
+        return first, files_before, patched, files_after_edit, refs_after_edit, deleted, audio_files(script_id)
+
+    first, files_before, patched, files_after_edit, refs_after_edit, deleted, files_after_delete = \
+        run_with_client(scenario)
+
+    ids = [s['sentence_id'] for s in first['sentences']]
+    assert files_before == {f'{sentence_id}.wav' for sentence_id in ids}
+    assert patched['changes'] == {'kept': 2, 'updated': 1, 'inserted': 0, 'removed': 1}
+    # 텍스트가 바뀐 문장(2번째)과 삭제된 문장(4번째)의 오디오 파일만 정리
+    assert files_after_edit == {f'{ids[0]}.wav', f'{ids[2]}.wav'}
+    assert refs_after_edit == 2
+    assert deleted.status_code == 200
+    assert files_after_delete == set()
+    assert ref_count() == 0
+
+
+def insert_sentences(script_id, count):
+    for i in range(count):
+        sentences_table.insert({'sentence_id': f'{script_id}-{i}', 'script_id': script_id, 'text': f'문장 {i}'})
+
+
+def test_concurrency_is_bounded(script_env, monkeypatch):
+    insert_sentences('bounded', 6)
+    active = {'now': 0, 'max': 0}
+    limit_reached = None
+
+    import core.script_tts
+
+    original = core.script_tts.cached_text_to_speech
+
+    async def tracking(*args, **kwargs):
+        # 시간 지연 대신, 동시 실행 수가 상한에 닿을 때까지 모든 호출을 붙잡아 둔다
+        active['now'] += 1
+        active['max'] = max(active['max'], active['now'])
+        if active['now'] == 2:
+            limit_reached.set()
+        try:
+            await limit_reached.wait()
+            return await original(*args, **kwargs)
+        finally:
+            active['now'] -= 1
+
+    monkeypatch.setattr(core.script_tts, 'cached_text_to_speech', tracking)
+
+    async def scenario():
+        nonlocal limit_reached
+        limit_reached = asyncio.Event()
+        try:
+            return await render_script_sentences(lambda stage: None, USER_ID, 'key', 'voice-script', 'bounded',
+                                                 concurrency=2)
+        finally:
+            await close_http_client()
+
+    result = asyncio.run(scenario())
+
+    assert result['rendered'] == 6
+    assert active['max'] == 2
+
+
+def test_results_are_saved_in_batches(script_env, monkeypatch):
+    insert_sentences('batched', 7)
+    stages = []
+    writes = []
+
+    import core.script_tts
+
+    original_write_tables = core.script_tts.write_tables
+
+    def counting_write_tables(**kwargs):
+        writes.append(kwargs)
+        return original_write_tables(**kwargs)
+
+    def no_per_sentence_update(*args, **kwargs):
+        raise AssertionError('문장마다 저장하면 안 됩니다.')
+
+    monkeypatch.setattr(core.script_tts, 'write_tables', counting_write_tables)
+    monkeypatch.setattr(sentences_table, 'update', no_per_sentence_update)
+
+    async def scenario():
+        try:
+            return await render_script_sentences(stages.append, USER_ID, 'key', 'voice-script', 'batched',
+                                                 concurrency=3, flush_every=3, flush_seconds=3600)
+        finally:
+            await close_http_client()
+
+    result = asyncio.run(scenario())
+
+    assert result['rendered'] == 7 and result['failed'] == []
+    assert 2 <= len(writes) <= 3  # 3개씩 저장 + 마지막 남은 문장
+    assert len(stages) == len(writes) + 1
+    assert stages[0] == 'rendering 0/7' and stages[-1] == 'rendering 7/7'
+    saved = sentences_table.search(lambda s: s['script_id'] == 'batched')
+    assert all(s['audio_object_key'] and s['audio_text_hash'] for s in saved)
+
+
+def test_requires_cloned_voice(script_env):
+    users_table.update({'voice_id': None}, lambda row: row.get('id') == USER_ID)
+
+    async def scenario(client):
+        script_id = await create_script(client)
+        return await client.post(f'/api/v1/scripts/{script_id}/tts')
+
+    assert run_with_client(scenario).status_code == 400
@@ -0,0 +1,99 @@
+"""
+사용자별 발화 속도 모델(core/speaking_rate.py) 테스트
+- 이상값에 강한 증분 학습, 관측 필터
+- 연습 점수 제출 → 문장 목록의 duration_estimate 개인화
+- 한글 문자 수 세기
+
+실행: python3 -m pytest test_speaking_rate.py
+"""
+
+import math
+import random
+
+import pytest
+
+from core import speaking_rate
+from core.database import practice_scores_table, scripts_table, sentences_table, slides_table, speaking_rates_table
+from core.script_processor import ScriptProcessor
+from core.security import get_current_user_id
+from main import app
+from test_script_slides import SLIDE_TEXT, create_script, run_with_client
+
+USER_ID = 'speaking-rate-user'
+
+
+@pytest.fixture
+def rate_env():
+    app.dependency_overrides[get_current_user_id] = lambda: USER_ID
+    yield
+    app.dependency_overrides.pop(get_current_user_id, None)
+    for table in (scripts_table, slides_table, sentences_table, practice_scores_table, speaking_rates_table):
+        table.truncate()
+
+
+def fit(ratios):
+    state = None
+    for ratio in ratios:
+        state = speaking_rate.update_state(state, ratio)
+    return state
+
+
+def test_model_converges_and_ignores_outliers():
+    rng = random.Random(0)
+    ratios = [1.3 * math.exp(rng.gauss(0, 0.1)) for _ in range(60)]
+    clean = fit(ratios)
+    # 10건 중 1건은 녹음을 멈추지 않은 듯 4배 가까이 걸린 기록
+    noisy = fit([ratio * (3.8 if i % 10 == 0 else 1) for i, ratio in enumerate(ratios)])
+
+    assert math.exp(clean['log_rate']) == pytest.approx(1.3, rel=0.08)
+    assert math.exp(noisy['log_rate']) == pytest.approx(1.3, rel=0.15)
+    assert clean['count'] == noisy['count'] == 60
+
+
+def test_model_follows_recent_speed():
+    state = fit([1.0] * 30 + [0.7] * 40)
+    assert math.exp(state['log_rate']) == pytest.approx(0.7, rel=0.05)
+
+
+def test_observe_filters_invalid_observations(rate_env):
+    text = "오늘은 효율적인 팀 관리에 대해 얘기하려고 합니다."
+    baseline = ScriptProcessor.estimate_reading_duration(text)
+
+    assert speaking_rate.observe(USER_ID, text, None) is None
+    assert speaking_rate.observe(USER_ID, text, baseline * 20) is None
+    assert speaking_rate.observe(USER_ID, "", 3.0) is None
+    assert speaking_rates_table.all() == []
+    for _ in range(speaking_rate.SPEAKING_RATE_MIN_OBSERVATIONS - 1):
+        speaking_rate.observe(USER_ID, text, baseline * 1.5)
+    assert speaking_rate.rate_factor(USER_ID) == 1.0
+    speaking_rate.observe(USER_ID, text, baseline * 1.5)
+    assert speaking_rate.rate_factor(USER_ID) == pytest.approx(1.5)
+    assert speaking_rate.rate_factor('other-user') == 1.0
+
+
+def test_practice_time_personalizes_sentence_listing(rate_env):
+    async def scenario(client):
+        script_id = await create_script(client)
+        slide = (await client.patch(f'/api/v1/scripts/{script_id}/slide/1', json={'script_text': SLIDE_TEXT})).json()
+        before = (await client.get(f'/api/v1/scripts/{script_id}/sentences')).json()
+        for sentence in slide['sentences']:
+            resp = await client.post(f"/api/v1/practice/scores/{sentence['sentence_id']}",
+                                     json={'accuracy': 90, 'time_taken': sentence['duration_estimate'] * 0.8})
+            assert resp.status_code == 200, resp.text
+        after = (await client.get(f'/api/v1/scripts/{script_id}/sentences')).json()
+        return before, after
+
+    before, after = run_with_client(scenario)
+
+    assert before['speaking_rate_factor'] == 1.0
+    assert after['speaking_rate_factor'] == pytest.approx(0.8)
+    for old, new in zip(before['sentences'], after['sentences']):
+        assert new['duration_estimate'] == pytest.approx(old['duration_estimate'] * 0.8, abs=0.01)
+    # 저장된 값은 기본 추정치 그대로
+    assert sorted(s['duration_estimate'] for s in sentences_table.all()) == \
+        sorted(s['duration_estimate'] for s in before['sentences'])
+
+
+@pytest.mark.parametrize("text", [SLIDE_TEXT, "Hello, world!", "가힣 ㄱㅏ 漢字 ｆｕｌｌ 😀 한국어", ""])
+def test_count_hangul_matches_syllable_count(text):
+    assert ScriptProcessor.count_hangul(text) == sum(1 for c in text if 0xAC00 <= ord(c) <= 0xD7A3)
@@ -0,0 +1,121 @@
+"""
+콘텐츠 주소 저장소(core/storage.py) 테스트
+- 같은 내용 업로드 중복 제거, 참조 카운트 증감, 참조가 0이 되면 S3 객체 삭제
+- 같은 파일명 재연결(relink) 시 이전 blob 반납
+- S3 업로드가 전역 락 밖에서 실행되는지, 같은 해시의 동시 업로드는 PUT 한 번인지
+
+실행: python3 -m pytest test_storage.py
+"""
+
+import io
+import threading
+
+from core import storage
+from core.database import s3_table, s3_blobs_table
+from core.storage import link_file, release_content, save_file
+
+USER_ID = 'storage-user'
+
+
+def blob_for(content_hash):
+    return s3_blobs_table.get(lambda doc: doc['content_hash'] == content_hash)
+
+
+def test_identical_uploads_share_one_object(fake_s3):
+    first = save_file(USER_ID, 'a.wav', b'same audio', 'audio/wav')
+    second = save_file(USER_ID, 'b.wav', b'same audio', 'audio/wav')
+
+    assert fake_s3.put_count == 1
+    assert first['object_key'] == second['object_key']
+    assert blob_for(first['content_hash'])['ref_count'] == 2
+    assert len(s3_table.all()) == 2
+
+
+def test_release_decrements_and_deletes_at_zero(fake_s3):
+    saved = save_file(USER_ID, 'a.wav', b'audio', 'audio/wav')
+    content_hash = saved['content_hash']
+    link_file(USER_ID, 'copy.wav', content_hash)
+    assert blob_for(content_hash)['ref_count'] == 2
+
+    release_content(content_hash)
+    assert blob_for(content_hash)['ref_count'] == 1
+    assert saved['object_key'] in fake_s3.objects
+
+    release_content(content_hash)
+    assert blob_for(content_hash) is None
+    assert saved['object_key'] not in fake_s3.objects
+
+    # 삭제된 뒤 같은 내용을 다시 올리면 새로 업로드
+    save_file(USER_ID, 'again.wav', b'audio', 'audio/wav')
+    assert fake_s3.put_count == 2 and saved['object_key'] in fake_s3.objects
+
+
+def test_relinking_existing_key_releases_previous_blob(fake_s3):
+    old = save_file(USER_ID, 'voice.wav', b'old', 'audio/wav')
+    new = save_file(USER_ID, 'other.wav', b'new', 'audio/wav')
+
+    relinked = link_file(USER_ID, 'voice.wav', new['content_hash'])
+
+    assert relinked['content_hash'] == new['content_hash']
+    assert relinked['id'] == old['id']
+    assert blob_for(old['content_hash']) is None
+    assert old['object_key'] not in fake_s3.objects
+    assert blob_for(new['content_hash'])['ref_count'] == 2
+
+    # 같은 내용으로 다시 연결하면 참조 수는 그대로
+    link_file(USER_ID, 'voice.wav', new['content_hash'])
+    save_file(USER_ID, 'voice.wav', b'new', 'audio/wav')
+    assert blob_for(new['content_hash'])['ref_count'] == 2
+    assert fake_s3.put_count == 2
+    assert link_file(USER_ID, 'missing.wav', 'sha256:none') is None
+
+
+def test_upload_runs_outside_global_lock(fake_s3):
+    started, release = threading.Event(), threading.Event()
+    original_put = fake_s3.put_object
+
+    def slow_put(**kwargs):
+        started.set()
+        assert release.wait(5)
+        return original_put(**kwargs)
+
+    fake_s3.put_object = slow_put
+    results = []
+    uploads = [
+        threading.Thread(target=lambda name=name: results.append(save_file(USER_ID, name, b'slow', 'audio/wav')))
+        for name in ('a.wav', 'b.wav')
+    ]
+    for thread in uploads:
+        thread.start()
+    try:
+        assert started.wait(5)
+        # 업로드가 진행 중이어도 카탈로그/캐시 작업(전역 락)은 기다리지 않음
+        assert storage._lock.acquire(timeout=1)
+        storage._lock.release()
+    finally:
+        release.set()
+        for thread in uploads:
+            thread.join(5)
+
+    assert len(results) == 2
+    assert fake_s3.put_count == 1  # 같은 해시의 두 번째 업로드는 첫 업로드를 기다렸다가 참조만 증가
+    assert blob_for(results[0]['content_hash'])['ref_count'] == 2
+    assert len(s3_blobs_table.all()) == 1
+
+
+def test_blob_registered_during_upload_is_not_duplicated(fake_s3):
+    original_put = fake_s3.put_object
+    content_hash, _ = storage.hash_stream(io.BytesIO(b'raced'))
+
+    def racing_put(**kwargs):
+        # 업로드 도중 다른 경로(마이그레이션 등)가 같은 blob을 먼저 등록한 상황
+        s3_blobs_table.insert({'content_hash': content_hash, 'object_key': kwargs['Key'], 'size': 5,
+                               'content_type': 'audio/wav', 'ref_count': 1})
+        return original_put(**kwargs)
+
+    fake_s3.put_object = racing_put
+    saved = save_file(USER_ID, 'a.wav', b'raced', 'audio/wav')
+
+    assert len(s3_blobs_table.all()) == 1
+    assert blob_for(saved['content_hash'])['ref_count'] == 2
+    assert storage._content_locks == {}
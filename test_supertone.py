@@ -0,0 +1,60 @@
+"""
+Supertone 호출 모듈(core/supertone.py)과 공용 HTTP 클라이언트 테스트
+로컬 대역 서버(conftest.py의 supertone_stub)를 대상으로 연결 재사용, 제한 시간, 오류 변환을 확인합니다.
+
+실행: python3 -m pytest test_supertone.py
+"""
+
+import asyncio
+
+import pytest
+
+from core.http_client import get_http_client, close_http_client
+from core.supertone import SupertoneError, create_cloned_voice, text_to_speech
+
+
+def run(coro):
+    async def wrapper():
+        try:
+            return await coro
+        finally:
+            await close_http_client()
+    return asyncio.run(wrapper())
+
+
+def test_calls_reuse_pooled_connection(supertone_stub):
+    async def scenario():
+        voice_id = await create_cloned_voice('key', 'tester', 'merged.wav', b'RIFF', 'audio/wav')
+        results = [await text_to_speech('key', voice_id, f'문장 {i}') for i in range(5)]
+        return voice_id, results
+
+    voice_id, results = run(scenario())
+
+    assert voice_id == 'voice-tester'
+    assert results[0] == (supertone_stub.tts_audio, '0.5')
+    assert len(supertone_stub.requests) == 6
+    assert supertone_stub.connection_count() == 1
+    assert all(headers['x-sup-api-key'] == 'key' for _, _, headers in supertone_stub.requests)
+
+
+def test_client_is_shared_within_loop():
+    async def scenario():
+        return get_http_client() is get_http_client()
+
+    assert run(scenario())
+
+
+def test_timeout_is_reported_as_upstream_error(supertone_stub):
+    supertone_stub.delay = 0.5
+    with pytest.raises(SupertoneError) as exc:
+        run(text_to_speech('key', 'voice', '안녕하세요', timeout=0.05))
+    assert exc.value.status_code == 502
+    assert 'Timeout' in exc.value.detail
+
+
+def test_unreachable_server_is_reported_as_upstream_error(monkeypatch):
+    import core.supertone
+    monkeypatch.setattr(core.supertone, 'SUPERTONE_BASE_URL', 'http://127.0.0.1:9')
+    with pytest.raises(SupertoneError) as exc:
+        run(create_cloned_voice('key', 'tester', 'merged.wav', b'RIFF', 'audio/wav'))
+    assert exc.value.status_code == 502
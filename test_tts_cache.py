@@ -0,0 +1,165 @@
+"""
+TTS 결과 캐시(core/tts_cache.py) 테스트
+- 캐시 키 정규화, 적중 시 Supertone/S3 호출 생략, 동시 요청 공유, 크기 상한 LRU 제거
+- 적중 시 사용 기록은 메모리에 모았다가 한 번에 저장
+
+실행: python3 -m pytest test_tts_cache.py
+"""
+
+import asyncio
+
+import pytest
+
+import core.tts_cache as tts_cache
+from core.database import tts_cache_table
+from core.http_client import close_http_client
+from core.tts_cache import cached_text_to_speech, cache_stats, evict, store, tts_cache_key
+
+
+@pytest.fixture
+def cache_env(monkeypatch, fake_s3, supertone_stub):
+    monkeypatch.setattr(tts_cache, '_stats', {'hits': 0, 'misses': 0, 'evictions': 0})
+    monkeypatch.setattr(tts_cache, '_usage', {})
+    return supertone_stub
+
+
+def run(coro):
+    async def wrapper():
+        try:
+            return await coro
+        finally:
+            await close_http_client()
+    return asyncio.run(wrapper())
+
+
+def tts_calls(stub):
+    return [kind for kind, _, _ in stub.requests].count('tts')
+
+
+def test_cache_key_is_canonical():
+    settings = {'language': 'ko', 'style': 'neutral', 'model': 'sona_speech_1',
+                'voice_settings': {'speed': 1, 'pitch_shift': 0, 'pitch_variance': 1}}
+    reordered = {'voice_settings': {'pitch_variance': 1, 'pitch_shift': 0, 'speed': 1},
+                 'model': 'sona_speech_1', 'style': 'neutral', 'language': 'ko'}
+    assert tts_cache_key('v1', '안녕하세요', settings) == tts_cache_key('v1', '안녕하세요', reordered)
+    assert tts_cache_key('v1', '안녕하세요', settings) == tts_cache_key('v1', '안녕하세요')  # 기본 설정과 동일
+    assert tts_cache_key('v1', '안녕하세요') != tts_cache_key('v2', '안녕하세요')
+    assert tts_cache_key('v1', '안녕하세요') != tts_cache_key('v1', '안녕하세요', output_format='mp3')
+    assert tts_cache_key('v1', '안녕하세요') != tts_cache_key('v1', '안녕하세요', {**settings, 'style': 'happy'})
+
+
+def test_hit_skips_supertone_and_upload(cache_env):
+    async def scenario():
+        first = await cached_text_to_speech('key', 'voice-1', '첫 문장')
+        second = await cached_text_to_speech('key', 'voice-1', '첫 문장')
+        return first, second
+
+    first, second = run(scenario())
+
+    assert first['content_hash'] == second['content_hash']
+    assert second['audio_length'] == '0.5'
+    assert tts_calls(cache_env) == 1
+    stats = cache_stats()
+    assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+    assert stats['entries'] == 1 and stats['total_bytes'] == len(cache_env.tts_audio)
+
+
+def test_concurrent_misses_call_supertone_once(cache_env):
+    cache_env.delay = 0.05
+
+    async def scenario():
+        return await asyncio.gather(*(cached_text_to_speech('key', 'voice-1', '동시 요청') for _ in range(5)))
+
+    entries = run(scenario())
+
+    assert len({entry['cache_key'] for entry in entries}) == 1
+    assert tts_calls(cache_env) == 1
+    assert cache_stats()['misses'] == 1
+
+
+def test_eviction_keeps_total_size_bounded(cache_env, fake_s3, monkeypatch):
+    monkeypatch.setattr(tts_cache, 'TTS_CACHE_MAX_BYTES', 250)
+    keys = [tts_cache_key('voice-1', f'문장 {i}') for i in range(3)]
+    for i, key in enumerate(keys):
+        store(key, 'voice-1', bytes([i]) * 100, '1.0')
+        if i == 1:
+            tts_cache.lookup(keys[0])  # 0번을 최근 사용으로 갱신 → 1번이 가장 오래됨
+
+    remaining = {entry['cache_key'] for entry in tts_cache_table.all()}
+    assert remaining == {keys[0], keys[2]}
+    assert cache_stats()['evictions'] == 1
+    # 제거된 항목의 blob은 참조가 없으므로 S3 객체도 삭제
+    assert len(fake_s3.objects) == 2
+
+
+def test_hits_are_saved_in_batches(cache_env, monkeypatch):
+    monkeypatch.setattr(tts_cache, 'TTS_CACHE_USAGE_FLUSH_ENTRIES', 3)
+    monkeypatch.setattr(tts_cache, 'TTS_CACHE_USAGE_FLUSH_SECONDS', 3600)
+    keys = [tts_cache_key('voice-1', f'문장 {i}') for i in range(3)]
+    for i, key in enumerate(keys):
+        store(key, 'voice-1', bytes([i]) * 10, '1.0')
+    writes = []
+    original = tts_cache.write_tables
+
+    def counting_write_tables(**kwargs):
+        writes.append(kwargs)
+        return original(**kwargs)
+
+    monkeypatch.setattr(tts_cache, 'write_tables', counting_write_tables)
+
+    def saved_hits(key):
+        return tts_cache_table.get(lambda doc: doc['cache_key'] == key).get('hits', 0)
+
+    for _ in range(5):
+        assert tts_cache.lookup(keys[0])['hits'] >= 1  # 저장 전에도 메모리의 적중 수 반영
+    tts_cache.lookup(keys[1])
+    assert writes == [] and saved_hits(keys[0]) == 0
+
+    tts_cache.lookup(keys[2])  # 세 번째 항목에서 한 번에 저장
+    assert len(writes) == 1
+    assert [saved_hits(key) for key in keys] == [5, 1, 1]
+    assert tts_cache.flush_usage() == 0
+
+
+def test_evict_releases_only_cache_reference(cache_env, fake_s3):
+    from core.storage import link_file
+
+    entry = store(tts_cache_key('voice-1', '공유 문장'), 'voice-1', b'shared-audio', '1.0')
+    link_file('user-1', 'example.wav', entry['content_hash'])
+
+    assert evict(0) == 1
+    assert tts_cache_table.all() == []
+    # 사용자 파일 항목이 참조 중이므로 객체는 유지
+    assert entry['object_key'] in fake_s3.objects
+
+
+def test_repeated_clone_reuses_cached_example_audio(cache_env, fake_s3, monkeypatch):
+    import httpx
+    import api.v1.voice as voice
+    import core.workers
+    from core.database import users_table
+    from core.security import get_current_user_id
+    from main import app
+    from test_voice_concurrency import make_wav
+
+    monkeypatch.setattr(voice, 'SUPERTONE_API_KEY', 'test-key')
+    monkeypatch.setattr(core.workers, 'AUDIO_WORKERS', 0)
+    app.dependency_overrides[get_current_user_id] = lambda: 'cache-user'
+    users_table.insert({'id': 'cache-user'})
+    files = [('files', (f'sample_{i}.wav', make_wav(2, seed=i), 'audio/wav')) for i in range(3)]
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return [await client.post('/api/v1/voice/clone', files=files) for _ in range(2)]
+
+    try:
+        responses = run(scenario())
+    finally:
+        app.dependency_overrides.pop(get_current_user_id, None)
+        users_table.remove(lambda row: row.get('id') == 'cache-user')
+
+    assert [r.status_code for r in responses] == [200, 200]
+    assert responses[0].json()['example_audio'] == responses[1].json()['example_audio']
+    assert tts_calls(cache_env) == 1
+    assert fake_s3.put_count == 1
@@ -0,0 +1,140 @@
+"""
+음성 업로드 스트리밍 수신(core/uploads.py) 테스트
+- 컨테이너 헤더 판별, 크기 초과 시 본문을 끝까지 읽지 않고 중단, 형식/개수 검증, 파트 헤더 크기 상한
+
+실행: python3 -m pytest test_uploads.py
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+import api.v1.voice as voice
+from core.security import get_current_user_id
+from core.uploads import sniff_audio_format
+from main import app
+from test_voice_concurrency import make_wav
+
+BOUNDARY = 'testboundary'
+
+
+@pytest.mark.parametrize("head,expected", [
+    (b'RIFF\x24\x08\x00\x00WAVEfmt ', 'wav'),
+    (b'ID3\x04\x00\x00\x00\x00\x00\x00\x00\x00', 'mp3'),
+    (bytes([0xFF, 0xFB, 0x90, 0x64]) + b'\x00' * 8, 'mp3'),  # MPEG-1 Layer III 128kbps 44.1kHz
+    (bytes([0xFF, 0xF3, 0x64, 0xC4]) + b'\x00' * 8, 'mp3'),  # MPEG-2 Layer III
+    (bytes([0xFF, 0xFB, 0xF0, 0x64]) + b'\x00' * 8, None),   # 금지된 비트레이트 인덱스
+    (bytes([0xFF, 0xE9, 0x90, 0x64]) + b'\x00' * 8, None),   # 예약된 MPEG 버전
+    (b'RIFF\x24\x08\x00\x00AVI LIST', None),
+    (b'\x00\x00\x00\x20ftypM4A ', None),
+    (b'', None),
+])
+def test_sniff_audio_format(head, expected):
+    assert sniff_audio_format(head) == expected
+
+
+def multipart_parts(files):
+    """(파일명, 바이트) 목록을 multipart 본문 조각으로 반환"""
+    parts = []
+    for name, data in files:
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="files"; filename="{name}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n'.encode()
+        )
+        for i in range(0, len(data), 64 * 1024):
+            parts.append(data[i:i + 64 * 1024])
+        parts.append(b'\r\n')
+    parts.append(f'--{BOUNDARY}--\r\n'.encode())
+    return parts
+
+
+class CountingStream(httpx.AsyncByteStream):
+    """전송된 본문 바이트 수를 기록하는 요청 스트림"""
+
+    def __init__(self, parts):
+        self.parts = parts
+        self.sent = 0
+
+    async def __aiter__(self):
+        for part in self.parts:
+            self.sent += len(part)
+            yield part
+
+
+@pytest.fixture
+def upload_env(monkeypatch):
+    monkeypatch.setattr(voice, 'SUPERTONE_API_KEY', 'test-key')
+    app.dependency_overrides[get_current_user_id] = lambda: 'upload-user'
+    yield
+    app.dependency_overrides.pop(get_current_user_id, None)
+
+
+def post_clone(parts, headers=None):
+    stream = CountingStream(parts)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            request = client.build_request(
+                'POST', '/api/v1/voice/clone',
+                headers={'Content-Type': f'multipart/form-data; boundary={BOUNDARY}', **(headers or {})},
+                content=stream
+            )
+            return await client.send(request)
+
+    return asyncio.run(scenario()), stream
+
+
+def test_oversized_file_is_rejected_before_body_is_read(upload_env):
+    oversized = make_wav(40, frame_rate=44100)  # 약 3.5MB
+    parts = multipart_parts([('a.wav', oversized), ('b.wav', make_wav(1)), ('c.wav', make_wav(1))])
+    total = sum(len(p) for p in parts)
+
+    resp, stream = post_clone(parts)
+
+    assert resp.status_code == 400
+    assert '3MB' in resp.json()['detail']
+    assert stream.sent < voice.MAX_SAMPLE_BYTES + 128 * 1024 < total
+
+
+def test_declared_content_length_over_limit_is_rejected_without_reading(upload_env):
+    parts = multipart_parts([('a.wav', make_wav(1))])
+    resp, stream = post_clone(parts, headers={'Content-Length': str(20 * 1024 * 1024)})
+
+    assert resp.status_code == 413
+    assert stream.sent == 0
+
+
+def test_non_audio_header_is_rejected_early(upload_env):
+    fake = b'<html>' + b'x' * (2 * 1024 * 1024)
+    resp, stream = post_clone(multipart_parts([('a.wav', fake), ('b.wav', make_wav(1)), ('c.wav', make_wav(1))]))
+
+    assert resp.status_code == 400
+    assert 'WAV 또는 MP3' in resp.json()['detail']
+    assert stream.sent < 256 * 1024
+
+
+@pytest.mark.parametrize("count", [2, 4])
+def test_wrong_file_count_is_rejected(upload_env, count):
+    files = [(f'{i}.wav', make_wav(0.2, seed=i)) for i in range(count)]
+    resp, _ = post_clone(multipart_parts(files))
+    assert resp.status_code == 400
+    assert '3개' in resp.json()['detail']
+
+
+@pytest.mark.parametrize("header", [
+    f'X-Padding: {"a" * 64 * 1024}\r\n',  # 긴 헤더 값
+    f'X-{"a" * 64 * 1024}: 1\r\n',  # 긴 헤더 이름
+    f'X-Padding: {"a" * 100}\r\n' * 200,  # 짧은 헤더 여러 개
+], ids=['long-value', 'long-name', 'many-headers'])
+def test_oversized_part_headers_are_rejected(upload_env, header):
+    parts = [
+        f'--{BOUNDARY}\r\n{header}Content-Disposition: form-data; name="files"; filename="a.wav"\r\n\r\n'.encode(),
+        make_wav(0.2),
+        f'\r\n--{BOUNDARY}--\r\n'.encode(),
+    ]
+    resp, stream = post_clone(parts)
+
+    assert resp.status_code == 413
+    assert '헤더' in resp.json()['detail']
@@ -0,0 +1,139 @@
+"""
+음성 클론 API 동시성 테스트
+- 실제 /voice/clone 동시 요청 중 이벤트 루프 지연을 측정하여, 오디오 처리(프로세스 풀)와
+  공용 HTTP 클라이언트 경로가 루프를 막지 않는지 확인합니다.
+- 동시 클론 요청이 모두 정상 처리되는지 확인합니다.
+- Supertone API는 로컬 대역 서버로, S3는 메모리 대역으로 대체합니다. (ffmpeg 불필요: WAV 샘플 사용)
+
+실행: python3 -m pytest test_voice_concurrency.py
+"""
+
+import asyncio
+import io
+import os
+import time
+import wave
+
+import httpx
+import numpy as np
+import pytest
+
+import api.v1.voice as voice
+from core.audio import build_clone_payload
+from core.database import users_table
+from core.http_client import close_http_client, start_http_client
+from core.security import get_current_user_id
+from core.workers import start_audio_workers, shutdown_audio_workers, run_audio_task
+from main import app
+
+USER_ID = 'concurrency-user'
+CONCURRENT_REQUESTS = 4
+MAX_LOOP_LAG = 0.15  # 초
+
+
+def make_wav(seconds: float, frame_rate: int = 44100, seed: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    n = int(seconds * frame_rate)
+    t = np.arange(n) / frame_rate
+    # 음절 사이 쉼이 있는 발화 형태 (연속된 톤은 품질 검사에서 잡음으로 판정됨)
+    envelope = np.sin(2 * np.pi * 1.5 * t) > -0.6
+    samples = 6000 * np.sin(2 * np.pi * 200 * t) * envelope + rng.normal(0, 30, n)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(frame_rate)
+        wav.writeframes(samples.astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def clone_env(monkeypatch, fake_s3, supertone_stub):
+    monkeypatch.setattr(voice, 'SUPERTONE_API_KEY', 'test-key')
+    supertone_stub.delay = 0.05
+    supertone_stub.tts_audio = make_wav(0.5, 22050)
+    app.dependency_overrides[get_current_user_id] = lambda: USER_ID
+    users_table.insert({'id': USER_ID, 'username': USER_ID})
+    start_audio_workers()
+    yield fake_s3
+    shutdown_audio_workers()
+    app.dependency_overrides.pop(get_current_user_id, None)
+    users_table.remove(lambda row: row.get('id') == USER_ID)
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """이벤트 루프 지연 최대값 측정"""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+def test_clone_requests_do_not_block_event_loop(clone_env):
+    samples = [make_wav(16, seed=i) for i in range(3)]
+
+    # 루프에서 직접 처리했다면 생겼을 지연이 허용치보다 커야 의미 있는 테스트
+    started = time.perf_counter()
+    build_clone_payload([(data, 'wav') for data in samples])
+    assert (time.perf_counter() - started) * CONCURRENT_REQUESTS > MAX_LOOP_LAG
+
+    async def scenario():
+        # 앱 lifespan과 같이 공용 HTTP 클라이언트를 만들고, 워커 프로세스를 준비 (spawn + import)
+        await start_http_client()
+        pids = await run_audio_task(os.getpid)
+        await run_audio_task(build_clone_payload, [(samples[0], 'wav')])
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            async def clone():
+                files = [('files', (f'sample_{i}.wav', data, 'audio/wav')) for i, data in enumerate(samples)]
+                return await client.post('/api/v1/voice/clone', files=files)
+
+            # 첫 요청에서만 일어나는 지연 import(스레드 풀 백엔드 등)는 측정에서 제외
+            await client.get('/api/v1/voice/tts-cache/stats')
+            stop = asyncio.Event()
+            lag_task = asyncio.create_task(measure_loop_lag(stop))
+            responses = await asyncio.gather(*(clone() for _ in range(CONCURRENT_REQUESTS)))
+            stop.set()
+            lag = await lag_task
+        await close_http_client()
+        return pids, responses, lag
+
+    worker_pid, responses, worst_lag = asyncio.run(scenario())
+
+    assert worker_pid != os.getpid()
+    for response in responses:
+        assert response.status_code == 200, response.text
+        assert response.json()['voice_id'] == f'voice-{USER_ID}'
+    assert worst_lag < MAX_LOOP_LAG
+
+
+def test_concurrent_clone_requests(clone_env):
+    # 병합 결과가 3MB 이하(WAV 경로)가 되는 길이: 환경의 ffmpeg 유무와 관계없이 동일하게 동작
+    samples = [make_wav(9.5, seed=i) for i in range(3)]
+
+    async def scenario():
+        await run_audio_task(build_clone_payload, [(samples[0], 'wav')])
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            async def clone():
+                files = [('files', (f'sample_{i}.wav', data, 'audio/wav')) for i, data in enumerate(samples)]
+                return await client.post('/api/v1/voice/clone', files=files)
+
+            responses = await asyncio.gather(*(clone() for _ in range(CONCURRENT_REQUESTS)))
+        await close_http_client()
+        return responses
+
+    responses = asyncio.run(scenario())
+
+    for response in responses:
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body['voice_id'] == f'voice-{USER_ID}'
+        assert body['example_audio']['audio_length'] == '0.5'
+        stages = [item.split(';')[0] for item in response.headers['server-timing'].split(', ')]
+        assert stages == ['receiving', 'preprocessing', 'cloning', 'tts', 'uploading', 'presigning']
+    assert clone_env.put_count == 1  # 같은 예제 오디오는 한 번만 업로드 (콘텐츠 해시)
@@ -0,0 +1,151 @@
+"""
+보이스 클로닝 비동기 작업 API 테스트
+- 작업 등록(202) → 상태 조회/SSE로 완료 확인, Idempotency-Key 중복 방지, 실패/재시작 처리
+- Supertone API는 로컬 대역 서버로, S3는 메모리 대역으로 대체합니다.
+
+실행: python3 -m pytest test_voice_jobs.py
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import api.v1.voice as voice
+import core.workers
+from core.database import users_table, jobs_table
+from core.http_client import close_http_client
+from core.jobs import JOB_FAILED, JOB_QUEUED, fail_interrupted_jobs, stop_job_workers
+from core.security import get_current_user_id
+from main import app
+from test_voice_concurrency import make_wav
+
+USER_ID = 'jobs-user'
+
+
+@pytest.fixture
+def job_env(monkeypatch, fake_s3, supertone_stub):
+    monkeypatch.setattr(voice, 'SUPERTONE_API_KEY', 'test-key')
+    monkeypatch.setattr(core.workers, 'AUDIO_WORKERS', 0)  # 오디오 처리는 스레드에서
+    supertone_stub.tts_audio = make_wav(0.5, 22050)
+    app.dependency_overrides[get_current_user_id] = lambda: USER_ID
+    users_table.insert({'id': USER_ID, 'username': USER_ID})
+    yield supertone_stub
+    app.dependency_overrides.pop(get_current_user_id, None)
+    users_table.remove(lambda row: row.get('id') == USER_ID)
+    jobs_table.truncate()
+
+
+def sample_files():
+    return [('files', (f'sample_{i}.wav', make_wav(2, seed=i), 'audio/wav')) for i in range(3)]
+
+
+def run_with_client(scenario):
+    async def wrapper():
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                return await scenario(client)
+        finally:
+            await stop_job_workers()
+            await close_http_client()
+    return asyncio.run(wrapper())
+
+
+async def wait_finished(client, job_id):
+    for _ in range(200):
+        body = (await client.get(f'/api/v1/voice/jobs/{job_id}')).json()
+        if body['status'] in ('completed', 'failed'):
+            return body
+        await asyncio.sleep(0.02)
+    raise AssertionError('작업이 끝나지 않았습니다.')
+
+
+def test_clone_job_completes_and_reports_result(job_env):
+    async def scenario(client):
+        resp = await client.post('/api/v1/voice/clone/jobs', files=sample_files())
+        assert resp.status_code == 202
+        accepted = resp.json()
+        assert accepted['status'] == JOB_QUEUED
+        return accepted, await wait_finished(client, accepted['job_id'])
+
+    accepted, job = run_with_client(scenario)
+
+    assert job['status'] == 'completed'
+    assert job['result']['voice_id'] == f'voice-{USER_ID}'
+    assert job['result']['example_audio']['audio_length'] == '0.5'
+    assert job['error'] is None
+    assert accepted['status_url'] == f"/api/v1/voice/jobs/{accepted['job_id']}"
+
+
+def test_idempotency_key_reuses_existing_job(job_env):
+    async def scenario(client):
+        headers = {'Idempotency-Key': 'retry-1'}
+        first = (await client.post('/api/v1/voice/clone/jobs', files=sample_files(), headers=headers)).json()
+        second = (await client.post('/api/v1/voice/clone/jobs', files=sample_files(), headers=headers)).json()
+        await wait_finished(client, first['job_id'])
+        third = (await client.post('/api/v1/voice/clone/jobs', files=sample_files(), headers=headers)).json()
+        return first, second, third
+
+    first, second, third = run_with_client(scenario)
+
+    assert first['job_id'] == second['job_id'] == third['job_id']
+    assert third['status'] == 'completed'
+    assert [kind for kind, _, _ in job_env.requests].count('clone') == 1
+
+
+def test_job_events_stream_until_finished(job_env):
+    job_env.delay = 0.05
+
+    async def scenario(client):
+        job_id = (await client.post('/api/v1/voice/clone/jobs', files=sample_files())).json()['job_id']
+        events = []
+        async with client.stream('GET', f'/api/v1/voice/jobs/{job_id}/events') as resp:
+            assert resp.headers['content-type'].startswith('text/event-stream')
+            async for line in resp.aiter_lines():
+                if line.startswith('data: '):
+                    events.append(json.loads(line[len('data: '):]))
+        return events
+
+    events = run_with_client(scenario)
+
+    assert events[-1]['status'] == 'completed'
+    assert events[-1]['result']['voice_id'] == f'voice-{USER_ID}'
+    stages = [event['stage'] for event in events if event['stage']]
+    # 연결 시점 이후의 단계가 순서대로 한 번씩 전달됨
+    assert stages == ['preprocessing', 'cloning', 'tts', 'uploading', 'presigning'][-len(stages):]
+    assert 'cloning' in stages
+
+
+def test_failed_job_reports_error(job_env):
+    users_table.remove(lambda row: row.get('id') == USER_ID)  # voice_id 저장 단계에서 404
+
+    async def scenario(client):
+        job_id = (await client.post('/api/v1/voice/clone/jobs', files=sample_files())).json()['job_id']
+        return await wait_finished(client, job_id)
+
+    job = run_with_client(scenario)
+
+    assert job['status'] == 'failed'
+    assert job['error']['status_code'] == 404
+    assert job['result'] is None
+
+
+def test_other_users_job_is_forbidden(job_env):
+    jobs_table.insert({'job_id': 'someone-else', 'kind': 'voice_clone', 'user_id': 'other', 'status': 'queued'})
+
+    async def scenario(client):
+        return (await client.get('/api/v1/voice/jobs/someone-else')).status_code, \
+               (await client.get('/api/v1/voice/jobs/missing')).status_code
+
+    assert run_with_client(scenario) == (403, 404)
+
+
+def test_interrupted_jobs_are_failed_on_restart(job_env):
+    for job_id, status in (('a', 'queued'), ('b', 'running'), ('c', 'completed')):
+        jobs_table.insert({'job_id': job_id, 'kind': 'voice_clone', 'user_id': USER_ID, 'status': status})
+
+    assert fail_interrupted_jobs() == 2
+    statuses = {job['job_id']: job['status'] for job in jobs_table.all()}
+    assert statuses == {'a': JOB_FAILED, 'b': JOB_FAILED, 'c': 'completed'}
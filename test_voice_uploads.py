@@ -0,0 +1,162 @@
+"""
+S3 직접 업로드 기반 보이스 클로닝 API 테스트
+- upload-urls 발급 → (클라이언트가 S3에 PUT) → clone/uploads 처리
+- 업로드 누락, 선언한 크기/형식과 불일치, 크기 초과, 중복 요청(처리 중 409, 완료 후 410)
+- Supertone API는 로컬 대역 서버로, S3는 메모리 대역으로 대체합니다.
+
+실행: python3 -m pytest test_voice_uploads.py
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+import api.v1.voice as voice
+import core.workers
+from core.database import users_table, voice_uploads_table
+from core.http_client import close_http_client
+from core.security import get_current_user_id
+from main import app
+from test_voice_concurrency import make_wav
+
+USER_ID = 'uploads-user'
+
+
+@pytest.fixture
+def upload_env(monkeypatch, fake_s3, supertone_stub):
+    monkeypatch.setattr(voice, 'SUPERTONE_API_KEY', 'test-key')
+    monkeypatch.setattr(core.workers, 'AUDIO_WORKERS', 0)  # 오디오 처리는 스레드에서
+    supertone_stub.tts_audio = make_wav(0.5, 22050)
+    app.dependency_overrides[get_current_user_id] = lambda: USER_ID
+    users_table.insert({'id': USER_ID, 'username': USER_ID})
+    yield fake_s3, supertone_stub
+    app.dependency_overrides.pop(get_current_user_id, None)
+    users_table.remove(lambda row: row.get('id') == USER_ID)
+    voice_uploads_table.truncate()
+
+
+def run_with_client(scenario):
+    async def wrapper():
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                return await scenario(client)
+        finally:
+            await close_http_client()
+    return asyncio.run(wrapper())
+
+
+SAMPLES = [make_wav(2, seed=i) for i in range(3)]
+
+
+async def request_urls(client, samples=SAMPLES, content_type='audio/wav'):
+    resp = await client.post('/api/v1/voice/clone/upload-urls', json={'files': [
+        {'file_name': f'sample_{i}.wav', 'content_type': content_type, 'size': len(data)}
+        for i, data in enumerate(samples)
+    ]})
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def put_objects(s3, session, samples=SAMPLES, content_type='audio/wav'):
+    """클라이언트가 presigned URL로 PUT 한 결과를 흉내 냄"""
+    for upload, data in zip(session['uploads'], samples):
+        s3.objects[upload['object_key']] = (data, content_type)
+
+
+def session_status(upload_id):
+    return voice_uploads_table.get(lambda row: row['upload_id'] == upload_id)['status']
+
+
+def test_clone_from_uploads_happy_path(upload_env):
+    s3, _ = upload_env
+
+    async def scenario(client):
+        session = await request_urls(client)
+        put_objects(s3, session)
+        return session, await client.post(f"/api/v1/voice/clone/uploads/{session['upload_id']}")
+
+    session, resp = run_with_client(scenario)
+
+    assert resp.status_code == 200, resp.text
+    assert resp.json()['voice_id'] == f'voice-{USER_ID}'
+    assert session_status(session['upload_id']) == 'completed'
+    assert all(upload['object_key'] not in s3.objects for upload in session['uploads'])
+
+
+def test_missing_object_reverts_session_for_retry(upload_env):
+    s3, _ = upload_env
+
+    async def scenario(client):
+        session = await request_urls(client)
+        put_objects(s3, session, SAMPLES[:2])
+        missing = await client.post(f"/api/v1/voice/clone/uploads/{session['upload_id']}")
+        status_after_failure = session_status(session['upload_id'])
+        put_objects(s3, session)
+        retried = await client.post(f"/api/v1/voice/clone/uploads/{session['upload_id']}")
+        return missing, status_after_failure, retried
+
+    missing, status_after_failure, retried = run_with_client(scenario)
+
+    assert missing.status_code == 400
+    assert 'sample_2.wav' in missing.json()['detail']
+    assert status_after_failure == 'pending'
+    assert retried.status_code == 200, retried.text
+
+
+@pytest.mark.parametrize('stored_data,stored_type,detail', [
+    (SAMPLES[0][:-10], 'audio/wav', '크기'),
+    (SAMPLES[0], 'audio/mpeg', '형식'),
+])
+def test_mismatched_upload_is_rejected(upload_env, stored_data, stored_type, detail):
+    s3, _ = upload_env
+
+    async def scenario(client):
+        session = await request_urls(client)
+        put_objects(s3, session)
+        s3.objects[session['uploads'][0]['object_key']] = (stored_data, stored_type)
+        return session, await client.post(f"/api/v1/voice/clone/uploads/{session['upload_id']}")
+
+    session, resp = run_with_client(scenario)
+
+    assert resp.status_code == 400
+    assert detail in resp.json()['detail']
+    assert session_status(session['upload_id']) == 'pending'
+
+
+def test_oversize_or_unsupported_declaration_is_rejected(upload_env):
+    async def scenario(client):
+        oversize = await client.post('/api/v1/voice/clone/upload-urls', json={'files': [
+            {'file_name': f'{i}.wav', 'content_type': 'audio/wav', 'size': voice.MAX_SAMPLE_BYTES + i}
+            for i in range(3)
+        ]})
+        unsupported = await client.post('/api/v1/voice/clone/upload-urls', json={'files': [
+            {'file_name': f'{i}.ogg', 'content_type': 'audio/ogg', 'size': 1000} for i in range(3)
+        ]})
+        return oversize, unsupported
+
+    oversize, unsupported = run_with_client(scenario)
+
+    assert oversize.status_code == 400 and '3MB' in oversize.json()['detail']
+    assert unsupported.status_code == 400
+    assert voice_uploads_table.all() == []
+
+
+def test_double_submit_is_processed_once(upload_env):
+    s3, stub = upload_env
+    stub.delay = 0.3
+
+    async def scenario(client):
+        session = await request_urls(client)
+        put_objects(s3, session)
+        url = f"/api/v1/voice/clone/uploads/{session['upload_id']}"
+        first, second = await asyncio.gather(client.post(url), client.post(url))
+        again = await client.post(url)
+        return first, second, again
+
+    first, second, again = run_with_client(scenario)
+
+    assert sorted([first.status_code, second.status_code]) == [200, 409]
+    assert again.status_code == 410
+    assert [kind for kind, _, _ in stub.requests].count('clone') == 1